@@ -12,13 +12,9 @@ This package provides:
 from .models.envelope_v1 import EventEnvelopeV1
 
 # Import from generated models with their actual class names
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), 'models', 'identity_user.v1'))
-
-from UserCreated import UserCreatedEvent as UserCreated
-from UserUpdated import UserUpdatedEvent as UserUpdated
-from UserDisabled import UserDisabledEvent as UserDisabled
+from .models import UserCreatedEvent as UserCreated
+from .models import UserUpdatedEvent as UserUpdated
+from .models import UserDisabledEvent as UserDisabled
 
 # Import validators
 from .validators import (
@@ -28,6 +24,7 @@ from .validators import (
     validate_user_updated,
     validate_user_disabled,
 )
+from .registry import EventValidationError, SchemaRegistry, get_registry
 
 # Import constants
 from .constants import EventTypes, Topics
@@ -45,6 +42,10 @@ __all__ = [
     "validate_user_created",
     "validate_user_updated",
     "validate_user_disabled",
+    # Schema registry
+    "EventValidationError",
+    "SchemaRegistry",
+    "get_registry",
     # Constants
     "EventTypes",
     "Topics",
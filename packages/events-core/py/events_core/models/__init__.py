@@ -1,3 +1,23 @@
 # generated by datamodel-codegen:
 #   filename:  schemas
 #   timestamp: 2025-11-23T06:26:27+00:00
+
+import importlib.util
+import sys
+from pathlib import Path
+
+
+def _load_generated(directory: str, module: str):
+    """Import a generated module from a directory that is not a valid package name."""
+    name = f"{__name__}.{directory.replace('.', '_')}.{module}"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, Path(__file__).parent / directory / f"{module}.py")
+        loaded = importlib.util.module_from_spec(spec)
+        sys.modules[name] = loaded
+        spec.loader.exec_module(loaded)
+    return sys.modules[name]
+
+
+UserCreatedEvent = _load_generated("identity_user.v1", "UserCreated").UserCreatedEvent
+UserUpdatedEvent = _load_generated("identity_user.v1", "UserUpdated").UserUpdatedEvent
+UserDisabledEvent = _load_generated("identity_user.v1", "UserDisabled").UserDisabledEvent
@@ -0,0 +1,227 @@
+"""Compiled event schema registry.
+
+The JSON Schemas under ``packages/events-core/schemas`` are compiled once into
+Pydantic ``TypeAdapter`` validators keyed by ``(topic, event_type,
+schema_version)``.  Validation works on plain dicts (schemas compile to
+``TypedDict`` types, not models), so it is cheap enough to run on every
+consumed event.
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple, Union
+from uuid import UUID
+
+from pydantic import ConfigDict, Field, TypeAdapter, ValidationError, with_config
+from typing_extensions import Annotated, NotRequired, TypedDict
+
+logger = logging.getLogger(__name__)
+
+SchemaKey = Tuple[str, str, int]
+
+ENVELOPE_SCHEMA = "envelope.v1.json"
+
+# JSON Schema "format" -> Python type.  Emails get a structural check only:
+# full deliverability parsing (email-validator) costs ~20x the rest of an
+# event, and producers already validate addresses on input.
+_FORMATS = {
+    "uuid": UUID,
+    "date-time": datetime,
+    "email": Annotated[str, Field(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$")],
+}
+
+_SCALARS = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+}
+
+_TOPIC_VERSION = re.compile(r"\.v(\d+)$")
+
+
+class EventValidationError(ValueError):
+    """Raised when an event does not match its schema."""
+
+    def __init__(self, message: str, errors: Optional[List[Dict[str, Any]]] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+def _schema_dir_candidates() -> Iterable[Path]:
+    env_dir = os.getenv("EVENTS_CORE_SCHEMA_DIR")
+    if env_dir:
+        yield Path(env_dir)
+    here = Path(__file__).resolve().parent
+    yield here.parent.parent / "schemas"  # source tree: packages/events-core/schemas
+    yield here.parent / "schemas"  # wheel install: schemas/ next to the package
+
+
+def default_schema_dir() -> Path:
+    """Locate the bundled schema directory."""
+    for candidate in _schema_dir_candidates():
+        if (candidate / ENVELOPE_SCHEMA).is_file():
+            return candidate
+    raise FileNotFoundError("events-core schemas not found; set EVENTS_CORE_SCHEMA_DIR")
+
+
+def _format_errors(error: ValidationError, limit: int = 5) -> str:
+    parts = [
+        f"{'.'.join(str(loc) for loc in e['loc']) or '<root>'}: {e['msg']}"
+        for e in error.errors(include_url=False)[:limit]
+    ]
+    if error.error_count() > limit:
+        parts.append(f"... {error.error_count() - limit} more")
+    return "; ".join(parts)
+
+
+class _SchemaCompiler:
+    """Translates the JSON Schema subset used by events-core into Python types."""
+
+    def compile(self, schema: Dict[str, Any], name: str) -> TypeAdapter:
+        return TypeAdapter(self._annotation(schema, name))
+
+    def _annotation(self, schema: Dict[str, Any], name: str) -> Any:
+        if "enum" in schema:
+            return Literal[tuple(schema["enum"])]
+
+        types = schema.get("type", [])
+        types = [types] if isinstance(types, str) else list(types)
+        nullable = "null" in types
+        options = [self._type(t, schema, name) for t in types if t != "null"] or [Any]
+
+        annotation = options[0] if len(options) == 1 else Union[tuple(options)]
+        return Optional[annotation] if nullable else annotation
+
+    def _type(self, json_type: str, schema: Dict[str, Any], name: str) -> Any:
+        if json_type == "object":
+            if "properties" not in schema:
+                return Dict[str, Any]
+            return self._object(schema, name)
+        if json_type == "array":
+            items = schema.get("items")
+            if not items:
+                return List[Any]
+            item_type = self._annotation(items, f"{name}Item")
+            return List[item_type]
+
+        base = _SCALARS[json_type]
+        if json_type == "string":
+            base = _FORMATS.get(schema.get("format"), str)
+
+        constraints = {
+            "min_length": schema.get("minLength"),
+            "max_length": schema.get("maxLength"),
+            "pattern": schema.get("pattern"),
+            "ge": schema.get("minimum"),
+            "le": schema.get("maximum"),
+        }
+        constraints = {k: v for k, v in constraints.items() if v is not None}
+        return Annotated[base, Field(**constraints)] if constraints else base
+
+    def _object(self, schema: Dict[str, Any], name: str) -> Any:
+        required = set(schema.get("required", []))
+        fields = {}
+        for prop, prop_schema in schema["properties"].items():
+            annotation = self._annotation(prop_schema, f"{name}_{prop}")
+            fields[prop] = annotation if prop in required else NotRequired[annotation]
+
+        extra = "forbid" if schema.get("additionalProperties") is False else "allow"
+        return with_config(ConfigDict(extra=extra))(TypedDict(name, fields))
+
+
+class SchemaRegistry:
+    """Validators for the event envelope and every registered payload schema."""
+
+    def __init__(self, schema_dir: Optional[Path] = None):
+        self.schema_dir = Path(schema_dir) if schema_dir else default_schema_dir()
+        compiler = _SchemaCompiler()
+
+        self._envelope = compiler.compile(self._read(self.schema_dir / ENVELOPE_SCHEMA), "EnvelopeV1")
+        self._payloads: Dict[SchemaKey, TypeAdapter] = {}
+        for path in sorted(self.schema_dir.glob("*/*.json")):
+            topic, event_type = path.parent.name, path.stem
+            match = _TOPIC_VERSION.search(topic)
+            version = int(match.group(1)) if match else 1
+            self._payloads[(topic, event_type, version)] = compiler.compile(self._read(path), event_type)
+
+        logger.debug(f"Compiled {len(self._payloads)} event schemas from {self.schema_dir}")
+
+    @staticmethod
+    def _read(path: Path) -> Dict[str, Any]:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def keys(self) -> List[SchemaKey]:
+        """Registered ``(topic, event_type, schema_version)`` keys."""
+        return list(self._payloads)
+
+    def validator_for(self, topic: str, event_type: str, schema_version: int) -> Optional[TypeAdapter]:
+        """Compiled payload validator, or None if no schema is registered."""
+        return self._payloads.get((topic, event_type, schema_version))
+
+    def validate_envelope(self, event: Dict[str, Any]):
+        """Validate the envelope fields of an event."""
+        try:
+            self._envelope.validate_python(event)
+        except ValidationError as e:
+            raise EventValidationError(f"Invalid event envelope: {_format_errors(e)}", e.errors()) from None
+
+    def validate_payload(self, topic: str, event_type: str, schema_version: int, payload: Any) -> bool:
+        """Validate a payload against its schema.
+
+        Returns:
+            False if no schema is registered for the key (nothing was checked)
+        """
+        validator = self.validator_for(topic, event_type, schema_version)
+        if validator is None:
+            return False
+        try:
+            validator.validate_python(payload)
+        except ValidationError as e:
+            raise EventValidationError(
+                f"Invalid {event_type} v{schema_version} payload: {_format_errors(e)}", e.errors()
+            ) from None
+        return True
+
+    def validate(self, event: Dict[str, Any], require_schema: bool = False):
+        """Validate a complete event (envelope + payload).
+
+        Args:
+            event: Event dict with envelope fields and a ``payload``
+            require_schema: Treat events without a registered payload schema as invalid
+
+        Raises:
+            EventValidationError: If the event does not validate
+        """
+        self.validate_envelope(event)
+        key = (event["topic"], event["event_type"], event["schema_version"])
+        if not self.validate_payload(*key, event["payload"]) and require_schema:
+            raise EventValidationError(f"No schema registered for {key}")
+
+    def is_valid(self, event: Dict[str, Any], require_schema: bool = False) -> bool:
+        """Boolean form of ``validate``."""
+        try:
+            self.validate(event, require_schema=require_schema)
+            return True
+        except EventValidationError:
+            return False
+
+
+@lru_cache(maxsize=None)
+def get_registry() -> SchemaRegistry:
+    """Process-wide registry compiled from the bundled schemas."""
+    return SchemaRegistry()
+
+
+__all__ = [
+    "EventValidationError",
+    "SchemaRegistry",
+    "default_schema_dir",
+    "get_registry",
+]
@@ -1,59 +1,45 @@
-"""Event validation utilities using the generated Pydantic models."""
+"""Event validation utilities backed by the compiled schema registry."""
 
-from typing import Any, Dict, Union
-from pydantic import ValidationError
+import logging
+from typing import Any, Dict
 
-from .models.envelope_v1 import EventEnvelopeV1
+from .constants import EventTypes, Topics
+from .registry import EventValidationError, get_registry
 
-# Import from generated models with correct path
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), 'models', 'identity_user.v1'))
-
-from UserCreated import UserCreatedEvent as UserCreated
-from UserUpdated import UserUpdatedEvent as UserUpdated
-from UserDisabled import UserDisabledEvent as UserDisabled
-from .constants import EventTypes
+logger = logging.getLogger(__name__)
 
 
 def validate_envelope(data: Dict[str, Any]) -> bool:
     """Validate event envelope structure."""
     try:
-        EventEnvelopeV1(**data)
+        get_registry().validate_envelope(data)
         return True
-    except ValidationError as e:
-        print(f"Envelope validation failed: {e}")
+    except EventValidationError as e:
+        logger.warning(f"Envelope validation failed: {e}")
         return False
 
 
-def validate_user_created(data: Dict[str, Any]) -> bool:
-    """Validate UserCreated payload."""
+def _validate_payload(event_type: str, data: Dict[str, Any]) -> bool:
     try:
-        UserCreated(**data)
-        return True
-    except ValidationError as e:
-        print(f"UserCreated validation failed: {e}")
+        return get_registry().validate_payload(Topics.IDENTITY_USER_V1, event_type, 1, data)
+    except EventValidationError as e:
+        logger.warning(f"{event_type} validation failed: {e}")
         return False
 
 
+def validate_user_created(data: Dict[str, Any]) -> bool:
+    """Validate UserCreated payload."""
+    return _validate_payload(EventTypes.USER_CREATED, data)
+
+
 def validate_user_updated(data: Dict[str, Any]) -> bool:
     """Validate UserUpdated payload."""
-    try:
-        UserUpdated(**data)
-        return True
-    except ValidationError as e:
-        print(f"UserUpdated validation failed: {e}")
-        return False
+    return _validate_payload(EventTypes.USER_UPDATED, data)
 
 
 def validate_user_disabled(data: Dict[str, Any]) -> bool:
     """Validate UserDisabled payload."""
-    try:
-        UserDisabled(**data)
-        return True
-    except ValidationError as e:
-        print(f"UserDisabled validation failed: {e}")
-        return False
+    return _validate_payload(EventTypes.USER_DISABLED, data)
 
 
 def validate_event(event_data: Dict[str, Any]) -> bool:
@@ -64,24 +50,13 @@ def validate_event(event_data: Dict[str, Any]) -> bool:
         event_data: Dictionary containing the complete event
 
     Returns:
-        bool: True if valid, False otherwise
+        bool: True if valid, False otherwise (including unknown event types)
     """
-    # First validate envelope
-    if not validate_envelope(event_data):
-        return False
-
-    # Then validate payload based on event type
-    event_type = event_data.get("event_type")
-    payload = event_data.get("payload", {})
-
-    if event_type == EventTypes.USER_CREATED:
-        return validate_user_created(payload)
-    elif event_type == EventTypes.USER_UPDATED:
-        return validate_user_updated(payload)
-    elif event_type == EventTypes.USER_DISABLED:
-        return validate_user_disabled(payload)
-    else:
-        print(f"Unknown event type: {event_type}")
+    try:
+        get_registry().validate(event_data, require_schema=True)
+        return True
+    except EventValidationError as e:
+        logger.warning(f"Event validation failed: {e}")
         return False
 
 
@@ -91,4 +66,4 @@ __all__ = [
     "validate_user_created",
     "validate_user_updated",
     "validate_user_disabled",
-]
\ No newline at end of file
+]
@@ -4,27 +4,35 @@ DLQ (Dead Letter Queue) inspection and recovery tool.
 
 This script provides utilities for:
 - Inspecting failed messages in DLQ streams
-- Reprocessing messages after fixes
+- Reprocessing messages after fixes (one at a time or in bulk)
 - Marking messages as resolved
 - Generating DLQ reports
 
+Both DLQ layouts are understood: relay entries (``original_event_id``,
+``error_message``, ...) and consumer entries (the original stream fields plus
+``original_stream``, ``error``, ``deliveries``, ...).
+
 Usage:
     python dlq_tool.py list --stream identity.dlq
     python dlq_tool.py inspect --stream identity.dlq --id 1700000000000-0
     python dlq_tool.py reprocess --stream identity.dlq --id 1700000000000-0
     python dlq_tool.py resolve --stream identity.dlq --id 1700000000000-0
     python dlq_tool.py report --stream identity.dlq --hours 24
+    python dlq_tool.py replay --stream identity.user.v1.dlq --event-type UserCreated \
+        --since 2h --rate 200 --batch-size 100
 """
 
 import argparse
 import asyncio
 import json
 import logging
+import re
 import sys
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 
-import aioredis
+import redis.asyncio as redis
 from tabulate import tabulate
 
 # Configure logging
@@ -34,6 +42,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Fields the event consumer adds when it dead-letters a stream entry
+CONSUMER_DLQ_FIELDS = {
+    "original_stream", "original_message_id", "consumer_group", "deliveries", "error", "failed_at",
+}
+
+# Replays are recorded in <stream>.resolved; keep enough history for bulk runs
+RESOLVED_MAXLEN = 100000
+
+_RELATIVE_TIME = re.compile(r"^(\d+)([smhd])$")
+
+
+def parse_time(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp or a relative age such as ``30m``, ``2h``, ``1d``."""
+    match = _RELATIVE_TIME.match(value)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        seconds = amount * {"s": 1, "m": 60, "h": 3600, "d": 86400}[unit]
+        return datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _stream_id_ms(moment: datetime) -> str:
+    """Stream ID bound (milliseconds part) for a point in time."""
+    return str(int(moment.timestamp() * 1000))
+
+
+def _stream_id_range(since: Optional[datetime], until: Optional[datetime]) -> Tuple[str, str]:
+    """XRANGE bounds for entries dead-lettered between ``since`` and ``until``."""
+    return (_stream_id_ms(since) if since else "-", _stream_id_ms(until) if until else "+")
+
+
+async def _pace(summary: Dict[str, Any], rate: float, started: float):
+    """Log progress and sleep so the average replay rate stays at or below ``rate``."""
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"Replayed {summary['replayed']} of {summary['matched']} matched "
+        f"({summary['replayed'] / elapsed if elapsed else 0:.0f} events/s)"
+    )
+    if rate > 0:
+        ahead = summary["replayed"] / rate - elapsed
+        if ahead > 0:
+            await asyncio.sleep(ahead)
+
 
 class DLQManager:
     """Manager for DLQ operations."""
@@ -45,7 +98,7 @@ class DLQManager:
 
     async def connect(self):
         """Connect to Redis."""
-        self.redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        self.redis = redis.from_url(self.redis_url, decode_responses=True)
         await self.redis.ping()
         logger.info("Connected to Redis")
 
@@ -64,11 +117,11 @@ class DLQManager:
             for message_id, fields in messages:
                 parsed_message = {
                     "dlq_id": message_id,
-                    "original_event_id": fields.get("original_event_id"),
+                    "original_event_id": fields.get("original_event_id") or fields.get("event_id"),
                     "event_type": fields.get("event_type"),
                     "aggregate_id": fields.get("aggregate_id"),
-                    "error_message": fields.get("error_message"),
-                    "attempts": fields.get("attempts"),
+                    "error_message": fields.get("error_message") or fields.get("error"),
+                    "attempts": fields.get("attempts") or fields.get("deliveries"),
                     "failed_at": fields.get("failed_at"),
                     "created_at": fields.get("created_at")
                 }
@@ -102,14 +155,15 @@ class DLQManager:
 
             return {
                 "dlq_id": message_id,
-                "original_event_id": fields.get("original_event_id"),
+                "original_event_id": fields.get("original_event_id") or fields.get("event_id"),
                 "event_type": fields.get("event_type"),
                 "aggregate_id": fields.get("aggregate_id"),
                 "payload": payload,
-                "error_message": fields.get("error_message"),
-                "attempts": fields.get("attempts"),
+                "error_message": fields.get("error_message") or fields.get("error"),
+                "attempts": fields.get("attempts") or fields.get("deliveries"),
                 "failed_at": fields.get("failed_at"),
-                "created_at": fields.get("created_at")
+                "created_at": fields.get("created_at"),
+                "fields": fields
             }
 
         except Exception as e:
@@ -125,22 +179,7 @@ class DLQManager:
             if not message:
                 return False
 
-            # Determine target stream (strip .dlq suffix if not provided)
-            if not target_stream:
-                target_stream = stream_name.replace(".dlq", "")
-
-            # Create new event envelope for reprocessing
-            envelope = {
-                "event_id": message["original_event_id"],
-                "event_type": message["event_type"],
-                "topic": target_stream,
-                "schema_version": "1",
-                "occurred_at": datetime.now(timezone.utc).isoformat(),
-                "tenant_id": message.get("payload", {}).get("tenant_id", "00000000-0000-0000-0000-000000000000"),
-                "aggregate_id": message["aggregate_id"],
-                "aggregate_type": message.get("payload", {}).get("aggregate_type", "unknown"),
-                "payload": json.dumps(message["payload"]) if message["payload"] else "{}"
-            }
+            target_stream, envelope = self._replay_envelope(stream_name, message["fields"], target_stream)
 
             # Publish to target stream
             new_id = await self.redis.xadd(target_stream, envelope, maxlen=10000)
@@ -186,6 +225,157 @@ class DLQManager:
             logger.error(f"Failed to mark message as resolved: {e}")
             return False
 
+    @staticmethod
+    def _replay_envelope(stream_name: str, fields: Dict[str, str],
+                         target_stream: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+        """Build the stream entry that re-publishes a DLQ message.
+
+        Returns:
+            (target stream, stream fields)
+        """
+        if "original_stream" in fields:
+            # Consumer DLQ: the original entry is stored verbatim plus metadata
+            envelope = {k: v for k, v in fields.items() if k not in CONSUMER_DLQ_FIELDS}
+            return target_stream or fields["original_stream"], envelope
+
+        # Relay DLQ: rebuild the envelope from the outbox fields
+        target_stream = target_stream or stream_name.removesuffix(".dlq")
+        try:
+            payload = json.loads(fields.get("payload") or "{}")
+        except json.JSONDecodeError:
+            payload = {}
+
+        envelope = {
+            "event_id": fields.get("original_event_id", ""),
+            "event_type": fields.get("event_type", ""),
+            "topic": target_stream,
+            "schema_version": "1",
+            "occurred_at": fields.get("created_at") or datetime.now(timezone.utc).isoformat(),
+            "tenant_id": payload.get("tenant_id", "00000000-0000-0000-0000-000000000000"),
+            "aggregate_id": fields.get("aggregate_id", ""),
+            "aggregate_type": payload.get("aggregate_type", "unknown"),
+            "payload": json.dumps(payload)
+        }
+        return target_stream, envelope
+
+    async def _scan(self, stream_name: str, start: str, end: str,
+                    batch_size: int) -> AsyncIterator[List[Tuple[str, Dict[str, str]]]]:
+        """Page through a stream range with XRANGE."""
+        while True:
+            page = await self.redis.xrange(stream_name, min=start, max=end, count=batch_size)
+            if not page:
+                return
+            yield page
+            if len(page) < batch_size:
+                return
+            start = f"({page[-1][0]}"  # exclusive start after the last entry
+
+    async def _resolved_ids(self, stream_name: str) -> set:
+        """DLQ IDs already recorded as resolved or replayed."""
+        resolved = set()
+        async for page in self._scan(f"{stream_name}.resolved", "-", "+", 1000):
+            resolved.update(fields.get("original_dlq_id") for _, fields in page)
+        return resolved
+
+    def _replay_batch(self, stream_name: str, page: List[Tuple[str, Dict[str, str]]],
+                      event_types: set, already_resolved: set, target_stream: Optional[str],
+                      summary: Dict[str, Any]) -> List[Tuple[str, str, Dict[str, str]]]:
+        """Select the entries of a page to replay, counting matches and skips.
+
+        Returns:
+            (DLQ ID, target stream, stream fields) per entry to replay
+        """
+        batch = []
+        for dlq_id, fields in page:
+            if event_types and fields.get("event_type") not in event_types:
+                continue
+            summary["matched"] += 1
+            if dlq_id in already_resolved:
+                summary["skipped_resolved"] += 1
+                continue
+            batch.append((dlq_id, *self._replay_envelope(stream_name, fields, target_stream)))
+        return batch
+
+    async def _replay(self, stream_name: str, batch: List[Tuple[str, str, Dict[str, str]]],
+                      delete: bool, summary: Dict[str, Any], targets: Dict[str, int]):
+        """Re-publish a batch and record it in ``<stream>.resolved`` (pipelined)."""
+        pipe = self.redis.pipeline(transaction=False)
+        for _, target, envelope in batch:
+            pipe.xadd(target, envelope, maxlen=10000)
+        results = await pipe.execute(raise_on_error=False)
+
+        # Record what was replayed (and optionally drop it from the DLQ)
+        record = self.redis.pipeline(transaction=False)
+        for (dlq_id, target, envelope), result in zip(batch, results):
+            if isinstance(result, Exception):
+                summary["failed"] += 1
+                logger.error(f"Failed to replay {dlq_id} to {target}: {result}")
+                continue
+            record.xadd(f"{stream_name}.resolved", {
+                "original_dlq_id": dlq_id,
+                "original_event_id": envelope.get("event_id", ""),
+                "resolved_at": datetime.now(timezone.utc).isoformat(),
+                "resolution_method": "bulk_replay",
+                "replayed_to": target,
+                "replay_id": result
+            }, maxlen=RESOLVED_MAXLEN)
+            if delete:
+                record.xdel(stream_name, dlq_id)
+            summary["replayed"] += 1
+            targets[target] = targets.get(target, 0) + 1
+        await record.execute()
+
+    async def bulk_replay(self, stream_name: str, event_types: Optional[List[str]] = None,
+                          since: Optional[datetime] = None, until: Optional[datetime] = None,
+                          target_stream: Optional[str] = None, batch_size: int = 100,
+                          rate: float = 0, dry_run: bool = False,
+                          delete: bool = False) -> Dict[str, Any]:
+        """Replay matching DLQ messages to their original streams.
+
+        Entries are read in pages, re-published with one pipelined round-trip
+        per batch and recorded in ``<stream>.resolved``; entries already
+        recorded there are skipped, so an interrupted run can simply be
+        repeated. The time range applies to when the entry was dead-lettered
+        (its stream ID).
+
+        Args:
+            rate: Maximum events per second (0 = unlimited)
+            dry_run: Only count what would be replayed
+            delete: XDEL replayed entries from the DLQ
+
+        Returns:
+            Summary with counts, elapsed time and throughput
+        """
+        if rate > 0:
+            # Keep each burst within one second's budget
+            batch_size = max(1, min(batch_size, int(rate)))
+
+        start, end = _stream_id_range(since, until)
+        event_types = set(event_types or [])
+        already_resolved = await self._resolved_ids(stream_name)
+
+        summary = {"scanned": 0, "matched": 0, "skipped_resolved": 0, "replayed": 0, "failed": 0}
+        targets: Dict[str, int] = {}
+        started = time.monotonic()
+
+        async for page in self._scan(stream_name, start, end, batch_size):
+            summary["scanned"] += len(page)
+            batch = self._replay_batch(stream_name, page, event_types, already_resolved, target_stream, summary)
+            if not batch or dry_run:
+                continue
+
+            await self._replay(stream_name, batch, delete, summary, targets)
+            await _pace(summary, rate, started)
+
+        elapsed = time.monotonic() - started
+        summary.update({
+            "dry_run": dry_run,
+            "targets": targets,
+            "elapsed_seconds": round(elapsed, 2),
+            "events_per_second": round(summary["replayed"] / elapsed, 1) if elapsed else 0.0
+        })
+        return summary
+
     async def get_dlq_report(self, stream_name: str, hours: int = 24) -> Dict[str, Any]:
         """Generate DLQ report for specified time window."""
         try:
@@ -235,6 +425,25 @@ class DLQManager:
             return {}
 
 
+def print_messages(stream_name: str, messages: List[Dict[str, Any]]):
+    """Print DLQ messages as a table."""
+    if not messages:
+        print(f"No messages found in {stream_name}")
+        return
+
+    headers = ["DLQ ID", "Event ID", "Type", "Error", "Failed At"]
+    rows = []
+    for msg in messages:
+        rows.append([
+            msg["dlq_id"][:16] + "...",
+            msg["original_event_id"][:16] + "..." if msg["original_event_id"] else "N/A",
+            msg["event_type"],
+            (msg["error_message"][:50] + "...") if len(msg["error_message"] or "") > 50 else msg["error_message"],
+            msg["failed_at"]
+        ])
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+
 async def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(description="DLQ Management Tool")
@@ -264,6 +473,22 @@ async def main():
     resolve_parser.add_argument("--stream", required=True, help="DLQ stream name")
     resolve_parser.add_argument("--id", required=True, help="Message ID")
 
+    # Replay command
+    replay_parser = subparsers.add_parser("replay", help="Bulk replay DLQ messages")
+    replay_parser.add_argument("--stream", required=True, help="DLQ stream name")
+    replay_parser.add_argument("--event-type", action="append", dest="event_types",
+                               help="Only replay this event type (repeatable)")
+    replay_parser.add_argument("--since", type=parse_time,
+                               help="Dead-lettered at or after (ISO-8601 or relative, e.g. 2h)")
+    replay_parser.add_argument("--until", type=parse_time,
+                               help="Dead-lettered at or before (ISO-8601 or relative)")
+    replay_parser.add_argument("--target", help="Target stream (default: the original stream)")
+    replay_parser.add_argument("--batch-size", type=int, default=100, help="Messages per pipelined batch")
+    replay_parser.add_argument("--rate", type=float, default=0,
+                               help="Maximum events per second (default: unlimited)")
+    replay_parser.add_argument("--delete", action="store_true", help="Remove replayed messages from the DLQ")
+    replay_parser.add_argument("--dry-run", action="store_true", help="Only report what would be replayed")
+
     # Report command
     report_parser = subparsers.add_parser("report", help="Generate DLQ report")
     report_parser.add_argument("--stream", required=True, help="DLQ stream name")
@@ -283,20 +508,7 @@ async def main():
 
         if args.command == "list":
             messages = await dlq_manager.list_dlq_messages(args.stream, args.count)
-            if messages:
-                headers = ["DLQ ID", "Event ID", "Type", "Error", "Failed At"]
-                rows = []
-                for msg in messages:
-                    rows.append([
-                        msg["dlq_id"][:16] + "...",
-                        msg["original_event_id"][:16] + "..." if msg["original_event_id"] else "N/A",
-                        msg["event_type"],
-                        (msg["error_message"][:50] + "...") if len(msg["error_message"] or "") > 50 else msg["error_message"],
-                        msg["failed_at"]
-                    ])
-                print(tabulate(rows, headers=headers, tablefmt="grid"))
-            else:
-                print(f"No messages found in {args.stream}")
+            print_messages(args.stream, messages)
 
         elif args.command == "inspect":
             message = await dlq_manager.inspect_message(args.stream, args.id)
@@ -319,6 +531,20 @@ async def main():
             else:
                 print(f"Failed to mark message {args.id} as resolved")
 
+        elif args.command == "replay":
+            summary = await dlq_manager.bulk_replay(
+                args.stream,
+                event_types=args.event_types,
+                since=args.since,
+                until=args.until,
+                target_stream=args.target,
+                batch_size=args.batch_size,
+                rate=args.rate,
+                dry_run=args.dry_run,
+                delete=args.delete,
+            )
+            print(json.dumps(summary, indent=2))
+
         elif args.command == "report":
             report = await dlq_manager.get_dlq_report(args.stream, args.hours)
             if report:
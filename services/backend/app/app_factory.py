@@ -1,7 +1,8 @@
 """FastAPI Application Factory."""
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -68,6 +69,11 @@ def _create_lifespan():
         await create_tables()
         logger.info("Database tables created/verified")
 
+        # Open the shared Redis pool before any service that uses it
+        from app.services.redis_pool import redis_pool
+        if await redis_pool.start():
+            logger.info("Redis connection pool ready")
+
         # Auto-seed icon packs from bundled seed files
         from app.services.icons.seeder import IconSeeder
         try:
@@ -87,8 +93,9 @@ def _create_lifespan():
         from app.services.collab import collab_manager
         await collab_manager.start()
 
+        await _start_background_services()
+
         # Start background event consumer for cross-app events
-        import asyncio
         _consumer_task = asyncio.create_task(_run_event_consumer())
 
         # Start periodic AI usage publisher (every 5 min)
@@ -123,19 +130,84 @@ def _create_lifespan():
 
         presence_manager.stop()
 
-        # Stop cross-app event consumer
-        if _consumer_task and not _consumer_task.done():
-            _consumer_task.cancel()
-            try:
-                await _consumer_task
-            except asyncio.CancelledError:
-                pass
+        await _stop_background_services()
+
+        # Stop cross-app event consumer and the AI usage publisher
+        await _cancel_task(_consumer_task)
+        await _cancel_task(_usage_task)
+
+        await _close_shared_connections()
 
         logger.info("Application shutdown complete.")
 
     return lifespan
 
 
+async def _start_background_services() -> None:
+    """Start the buffered trackers, the icon indexer and webhook-driven sync."""
+    # Buffered icon/document access tracking
+    from app.services.access_tracker import access_tracker
+    await access_tracker.start()
+
+    # Cached storage usage accounting
+    from app.services.storage.usage import storage_usage
+    await storage_usage.start()
+
+    # Document -> icon reference indexer
+    from app.services.document_icon_index import document_icon_indexer
+    await document_icon_indexer.start()
+
+    # Push webhooks are synced by the GitHub background service
+    if settings.github_webhook_secret:
+        from app.services.github.background import github_background_sync
+        await github_background_sync.start()
+
+
+async def _stop_background_services() -> None:
+    """Stop the services started by ``_start_background_services``, flushing buffers."""
+    # Flush buffered access counts before the process exits
+    from app.services.access_tracker import access_tracker
+    try:
+        await access_tracker.stop()
+    except Exception:
+        logger.exception("Failed to flush buffered access counts")
+
+    from app.services.storage.usage import storage_usage
+    await storage_usage.stop()
+
+    from app.services.document_icon_index import document_icon_indexer
+    try:
+        await document_icon_indexer.stop()
+    except Exception:
+        logger.exception("Failed to flush pending document icon indexing")
+
+    # Stop GitHub background and webhook-triggered sync
+    from app.services.github.background import github_background_sync
+    await github_background_sync.shutdown()
+
+
+async def _close_shared_connections() -> None:
+    """Close the shared Redis pool and upstream HTTP clients."""
+    from app.services.redis_pool import redis_pool
+    try:
+        await redis_pool.stop()
+    except Exception:
+        logger.exception("Failed to close Redis connection pool")
+
+    from app.services.http_clients import http_clients
+    await http_clients.aclose()
+
+
+async def _cancel_task(task: Optional[asyncio.Task]) -> None:
+    """Cancel a background task started by the lifespan and wait for it."""
+    if task and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
 async def _run_event_consumer():
     """Background task: consume Redis Stream events from other apps."""
     from app.services.event_consumer_backend import start_event_consumer
@@ -150,7 +222,8 @@ async def _run_event_consumer():
 async def _register_with_platform_ai():
     """Background task: register agents with Platform AI service (retry with backoff)."""
     import asyncio
-    import httpx
+
+    from app.services.http_clients import INTERNAL, http_clients
 
     platform_url = getattr(settings, "platform_ai_url", "")
     platform_token = getattr(settings, "platform_ai_token", "")
@@ -184,16 +257,16 @@ async def _register_with_platform_ai():
     backoff = [5, 10, 20, 40, 60]
     for attempt, wait in enumerate(backoff):
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.post(
-                    f"{platform_url}/api/agents/register",
-                    json=registration,
-                    headers=headers,
-                )
-                if resp.status_code == 200:
-                    logger.info("Registered with Platform AI service (attempt %d)", attempt + 1)
-                    return
-                logger.warning("Platform AI registration returned %d (attempt %d)", resp.status_code, attempt + 1)
+            client = http_clients.get(INTERNAL)
+            resp = await client.post(
+                f"{platform_url}/api/agents/register",
+                json=registration,
+                headers=headers,
+            )
+            if resp.status_code == 200:
+                logger.info("Registered with Platform AI service (attempt %d)", attempt + 1)
+                return
+            logger.warning("Platform AI registration returned %d (attempt %d)", resp.status_code, attempt + 1)
         except Exception as exc:
             logger.warning("Platform AI registration failed (attempt %d): %s", attempt + 1, exc)
         await asyncio.sleep(wait)
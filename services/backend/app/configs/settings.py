@@ -188,6 +188,9 @@ class Settings(BaseSettings):
     github_redirect_uri: Optional[str] = Field(
         default=None, description="GitHub OAuth redirect URI"
     )
+    github_webhook_secret: Optional[str] = Field(
+        default=None, description="Secret for verifying GitHub push webhook signatures"
+    )
 
     @field_validator("environment")
     @classmethod
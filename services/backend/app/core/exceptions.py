@@ -55,3 +55,13 @@ class UnauthorizedDocumentAccess(HTTPException):
             status_code=403,
             detail=f"Access denied to document {document_id}"
         )
+
+
+class GitHubFileConflict(HTTPException):
+    """Exception raised when a file changed on GitHub since it was last pulled."""
+
+    def __init__(self, file_path: str):
+        super().__init__(
+            status_code=409,
+            detail=f"Remote file '{file_path}' has been modified since last sync"
+        )
@@ -1,12 +1,16 @@
 """CRUD operations for documents."""
-from typing import Any, List, Optional
+import logging
+from typing import Any, List, Optional, Tuple
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.document import Document
 
+logger = logging.getLogger(__name__)
+
 
 class DocumentCRUD:
     async def add_category_for_user(
@@ -606,6 +610,83 @@ class DocumentCRUD:
         result = await db.execute(query)
         return list(result.scalars().all())
 
+    async def upsert_github_documents(
+        self,
+        db: AsyncSession,
+        rows: List[dict]
+    ) -> Tuple[dict[str, int], List[dict]]:
+        """Insert or update GitHub documents in one statement.
+
+        Rows are matched on (user_id, repository, file path, branch). The
+        caller owns the transaction.
+
+        A row whose folder and name already belong to another document (e.g.
+        branch ``feature/x`` with ``a.md`` and branch ``feature`` with
+        ``x/a.md``) would violate ``uq_user_folder_name``; such rows are not
+        written.
+
+        Returns:
+            (github_file_path -> document id, rejected rows)
+        """
+        rows, rejected = await self._split_name_conflicts(db, rows)
+        document_ids: dict[str, int] = {}
+        # Stay well below PostgreSQL's 65535 bind parameter limit
+        for start in range(0, len(rows), 1000):
+            document_ids.update(await self._upsert_github_chunk(db, rows[start:start + 1000]))
+        return document_ids, rejected
+
+    async def _split_name_conflicts(self, db: AsyncSession, rows: List[dict]) -> Tuple[List[dict], List[dict]]:
+        """Separate rows whose (user, folder, name) is taken by another document."""
+        def github_key(row) -> tuple:
+            return row['github_repository_id'], row['github_file_path'], row['github_branch']
+
+        owners: dict[tuple, tuple] = {}
+        for start in range(0, len(rows), 1000):
+            chunk = rows[start:start + 1000]
+            result = await db.execute(
+                select(
+                    Document.user_id, Document.folder_path, Document.name,
+                    Document.github_repository_id, Document.github_file_path, Document.github_branch,
+                ).where(
+                    tuple_(Document.user_id, Document.folder_path, Document.name).in_(
+                        [(row['user_id'], row['folder_path'], row['name']) for row in chunk]
+                    )
+                )
+            )
+            for user_id, folder_path, name, *key in result.all():
+                owners[(user_id, folder_path, name)] = tuple(key)
+
+        accepted, rejected = [], []
+        for row in rows:
+            slot = (row['user_id'], row['folder_path'], row['name'])
+            # The first row of a batch claims a free slot
+            owner = owners.setdefault(slot, github_key(row))
+            (accepted if owner == github_key(row) else rejected).append(row)
+        return accepted, rejected
+
+    async def _upsert_github_chunk(self, db: AsyncSession, rows: List[dict]) -> dict[str, int]:
+        stmt = pg_insert(Document).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                Document.user_id,
+                Document.github_repository_id,
+                Document.github_file_path,
+                Document.github_branch,
+            ],
+            index_where=text("github_repository_id IS NOT NULL"),
+            set_={
+                "folder_path": stmt.excluded.folder_path,
+                "github_sha": stmt.excluded.github_sha,
+                "local_sha": stmt.excluded.local_sha,
+                "github_sync_status": stmt.excluded.github_sync_status,
+                "last_github_sync_at": stmt.excluded.last_github_sync_at,
+                "updated_at": func.now(),
+            },
+        ).returning(Document.id, Document.github_file_path)
+
+        result = await db.execute(stmt)
+        return {file_path: document_id for document_id, file_path in result.all()}
+
     async def get_github_folders_for_user(self, db: AsyncSession, user_id: int) -> List[str]:
         """Get all GitHub folder paths for a user."""
         query = select(Document.folder_path).where(
@@ -645,6 +726,15 @@ class DocumentCRUD:
         source: Optional[str] = None
     ) -> List[Document]:
         """Get recently opened documents for a user."""
+        # Opens are buffered; write pending ones so this read sees them
+        from app.services.access_tracker import access_tracker
+        if access_tracker.pending_documents:
+            try:
+                await access_tracker.flush()
+            except Exception:
+                # Recents will catch up on the next background flush
+                logger.exception("Failed to flush pending document opens before reading recents")
+
         query = select(Document).options(
             selectinload(Document.category_ref),
             selectinload(Document.github_repository)
@@ -683,12 +773,11 @@ class DocumentCRUD:
         if not document:
             return None
 
-        # Update last_opened_at
-        from datetime import datetime
-        document.last_opened_at = datetime.utcnow()
-
-        await db.commit()
-        await db.refresh(document)
+        # Buffered: the timestamp is written by the access tracker's next flush
+        from sqlalchemy.orm.attributes import set_committed_value
+        from app.services.access_tracker import access_tracker
+        opened_at = access_tracker.record_document_opened(document.id)
+        set_committed_value(document, "last_opened_at", opened_at)
         return document
 
     async def dismiss_from_recent(
@@ -709,6 +798,8 @@ class DocumentCRUD:
         if not document:
             return None
 
+        from app.services.access_tracker import access_tracker
+        access_tracker.discard_document(document.id)
         document.last_opened_at = None
 
         await db.commit()
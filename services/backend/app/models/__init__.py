@@ -12,6 +12,7 @@ from .document import Document
 from .document_collaborator import DocumentCollaborator
 from .document_collab_state import DocumentCollabState
 from .document_embedding import DocumentEmbedding
+from .document_icon_reference import DocumentIconIndex, DocumentIconReference
 from .git_operations import GitOperationLog
 from .github_models import GitHubAccount, GitHubRepository, GitHubSyncHistory
 from .github_settings import GitHubSettings
@@ -39,6 +40,8 @@ __all__ = [
     "DocumentCollaborator",
     "DocumentCollabState",
     "DocumentEmbedding",
+    "DocumentIconIndex",
+    "DocumentIconReference",
     "GitOperationLog",
     "GitHubAccount",
     "GitHubRepository",
@@ -0,0 +1,58 @@
+"""Document → icon reference index.
+
+One ``DocumentIconIndex`` row per indexed document and one
+``DocumentIconReference`` row per distinct ``pack:key`` (and context) it
+references.  Maintained when documents are written, so usage statistics and
+pack-change impact checks never have to read document files.
+"""
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class DocumentIconIndex(Base):
+    """Index bookkeeping for a document (also marks it as indexed)."""
+
+    __tablename__ = "document_icon_index"
+
+    document_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    content_hash: Mapped[str] = mapped_column(
+        String(64), nullable=False, comment="SHA-256 of the indexed content"
+    )
+    mermaid_diagrams: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Number of ```mermaid fences"
+    )
+    indexed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class DocumentIconReference(Base):
+    """A ``pack:key`` icon reference found in a document."""
+
+    __tablename__ = "document_icon_references"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    document_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+    )
+    pack_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    icon_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    context: Mapped[str] = mapped_column(
+        String(20), nullable=False, comment="'mermaid' (inside a mermaid fence) or 'markdown'"
+    )
+    occurrences: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        UniqueConstraint("document_id", "pack_name", "icon_key", "context", name="uq_document_icon_reference"),
+        Index("ix_document_icon_references_pack_icon", "pack_name", "icon_key"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of DocumentIconReference."""
+        return f"<DocumentIconReference(document_id={self.document_id}, ref='{self.pack_name}:{self.icon_key}')>"
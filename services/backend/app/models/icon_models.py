@@ -3,7 +3,7 @@ from __future__ import annotations
 """Icon models for icon service."""
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import ForeignKey, Integer, String, Text, UniqueConstraint, Index, JSON, DateTime, func
+from sqlalchemy import ForeignKey, Integer, String, Text, UniqueConstraint, Index, JSON, DateTime, func, text
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -98,6 +98,16 @@ class IconMetadata(BaseModel):
         comment="File path for AWS SVG files"
     )
 
+    # Pre-rendered SVG document (built at install/seed time)
+    rendered_svg: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True,
+        comment="Final SVG markup rendered from icon_data/file_path"
+    )
+    rendered_svg_version: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True,
+        comment="SVG_RENDER_VERSION that produced rendered_svg"
+    )
+
     # Usage tracking
     access_count: Mapped[int] = mapped_column(
         Integer, default=0, nullable=False,
@@ -128,6 +138,11 @@ class IconMetadata(BaseModel):
         UniqueConstraint('pack_id', 'key', name='uq_icon_pack_key'),
         Index('ix_icon_metadata_pack_key', 'pack_id', 'key'),
         Index('ix_icon_metadata_access_count', 'access_count'),
+        # Popularity ordering of keyword search.  The search itself (ILIKE
+        # '%term%') is served by ix_icon_metadata_search_terms_trgm, which
+        # needs the pg_trgm extension and so is created only by migration
+        # d4e5f6a7b8c9, not by create_all.
+        Index('ix_icon_metadata_popularity', text('access_count DESC'), 'key', 'id'),
     )
 
     def __repr__(self) -> str:
@@ -288,7 +288,7 @@ async def get_user_storage_stats(
 
     from app.models.document import Document
     from app.services.storage.filesystem import Filesystem
-    import os
+    from app.services.storage.usage import storage_usage
 
     # Get document statistics
     docs_query = await db.execute(
@@ -313,37 +313,29 @@ async def get_user_storage_stats(
         user_dir = filesystem_service.get_user_directory(user_id)
 
         if user_dir.exists():
-            # Calculate storage size
-            for root, dirs, files in os.walk(user_dir):
-                for file in files:
-                    file_path = Path(root) / file
-                    if file_path.exists():
-                        stats["storage_size_bytes"] += file_path.stat().st_size
+            # Cached size and directory counts, kept current on writes and clones
+            usage = await storage_usage.get(user_dir)
+            stats["storage_size_bytes"] = usage.size_bytes
+            stats["directories_count"] = usage.directory_count
 
             # Count directories and repositories more accurately
             local_repos = set()
             github_repos = set()
 
             # First, count actual .git repositories
-            for item in user_dir.rglob("*"):
-                if item.is_dir():
-                    stats["directories_count"] += 1
-
-                    # Check if this is a git repository
-                    if (item / ".git").exists():
-                        # Determine repository type based on path structure
-                        relative_path = item.relative_to(user_dir)
-                        path_parts = relative_path.parts
-
-                        if len(path_parts) >= 2 and path_parts[0] == "local":
-                            # Local repository: /local/{category}
-                            category = path_parts[1]
-                            local_repos.add(category)
-                        elif len(path_parts) >= 3 and path_parts[0] == "github":
-                            # GitHub repository: /github/{account_id}/{repo_name}
-                            account_id = path_parts[1]
-                            repo_name = path_parts[2]
-                            github_repos.add(f"{account_id}/{repo_name}")
+            for repository in usage.git_repositories:
+                # Determine repository type based on path structure
+                path_parts = Path(repository).parts
+
+                if len(path_parts) >= 2 and path_parts[0] == "local":
+                    # Local repository: /local/{category}
+                    category = path_parts[1]
+                    local_repos.add(category)
+                elif len(path_parts) >= 3 and path_parts[0] == "github":
+                    # GitHub repository: /github/{account_id}/{repo_name}
+                    account_id = path_parts[1]
+                    repo_name = path_parts[2]
+                    github_repos.add(f"{account_id}/{repo_name}")
 
             # Also count logical repositories based on document file paths
             # This accounts for repositories that may not have .git but have documents
@@ -675,7 +675,7 @@ async def invalidate_pack_cache(
         before_stats = icon_service.get_cache_stats()
 
         # Invalidate pack cache
-        invalidated_count = icon_service.invalidate_pack_cache(pack_name)
+        invalidated_count = await icon_service.invalidate_pack_cache(pack_name)
 
         # Get stats after invalidation
         after_stats = icon_service.get_cache_stats()
@@ -5,7 +5,6 @@ import logging
 from datetime import datetime
 from typing import Any, Optional
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -14,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_admin_user
 from app.database import get_db
+from app.services.http_clients import LLM, http_clients
 from app.models.document import Document
 from app.models.document_embedding import DocumentEmbedding
 from app.models.attachment import Attachment
@@ -160,11 +160,11 @@ async def _effective_llm_config(db: AsyncSession) -> tuple[str, str, str]:
 
 async def _list_ollama_models(url: str) -> list[str]:
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            r = await client.get(f"{url.rstrip('/')}/api/tags")
-            if r.status_code == 200:
-                data = r.json()
-                return [m["name"] for m in data.get("models", [])]
+        client = http_clients.get(LLM)
+        r = await client.get(f"{url.rstrip('/')}/api/tags", timeout=5.0)
+        if r.status_code == 200:
+            data = r.json()
+            return [m["name"] for m in data.get("models", [])]
     except Exception:
         pass
     return []
@@ -273,19 +273,20 @@ async def pull_model(
 
     async def _stream():
         try:
-            async with httpx.AsyncClient(timeout=None) as client:
-                async with client.stream(
-                    "POST",
-                    f"{ollama_url}/api/pull",
-                    json={"name": model_name, "stream": True},
-                ) as resp:
-                    if resp.status_code != 200:
-                        import json as _json
-                        yield _json.dumps({"status": "error", "error": f"Ollama returned {resp.status_code}"}) + "\n"
-                        return
-                    async for line in resp.aiter_lines():
-                        if line.strip():
-                            yield line + "\n"
+            client = http_clients.get(LLM)
+            async with client.stream(
+                "POST",
+                f"{ollama_url}/api/pull",
+                json={"name": model_name, "stream": True},
+                timeout=None,
+            ) as resp:
+                if resp.status_code != 200:
+                    import json as _json
+                    yield _json.dumps({"status": "error", "error": f"Ollama returned {resp.status_code}"}) + "\n"
+                    return
+                async for line in resp.aiter_lines():
+                    if line.strip():
+                        yield line + "\n"
         except Exception as exc:
             import json as _json
             logger.exception("Model pull failed for %s", model_name)
@@ -11,12 +11,15 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.services.redis_pool import redis_pool
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# In-memory rate limiter (per-session, resets on restart)
+# Per-session rate limiter: a fixed window counter in Redis shared by all
+# workers, with an in-memory sliding window when Redis is unavailable
+_RATE_LIMIT_KEY_PREFIX = "analytics:rl:"
 _rate_limits: dict[str, list[float]] = {}
 _RATE_LIMIT_WINDOW = 60  # seconds
 _RATE_LIMIT_MAX = 50  # max events per window per session
@@ -72,8 +75,23 @@ def _hash_ip(ip: str) -> str:
     return hashlib.sha256(f"{daily_salt}:{ip}".encode()).hexdigest()[:16]
 
 
-def _check_rate_limit(session_id: str) -> bool:
+async def _check_rate_limit(session_id: str) -> bool:
     """Check and enforce per-session rate limit. Returns True if allowed."""
+    window = int(datetime.now(timezone.utc).timestamp() // _RATE_LIMIT_WINDOW)
+    key = f"{_RATE_LIMIT_KEY_PREFIX}{session_id}:{window}"
+
+    def count_request(pipe):
+        pipe.incr(key)
+        pipe.expire(key, _RATE_LIMIT_WINDOW)
+
+    results = await redis_pool.pipeline(count_request)
+    if results is not None:
+        return int(results[0]) <= _RATE_LIMIT_MAX
+    return _check_rate_limit_local(session_id)
+
+
+def _check_rate_limit_local(session_id: str) -> bool:
+    """In-process sliding window used when Redis is unavailable."""
     global _LAST_CLEANUP
     now = datetime.now(timezone.utc).timestamp()
     window_start = now - _RATE_LIMIT_WINDOW
@@ -110,7 +128,7 @@ async def ingest_analytics_events(
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, str]:
     """Ingest a batch of analytics events (no authentication required)."""
-    if not _check_rate_limit(batch.session_id):
+    if not await _check_rate_limit(batch.session_id):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
     client_ip = request.headers.get("X-Forwarded-For", request.client.host or "")
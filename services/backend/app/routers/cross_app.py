@@ -94,15 +94,11 @@ async def semantic_search(
     from app.services.search.semantic import SemanticSearchService
     from app.services.search.embedding_client import EmbeddingClient
 
+    from app.services.redis_pool import redis_pool
+
     settings = get_settings()
     client = EmbeddingClient(base_url=settings.embedding_service_url)
-    try:
-        import redis.asyncio as aioredis
-        redis_client = aioredis.from_url(settings.redis_url, decode_responses=True)
-    except Exception:
-        redis_client = None
-
-    service = SemanticSearchService(client, redis_client=redis_client)
+    service = SemanticSearchService(client, redis_client=await redis_pool.get())
     results = await service.search(db, user.id, q, limit=limit)
 
     response = []
@@ -1,8 +1,6 @@
 """Default router for root, health, and utility endpoints."""
 import asyncio
 
-import httpx
-import redis.asyncio as redis
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from sqlalchemy import text
@@ -11,7 +9,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.configs import settings
 from app.database import get_db
 from app.services.export_service_client import export_service_client
+from app.services.http_clients import INTERNAL, http_clients
 from app.services.icon_service import IconService
+from app.services.redis_pool import redis_pool
 from app.services.virus_scan_service import VirusScanService
 
 router = APIRouter()
@@ -39,14 +39,14 @@ async def _check_http_service(
 ) -> ServiceHealth:
     """Check health of an HTTP service."""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{service_url}{health_path}")
-            if response.status_code == 200:
-                return ServiceHealth(status="healthy", details="Responsive")
-            else:
-                return ServiceHealth(
-                    status="unhealthy", details=f"HTTP {response.status_code}"
-                )
+        client = http_clients.get(INTERNAL)
+        response = await client.get(f"{service_url}{health_path}", timeout=5.0)
+        if response.status_code == 200:
+            return ServiceHealth(status="healthy", details="Responsive")
+        else:
+            return ServiceHealth(
+                status="unhealthy", details=f"HTTP {response.status_code}"
+            )
     except Exception as e:
         return ServiceHealth(
             status="unhealthy", details=f"Health check failed: {str(e)}"
@@ -293,10 +293,10 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> HealthResponse:
 
     # Check Redis health
     try:
-        redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        redis_client = redis_pool.client
 
         # Test basic connectivity
-        ping_result = await redis_client.ping()
+        ping_ms = await redis_pool.ping()
 
         # Get Redis info
         info = await redis_client.info()
@@ -305,12 +305,15 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> HealthResponse:
         aof_enabled = info.get('aof_enabled', 0) == 1
 
         # Check if AOF is enabled (required for durability)
-        redis_status = "healthy" if ping_result and aof_enabled else "degraded"
+        redis_status = "healthy" if aof_enabled else "degraded"
         aof_status = "enabled" if aof_enabled else "disabled (WARNING: no persistence)"
 
         services["redis"] = ServiceHealth(
             status=redis_status,
-            details=f"PING: {ping_result}, Memory: {memory_used_mb}MB (peak: {memory_peak_mb}MB), AOF: {aof_status}"
+            details=(
+                f"PING: {ping_ms}ms, Memory: {memory_used_mb}MB (peak: {memory_peak_mb}MB), AOF: {aof_status}, "
+                f"Pool: {redis_pool.get_stats()['connections_in_use']}/{redis_pool.max_connections} in use"
+            )
         )
 
         if redis_status != "healthy":
@@ -332,8 +335,6 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> HealthResponse:
             )
             overall_status = "degraded"
 
-        await redis_client.close()
-
     except Exception as e:
         services["redis"] = ServiceHealth(
             status="unhealthy", details=f"Connection failed: {str(e)}"
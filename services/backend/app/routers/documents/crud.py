@@ -2,7 +2,6 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from datetime import datetime
 from typing import Optional
 
 from app.core.auth import get_current_user
@@ -12,6 +11,7 @@ from app.database import get_db
 from app.models.user import User
 from app.models.document import Document as DocumentModel
 from app.schemas.document import Document, DocumentUpdate, DocumentImageMetadataUpdate
+from app.services.access_tracker import access_tracker
 from .response_utils import create_document_response
 from .docs import DOCUMENT_CRUD_DOCS
 
@@ -93,14 +93,8 @@ async def get_document(
                 print(f"Warning: GitHub sync failed for document {document_id}: {e}")
                 # Continue with normal document retrieval
 
-        # Update last opened timestamp
-        try:
-            document.last_opened_at = datetime.utcnow()
-            db.add(document)
-            await db.commit()
-        except Exception as e:
-            print(f"Warning: Failed to update last_opened_at for document {document_id}: {e}")
-            await db.rollback()
+        # Update last opened timestamp (buffered, flushed in the background)
+        access_tracker.record_document_opened(document.id)
 
         # Set category name attribute for response helper
         if document.category_ref:
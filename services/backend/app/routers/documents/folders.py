@@ -16,6 +16,7 @@ from app.schemas.document import (
     MoveDocumentRequest,
 )
 from app.services.search.embedding_client import EmbeddingClient
+from app.services.redis_pool import redis_pool
 from app.services.search.semantic import SemanticSearchService
 from app.configs.settings import get_settings
 
@@ -224,15 +225,10 @@ class SemanticSearchResult(BaseModel):
     score: float
 
 
-def _get_search_service() -> SemanticSearchService:
+async def _get_search_service() -> SemanticSearchService:
     settings = get_settings()
     client = EmbeddingClient(base_url=settings.embedding_service_url)
-    try:
-        import redis.asyncio as aioredis
-        redis_client = aioredis.from_url(settings.redis_url, decode_responses=True)
-    except Exception:
-        redis_client = None
-    return SemanticSearchService(client, redis_client=redis_client)
+    return SemanticSearchService(client, redis_client=await redis_pool.get())
 
 
 @router.get("/semantic-search", response_model=list[SemanticSearchResult])
@@ -255,7 +251,7 @@ async def semantic_search_documents(
     Returns:
         List of matching documents with similarity scores
     """
-    service = _get_search_service()
+    service = await _get_search_service()
     results = await service.search(db, current_user.id, q, limit=limit)
 
     response = []
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from app.core.auth import get_current_user
+from app.core.exceptions import GitHubFileConflict
 from app.crud import document as document_crud
 from app.crud import github_settings as github_settings_crud
 from app.crud.document_collaborator import get_user_role
@@ -1340,24 +1341,10 @@ async def get_all_git_branches(
 
             for github_repo in github_repos:
                 try:
-                    import httpx
-
-                    # Call GitHub API to get branches
-                    headers = {
-                        "Authorization": f"Bearer {github_repo.account.access_token}",
-                        "Accept": "application/vnd.github.v3+json",
-                        "User-Agent": "MarkdownManager/1.0"
-                    }
-
-                    async with httpx.AsyncClient() as client:
-                        response = await client.get(
-                            f"https://api.github.com/repos/{github_repo.repo_full_name}/branches",
-                            headers=headers
-                        )
-                        if response.status_code == 200:
-                            branches_data = response.json()
-                        else:
-                            branches_data = None
+                    # Scheduled and served from the conditional-request cache
+                    branches_data = await GitHubAPIService().get_repository_branches(
+                        github_repo.account.access_token, github_repo.repo_owner, github_repo.repo_name
+                    )
 
                     if branches_data:
                         # Convert GitHub API response to our format
@@ -1703,6 +1690,13 @@ async def save_document_to_github(
                 message=request.commit_message,
                 branch=request.branch,
                 diagrams=converted_diagrams,
+                # Only a save back to the linked file can be checked for remote edits
+                sha=(
+                    document.github_sha
+                    if document.github_repository_id == request.repository_id
+                    and document.github_file_path == request.file_path
+                    else None
+                ),
                 create_branch=request.create_branch,
                 base_branch=request.base_branch
             )
@@ -1767,6 +1761,8 @@ async def save_document_to_github(
             total_diagrams=result.get('total_diagrams', 0)
         )
 
+    except GitHubFileConflict:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
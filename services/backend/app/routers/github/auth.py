@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.auth import get_current_user
 from app.database import get_db, AsyncSessionLocal
 from app.models import User
+from app.services.github.scheduler import runs_in_background
 from app.services.github_service import GitHubService
 from app.services.storage import UserStorage
 
@@ -16,6 +17,7 @@ router = APIRouter()
 github_service = GitHubService()
 
 
+@runs_in_background
 async def sync_repositories_background(
     account_id: int,
     user_id: int,
@@ -259,6 +259,7 @@ async def _perform_commit(
             message=commit_request.commit_message,
             branch=target_branch,
             diagrams=converted_diagrams,
+            sha=sha_to_use,
             create_branch=commit_request.create_new_branch,
             base_branch=document.github_branch or repository.default_branch if commit_request.create_new_branch else None
         )
@@ -53,7 +53,6 @@ async def import_repository_files(
     """Import files from GitHub repository with proper folder structure."""
     
     github_import_service = GitHubImportService(db)
-    github_service = GitHubService()
 
     # Get repository
     repository = await github_import_service.get_repository_by_id(repository_id)
@@ -70,38 +69,13 @@ async def import_repository_files(
     # Import files
     if import_request.file_paths:
         # Import specific files
-        results = {'imported': [], 'updated': [], 'errors': [], 'skipped': []}
-        for file_path in import_request.file_paths:
-            try:
-                # Get file info from GitHub
-                file_content, sha = await github_service.get_file_content(
-                    access_token,
-                    repository.repo_owner,
-                    repository.repo_name,
-                    file_path,
-                    import_request.branch
-                )
-                
-                # Create file data structure
-                file_data = {
-                    'name': file_path.split('/')[-1],
-                    'path': file_path,
-                    'type': 'file',
-                    'sha': sha
-                }
-                
-                document = await github_import_service.import_repository_file(
-                    current_user.id, repository, access_token, file_data, import_request.branch
-                )
-                
-                results['imported'].append({
-                    'document_id': document.id,
-                    'file_path': file_path,
-                    'name': document.name
-                })
-                
-            except Exception as e:
-                results['errors'].append({'file': file_path, 'error': str(e)})
+        results = await github_import_service.import_repository_tree(
+            current_user.id,
+            repository,
+            access_token,
+            import_request.branch,
+            file_paths=import_request.file_paths
+        )
     else:
         # Import entire repository
         results = await github_import_service.sync_repository_structure(
@@ -3,7 +3,7 @@ from fastapi import APIRouter
 
 from . import (
     accounts, auth, cache, commits, files, repositories,
-    repository_selection, sync, pull_requests, import_enhanced, git_operations
+    repository_selection, sync, pull_requests, import_enhanced, git_operations, webhooks
 )
 from .save import router as save_router
 
@@ -22,3 +22,4 @@ router.include_router(cache.router, prefix="/cache", tags=["github-cache"])
 router.include_router(import_enhanced.router, tags=["github-import-enhanced"])
 router.include_router(save_router, prefix="/save", tags=["github-save"])
 router.include_router(git_operations.router, prefix="/git", tags=["git-operations"])
+router.include_router(webhooks.router, prefix="/webhooks", tags=["github-webhooks"])
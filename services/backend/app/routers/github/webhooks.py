@@ -0,0 +1,98 @@
+"""GitHub webhook endpoints."""
+import json
+import logging
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+
+from app.configs.settings import settings
+from app.core.github_security import github_security
+from app.services.github.background import github_background_sync
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# GitHub lists at most this many commits in a push payload
+MAX_PAYLOAD_COMMITS = 20
+
+
+def get_pushed_paths(payload: Dict[str, Any]) -> Optional[Set[str]]:
+    """Return the paths a push changed, or None when the payload cannot tell."""
+    commits = payload.get("commits") or []
+    if payload.get("forced") or len(commits) >= MAX_PAYLOAD_COMMITS:
+        return None
+
+    paths: Set[str] = set()
+    for commit in commits:
+        for key in ("added", "modified", "removed"):
+            paths.update(commit.get(key) or [])
+    return paths
+
+
+def _verify_signature(body: bytes, signature: str) -> None:
+    """Reject the request unless webhooks are configured and ``signature`` matches ``body``."""
+    secret = settings.github_webhook_secret
+    if not secret:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="GitHub webhooks are not configured"
+        )
+    if not github_security.validate_webhook_signature(body, signature, secret):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook signature"
+        )
+
+
+def _parse_push(body: bytes) -> Tuple[Dict[str, Any], int, str]:
+    """Return ``(payload, GitHub repository id, ref)`` of a push event body."""
+    try:
+        payload = json.loads(body)
+        return payload, int(payload["repository"]["id"]), payload["ref"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid push payload"
+        )
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def receive_webhook(
+    request: Request,
+    x_github_event: str = Header(default=""),
+    x_hub_signature_256: str = Header(default=""),
+):
+    """Receive GitHub push events and queue targeted syncs of the changed files.
+
+    Authenticated by the ``X-Hub-Signature-256`` HMAC of the body rather than
+    a user session.
+    """
+    body = await request.body()
+    _verify_signature(body, x_hub_signature_256)
+
+    if x_github_event == "ping":
+        return {"message": "pong"}
+    if x_github_event != "push":
+        return {"message": f"Ignored {x_github_event or 'unknown'} event"}
+
+    payload, github_repo_id, ref = _parse_push(body)
+    if not ref.startswith("refs/heads/") or payload.get("deleted"):
+        return {"message": "Ignored push without branch changes"}
+
+    branch = ref[len("refs/heads/"):]
+    paths = get_pushed_paths(payload)
+    if not github_background_sync.enqueue_push(github_repo_id, branch, paths):
+        logger.warning(f"Background sync is stopped; dropped push to {github_repo_id}@{branch}")
+        return {"message": "Background sync is stopped; push not queued", "branch": branch, "queued": False}
+
+    logger.info(
+        f"Queued sync for push to {payload['repository'].get('full_name', github_repo_id)}@{branch} "
+        f"({'all' if paths is None else len(paths)} paths)"
+    )
+
+    return {
+        "message": "Push queued for sync",
+        "branch": branch,
+        "paths": None if paths is None else sorted(paths),
+        "queued": True
+    }
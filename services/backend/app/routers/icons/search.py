@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy import desc, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from ...database import get_db
 from ...models.icon_models import IconMetadata, IconPack
@@ -45,6 +45,8 @@ async def search_icons(
     category: str = Query("all", description="Filter by icon category"),
     page: int = Query(0, ge=0, description="Page number (0-based)"),
     size: int = Query(24, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous response (overrides page)"),
+    count: Literal["exact", "estimated"] = Query("exact", description="Exact total or planner estimate"),
     icon_service: IconService = Depends(get_icon_service)
 ):
     """
@@ -59,7 +61,9 @@ async def search_icons(
             packs=packs_list,
             category=category,
             page=page,
-            size=size
+            size=size,
+            cursor=cursor,
+            count=count
         )
         result = await icon_service.search_icons(search_request)
 
@@ -76,6 +80,8 @@ async def search_icons(
                 })
 
         return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -176,8 +176,9 @@ async def _tool_search_documents(db, user, args: dict) -> dict:
     if not query:
         return {"error": "query is required"}
 
+    from app.services.redis_pool import redis_pool
     from app.services.search.embedding_client import EmbeddingClient
-    search_service = SemanticSearchService(EmbeddingClient())
+    search_service = SemanticSearchService(EmbeddingClient(), redis_client=await redis_pool.get())
     results = await search_service.search(db, user.id, query, limit=limit, category_id=category_id)
 
     return {
@@ -290,8 +291,9 @@ async def _build_single_doc_context(db, user, document_id, deep_think, selection
 
 async def _build_rag_context(db, user, question, category_id=None):
     """Build RAG context via semantic search."""
+    from app.services.redis_pool import redis_pool
     from app.services.search.embedding_client import EmbeddingClient
-    search_service = SemanticSearchService(EmbeddingClient())
+    search_service = SemanticSearchService(EmbeddingClient(), redis_client=await redis_pool.get())
     results = await search_service.search(
         db, user.id, question, limit=5, category_id=category_id
     )
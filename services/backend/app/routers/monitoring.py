@@ -78,10 +78,19 @@ async def get_metrics():
     if not monitoring_middleware:
         raise HTTPException(status_code=503, detail="Monitoring not available")
 
+    from app.services.github.scheduler import github_scheduler
+    from app.services.http_clients import http_clients
+    from app.services.redis_pool import redis_pool
+    from app.services.storage.usage import storage_usage
+
     metrics = monitoring_middleware.get_metrics()
     return {
         "status": "ok",
         "metrics": metrics,
+        "redis_pool": redis_pool.get_stats(),
+        "http_clients": http_clients.get_stats(),
+        "github_scheduler": github_scheduler.get_stats(),
+        "storage_usage": storage_usage.get_stats(),
     }
 
 
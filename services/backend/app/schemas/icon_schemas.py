@@ -1,6 +1,6 @@
 """Icon schemas for API requests and responses."""
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -112,6 +112,10 @@ class IconSearchRequest(BaseModel):
     category: str = Field("all", description="Filter by category")
     page: int = Field(0, ge=0, description="Page number for pagination")
     size: int = Field(24, ge=1, le=1000, description="Number of results per page")
+    cursor: Optional[str] = Field(None, description="Keyset cursor from a previous response (overrides page)")
+    count: Literal["exact", "estimated"] = Field(
+        "exact", description="How to compute total: exact COUNT or planner estimate for large result sets"
+    )
 
 
 class IconSearchResponse(BaseModel):
@@ -124,6 +128,8 @@ class IconSearchResponse(BaseModel):
     pages: int = Field(..., description="Total number of pages")
     has_next: bool = Field(..., description="Whether there are more pages")
     has_prev: bool = Field(..., description="Whether there are previous pages")
+    next_cursor: Optional[str] = Field(None, description="Keyset cursor for the next page")
+    total_is_estimate: bool = Field(False, description="Whether total is a planner estimate")
 
 
 class IconBatchRequest(BaseModel):
@@ -0,0 +1,196 @@
+"""Buffered access tracking for icons and documents.
+
+Serving an icon or opening a document used to do a read-modify-write
+transaction per access (``icon_metadata.access_count``,
+``documents.last_opened_at``).  Popular icons and recently opened documents
+made those rows hot, and every read paid a DB round-trip.
+
+``AccessTracker`` aggregates the increments and timestamps in memory and
+writes them back every few seconds with one ``UPDATE ... FROM (VALUES ...)``
+statement per table.  Readers never wait on the write, and ordering by
+``access_count`` / ``last_opened_at`` keeps working with a few seconds of lag.
+"""
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Rows per VALUES list; keeps statements well below the bind-parameter limit
+_CHUNK_SIZE = 500
+
+
+def _chunks(items: List[Any], size: int = _CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class AccessTracker:
+    """In-memory access counters flushed to the database on an interval."""
+
+    FLUSH_INTERVAL_SECONDS = 5.0
+
+    def __init__(self):
+        self._icon_hits: Counter[Tuple[str, str]] = Counter()
+        self._document_opens: Dict[int, datetime] = {}
+        self._task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    # -- recording (never touches the database) ----------------------------
+
+    def record_icon(self, pack_name: str, key: str, count: int = 1) -> None:
+        """Count an icon access."""
+        self._icon_hits[(pack_name, key)] += count
+
+    def record_document_opened(self, document_id: int, opened_at: Optional[datetime] = None) -> datetime:
+        """Remember that a document was opened; returns the recorded timestamp."""
+        opened_at = opened_at or datetime.now(timezone.utc)
+        previous = self._document_opens.get(document_id)
+        if previous is None or opened_at > previous:
+            self._document_opens[document_id] = opened_at
+        return opened_at
+
+    def discard_document(self, document_id: int) -> None:
+        """Drop a buffered open, e.g. when the document is dismissed from recents."""
+        self._document_opens.pop(document_id, None)
+
+    @property
+    def pending_icons(self) -> Dict[Tuple[str, str], int]:
+        """Icon increments waiting for the next flush."""
+        return dict(self._icon_hits)
+
+    @property
+    def pending_documents(self) -> Dict[int, datetime]:
+        """Document open timestamps waiting for the next flush."""
+        return dict(self._document_opens)
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start the periodic flush loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out whatever is still buffered."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL_SECONDS)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Access tracker flush failed")
+
+    # -- flushing ----------------------------------------------------------
+
+    async def flush(self) -> Dict[str, int]:
+        """Write all buffered accesses in one transaction.
+
+        Returns:
+            Number of icon and document rows written
+        """
+        async with self._flush_lock:
+            if not self._icon_hits and not self._document_opens:
+                return {"icons": 0, "documents": 0}
+
+            icon_batch, self._icon_hits = self._icon_hits, Counter()
+            doc_batch, self._document_opens = self._document_opens, {}
+            try:
+                async with AsyncSessionLocal() as db:
+                    postgres = db.get_bind().dialect.name == "postgresql"
+                    if icon_batch:
+                        await self._write_icon_hits(db, icon_batch, postgres)
+                    if doc_batch:
+                        await self._write_document_opens(db, doc_batch, postgres)
+                    await db.commit()
+            except Exception:
+                # Merge back so the accesses are retried on the next flush
+                self._icon_hits.update(icon_batch)
+                for document_id, opened_at in doc_batch.items():
+                    self.record_document_opened(document_id, opened_at)
+                raise
+            return {"icons": len(icon_batch), "documents": len(doc_batch)}
+
+    @staticmethod
+    async def _write_icon_hits(
+        db: AsyncSession, batch: Counter[Tuple[str, str]], postgres: bool
+    ) -> None:
+        rows = [(pack_name, key, delta) for (pack_name, key), delta in batch.items()]
+        if not postgres:
+            # SQLite (dev/test) has no aliased VALUES lists
+            await db.execute(
+                text(
+                    "UPDATE icon_metadata SET access_count = access_count + :delta "
+                    "WHERE key = :key AND pack_id = (SELECT id FROM icon_packs WHERE name = :pack_name)"
+                ),
+                [{"pack_name": p, "key": k, "delta": d} for p, k, d in rows],
+            )
+            return
+
+        for chunk in _chunks(rows):
+            values = ", ".join(
+                f"(CAST(:p{i} AS VARCHAR), CAST(:k{i} AS VARCHAR), CAST(:d{i} AS INTEGER))"
+                for i in range(len(chunk))
+            )
+            params: Dict[str, Any] = {}
+            for i, (pack_name, key, delta) in enumerate(chunk):
+                params.update({f"p{i}": pack_name, f"k{i}": key, f"d{i}": delta})
+            await db.execute(
+                text(
+                    "UPDATE icon_metadata AS m "
+                    "SET access_count = m.access_count + v.delta "
+                    f"FROM (VALUES {values}) AS v(pack_name, key, delta), icon_packs AS p "
+                    "WHERE p.name = v.pack_name AND m.pack_id = p.id AND m.key = v.key"
+                ),
+                params,
+            )
+
+    @staticmethod
+    async def _write_document_opens(
+        db: AsyncSession, batch: Dict[int, datetime], postgres: bool
+    ) -> None:
+        rows = sorted(batch.items())
+        if not postgres:
+            await db.execute(
+                text("UPDATE documents SET last_opened_at = :opened_at WHERE id = :id"),
+                [{"id": document_id, "opened_at": opened_at} for document_id, opened_at in rows],
+            )
+            return
+
+        for chunk in _chunks(rows):
+            values = ", ".join(
+                f"(CAST(:i{i} AS INTEGER), CAST(:t{i} AS TIMESTAMPTZ))" for i in range(len(chunk))
+            )
+            params: Dict[str, Any] = {}
+            for i, (document_id, opened_at) in enumerate(chunk):
+                params.update({f"i{i}": document_id, f"t{i}": opened_at})
+            # Never move a timestamp backwards (another worker may have flushed a newer one)
+            await db.execute(
+                text(
+                    "UPDATE documents AS d SET last_opened_at = v.opened_at "
+                    f"FROM (VALUES {values}) AS v(id, opened_at) "
+                    "WHERE d.id = v.id "
+                    "AND (d.last_opened_at IS NULL OR d.last_opened_at < v.opened_at)"
+                ),
+                params,
+            )
+
+
+# Module-level singleton, started/stopped by the application lifespan
+access_tracker = AccessTracker()
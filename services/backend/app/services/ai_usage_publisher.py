@@ -7,7 +7,6 @@ import logging
 import uuid
 from datetime import date, datetime, timezone
 
-import redis.asyncio as aioredis
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,6 +14,7 @@ from app.configs.settings import get_settings
 from app.database import AsyncSessionLocal
 from app.models.ai_usage_daily import AIUsageDaily
 from app.models.user import User
+from app.services.redis_pool import redis_pool
 
 logger = logging.getLogger(__name__)
 
@@ -55,28 +55,31 @@ async def publish_usage_stats() -> None:
             "error_count": daily.error_count,
         })
 
+    now = datetime.now(timezone.utc).isoformat()
+    events = [
+        {
+            "event_id": str(uuid.uuid4()),
+            "event_type": "AIUsagePublished",
+            "topic": TOPIC,
+            "schema_version": "1",
+            "occurred_at": now,
+            "aggregate_id": email,
+            "payload": json.dumps({
+                "user_email": email,
+                "source_app": SOURCE_APP,
+                "usage_date": today.isoformat(),
+                "stats": stats,
+            }),
+        }
+        for email, stats in by_user.items()
+    ]
+
     try:
-        r = aioredis.from_url(redis_url, decode_responses=True)
-        try:
-            for email, stats in by_user.items():
-                event = {
-                    "event_id": str(uuid.uuid4()),
-                    "event_type": "AIUsagePublished",
-                    "topic": TOPIC,
-                    "schema_version": "1",
-                    "occurred_at": datetime.now(timezone.utc).isoformat(),
-                    "aggregate_id": email,
-                    "payload": json.dumps({
-                        "user_email": email,
-                        "source_app": SOURCE_APP,
-                        "usage_date": today.isoformat(),
-                        "stats": stats,
-                    }),
-                }
-                await r.xadd(TOPIC, event, maxlen=5000)
-            logger.info("Published usage stats for %d users", len(by_user))
-        finally:
-            await r.aclose()
+        async with redis_pool.client.pipeline(transaction=False) as pipe:
+            for event in events:
+                pipe.xadd(TOPIC, event, maxlen=5000)
+            await pipe.execute()
+        logger.info("Published usage stats for %d users", len(by_user))
     except Exception as exc:
         logger.warning("Failed to publish usage stats: %s", exc)
 
@@ -0,0 +1,392 @@
+"""Document → icon reference index.
+
+Icon usage questions ("which documents use pack X", "how often is icon Y
+referenced", "whose documents break if icon Z is removed") used to be
+answered by reading every document file and substring-scanning it.  This
+module keeps an inverted index instead:
+
+* ``extract_icon_references`` parses a document once into
+  ``(pack, icon, context) -> occurrences`` plus its mermaid diagram count.
+* Every successful ``Filesystem.write_document`` schedules the document on
+  ``document_icon_indexer``; the indexer debounces rapid saves and reconciles
+  the stored rows for each document (only changed rows are written).
+* ``ensure_indexed`` backfills documents that have not been written since
+  the index was introduced, in batches, so readers can rely on the tables.
+  It runs in the background at startup; documents whose file cannot be read
+  are marked so they are not retried until they are written again.
+
+Every ``pack:icon`` token is indexed whether or not the pack is installed,
+so a pack installed later immediately sees the references that existing
+documents already make.  Queries always filter by pack name, which keeps
+times and ``key:value`` text out of the results.  Rows are written with
+``INSERT .. ON CONFLICT`` because a flush and a backfill may index the same
+document concurrently.
+"""
+import asyncio
+import hashlib
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models.document import Document
+from app.models.document_icon_reference import DocumentIconIndex, DocumentIconReference
+
+logger = logging.getLogger(__name__)
+
+# pack:icon-name, not preceded by another identifier character
+ICON_REFERENCE_PATTERN = re.compile(r'(?<![\w-])([a-zA-Z0-9_-]+):([a-zA-Z0-9_-]+)')
+MERMAID_FENCE_PATTERN = re.compile(r'```mermaid\s', re.IGNORECASE | re.MULTILINE)
+MERMAID_BLOCK_PATTERN = re.compile(r'^```mermaid[^\n]*\n.*?^```', re.IGNORECASE | re.MULTILINE | re.DOTALL)
+
+CONTEXT_MERMAID = "mermaid"
+CONTEXT_MARKDOWN = "markdown"
+
+# content_hash of documents whose file could not be read during a backfill
+UNREADABLE_CONTENT_HASH = "unreadable"
+
+
+@dataclass
+class ExtractedReferences:
+    """Icon references parsed from one document."""
+
+    # (pack_name, icon_key, context) -> occurrences
+    references: Counter = field(default_factory=Counter)
+    mermaid_diagrams: int = 0
+    content_hash: str = ""
+
+
+def extract_icon_references(content: str) -> ExtractedReferences:
+    """Parse ``pack:key`` references out of document content."""
+    mermaid_spans = [m.span() for m in MERMAID_BLOCK_PATTERN.finditer(content)]
+    references: Counter = Counter()
+    for match in ICON_REFERENCE_PATTERN.finditer(content):
+        position = match.start()
+        in_mermaid = any(start <= position < end for start, end in mermaid_spans)
+        context = CONTEXT_MERMAID if in_mermaid else CONTEXT_MARKDOWN
+        references[(match.group(1), match.group(2), context)] += 1
+
+    return ExtractedReferences(
+        references=references,
+        mermaid_diagrams=len(MERMAID_FENCE_PATTERN.findall(content)),
+        content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+    )
+
+
+class DocumentIconIndexer:
+    """Maintains ``document_icon_references`` as documents are written."""
+
+    FLUSH_INTERVAL_SECONDS = 2.0
+    BACKFILL_BATCH_SIZE = 200
+
+    def __init__(self):
+        self._pending: Dict[Tuple[int, str], str] = {}
+        self._task: asyncio.Task | None = None
+        self._backfill_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+        self._backfill_lock = asyncio.Lock()
+
+    def schedule(self, user_id: int, file_path: str, content: str) -> None:
+        """Queue a written document for (re)indexing; the latest content wins."""
+        self._pending[(user_id, file_path)] = content
+
+    @property
+    def pending(self) -> Dict[Tuple[int, str], str]:
+        """Documents waiting for the next flush."""
+        return dict(self._pending)
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start the periodic flush loop and a background backfill."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+        if self._backfill_task is None:
+            self._backfill_task = asyncio.create_task(self._backfill())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and index whatever is still queued."""
+        for task in (self._task, self._backfill_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._backfill_task = None
+        await self.flush()
+
+    async def _backfill(self) -> None:
+        try:
+            await self.ensure_indexed()
+        except Exception:
+            logger.exception("Document icon index backfill failed")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL_SECONDS)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Document icon index flush failed")
+
+    async def flush(self) -> int:
+        """Index all queued documents in one transaction; returns rows reindexed."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, {}
+            try:
+                async with AsyncSessionLocal() as db:
+                    document_ids = await self._resolve_documents(db, batch.keys())
+                    reindexed = 0
+                    for location, content in batch.items():
+                        document_id = document_ids.get(location)
+                        # Files written before their Document row exists are
+                        # picked up by ensure_indexed() later
+                        if document_id is None:
+                            continue
+                        if await self.index_document(db, document_id, content):
+                            reindexed += 1
+                    await db.commit()
+            except Exception:
+                # Newer writes queued meanwhile take precedence over the batch
+                for location, content in batch.items():
+                    self._pending.setdefault(location, content)
+                raise
+            return reindexed
+
+    @staticmethod
+    async def _resolve_documents(
+        db: AsyncSession, locations: Iterable[Tuple[int, str]]
+    ) -> Dict[Tuple[int, str], int]:
+        locations = list(locations)
+        user_ids = {user_id for user_id, _ in locations}
+        paths = {file_path for _, file_path in locations}
+        result = await db.execute(
+            select(Document.id, Document.user_id, Document.file_path).where(
+                Document.user_id.in_(user_ids), Document.file_path.in_(paths)
+            )
+        )
+        return {(row.user_id, row.file_path): row.id for row in result}
+
+    # -- indexing ----------------------------------------------------------
+
+    async def index_document(self, db: AsyncSession, document_id: int, content: str) -> bool:
+        """Reconcile the stored references for one document with ``content``.
+
+        Returns:
+            False when the content is unchanged since it was last indexed
+        """
+        extracted = extract_icon_references(content)
+        indexed_hash = await db.scalar(
+            select(DocumentIconIndex.content_hash).where(DocumentIconIndex.document_id == document_id)
+        )
+        if indexed_hash == extracted.content_hash:
+            return False
+
+        await self._reconcile_references(db, document_id, extracted.references)
+        await self._store_state(db, document_id, extracted.content_hash, extracted.mermaid_diagrams)
+        return True
+
+    @staticmethod
+    async def _reconcile_references(db: AsyncSession, document_id: int, references: Counter) -> None:
+        """Delete references that disappeared and upsert new or changed ones."""
+        result = await db.execute(
+            select(
+                DocumentIconReference.id,
+                DocumentIconReference.pack_name,
+                DocumentIconReference.icon_key,
+                DocumentIconReference.context,
+                DocumentIconReference.occurrences,
+            ).where(DocumentIconReference.document_id == document_id)
+        )
+        existing = {(row.pack_name, row.icon_key, row.context): row for row in result}
+
+        stale_ids = [row.id for key, row in existing.items() if key not in references]
+        if stale_ids:
+            await db.execute(delete(DocumentIconReference).where(DocumentIconReference.id.in_(stale_ids)))
+
+        changed = [
+            {
+                "document_id": document_id, "pack_name": pack_name, "icon_key": icon_key,
+                "context": context, "occurrences": occurrences,
+            }
+            for (pack_name, icon_key, context), occurrences in references.items()
+            if getattr(existing.get((pack_name, icon_key, context)), "occurrences", None) != occurrences
+        ]
+        if changed:
+            stmt = pg_insert(DocumentIconReference).values(changed)
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[
+                    DocumentIconReference.document_id,
+                    DocumentIconReference.pack_name,
+                    DocumentIconReference.icon_key,
+                    DocumentIconReference.context,
+                ],
+                set_={"occurrences": stmt.excluded.occurrences},
+            ))
+
+    @staticmethod
+    async def _store_state(db: AsyncSession, document_id: int, content_hash: str, mermaid_diagrams: int) -> None:
+        """Record the indexed content hash; the last writer wins."""
+        stmt = pg_insert(DocumentIconIndex).values(
+            document_id=document_id, content_hash=content_hash, mermaid_diagrams=mermaid_diagrams,
+        )
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[DocumentIconIndex.document_id],
+            set_={
+                "content_hash": stmt.excluded.content_hash,
+                "mermaid_diagrams": stmt.excluded.mermaid_diagrams,
+                "indexed_at": func.now(),
+            },
+        ))
+
+    async def ensure_indexed(self, user_id: Optional[int] = None) -> int:
+        """Index queued writes and any document that has never been indexed.
+
+        Works through the documents in batches, each in its own session, so
+        callers mid-transaction are unaffected.  Documents whose file cannot
+        be read are marked with ``UNREADABLE_CONTENT_HASH``; their next write
+        indexes them.
+
+        Args:
+            user_id: Restrict the backfill to one user's documents
+
+        Returns:
+            Number of documents backfilled
+        """
+        if self._pending:
+            await self.flush()
+
+        backfilled = 0
+        async with self._backfill_lock:
+            last_id = 0
+            while True:
+                indexed, last_id = await self._backfill_batch(user_id, last_id)
+                if last_id is None:
+                    break
+                backfilled += indexed
+
+        if backfilled:
+            logger.info("Backfilled icon reference index for %d document(s)", backfilled)
+        return backfilled
+
+    async def _backfill_batch(self, user_id: Optional[int], after_id: int) -> Tuple[int, Optional[int]]:
+        """Index one batch of unindexed documents with ids above ``after_id``.
+
+        Returns:
+            ``(documents indexed, last id seen)``; the id is None when done
+        """
+        # Imported lazily: the filesystem layer schedules writes on this module
+        from app.services.storage.filesystem import Filesystem
+
+        query = (
+            select(Document.id, Document.user_id, Document.file_path)
+            .outerjoin(DocumentIconIndex, DocumentIconIndex.document_id == Document.id)
+            .where(
+                DocumentIconIndex.document_id.is_(None),
+                Document.file_path.is_not(None),
+                Document.id > after_id,
+            )
+            .order_by(Document.id)
+            .limit(self.BACKFILL_BATCH_SIZE)
+        )
+        if user_id is not None:
+            query = query.where(Document.user_id == user_id)
+
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(query)).all()
+            if not rows:
+                return 0, None
+
+            filesystem = Filesystem()
+            indexed = 0
+            for row in rows:
+                content = await filesystem.read_document(row.user_id, row.file_path)
+                if content is None:
+                    await self._store_state(db, row.id, UNREADABLE_CONTENT_HASH, 0)
+                    continue
+                await self.index_document(db, row.id, content)
+                indexed += 1
+            await db.commit()
+        return indexed, rows[-1].id
+
+    # -- queries -----------------------------------------------------------
+
+    @staticmethod
+    async def documents_referencing(
+        db: AsyncSession,
+        pack_name: str,
+        icon_keys: Optional[Iterable[str]] = None,
+        user_id: Optional[int] = None,
+    ) -> List[Tuple[int, int, str, Set[str]]]:
+        """Documents referencing a pack (optionally only some of its icons).
+
+        Returns:
+            List of ``(document_id, user_id, document_name, icon_keys_found)``
+        """
+        query = (
+            select(Document.id, Document.user_id, Document.name, DocumentIconReference.icon_key)
+            .join(DocumentIconReference, DocumentIconReference.document_id == Document.id)
+            .where(DocumentIconReference.pack_name == pack_name)
+            .order_by(Document.id)
+        )
+        if icon_keys is not None:
+            query = query.where(DocumentIconReference.icon_key.in_(list(icon_keys)))
+        if user_id is not None:
+            query = query.where(Document.user_id == user_id)
+
+        documents: Dict[int, Tuple[int, int, str, Set[str]]] = {}
+        for row in await db.execute(query):
+            entry = documents.setdefault(row.id, (row.id, row.user_id, row.name, set()))
+            entry[3].add(row.icon_key)
+        return list(documents.values())
+
+    @staticmethod
+    async def pack_usage(db: AsyncSession, user_id: int, pack_names: Iterable[str]) -> Dict[str, dict]:
+        """Per-pack document count, reference total and icon usage for a user."""
+        query = (
+            select(
+                DocumentIconReference.pack_name,
+                DocumentIconReference.icon_key,
+                DocumentIconReference.document_id,
+                func.sum(DocumentIconReference.occurrences).label("occurrences"),
+            )
+            .join(Document, Document.id == DocumentIconReference.document_id)
+            .where(Document.user_id == user_id, DocumentIconReference.pack_name.in_(list(pack_names)))
+            .group_by(
+                DocumentIconReference.pack_name,
+                DocumentIconReference.icon_key,
+                DocumentIconReference.document_id,
+            )
+        )
+        usage: Dict[str, dict] = {}
+        for row in await db.execute(query):
+            entry = usage.setdefault(row.pack_name, {"documents": set(), "total_references": 0, "icons": Counter()})
+            entry["documents"].add(row.document_id)
+            entry["total_references"] += row.occurrences
+            entry["icons"][row.icon_key] += row.occurrences
+        return usage
+
+    @staticmethod
+    async def mermaid_diagram_count(db: AsyncSession, user_id: int) -> int:
+        """Total mermaid diagrams across a user's indexed documents."""
+        result = await db.execute(
+            select(func.coalesce(func.sum(DocumentIconIndex.mermaid_diagrams), 0))
+            .join(Document, Document.id == DocumentIconIndex.document_id)
+            .where(Document.user_id == user_id)
+        )
+        return int(result.scalar() or 0)
+
+
+# Module-level singleton, started/stopped by the application lifespan
+document_icon_indexer = DocumentIconIndexer()
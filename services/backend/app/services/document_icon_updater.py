@@ -3,11 +3,12 @@ Document Icon Update Service
 Handles updating icon references in documents when icon pack keys change.
 """
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from ..models.document import Document
+from ..services.document_icon_index import document_icon_indexer
 from ..services.storage.user import UserStorage
 
 
@@ -22,7 +23,7 @@ class DocumentIconUpdater:
         self,
         old_pack_key: str,
         new_pack_key: str,
-        user_id: int
+        user_id: Optional[int] = None
     ) -> Tuple[int, List[str]]:
         """
         Update all document references from old pack key to new pack key.
@@ -30,7 +31,7 @@ class DocumentIconUpdater:
         Args:
             old_pack_key: The old icon pack key
             new_pack_key: The new icon pack key
-            user_id: The user ID to limit document updates to
+            user_id: The user ID to limit document updates to (all users if None)
 
         Returns:
             Tuple of (updated_count, list_of_updated_document_names)
@@ -38,10 +39,8 @@ class DocumentIconUpdater:
         if old_pack_key == new_pack_key:
             return 0, []
 
-        # Get all documents for the user
-        query = select(Document).where(Document.user_id == user_id)
-        result = await self.db.execute(query)
-        documents = result.scalars().all()
+        # Only documents the reference index says use the pack
+        documents = await self._indexed_documents(old_pack_key, user_id=user_id)
 
         updated_documents = []
         updated_count = 0
@@ -52,7 +51,7 @@ class DocumentIconUpdater:
             if doc.file_path:
                 try:
                     content = await self.storage_service.read_document(
-                        user_id=user_id,
+                        user_id=doc.user_id,
                         file_path=doc.file_path
                     )
                     original_content = content or ""
@@ -76,7 +75,7 @@ class DocumentIconUpdater:
                 if doc.file_path:
                     try:
                         await self.storage_service.write_document(
-                            user_id=user_id,
+                            user_id=doc.user_id,
                             file_path=doc.file_path,
                             content=updated_content,
                             commit_message=f"Update icon pack references: {old_pack_key} -> {new_pack_key}",
@@ -125,10 +124,8 @@ class DocumentIconUpdater:
 
         old_full_key = f"{pack_key}:{old_icon_key}"
 
-        # Get all documents for the user
-        query = select(Document).where(Document.user_id == user_id)
-        result = await self.db.execute(query)
-        documents = result.scalars().all()
+        # Only documents the reference index says use the icon
+        documents = await self._indexed_documents(pack_key, [old_icon_key], user_id)
 
         updated_documents = []
         updated_count = 0
@@ -139,7 +136,7 @@ class DocumentIconUpdater:
             if doc.file_path:
                 try:
                     content = await self.storage_service.read_document(
-                        user_id=user_id,
+                        user_id=doc.user_id,
                         file_path=doc.file_path
                     )
                     original_content = content or ""
@@ -163,7 +160,7 @@ class DocumentIconUpdater:
                 if doc.file_path:
                     try:
                         await self.storage_service.write_document(
-                            user_id=user_id,
+                            user_id=doc.user_id,
                             file_path=doc.file_path,
                             content=updated_content,
                             commit_message=f"Update icon key references: {old_icon_key} -> {new_icon_key}",
@@ -305,9 +302,28 @@ class DocumentIconUpdater:
             # Legacy document without file_path
             return getattr(document, 'content', "")
 
+    async def _indexed_documents(
+        self,
+        pack_key: str,
+        icon_keys: Optional[List[str]] = None,
+        user_id: Optional[int] = None
+    ) -> List[Document]:
+        """Load the documents whose indexed references include the pack (or icons)."""
+        await document_icon_indexer.ensure_indexed(user_id)
+        matches = await document_icon_indexer.documents_referencing(
+            self.db, pack_key, icon_keys=icon_keys, user_id=user_id
+        )
+        if not matches:
+            return []
+
+        result = await self.db.execute(
+            select(Document).where(Document.id.in_([document_id for document_id, *_ in matches]))
+        )
+        return list(result.scalars().all())
+
     async def find_documents_using_pack(self, pack_key: str, user_id: int) -> List[Tuple[int, str]]:
         """
-        Find all documents that reference a specific icon pack by scanning filesystem content.
+        Find all documents that reference a specific icon pack.
 
         Args:
             pack_key: The icon pack key to search for
@@ -316,25 +332,13 @@ class DocumentIconUpdater:
         Returns:
             List of tuples (document_id, document_name)
         """
-        # Get all documents for the user
-        query = select(Document).where(Document.user_id == user_id)
-        result = await self.db.execute(query)
-        documents = result.scalars().all()
-
-        found_documents = []
-        search_pattern = f"{pack_key}:"
-
-        for doc in documents:
-            # Load content from filesystem
-            content = await self._load_document_content(doc, user_id)
-            if search_pattern in content:
-                found_documents.append((doc.id, doc.name))
-
-        return found_documents
+        await document_icon_indexer.ensure_indexed(user_id)
+        matches = await document_icon_indexer.documents_referencing(self.db, pack_key, user_id=user_id)
+        return [(document_id, name) for document_id, _, name, _ in matches]
 
     async def find_documents_using_icon(self, pack_key: str, icon_key: str, user_id: int) -> List[Tuple[int, str]]:
         """
-        Find all documents that reference a specific icon by scanning filesystem content.
+        Find all documents that reference a specific icon.
 
         Args:
             pack_key: The icon pack key
@@ -344,25 +348,15 @@ class DocumentIconUpdater:
         Returns:
             List of tuples (document_id, document_name)
         """
-        # Get all documents for the user
-        query = select(Document).where(Document.user_id == user_id)
-        result = await self.db.execute(query)
-        documents = result.scalars().all()
-
-        found_documents = []
-        full_key = f"{pack_key}:{icon_key}"
-
-        for doc in documents:
-            # Load content from filesystem
-            content = await self._load_document_content(doc, user_id)
-            if full_key in content:
-                found_documents.append((doc.id, doc.name))
-
-        return found_documents
+        await document_icon_indexer.ensure_indexed(user_id)
+        matches = await document_icon_indexer.documents_referencing(
+            self.db, pack_key, icon_keys=[icon_key], user_id=user_id
+        )
+        return [(document_id, name) for document_id, _, name, _ in matches]
 
     async def get_icon_usage_stats(self, pack_key: str, user_id: int) -> dict:
         """
-        Get statistics about icon pack usage in documents by scanning filesystem content.
+        Get statistics about icon pack usage in documents.
 
         Args:
             pack_key: The icon pack key to analyze
@@ -371,35 +365,14 @@ class DocumentIconUpdater:
         Returns:
             Dictionary with usage statistics
         """
-        # Get all documents for the user
-        query = select(Document).where(Document.user_id == user_id)
-        result = await self.db.execute(query)
-        documents = result.scalars().all()
-
-        documents_with_pack = []
-        total_references = 0
-        unique_icons = set()
-        search_pattern = f"{pack_key}:"
-
-        # Regex pattern to find icon references
-        pattern = rf'{re.escape(pack_key)}:([a-zA-Z0-9_-]+)'
-
-        for doc in documents:
-            # Load content from filesystem
-            content = await self._load_document_content(doc, user_id)
-
-            if search_pattern in content:
-                documents_with_pack.append((doc.id, doc.name))
-
-                # Find all icon references in this document
-                matches = re.findall(pattern, content)
-                total_references += len(matches)
-                unique_icons.update(matches)
+        await document_icon_indexer.ensure_indexed(user_id)
+        usage = await document_icon_indexer.pack_usage(self.db, user_id, [pack_key])
+        pack_usage = usage.get(pack_key, {"documents": set(), "total_references": 0, "icons": {}})
 
         return {
             "pack_key": pack_key,
-            "documents_count": len(documents_with_pack),
-            "total_references": total_references,
-            "unique_icons_used": len(unique_icons),
-            "icon_names": sorted(list(unique_icons))
+            "documents_count": len(pack_usage["documents"]),
+            "total_references": pack_usage["total_references"],
+            "unique_icons_used": len(pack_usage["icons"]),
+            "icon_names": sorted(pack_usage["icons"])
         }
@@ -10,11 +10,10 @@ import json
 import logging
 from datetime import datetime, timezone
 
-import redis.asyncio as aioredis
 from sqlalchemy import select
 
-from app.configs.settings import get_settings
 from app.models.user import User
+from app.services.redis_pool import redis_pool
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +24,8 @@ TOPICS = ["ai.usage.v1"]
 
 async def start_event_consumer() -> None:
     """Start the background event consumer loop."""
-    settings = get_settings()
     try:
-        redis = aioredis.from_url(settings.redis_url, decode_responses=True)
+        redis = redis_pool.client
     except Exception as exc:
         logger.warning("Event consumer cannot start — Redis unavailable: %s", exc)
         return
@@ -42,36 +40,33 @@ async def start_event_consumer() -> None:
 
     logger.info("Event consumer started (group=%s, topics=%s)", CONSUMER_GROUP, TOPICS)
 
-    try:
-        while True:
-            try:
-                streams = {topic: ">" for topic in TOPICS}
-                results = await redis.xreadgroup(
-                    groupname=CONSUMER_GROUP,
-                    consumername=CONSUMER_NAME,
-                    streams=streams,
-                    count=10,
-                    block=5000,
-                )
+    while True:
+        try:
+            streams = {topic: ">" for topic in TOPICS}
+            results = await redis.xreadgroup(
+                groupname=CONSUMER_GROUP,
+                consumername=CONSUMER_NAME,
+                streams=streams,
+                count=10,
+                block=5000,
+            )
+
+            if not results:
+                continue
 
-                if not results:
-                    continue
-
-                for topic, messages in results:
-                    for msg_id, data in messages:
-                        try:
-                            await _handle_event(topic, msg_id, data)
-                            await redis.xack(topic, CONSUMER_GROUP, msg_id)
-                        except Exception as exc:
-                            logger.error("Failed to process event %s from %s: %s", msg_id, topic, exc)
-
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                logger.error("Event consumer error: %s", exc)
-                await asyncio.sleep(5)
-    finally:
-        await redis.aclose()
+            for topic, messages in results:
+                for msg_id, data in messages:
+                    try:
+                        await _handle_event(topic, msg_id, data)
+                        await redis.xack(topic, CONSUMER_GROUP, msg_id)
+                    except Exception as exc:
+                        logger.error("Failed to process event %s from %s: %s", msg_id, topic, exc)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error("Event consumer error: %s", exc)
+            await asyncio.sleep(5)
 
 
 async def _handle_event(topic: str, msg_id: str, data: dict) -> None:
@@ -1,12 +1,20 @@
 """GitHub API operations service."""
+import asyncio
 import base64
 import hashlib
 from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 
 import httpx
 from fastapi import HTTPException, status
 
+from app.core.exceptions import GitHubFileConflict
+from app.services.http_clients import GITHUB, http_clients
+
 from .base import BaseGitHubService
+from .diagram_cache import diagram_render_cache, git_blob_sha
+from .response_cache import github_response_cache
+from .scheduler import github_scheduler
 
 
 class GitHubAPIService(BaseGitHubService):
@@ -20,23 +28,24 @@ class GitHubAPIService(BaseGitHubService):
 
     async def get_user_info(self, access_token: str) -> Dict[str, Any]:
         """Get authenticated user information."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/user",
-                headers={
-                    "Authorization": f"token {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "User-Agent": "Markdown-Manager/1.0"
-                }
-            )
+        client = http_clients.get(GITHUB)
+        response = await github_response_cache.get(
+            client,
+            f"{self.BASE_URL}/user",
+            headers={
+                "Authorization": f"token {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Markdown-Manager/1.0"
+            }
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to get user info"
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to get user info"
+            )
 
-            return response.json()
+        return response.json()
 
     async def get_user_repositories(
         self,
@@ -45,30 +54,31 @@ class GitHubAPIService(BaseGitHubService):
         per_page: int = 30
     ) -> List[Dict[str, Any]]:
         """Get user's repositories."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/user/repos",
-                params={
-                    "type": "all",
-                    "sort": "updated",
-                    "direction": "desc",
-                    "per_page": per_page,
-                    "page": page
-                },
-                headers={
-                    "Authorization": f"token {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "User-Agent": "Markdown-Manager/1.0"
-                }
-            )
+        client = http_clients.get(GITHUB)
+        response = await github_response_cache.get(
+            client,
+            f"{self.BASE_URL}/user/repos",
+            params={
+                "type": "all",
+                "sort": "updated",
+                "direction": "desc",
+                "per_page": per_page,
+                "page": page
+            },
+            headers={
+                "Authorization": f"token {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Markdown-Manager/1.0"
+            }
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to get repositories"
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to get repositories"
+            )
 
-            return response.json()
+        return response.json()
 
     async def get_user_repositories_filtered(
         self,
@@ -87,80 +97,82 @@ class GitHubAPIService(BaseGitHubService):
         current_page = page
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=min_updated_days)
 
-        async with httpx.AsyncClient() as client:
-            while len(all_repos) < max_repos:
-                response = await client.get(
-                    f"{self.BASE_URL}/user/repos",
-                    params={
-                        "type": "all",
-                        "sort": "updated",
-                        "direction": "desc",
-                        "per_page": per_page,
-                        "page": current_page
-                    },
-                    headers={
-                        "Authorization": f"token {access_token}",
-                        "Accept": "application/vnd.github.v3+json",
-                        "User-Agent": "Markdown-Manager/1.0"
-                    }
+        client = http_clients.get(GITHUB)
+        while len(all_repos) < max_repos:
+            response = await github_response_cache.get(
+                client,
+                f"{self.BASE_URL}/user/repos",
+                params={
+                    "type": "all",
+                    "sort": "updated",
+                    "direction": "desc",
+                    "per_page": per_page,
+                    "page": current_page
+                },
+                headers={
+                    "Authorization": f"token {access_token}",
+                    "Accept": "application/vnd.github.v3+json",
+                    "User-Agent": "Markdown-Manager/1.0"
+                }
+            )
+
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Failed to get repositories"
                 )
 
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Failed to get repositories"
-                    )
+            repos = response.json()
+            if not repos:  # No more repositories
+                break
 
-                repos = response.json()
-                if not repos:  # No more repositories
+            for repo in repos:
+                # Apply filters
+                if len(all_repos) >= max_repos:
                     break
 
-                for repo in repos:
-                    # Apply filters
-                    if len(all_repos) >= max_repos:
-                        break
+                # Skip forks if not wanted
+                if not include_forks and repo.get("fork", False):
+                    continue
 
-                    # Skip forks if not wanted
-                    if not include_forks and repo.get("fork", False):
-                        continue
+                # Skip archived repos if not wanted
+                if exclude_archived and repo.get("archived", False):
+                    continue
 
-                    # Skip archived repos if not wanted
-                    if exclude_archived and repo.get("archived", False):
-                        continue
-
-                    # Check update date
-                    updated_at = datetime.fromisoformat(
-                        repo.get("updated_at", "").replace('Z', '+00:00')
-                    )
-                    if updated_at < cutoff_date:
-                        # Since repos are sorted by updated date, we can stop here
-                        return all_repos
+                # Check update date
+                updated_at = datetime.fromisoformat(
+                    repo.get("updated_at", "").replace('Z', '+00:00')
+                )
+                if updated_at < cutoff_date:
+                    # Since repos are sorted by updated date, we can stop here
+                    return all_repos
 
-                    all_repos.append(repo)
+                all_repos.append(repo)
 
-                current_page += 1
+            current_page += 1
 
         return all_repos
 
     async def get_user_organizations(self, access_token: str) -> List[Dict[str, Any]]:
         """Get organizations that the user belongs to."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/user/orgs",
-                headers={
-                    "Authorization": f"token {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "User-Agent": "Markdown-Manager/1.0"
-                }
-            )
+        client = http_clients.get(GITHUB)
+        response = await github_response_cache.get(
+            client,
+            f"{self.BASE_URL}/user/orgs",
+            headers={
+                "Authorization": f"token {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Markdown-Manager/1.0"
+            }
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Failed to get user organizations: {response.text}"
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to get user organizations: {response.text}"
+            )
 
-            return response.json()
+        return response.json()
 
     async def get_repository_contents(
         self,
@@ -174,33 +186,34 @@ class GitHubAPIService(BaseGitHubService):
         # Normalize path - GitHub API expects empty string for root, not "/"
         normalized_path = path.strip('/')
 
-        async with httpx.AsyncClient() as client:
-            url = f"{self.BASE_URL}/repos/{owner}/{repo}/contents"
-            if normalized_path:
-                url += f"/{normalized_path}"
+        client = http_clients.get(GITHUB)
+        url = f"{self.BASE_URL}/repos/{owner}/{repo}/contents"
+        if normalized_path:
+            url += f"/{normalized_path}"
 
-            params = {"ref": ref}
+        params = {"ref": ref}
 
-            response = await client.get(
-                url,
-                params=params,
-                headers={
-                    "Authorization": f"token {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "User-Agent": "Markdown-Manager/1.0"
-                }
-            )
+        response = await github_response_cache.get(
+            client,
+            url,
+            params=params,
+            headers={
+                "Authorization": f"token {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Markdown-Manager/1.0"
+            }
+        )
 
-            if response.status_code == 404:
-                return []
-            elif response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Failed to get repository contents: {response.text}"
-                )
+        if response.status_code == 404:
+            return []
+        elif response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Failed to get repository contents: {response.text}"
+            )
 
-            data = response.json()
-            return data if isinstance(data, list) else [data]
+        data = response.json()
+        return data if isinstance(data, list) else [data]
 
     async def get_file_content(
         self,
@@ -211,35 +224,103 @@ class GitHubAPIService(BaseGitHubService):
         ref: str = "main"
     ) -> Tuple[str, str]:
         """Get file content and SHA."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/contents/{path}",
-                params={"ref": ref},
-                headers={
-                    "Authorization": f"token {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "User-Agent": "Markdown-Manager/1.0"
-                }
+        client = http_clients.get(GITHUB)
+        response = await github_response_cache.get(
+            client,
+            f"{self.BASE_URL}/repos/{owner}/{repo}/contents/{path}",
+            params={"ref": ref},
+            headers={
+                "Authorization": f"token {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Markdown-Manager/1.0"
+            }
+        )
+
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Failed to get file content: {response.text}"
             )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Failed to get file content: {response.text}"
-                )
+        file_data = response.json()
+        if file_data["type"] != "file":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Path does not point to a file"
+            )
 
-            file_data = response.json()
-            if file_data["type"] != "file":
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Path does not point to a file"
-                )
+        # Decode base64 content
+        content = base64.b64decode(file_data["content"]).decode("utf-8")
+        sha = file_data["sha"]
+
+        return content, sha
+
+    async def get_tree_blob_shas(
+        self,
+        access_token: str,
+        owner: str,
+        repo: str,
+        ref: str = "main"
+    ) -> Tuple[Dict[str, str], bool]:
+        """Map every file path on ``ref`` to its blob SHA with one tree request.
+
+        Returns:
+            ``(path -> blob SHA, truncated)``.  GitHub truncates very large
+            trees; paths missing from a truncated tree must be checked
+            individually.
+        """
+        client = http_clients.get(GITHUB)
+        response = await github_response_cache.get(
+            client,
+            f"{self.BASE_URL}/repos/{owner}/{repo}/git/trees/{quote(ref, safe='')}",
+            params={"recursive": "1"},
+            headers={
+                "Authorization": f"token {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Markdown-Manager/1.0"
+            }
+        )
+
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Failed to get repository tree: {response.text}"
+            )
+
+        data = response.json()
+        blobs = {
+            entry["path"]: entry["sha"]
+            for entry in data.get("tree", [])
+            if entry.get("type") == "blob"
+        }
+        return blobs, bool(data.get("truncated"))
+
+    async def get_blob_content(
+        self,
+        access_token: str,
+        owner: str,
+        repo: str,
+        sha: str
+    ) -> str:
+        """Get the decoded text content of a blob by SHA."""
+        client = http_clients.get(GITHUB)
+        response = await github_response_cache.get(
+            client,
+            f"{self.BASE_URL}/repos/{owner}/{repo}/git/blobs/{sha}",
+            headers={
+                "Authorization": f"token {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Markdown-Manager/1.0"
+            }
+        )
 
-            # Decode base64 content
-            content = base64.b64decode(file_data["content"]).decode("utf-8")
-            sha = file_data["sha"]
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Failed to get blob: {response.text}"
+            )
 
-            return content, sha
+        return base64.b64decode(response.json()["content"]).decode("utf-8")
 
     async def create_or_update_file(
         self,
@@ -254,45 +335,47 @@ class GitHubAPIService(BaseGitHubService):
         is_binary: bool = False
     ) -> Dict[str, Any]:
         """Create or update a file in the repository."""
-        async with httpx.AsyncClient() as client:
-            # Handle binary vs text content encoding
-            if is_binary:
-                # Content is already base64 encoded for binary files
-                encoded_content = content
-            else:
-                # Encode text content to base64
-                encoded_content = base64.b64encode(content.encode("utf-8")).decode("utf-8")
+        client = http_clients.get(GITHUB)
+        # Handle binary vs text content encoding
+        if is_binary:
+            # Content is already base64 encoded for binary files
+            encoded_content = content
+        else:
+            # Encode text content to base64
+            encoded_content = base64.b64encode(content.encode("utf-8")).decode("utf-8")
+
+        data = {
+            "message": message,
+            "content": encoded_content,
+            "branch": branch
+        }
 
-            data = {
-                "message": message,
-                "content": encoded_content,
-                "branch": branch
-            }
+        if sha:
+            data["sha"] = sha
 
-            if sha:
-                data["sha"] = sha
+        response = await github_scheduler.request(
+            client,
+            "PUT",
+            f"{self.BASE_URL}/repos/{owner}/{repo}/contents/{path}",
+            json=data,
+            headers={
+                "Authorization": f"token {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Markdown-Manager/1.0"
+            }
+        )
 
-            response = await client.put(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/contents/{path}",
-                json=data,
-                headers={
-                    "Authorization": f"token {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "User-Agent": "Markdown-Manager/1.0"
-                }
+        if response.status_code not in (200, 201):
+            try:
+                error_data = response.json()
+            except Exception:
+                error_data = {"message": response.text}
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Failed to create/update file: {error_data.get('message', 'Unknown error')}"
             )
 
-            if response.status_code not in (200, 201):
-                try:
-                    error_data = response.json()
-                except Exception:
-                    error_data = {"message": response.text}
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Failed to create/update file: {error_data.get('message', 'Unknown error')}"
-                )
-
-            return response.json()
+        return response.json()
 
     async def get_repository_branches(
         self,
@@ -301,23 +384,24 @@ class GitHubAPIService(BaseGitHubService):
         repo: str
     ) -> List[Dict[str, Any]]:
         """Get repository branches."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/branches",
-                headers={
-                    "Authorization": f"token {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "User-Agent": "Markdown-Manager/1.0"
-                }
-            )
+        client = http_clients.get(GITHUB)
+        response = await github_response_cache.get(
+            client,
+            f"{self.BASE_URL}/repos/{owner}/{repo}/branches",
+            headers={
+                "Authorization": f"token {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Markdown-Manager/1.0"
+            }
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to get repository branches"
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail="Failed to get repository branches"
+            )
 
-            return response.json()
+        return response.json()
 
     def generate_content_hash(self, content: str) -> str:
         """Generate SHA-256 hash of content for comparison."""
@@ -344,21 +428,21 @@ class GitHubAPIService(BaseGitHubService):
         base_branch: Optional[str] = None
     ) -> Dict[str, Any]:
         """Commit file changes to GitHub repository."""
-        async with httpx.AsyncClient() as client:
-            headers = {
-                "Authorization": f"token {access_token}",
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "Markdown-Manager/1.0"
-            }
+        client = http_clients.get(GITHUB)
+        headers = {
+            "Authorization": f"token {access_token}",
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "Markdown-Manager/1.0"
+        }
 
-            # Create branch if requested
-            if create_branch and base_branch:
-                await self._create_branch(client, headers, owner, repo, branch, base_branch)
+        # Create branch if requested
+        if create_branch and base_branch:
+            await self._create_branch(client, headers, owner, repo, branch, base_branch)
 
-            # Commit the file
-            return await self.create_or_update_file(
-                access_token, owner, repo, file_path, content, message, sha, branch
-            )
+        # Commit the file
+        return await self.create_or_update_file(
+            access_token, owner, repo, file_path, content, message, sha, branch
+        )
 
     async def _create_branch(
         self,
@@ -372,7 +456,7 @@ class GitHubAPIService(BaseGitHubService):
         """Create a new branch from base branch."""
         # Get base branch SHA
         base_url = f"{self.BASE_URL}/repos/{owner}/{repo}/git/refs/heads/{base_branch}"
-        response = await client.get(base_url, headers=headers)
+        response = await github_response_cache.get(client, base_url, headers=headers)
 
         if response.status_code != 200:
             raise HTTPException(
@@ -390,7 +474,7 @@ class GitHubAPIService(BaseGitHubService):
         }
 
         create_url = f"{self.BASE_URL}/repos/{owner}/{repo}/git/refs"
-        response = await client.post(create_url, json=create_data, headers=headers)
+        response = await github_scheduler.request(client, "POST", create_url, json=create_data, headers=headers)
 
         if response.status_code != 201:
             error_data = response.json() if response.content else {"message": "Unknown error"}
@@ -449,52 +533,53 @@ class GitHubAPIService(BaseGitHubService):
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """Get commit history for a specific file."""
-        async with httpx.AsyncClient() as client:
-            params = {
-                "sha": branch,
-                "path": file_path,
-                "per_page": min(limit, 100)  # GitHub API max is 100
+        client = http_clients.get(GITHUB)
+        params = {
+            "sha": branch,
+            "path": file_path,
+            "per_page": min(limit, 100)  # GitHub API max is 100
+        }
+
+        response = await github_response_cache.get(
+            client,
+            f"{self.BASE_URL}/repos/{owner}/{repo}/commits",
+            params=params,
+            headers={
+                "Authorization": f"token {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Markdown-Manager/1.0"
             }
+        )
 
-            response = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/commits",
-                params=params,
-                headers={
-                    "Authorization": f"token {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                    "User-Agent": "Markdown-Manager/1.0"
-                }
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Failed to get commit history: {response.text}"
             )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Failed to get commit history: {response.text}"
-                )
+        commits_data = response.json()
+
+        # Transform GitHub API response to our format
+        commits = []
+        for commit in commits_data:
+            commits.append({
+                "hash": commit["sha"],
+                "short_hash": commit["sha"][:7],
+                "message": commit["commit"]["message"],
+                "author_name": commit["commit"]["author"]["name"],
+                "author_email": commit["commit"]["author"]["email"],
+                "date": commit["commit"]["author"]["date"],
+                "relative_date": self._format_relative_date(commit["commit"]["author"]["date"]),
+                "url": commit["html_url"],
+                "github_data": {
+                    "author": commit.get("author", {}),
+                    "committer": commit.get("committer", {}),
+                    "stats": commit.get("stats", {}),
+                    "files": commit.get("files", [])
+                }
+            })
 
-            commits_data = response.json()
-
-            # Transform GitHub API response to our format
-            commits = []
-            for commit in commits_data:
-                commits.append({
-                    "hash": commit["sha"],
-                    "short_hash": commit["sha"][:7],
-                    "message": commit["commit"]["message"],
-                    "author_name": commit["commit"]["author"]["name"],
-                    "author_email": commit["commit"]["author"]["email"],
-                    "date": commit["commit"]["author"]["date"],
-                    "relative_date": self._format_relative_date(commit["commit"]["author"]["date"]),
-                    "url": commit["html_url"],
-                    "github_data": {
-                        "author": commit.get("author", {}),
-                        "committer": commit.get("committer", {}),
-                        "stats": commit.get("stats", {}),
-                        "files": commit.get("files", [])
-                    }
-                })
-
-            return commits
+        return commits
 
     def _format_relative_date(self, iso_date: str) -> str:
         """Format ISO date to relative date string."""
@@ -553,6 +638,9 @@ class GitHubAPIService(BaseGitHubService):
         """
         Commit file changes with associated diagram images to GitHub repository.
 
+        The document and all diagram images land in one commit built with the
+        Git Data API, so a save either applies completely or not at all.
+
         Args:
             access_token: GitHub access token
             owner: Repository owner
@@ -562,7 +650,9 @@ class GitHubAPIService(BaseGitHubService):
             message: Commit message
             branch: Target branch
             diagrams: List of diagram conversion objects
-            sha: Current file SHA (for updates)
+            sha: Blob SHA ``file_path`` had when last pulled; if the file on
+                the branch has another one the commit fails with a 409
+                instead of overwriting the remote edit
             create_branch: Whether to create branch if it doesn't exist
             base_branch: Base branch for new branch creation
             diagram_path: Path in repository for diagram images
@@ -570,111 +660,233 @@ class GitHubAPIService(BaseGitHubService):
         Returns:
             Dict containing commit information and uploaded diagram details
         """
-        async with httpx.AsyncClient() as client:
-            headers = {
-                "Authorization": f"token {access_token}",
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "Markdown-Manager/1.0"
-            }
+        client = http_clients.get(GITHUB)
+        headers = {
+            "Authorization": f"token {access_token}",
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "Markdown-Manager/1.0"
+        }
 
-            uploaded_diagrams = []
-            errors = []
+        uploads = await self._diagrams_to_upload(
+            access_token, owner, repo, branch, diagrams, diagram_path, create_branch
+        )
+        uploaded_diagrams = []
+        files: Dict[str, Tuple[str, str]] = {file_path: (content, "utf-8")}
+        for diagram in uploads:
+            diagram_file_path = f"{diagram_path.rstrip('/')}/{diagram['filename']}"
+            # Convert image data to base64 if it's bytes
+            if isinstance(diagram['image_data'], bytes):
+                image_content = base64.b64encode(diagram['image_data']).decode('utf-8')
+                size = len(diagram['image_data'])
+            else:
+                image_content = diagram['image_data']
+                size = len(diagram['image_data'].encode())
+            files[diagram_file_path] = (image_content, "base64")
+            uploaded_diagrams.append({
+                'filename': diagram['filename'],
+                'path': diagram_file_path,
+                'hash': diagram['hash'],
+                'format': diagram['image_format'],
+                'size': size
+            })
 
-            try:
-                # Create branch if requested
-                if create_branch and base_branch:
-                    await self._create_branch(client, headers, owner, repo, branch, base_branch)
-
-                # Upload diagram images first
-                for diagram in diagrams:
-                    try:
-                        if diagram.get('needs_upload', True):
-                            diagram_file_path = f"{diagram_path.rstrip('/')}/{diagram['filename']}"
-
-                            # Convert image data to base64 if it's bytes
-                            if isinstance(diagram['image_data'], bytes):
-                                image_content = base64.b64encode(diagram['image_data']).decode('utf-8')
-                            else:
-                                image_content = diagram['image_data']
-
-                            # Check if diagram file already exists
-                            existing_sha = await self._get_file_sha(
-                                client, headers, owner, repo, diagram_file_path, branch
-                            )
-
-                            # Upload diagram image
-                            upload_result = await self.create_or_update_file(
-                                access_token, owner, repo, diagram_file_path,
-                                image_content, f"Add diagram image: {diagram['filename']}",
-                                existing_sha, branch, is_binary=True
-                            )
-
-                            # Calculate size
-                            if isinstance(diagram['image_data'], bytes):
-                                size = len(diagram['image_data'])
-                            else:
-                                size = len(diagram['image_data'].encode())
-
-                            uploaded_diagrams.append({
-                                'filename': diagram['filename'],
-                                'path': diagram_file_path,
-                                'hash': diagram['hash'],
-                                'format': diagram['image_format'],
-                                'sha': upload_result.get('content', {}).get('sha'),
-                                'size': size
-                            })
-
-                    except Exception as e:
-                        error_msg = f"Failed to upload diagram {diagram.get('filename', 'unknown')}: {str(e)}"
-                        errors.append(error_msg)
-                        continue
-
-                # Commit the main file
-                main_commit = await self.create_or_update_file(
-                    access_token, owner, repo, file_path, content, message, sha, branch
-                )
+        try:
+            # Create branch if requested
+            if create_branch and base_branch:
+                await self._create_branch(client, headers, owner, repo, branch, base_branch)
 
-                return {
-                    'commit': main_commit,
-                    'uploaded_diagrams': uploaded_diagrams,
-                    'errors': errors,
-                    'success': True,
-                    'diagrams_uploaded': len(uploaded_diagrams),
-                    'total_diagrams': len(diagrams)
-                }
+            commit, blob_shas = await self._commit_tree(
+                client, headers, owner, repo, branch, files, message,
+                expected_shas={file_path: sha} if sha else None
+            )
+        except GitHubFileConflict:
+            raise
+        except Exception as e:
+            return {
+                'commit': None,
+                'uploaded_diagrams': [],
+                'errors': [f"Commit failed: {str(e)}"],
+                'success': False,
+                'diagrams_uploaded': 0,
+                'total_diagrams': len(diagrams)
+            }
 
-            except Exception as e:
-                return {
-                    'commit': None,
-                    'uploaded_diagrams': uploaded_diagrams,
-                    'errors': errors + [f"Main commit failed: {str(e)}"],
-                    'success': False,
-                    'diagrams_uploaded': len(uploaded_diagrams),
-                    'total_diagrams': len(diagrams)
-                }
+        for uploaded in uploaded_diagrams:
+            uploaded['sha'] = blob_shas[uploaded['path']]
+        await diagram_render_cache.record_uploaded(
+            owner, repo, branch, {d['path']: d['sha'] for d in uploaded_diagrams}
+        )
+
+        return {
+            # Same shape as a contents-API PUT response
+            'commit': {
+                'content': {
+                    'name': file_path.split('/')[-1],
+                    'path': file_path,
+                    'sha': blob_shas[file_path]
+                },
+                'commit': commit
+            },
+            'uploaded_diagrams': uploaded_diagrams,
+            'errors': [],
+            'success': True,
+            'diagrams_uploaded': len(uploaded_diagrams),
+            'total_diagrams': len(diagrams)
+        }
 
-    async def _get_file_sha(
+    async def _diagrams_to_upload(
+        self,
+        access_token: str,
+        owner: str,
+        repo: str,
+        branch: str,
+        diagrams: List[Dict[str, Any]],
+        diagram_path: str,
+        create_branch: bool
+    ) -> List[Dict[str, Any]]:
+        """Return the diagrams whose image is not already on ``branch``.
+
+        Diagrams the upload cache marked as committed are checked against the
+        branch tree, since the branch may have been reset or the image removed
+        since they were recorded.  Anything that cannot be confirmed is
+        uploaded.
+        """
+        if create_branch or all(d.get('needs_upload', True) for d in diagrams):
+            return list(diagrams)
+
+        try:
+            blobs, _ = await self.get_tree_blob_shas(access_token, owner, repo, branch)
+        except Exception:
+            return list(diagrams)
+
+        uploads = []
+        for diagram in diagrams:
+            if not diagram.get('needs_upload', True):
+                image_data = diagram['image_data']
+                if isinstance(image_data, str):
+                    image_data = base64.b64decode(image_data)
+                path = f"{diagram_path.rstrip('/')}/{diagram['filename']}"
+                if blobs.get(path) == git_blob_sha(image_data):
+                    diagram_render_cache.record_skipped_upload()
+                    continue
+            uploads.append(diagram)
+        return uploads
+
+    async def _commit_tree(
         self,
         client: httpx.AsyncClient,
         headers: Dict[str, str],
         owner: str,
         repo: str,
-        file_path: str,
-        branch: str
-    ) -> Optional[str]:
-        """Get SHA of existing file, return None if file doesn't exist"""
-        try:
-            response = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}/contents/{file_path}",
-                headers=headers,
-                params={"ref": branch}
+        branch: str,
+        files: Dict[str, Tuple[str, str]],
+        message: str,
+        expected_shas: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Commit several files to ``branch`` as a single commit.
+
+        Blobs are created concurrently, then one tree, one commit and one
+        ref update.  If the branch moved in the meantime the tree and commit
+        are rebuilt on the new head once before giving up.
+
+        Args:
+            files: path -> (content, encoding) with encoding ``utf-8`` or ``base64``
+            expected_shas: path -> blob SHA the file must have on the head
+                being built on; a file that exists with another SHA raises
+                ``GitHubFileConflict``
+
+        Returns:
+            ``(commit data, path -> blob SHA)``
+        """
+        repo_url = f"{self.BASE_URL}/repos/{owner}/{repo}"
+        blob_shas = dict(zip(files, await asyncio.gather(*(
+            self._create_blob(client, headers, repo_url, blob_content, encoding)
+            for blob_content, encoding in files.values()
+        ))))
+        tree_entries = [
+            {"path": path, "mode": "100644", "type": "blob", "sha": blob_sha}
+            for path, blob_sha in blob_shas.items()
+        ]
+
+        for _ in range(2):
+            ref_response = await github_scheduler.request(
+                client, "GET", f"{repo_url}/git/ref/heads/{quote(branch, safe='')}", headers=headers
             )
+            self._raise_for_git_status(ref_response, 200, f"Failed to get branch {branch}")
+            head_sha = ref_response.json()["object"]["sha"]
+            for path, expected_sha in (expected_shas or {}).items():
+                current_sha = await self._file_sha(client, headers, repo_url, path, head_sha)
+                if current_sha is not None and current_sha != expected_sha:
+                    raise GitHubFileConflict(path)
+
+            head_response = await github_response_cache.get(
+                client, f"{repo_url}/git/commits/{head_sha}", headers=headers
+            )
+            self._raise_for_git_status(head_response, 200, "Failed to get head commit")
 
-            if response.status_code == 200:
-                content = response.json()
-                return content.get('sha')
-            else:
-                return None
+            tree_response = await github_scheduler.request(
+                client, "POST", f"{repo_url}/git/trees", headers=headers,
+                json={"base_tree": head_response.json()["tree"]["sha"], "tree": tree_entries}
+            )
+            self._raise_for_git_status(tree_response, 201, "Failed to create tree")
 
-        except Exception:
+            commit_response = await github_scheduler.request(
+                client, "POST", f"{repo_url}/git/commits", headers=headers,
+                json={"message": message, "tree": tree_response.json()["sha"], "parents": [head_sha]}
+            )
+            self._raise_for_git_status(commit_response, 201, "Failed to create commit")
+            commit = commit_response.json()
+
+            update_response = await github_scheduler.request(
+                client, "PATCH", f"{repo_url}/git/refs/heads/{quote(branch, safe='')}", headers=headers,
+                json={"sha": commit["sha"], "force": False}
+            )
+            if update_response.status_code == 422:
+                # Branch advanced since we read it; rebuild on the new head
+                continue
+            self._raise_for_git_status(update_response, 200, f"Failed to update branch {branch}")
+            return commit, blob_shas
+
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Branch {branch} changed during commit")
+
+    async def _file_sha(
+        self,
+        client: httpx.AsyncClient,
+        headers: Dict[str, str],
+        repo_url: str,
+        path: str,
+        ref: str
+    ) -> Optional[str]:
+        """Return the blob SHA of ``path`` at ``ref``, or None if it does not exist."""
+        response = await github_scheduler.request(
+            client, "GET", f"{repo_url}/contents/{quote(path)}", headers=headers, params={"ref": ref}
+        )
+        if response.status_code == 404:
             return None
+        self._raise_for_git_status(response, 200, f"Failed to get {path}")
+        return response.json()["sha"]
+
+    async def _create_blob(
+        self,
+        client: httpx.AsyncClient,
+        headers: Dict[str, str],
+        repo_url: str,
+        blob_content: str,
+        encoding: str
+    ) -> str:
+        """Create a Git blob and return its SHA."""
+        response = await github_scheduler.request(
+            client, "POST", f"{repo_url}/git/blobs", headers=headers,
+            json={"content": blob_content, "encoding": encoding}
+        )
+        self._raise_for_git_status(response, 201, "Failed to create blob")
+        return response.json()["sha"]
+
+    @staticmethod
+    def _raise_for_git_status(response: httpx.Response, expected: int, detail: str) -> None:
+        if response.status_code != expected:
+            try:
+                message = response.json().get("message", "Unknown error")
+            except Exception:
+                message = response.text
+            raise HTTPException(status_code=response.status_code, detail=f"{detail}: {message}")
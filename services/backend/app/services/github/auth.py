@@ -3,10 +3,12 @@ import os
 import time
 from typing import Any, Dict
 
-import httpx
 from fastapi import HTTPException, status
 
+from app.services.http_clients import GITHUB, http_clients
+
 from .base import BaseGitHubService
+from .scheduler import github_scheduler
 
 
 class GitHubAuthService(BaseGitHubService):
@@ -58,45 +60,47 @@ class GitHubAuthService(BaseGitHubService):
 
     async def exchange_code_for_token(self, code: str, state: str) -> Dict[str, Any]:
         """Exchange OAuth code for access token."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://github.com/login/oauth/access_token",
-                data={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "code": code,
-                    "redirect_uri": self.redirect_uri
-                },
-                headers={"Accept": "application/json"}
+        client = http_clients.get(GITHUB)
+        response = await client.post(
+            "https://github.com/login/oauth/access_token",
+            data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "code": code,
+                "redirect_uri": self.redirect_uri
+            },
+            headers={"Accept": "application/json"}
+        )
+
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to exchange code for token"
             )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to exchange code for token"
-                )
-
-            token_data = response.json()
-            if "error" in token_data:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"GitHub OAuth error: {token_data.get('error_description', token_data['error'])}"
-                )
+        token_data = response.json()
+        if "error" in token_data:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"GitHub OAuth error: {token_data.get('error_description', token_data['error'])}"
+            )
 
-            return token_data
+        return token_data
 
     async def validate_token(self, access_token: str) -> bool:
         """Validate if access token is still valid."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.github.com/user",
-                    headers={
-                        "Authorization": f"token {access_token}",
-                        "Accept": "application/vnd.github.v3+json",
-                        "User-Agent": "Markdown-Manager/1.0"
-                    }
-                )
-                return response.status_code == 200
+            client = http_clients.get(GITHUB)
+            response = await github_scheduler.request(
+                client,
+                "GET",
+                "https://api.github.com/user",
+                headers={
+                    "Authorization": f"token {access_token}",
+                    "Accept": "application/vnd.github.v3+json",
+                    "User-Agent": "Markdown-Manager/1.0"
+                }
+            )
+            return response.status_code == 200
         except Exception:
             return False
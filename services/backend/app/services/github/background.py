@@ -1,12 +1,15 @@
 """Background synchronization service for GitHub integration."""
 import asyncio
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from app.configs.settings import settings
 from app.database import AsyncSessionLocal
 from app.models.document import Document
 from app.models.github_models import GitHubRepository
@@ -15,22 +18,39 @@ from app.crud.document import DocumentCRUD
 from app.routers.notifications import create_notification
 
 from .base import BaseGitHubService
+from .scheduler import background_priority
 from .api import GitHubAPIService
 from .sync import GitHubSyncService
 
 logger = logging.getLogger(__name__)
 
+# Paths pushed to a (GitHub repository id, branch); None means every document
+PushedPaths = Dict[Tuple[int, str], Optional[Set[str]]]
+
 
 class GitHubBackgroundService(BaseGitHubService):
-    """Background service for GitHub synchronization."""
+    """Background service for GitHub synchronization.
+
+    Push webhooks queue targeted syncs of the changed paths; the polling loop
+    remains as a reconciliation pass for missed deliveries, and runs far less
+    often once webhooks are configured.
+    """
 
     def __init__(self):
         """Initialize background service."""
         super().__init__()
-        self.sync_interval = 300  # 5 minutes
-        self.max_documents_per_run = 50
+        # 5 minutes, or hourly when push webhooks deliver changes
+        self.sync_interval = 3600 if settings.github_webhook_secret else 300
+        # Scaled with the interval so reconciliation covers as many documents
+        # per hour when webhooks make polling hourly
+        self.max_documents_per_run = 50 * self.sync_interval // 300
+        # Pushes arriving within this window are synced together
+        self.push_debounce_seconds = 2.0
         self.running = False
         self._task = None
+        self._pushes: PushedPaths = {}
+        self._push_event = asyncio.Event()
+        self._push_task = None
         self.document_crud = DocumentCRUD()
 
     async def start(self) -> None:
@@ -49,13 +69,23 @@ class GitHubBackgroundService(BaseGitHubService):
         self.running = False
         if self._task and not self._task.done():
             self._task.cancel()
+        if self._push_task and not self._push_task.done():
+            self._push_task.cancel()
         logger.info("Stopping GitHub background sync service")
 
+    async def shutdown(self) -> None:
+        """Stop the service and wait for its sync tasks to finish cancelling."""
+        self.stop()
+        tasks = [task for task in (self._task, self._push_task) if task]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = self._push_task = None
+
     async def _background_sync_loop(self) -> None:
         """Main background sync loop."""
         while self.running:
             try:
-                await self.sync_documents()
+                with background_priority():
+                    await self.sync_documents()
             except Exception as e:
                 logger.error(f"Background sync error: {e}")
 
@@ -73,29 +103,108 @@ class GitHubBackgroundService(BaseGitHubService):
                     logger.debug("No documents need background sync")
                     return
 
-                logger.info(f"Background sync checking {len(documents_to_check)} documents")
+                documents = documents_to_check[:self.max_documents_per_run]
+                logger.info(f"Background sync checking {len(documents)} documents")
 
-                synced_count = 0
-                error_count = 0
+                stats = await self._sync_documents_by_tree(db, documents)
 
-                for document in documents_to_check[:self.max_documents_per_run]:
-                    try:
-                        success = await self._sync_single_document(db, document)
-                        if success:
-                            synced_count += 1
-                        else:
-                            error_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to sync document {document.id}: {e}")
-                        error_count += 1
-
-                logger.info(f"Background sync completed: {synced_count} synced, {error_count} errors")
+                logger.info(
+                    f"Background sync completed: {stats['synced']} synced, {stats['errors']} errors "
+                    f"({stats['api_calls']} GitHub API calls)"
+                )
                 await db.commit()
 
             except Exception as e:
                 logger.error(f"Background sync failed: {e}")
                 await db.rollback()
 
+    def enqueue_push(self, github_repo_id: int, branch: str, paths: Optional[Iterable[str]]) -> bool:
+        """Queue a targeted sync of ``paths`` pushed to a repository branch.
+
+        ``paths`` of None syncs every document on the branch (e.g. when the
+        push payload does not list all changed files).
+
+        Returns:
+            False if the push was dropped because the service is stopped
+        """
+        if not self.running:
+            return False
+
+        key = (github_repo_id, branch)
+        if paths is None or (key in self._pushes and self._pushes[key] is None):
+            self._pushes[key] = None
+        else:
+            self._pushes.setdefault(key, set()).update(path.strip("/") for path in paths)
+
+        self._push_event.set()
+        if self._push_task is None or self._push_task.done():
+            self._push_task = asyncio.create_task(self._push_sync_loop())
+        return True
+
+    async def _push_sync_loop(self) -> None:
+        """Sync queued pushes, coalescing bursts."""
+        while True:
+            await self._push_event.wait()
+            await asyncio.sleep(self.push_debounce_seconds)
+            self._push_event.clear()
+            pushes, self._pushes = self._pushes, {}
+            try:
+                with background_priority():
+                    await self.sync_pushed_documents(pushes)
+            except Exception as e:
+                logger.error(f"Webhook sync error: {e}")
+
+    async def sync_pushed_documents(self, pushes: PushedPaths) -> Dict[str, int]:
+        """Sync the documents affected by queued pushes."""
+        stats = {"synced": 0, "errors": 0, "api_calls": 0}
+        async with AsyncSessionLocal() as db:
+            try:
+                documents = await self._get_pushed_documents(db, pushes)
+                if not documents:
+                    logger.debug("Push did not touch any linked documents")
+                    return stats
+
+                stats = await self._sync_documents_by_tree(db, documents)
+                logger.info(
+                    f"Webhook sync completed: {stats['synced']} synced, {stats['errors']} errors "
+                    f"({stats['api_calls']} GitHub API calls)"
+                )
+                await db.commit()
+
+            except Exception as e:
+                logger.error(f"Webhook sync failed: {e}")
+                await db.rollback()
+
+        return stats
+
+    async def _get_pushed_documents(self, db: AsyncSession, pushes: PushedPaths) -> List[Document]:
+        """Get GitHub documents on the pushed branches, limited to the pushed paths."""
+        conditions = []
+        for (github_repo_id, branch), paths in pushes.items():
+            branch_matches = Document.github_branch == branch
+            if branch == "main":
+                # Documents without a branch sync against main
+                branch_matches = or_(branch_matches, Document.github_branch.is_(None))
+            condition = and_(GitHubRepository.github_repo_id == github_repo_id, branch_matches)
+            if paths is not None:
+                if not paths:
+                    continue
+                condition = and_(
+                    condition,
+                    Document.github_file_path.in_(paths | {f"/{path}" for path in paths}),
+                )
+            conditions.append(condition)
+
+        if not conditions:
+            return []
+
+        result = await db.execute(
+            select(Document)
+            .join(GitHubRepository, Document.github_repository_id == GitHubRepository.id)
+            .where(or_(*conditions))
+        )
+        return list(result.scalars().all())
+
     async def _get_documents_needing_sync(self, db: AsyncSession) -> List[Document]:
         """Get GitHub documents that need background sync."""
         # Get documents that:
@@ -118,13 +227,129 @@ class GitHubBackgroundService(BaseGitHubService):
         result = await db.execute(query)
         return list(result.scalars().all())
 
-    async def _sync_single_document(self, db: AsyncSession, document: Document) -> bool:
-        """Sync a single GitHub document."""
+    async def _load_repositories(
+        self, db: AsyncSession, repository_ids: Iterable[int]
+    ) -> Dict[int, GitHubRepository]:
+        """Load repositories (with their accounts) in one query."""
+        result = await db.execute(
+            select(GitHubRepository)
+            .options(selectinload(GitHubRepository.account))
+            .where(GitHubRepository.id.in_(set(repository_ids)))
+        )
+        return {repository.id: repository for repository in result.scalars().all()}
+
+    async def _sync_documents_by_tree(self, db: AsyncSession, documents: List[Document]) -> Dict[str, int]:
+        """Sync documents with one tree request per (repository, branch).
+
+        The branch tree gives the current blob SHA of every file, so unchanged
+        documents cost no further requests and only changed blobs are
+        downloaded.
+        """
+        stats = {"synced": 0, "errors": 0, "api_calls": 0}
+        repositories = await self._load_repositories(db, (d.github_repository_id for d in documents))
+
+        groups: Dict[Tuple[int, str], List[Document]] = defaultdict(list)
+        for document in documents:
+            groups[(document.github_repository_id, document.github_branch or "main")].append(document)
+
+        api_service = GitHubAPIService()
+        for (repository_id, branch), group in groups.items():
+            repository = repositories.get(repository_id)
+            access_token = repository.account.access_token if repository and repository.account else None
+            if not access_token:
+                logger.warning(f"Repository {repository_id} has no account or access token; skipping {len(group)} documents")
+                stats["errors"] += len(group)
+                continue
+
+            await self._sync_tree_group(db, api_service, repository, branch, group, stats)
+
+        return stats
+
+    async def _sync_tree_group(
+        self,
+        db: AsyncSession,
+        api_service: GitHubAPIService,
+        repository: GitHubRepository,
+        branch: str,
+        group: List[Document],
+        stats: Dict[str, int],
+    ) -> None:
+        """Sync the documents of one (repository, branch) against its tree.
+
+        The session is committed before each GitHub call, so no database
+        connection is held while the scheduler paces background requests
+        (a wait for the rate-limit reset can last most of an hour).
+        """
+        await db.commit()
+        try:
+            stats["api_calls"] += 1
+            blob_shas, truncated = await api_service.get_tree_blob_shas(
+                repository.account.access_token, repository.repo_owner, repository.repo_name, branch
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get tree for {repository.repo_full_name}@{branch}: {e}")
+            for document in group:
+                await self._mark_sync_failed(
+                    db, document, f"Failed to sync \"{document.name}\" from GitHub: {e}"
+                )
+            stats["errors"] += len(group)
+            return
+
+        for document in group:
+            try:
+                success = await self._sync_tree_document(
+                    db, api_service, repository, branch, document, blob_shas, truncated, stats
+                )
+            except Exception as e:
+                logger.error(f"Error syncing document {document.id}: {e}")
+                await self._mark_sync_failed(db, document, f"Error syncing \"{document.name}\": {e}")
+                success = False
+
+            stats["synced" if success else "errors"] += 1
+            await db.commit()
+
+    async def _sync_tree_document(
+        self,
+        db: AsyncSession,
+        api_service: GitHubAPIService,
+        repository: GitHubRepository,
+        branch: str,
+        document: Document,
+        blob_shas: Dict[str, str],
+        truncated: bool,
+        stats: Dict[str, int],
+    ) -> bool:
+        """Sync one document from its entry in the branch tree."""
+        path = (document.github_file_path or "").strip("/")
+        remote_sha = blob_shas.get(path)
+        if remote_sha is None and truncated:
+            # Not in the truncated listing; fall back to a direct lookup
+            stats["api_calls"] += 1
+            return await self._sync_single_document(db, document, repository)
+        if remote_sha is None:
+            await self._mark_sync_failed(
+                db, document,
+                f"Failed to sync \"{document.name}\" from GitHub: "
+                f"{path} no longer exists on {branch}",
+            )
+            return False
+
+        async def load_content() -> str:
+            stats["api_calls"] += 1
+            return await api_service.get_blob_content(
+                repository.account.access_token, repository.repo_owner, repository.repo_name, remote_sha
+            )
+
+        return await self._apply_remote_version(db, document, remote_sha, load_content)
+
+    async def _sync_single_document(
+        self, db: AsyncSession, document: Document, repository: GitHubRepository | None = None
+    ) -> bool:
+        """Sync a single GitHub document by fetching its file directly."""
         try:
-            # Get repository with account
-            repo_query = select(GitHubRepository).where(GitHubRepository.id == document.github_repository_id)
-            repo_result = await db.execute(repo_query)
-            repository = repo_result.scalar_one_or_none()
+            if repository is None:
+                repositories = await self._load_repositories(db, [document.github_repository_id])
+                repository = repositories.get(document.github_repository_id)
 
             if not repository or not repository.account:
                 logger.warning(f"Document {document.id} has invalid repository or account")
@@ -135,9 +360,6 @@ class GitHubBackgroundService(BaseGitHubService):
                 logger.warning(f"No access token for repository {repository.id}")
                 return False
 
-            # Use GitHubSyncService to check and sync the document
-            sync_service = GitHubSyncService(db)
-
             # Check if remote file has changed
             api_service = GitHubAPIService()
             try:
@@ -151,77 +373,92 @@ class GitHubBackgroundService(BaseGitHubService):
             except Exception as e:
                 logger.warning(f"Failed to get remote content for document {document.id}: {e}")
                 # Mark as error but don't fail the sync
-                document.github_sync_status = "error"
-                document.last_github_sync_at = datetime.utcnow()
-                await create_notification(
-                    db, document.user_id,
-                    "GitHub sync failed",
-                    f"Failed to sync \"{document.name}\" from GitHub: {e}",
-                    category="github",
-                    link=f"/documents/{document.id}",
-                )
+                await self._mark_sync_failed(db, document, f"Failed to sync \"{document.name}\" from GitHub: {e}")
                 return False
 
-            # Check if content has changed
-            if remote_sha == document.github_sha:
-                # No changes, just update sync time
-                document.last_github_sync_at = datetime.utcnow()
-                logger.debug(f"Document {document.id} is up to date")
-                return True
-
-            # Content has changed - check for conflicts
-            if document.github_sync_status == "local_changes":
-                # Local changes exist - this is a conflict
-                document.github_sync_status = "conflict"
-                document.last_github_sync_at = datetime.utcnow()
-                logger.info(f"Document {document.id} has conflict - local changes with remote updates")
-                return True  # Still "successful" in terms of checking
+            async def load_content() -> str:
+                return remote_content
 
-            # No local changes, safe to update
-            success = await sync_service.pull_document_changes(
-                document.id,
-                document.user_id,
-                remote_content,
-                remote_sha
-            )
+            return await self._apply_remote_version(db, document, remote_sha, load_content)
 
-            if success:
-                document.github_sync_status = "synced"
-                document.last_github_sync_at = datetime.utcnow()
-                logger.info(f"Document {document.id} synced successfully")
-                await create_notification(
-                    db, document.user_id,
-                    "GitHub sync completed",
-                    f"\"{document.name}\" synced from GitHub successfully",
-                    category="github",
-                    link=f"/documents/{document.id}",
-                )
-                return True
-            else:
-                document.github_sync_status = "error"
-                document.last_github_sync_at = datetime.utcnow()
-                logger.error(f"Failed to sync document {document.id}")
+        except Exception as e:
+            logger.error(f"Error syncing document {document.id}: {e}")
+            await self._mark_sync_failed(db, document, f"Error syncing \"{document.name}\": {e}")
+            return False
+
+    async def _apply_remote_version(
+        self,
+        db: AsyncSession,
+        document: Document,
+        remote_sha: str,
+        load_content: Callable[[], Awaitable[str]],
+    ) -> bool:
+        """Compare the remote blob SHA with the document and pull if it changed.
+
+        ``load_content`` is only awaited when the document actually needs
+        updating.
+        """
+        # Check if content has changed
+        if remote_sha == document.github_sha:
+            # No changes, just update sync time
+            document.last_github_sync_at = datetime.utcnow()
+            logger.debug(f"Document {document.id} is up to date")
+            return True
+
+        # Content has changed; unresolved conflicts wait for the user
+        if document.github_sync_status == "conflict":
+            document.last_github_sync_at = datetime.utcnow()
+            logger.info(f"Document {document.id} has unresolved conflicts - remote update deferred")
+            return True  # Still "successful" in terms of checking
+
+        # Pull, three-way merging any local changes
+        sync_service = GitHubSyncService()
+        sync_status = await sync_service.pull_document_changes(
+            document.id,
+            document.user_id,
+            await load_content(),
+            remote_sha
+        )
+
+        if sync_status:
+            document.github_sync_status = sync_status
+            document.last_github_sync_at = datetime.utcnow()
+            if sync_status == "conflict":
+                logger.info(f"Document {document.id} has conflict - overlapping local and remote changes")
                 await create_notification(
                     db, document.user_id,
-                    "GitHub sync failed",
-                    f"Failed to pull changes for \"{document.name}\"",
+                    "GitHub sync conflict",
+                    f"\"{document.name}\" has local changes that conflict with GitHub",
                     category="github",
                     link=f"/documents/{document.id}",
                 )
-                return False
+                return True  # Still "successful" in terms of checking
 
-        except Exception as e:
-            logger.error(f"Error syncing document {document.id}: {e}")
-            document.github_sync_status = "error"
-            document.last_github_sync_at = datetime.utcnow()
+            logger.info(f"Document {document.id} synced successfully")
             await create_notification(
                 db, document.user_id,
-                "GitHub sync failed",
-                f"Error syncing \"{document.name}\": {e}",
+                "GitHub sync completed",
+                f"\"{document.name}\" synced from GitHub successfully",
                 category="github",
                 link=f"/documents/{document.id}",
             )
-            return False
+            return True
+
+        logger.error(f"Failed to sync document {document.id}")
+        await self._mark_sync_failed(db, document, f"Failed to pull changes for \"{document.name}\"")
+        return False
+
+    async def _mark_sync_failed(self, db: AsyncSession, document: Document, message: str) -> None:
+        """Record a failed sync on the document and notify its owner."""
+        document.github_sync_status = "error"
+        document.last_github_sync_at = datetime.utcnow()
+        await create_notification(
+            db, document.user_id,
+            "GitHub sync failed",
+            message,
+            category="github",
+            link=f"/documents/{document.id}",
+        )
 
     async def sync_specific_document(self, document_id: int) -> bool:
         """Sync a specific document immediately."""
@@ -262,16 +499,9 @@ class GitHubBackgroundService(BaseGitHubService):
 
                 stats["checked"] = len(documents)
 
-                for document in documents:
-                    try:
-                        success = await self._sync_single_document(db, document)
-                        if success:
-                            stats["updated"] += 1
-                        else:
-                            stats["errors"] += 1
-                    except Exception as e:
-                        logger.error(f"Failed to sync document {document.id}: {e}")
-                        stats["errors"] += 1
+                tree_stats = await self._sync_documents_by_tree(db, documents)
+                stats["updated"] = tree_stats["synced"]
+                stats["errors"] = tree_stats["errors"]
 
                 await db.commit()
                 logger.info(f"Force sync completed: {stats}")
@@ -289,7 +519,9 @@ class GitHubBackgroundService(BaseGitHubService):
             "running": self.running,
             "sync_interval": self.sync_interval,
             "max_documents_per_run": self.max_documents_per_run,
-            "task_running": self._task is not None and not self._task.done()
+            "task_running": self._task is not None and not self._task.done(),
+            "webhooks_enabled": bool(settings.github_webhook_secret),
+            "queued_pushes": len(self._pushes)
         }
 
 
@@ -1,10 +1,12 @@
 """GitHub API caching and rate limiting service."""
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException, status
 
 from .base import BaseGitHubService
+from .response_cache import github_response_cache
 
 
 class GitHubCacheService(BaseGitHubService):
@@ -34,7 +36,7 @@ class GitHubCacheService(BaseGitHubService):
         """Get cached data."""
         if key in self._cache:
             entry = self._cache[key]
-            if datetime.utcnow() < datetime.fromisoformat(entry['expires']):
+            if time.time() < entry['expires_at']:
                 self._stats['hits'] += 1
                 return entry['data']
             else:
@@ -46,10 +48,9 @@ class GitHubCacheService(BaseGitHubService):
 
     async def set_cached(self, key: str, data: Any, ttl: int = 300) -> None:
         """Set cached data."""
-        expires = (datetime.utcnow().timestamp() + ttl)
         self._cache[key] = {
             'data': data,
-            'expires': datetime.fromtimestamp(expires).isoformat()
+            'expires_at': time.time() + ttl
         }
         self._stats['sets'] += 1
 
@@ -264,12 +265,12 @@ class GitHubCacheService(BaseGitHubService):
 
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        current_time = datetime.utcnow()
+        current_time = time.time()
         active_keys = 0
         expired_keys = 0
         
         for key, entry in self._cache.items():
-            if current_time < datetime.fromisoformat(entry['expires']):
+            if current_time < entry['expires_at']:
                 active_keys += 1
             else:
                 expired_keys += 1
@@ -289,7 +290,8 @@ class GitHubCacheService(BaseGitHubService):
             "hits": self._stats['hits'],
             "misses": self._stats['misses'],
             "sets": self._stats['sets'],
-            "hit_rate": hit_rate
+            "hit_rate": hit_rate,
+            "conditional_requests": github_response_cache.get_stats()
         }
 
     async def clear_all_cache(self) -> bool:
@@ -6,14 +6,17 @@ converts them to GitHub-compatible format using static images with collapsible s
 """
 
 import re
+import asyncio
 import hashlib
 import base64
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
-import httpx
 
 from app.configs.settings import get_settings
+from app.services.http_clients import EXPORT, http_clients
+
+from .diagram_cache import diagram_render_cache, git_blob_sha
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -57,7 +60,8 @@ class GitHubDiagramConversionService:
 
     def __init__(self, export_service_url: str = "http://export:8001"):
         self.export_service_url = export_service_url
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Shared export-service pool; owned by the app lifespan, not this service
+        self.client = http_clients.get(EXPORT)
 
         # Patterns for detecting advanced diagrams
         self.advanced_patterns = [
@@ -67,8 +71,8 @@ class GitHubDiagramConversionService:
             r'classDef\s+\w+\s+.*icon:',  # Class definitions with icons
         ]
 
-        # Compile regex patterns for performance
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.advanced_patterns]
+        # One alternation scans each diagram once instead of once per pattern
+        self.advanced_regex = re.compile('|'.join(f'(?:{p})' for p in self.advanced_patterns), re.IGNORECASE)
 
     async def convert_document(
         self,
@@ -126,19 +130,13 @@ class GitHubDiagramConversionService:
             if rendered_diagrams:
                 logger.info(f"Processing {len(rendered_diagrams)} pre-rendered diagrams from frontend")
 
+                converted = await self._convert_rendered(
+                    rendered_diagrams, errors, repository_path, repository_owner, repository_name, branch
+                )
+
                 # Process each rendered diagram
-                for rendered in rendered_diagrams:
+                for rendered, conversion in converted:
                     try:
-                        # Convert SVG to PNG
-                        conversion = await self._convert_svg_to_png(
-                            rendered['diagram_code'],
-                            rendered['svg_content'],
-                            repository_path,
-                            repository_owner,
-                            repository_name,
-                            branch
-                        )
-
                         if conversion:
                             diagrams.append(conversion)
 
@@ -215,12 +213,55 @@ class GitHubDiagramConversionService:
 
     def _is_advanced_diagram(self, diagram_code: str) -> bool:
         """Check if diagram uses advanced features not supported by GitHub"""
-        for pattern in self.compiled_patterns:
-            if pattern.search(diagram_code):
-                logger.debug(f"Advanced feature detected: {pattern.pattern}")
-                return True
+        match = self.advanced_regex.search(diagram_code)
+        if match:
+            logger.debug(f"Advanced feature detected: {match.group(0)}")
+            return True
         return False
 
+    async def _convert_rendered(
+        self,
+        rendered_diagrams: List[Dict[str, str]],
+        errors: List[str],
+        repository_path: str,
+        repository_owner: str,
+        repository_name: str,
+        branch: str
+    ) -> List[Tuple[Dict[str, str], Optional[DiagramConversion]]]:
+        """Convert pre-rendered SVGs concurrently and pair each with its result.
+
+        Cached renders skip the export service.  Conversions that raised are
+        reported in ``errors`` and left out.  Images the upload cache lists
+        for the branch get ``needs_upload`` cleared; the commit path confirms
+        them against the branch tree before skipping the upload.
+        """
+        conversions = await asyncio.gather(*(
+            self._convert_svg_to_png(
+                rendered['diagram_code'],
+                rendered['svg_content'],
+                repository_path,
+                repository_owner,
+                repository_name,
+                branch
+            )
+            for rendered in rendered_diagrams
+        ), return_exceptions=True)
+
+        uploaded = await diagram_render_cache.get_uploaded(repository_owner, repository_name, branch)
+        converted = []
+        for rendered, conversion in zip(rendered_diagrams, conversions):
+            if isinstance(conversion, Exception):
+                error_msg = f"Error converting provided diagram: {str(conversion)}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+                continue
+            if conversion:
+                image_path = f"{repository_path.rstrip('/')}/{conversion.filename}"
+                if uploaded.get(image_path) == git_blob_sha(conversion.image_data):
+                    conversion.needs_upload = False
+            converted.append((rendered, conversion))
+        return converted
+
     async def _convert_svg_to_png(
         self,
         diagram_code: str,
@@ -236,25 +277,31 @@ class GitHubDiagramConversionService:
             diagram_hash = hashlib.sha256(diagram_code.encode()).hexdigest()[:12]
             filename = f"diagram_{diagram_hash}.png"
 
-            # Convert SVG to PNG using export service
-            endpoint = f"{self.export_service_url}/diagram/png"
-            payload = {
-                "svg_content": svg_content,
-                "transparent_background": True
-            }
-            logger.debug(f"Converting SVG to PNG using: {endpoint}")
+            image_data = await diagram_render_cache.get_render(svg_content)
+            if image_data:
+                logger.debug(f"Using cached render for diagram {diagram_hash}")
+            else:
+                # Convert SVG to PNG using export service
+                endpoint = f"{self.export_service_url}/diagram/png"
+                payload = {
+                    "svg_content": svg_content,
+                    "transparent_background": True
+                }
+                logger.debug(f"Converting SVG to PNG using: {endpoint}")
 
-            response = await self.client.post(endpoint, json=payload)
-            if response.status_code != 200:
-                logger.error(f"Export service error: {response.status_code} - {response.text}")
-                return None
+                response = await self.client.post(endpoint, json=payload)
+                if response.status_code != 200:
+                    logger.error(f"Export service error: {response.status_code} - {response.text}")
+                    return None
 
-            result = response.json()
-            image_data = base64.b64decode(result.get('image_data', ''))
+                result = response.json()
+                image_data = base64.b64decode(result.get('image_data', ''))
 
-            if not image_data:
-                logger.error("No image data received from export service")
-                return None
+                if not image_data:
+                    logger.error("No image data received from export service")
+                    return None
+
+                await diagram_render_cache.set_render(svg_content, image_data)
 
             return DiagramConversion(
                 filename=filename,
@@ -427,8 +474,7 @@ class GitHubDiagramConversionService:
         return before + conversion.converted_markdown + after
 
     async def cleanup(self):
-        """Cleanup resources"""
-        await self.client.aclose()
+        """Cleanup resources (the shared HTTP client is closed at shutdown)"""
 
 
 # Factory function for dependency injection
@@ -0,0 +1,131 @@
+"""Content-addressed cache for diagrams converted on GitHub save.
+
+Saving a document with advanced Mermaid diagrams used to send every
+diagram's SVG through the export service and upload the resulting PNG again,
+even when only the surrounding text changed.  ``DiagramRenderCache`` keeps
+two things in Redis:
+
+* Rendered PNG bytes keyed by the SHA-256 of the SVG sent for rendering.
+  The frontend renders the SVG with the user's theme, so the SVG hash covers
+  both diagram source and theme.  The per-render element id Mermaid embeds
+  (``mermaid-<timestamp>-<random>``) is normalized first, otherwise every
+  render of the same diagram would hash differently.
+* Per repository and branch, the Git blob SHA of each diagram image last
+  committed.  The commit path confirms these against the branch tree before
+  skipping an upload, so a reset branch or deleted image is uploaded again.
+
+Redis being unavailable only means diagrams are rendered and uploaded as
+before.
+"""
+import base64
+import hashlib
+import logging
+import re
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from app.services.redis_pool import CONNECTION_ERRORS, redis_pool
+
+logger = logging.getLogger(__name__)
+
+_RENDER_PREFIX = "github:diagram:png:v2:"
+_UPLOADED_PREFIX = "github:diagram:uploaded:v1:"
+_TTL_SECONDS = 30 * 24 * 3600
+# Larger renders are not worth keeping in Redis
+_MAX_IMAGE_BYTES = 2 * 1024 * 1024
+# Element id passed to mermaid.render() by the frontend renderer
+_RENDER_ID_PATTERN = re.compile(r"mermaid-\d+-[a-z0-9]+")
+
+
+def git_blob_sha(data: bytes) -> str:
+    """Return the SHA-1 Git assigns to a blob with ``data`` as content."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class DiagramRenderCache:
+    """Redis-backed render and upload cache for GitHub diagram conversion."""
+
+    def __init__(self):
+        self._stats: Counter[str] = Counter()
+
+    @staticmethod
+    def render_key(svg_content: str) -> str:
+        normalized = _RENDER_ID_PATTERN.sub("mermaid-render", svg_content)
+        return _RENDER_PREFIX + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _uploaded_key(owner: str, repo: str, branch: str) -> str:
+        return f"{_UPLOADED_PREFIX}{owner}/{repo}@{branch}"
+
+    async def get_render(self, svg_content: str) -> Optional[bytes]:
+        """Return cached PNG bytes for ``svg_content``, if any."""
+        r = await redis_pool.get()
+        if r is None:
+            return None
+        try:
+            cached = await r.get(self.render_key(svg_content))
+        except CONNECTION_ERRORS as exc:
+            logger.debug("Diagram render cache read failed", exc_info=True)
+            redis_pool.mark_failed(exc)
+            return None
+        except Exception:
+            logger.debug("Diagram render cache read rejected", exc_info=True)
+            return None
+        self._stats["render_hits" if cached else "render_misses"] += 1
+        return base64.b64decode(cached) if cached else None
+
+    async def set_render(self, svg_content: str, image_data: bytes) -> None:
+        """Store PNG bytes rendered from ``svg_content``."""
+        if len(image_data) > _MAX_IMAGE_BYTES:
+            return
+        r = await redis_pool.get()
+        if r is None:
+            return
+        try:
+            await r.set(
+                self.render_key(svg_content),
+                base64.b64encode(image_data).decode("ascii"),
+                ex=_TTL_SECONDS,
+            )
+        except CONNECTION_ERRORS as exc:
+            logger.debug("Diagram render cache write failed", exc_info=True)
+            redis_pool.mark_failed(exc)
+        except Exception:
+            logger.debug("Diagram render cache write rejected", exc_info=True)
+
+    async def get_uploaded(self, owner: str, repo: str, branch: str) -> Dict[str, str]:
+        """Return ``path -> blob SHA`` of diagrams already committed to the branch."""
+        if not (owner and repo):
+            return {}
+        r = await redis_pool.get()
+        if r is None:
+            return {}
+        try:
+            return await r.hgetall(self._uploaded_key(owner, repo, branch)) or {}
+        except CONNECTION_ERRORS as exc:
+            logger.debug("Diagram upload cache read failed", exc_info=True)
+            redis_pool.mark_failed(exc)
+            return {}
+        except Exception:
+            logger.debug("Diagram upload cache read rejected", exc_info=True)
+            return {}
+
+    async def record_uploaded(self, owner: str, repo: str, branch: str, blob_shas: Dict[str, str]) -> None:
+        """Remember the blob SHAs of diagram images just committed to the branch."""
+        if not blob_shas:
+            return
+        key = self._uploaded_key(owner, repo, branch)
+        await redis_pool.pipeline(
+            lambda pipe: (pipe.hset(key, mapping=blob_shas), pipe.expire(key, _TTL_SECONDS))
+        )
+
+    def record_skipped_upload(self) -> None:
+        self._stats["uploads_skipped"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache counters for this worker."""
+        return dict(self._stats)
+
+
+# Module-level singleton shared by conversion and commit paths
+diagram_render_cache = DiagramRenderCache()
@@ -12,10 +12,17 @@ from typing import Any, Dict, List, Optional, Tuple
 import logging
 
 from app.configs.settings import settings
+from app.services.storage.usage import storage_usage
 from .base import BaseGitHubService
 
 logger = logging.getLogger(__name__)
 
+# Non-cone sparse-checkout patterns: markdown anywhere, plus common top-level docs
+SPARSE_CHECKOUT_PATTERNS = [
+    "*.md", "*.markdown", "*.mdown", "*.mkd", "*.mkdn",
+    "/README*", "/LICENSE*", "/CHANGELOG*", "/.gitignore",
+]
+
 
 class GitHubFilesystemService(BaseGitHubService):
     """
@@ -84,6 +91,10 @@ class GitHubFilesystemService(BaseGitHubService):
         """
         Clone a GitHub repository with optimizations for markdown-focused system.
 
+        Uses a shallow, blobless partial clone with a sparse checkout of
+        markdown files, so only the blobs of checked-out markdown files are
+        downloaded and nothing has to be deleted afterwards.
+
         Args:
             repo_url: URL of the repository to clone
             target_path: Local path where repository should be cloned
@@ -96,10 +107,12 @@ class GitHubFilesystemService(BaseGitHubService):
             # Create parent directory if it doesn't exist
             target_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Build clone command with shallow clone (depth 1) for efficiency
+            # Shallow partial clone: commits and trees only, blobs on demand
             clone_cmd = [
                 "clone",
                 "--depth", "1",  # Always use shallow clone with depth 1
+                "--filter=blob:none",  # Fetch file contents lazily
+                "--no-checkout",  # Check out after sparse patterns are set
                 "--single-branch",
                 "--no-tags"  # Skip tags to save space
             ]
@@ -119,65 +132,40 @@ class GitHubFilesystemService(BaseGitHubService):
 
             stdout, stderr = await process.communicate()
 
-            if process.returncode == 0:
-                # Ensure working directory is in sync with git index
-                reset_success, _, reset_error = await self._run_git_command(
-                    target_path,
-                    ["reset", "--hard", "HEAD"]
-                )
-
-                if not reset_success:
-                    logger.warning(f"Git reset failed after clone: {reset_error}")
-
-                logger.info(f"Successfully cloned repository to {target_path} (shallow clone depth 1)")
-                return True
-            else:
+            if process.returncode != 0:
                 logger.error(f"Failed to clone repository: {stderr.decode()}")
                 return False
 
-        except Exception as e:
-            logger.error(f"Failed to clone repository from {repo_url}: {e}")
-            return False
+            # Restrict the working tree to markdown and a few top-level docs
+            success, _, error = await self._run_git_command(
+                target_path,
+                ["sparse-checkout", "set", "--no-cone", *SPARSE_CHECKOUT_PATTERNS]
+            )
+            if not success:
+                logger.error(f"Failed to configure sparse checkout: {error}")
+                return False
 
-    async def _cleanup_non_markdown_files(self, repo_path: Path) -> None:
-        """
-        Remove non-markdown files to save storage space.
+            # Populate the working tree; fetches only the matching blobs
+            success, _, error = await self._run_git_command(target_path, ["checkout"])
+            if not success:
+                logger.error(f"Failed to check out cloned repository: {error}")
+                return False
 
-        Args:
-            repo_path: Path to the cloned repository
-        """
-        try:
-            markdown_extensions = {'.md', '.markdown', '.mdown', '.mkd', '.mkdn'}
-            keep_files = {'README', 'LICENSE', 'CHANGELOG', '.gitignore'}
-
-            for file_path in repo_path.rglob('*'):
-                if file_path.is_file():
-                    # Keep markdown files
-                    if file_path.suffix.lower() in markdown_extensions:
-                        continue
-
-                    # Keep important non-markdown files
-                    if file_path.name in keep_files or file_path.name.upper() in keep_files:
-                        continue
-
-                    # Keep .git directory
-                    if '.git' in file_path.parts:
-                        continue
-
-                    # Remove everything else
-                    try:
-                        file_path.unlink()
-                        logger.debug(f"Removed non-markdown file: {file_path}")
-                    except Exception as e:
-                        logger.warning(f"Failed to remove file {file_path}: {e}")
+            await storage_usage.add(target_path)
+            logger.info(f"Successfully cloned repository to {target_path} (sparse, blobless, depth 1)")
+            return True
 
         except Exception as e:
-            logger.error(f"Failed to cleanup non-markdown files in {repo_path}: {e}")
+            logger.error(f"Failed to clone repository from {repo_url}: {e}")
+            return False
 
     async def get_repository_size(self, repo_path: Path) -> int:
         """
         Get the total size of a repository in bytes.
 
+        Served from the storage usage tracker; the repository is only scanned
+        the first time it is asked for.
+
         Args:
             repo_path: Path to the repository
 
@@ -188,12 +176,7 @@ class GitHubFilesystemService(BaseGitHubService):
             if not repo_path.exists():
                 return 0
 
-            total_size = 0
-            for file_path in repo_path.rglob('*'):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-
-            return total_size
+            return (await storage_usage.get(repo_path)).size_bytes
 
         except Exception as e:
             logger.error(f"Failed to calculate size for {repo_path}: {e}")
@@ -214,17 +197,11 @@ class GitHubFilesystemService(BaseGitHubService):
             if not github_dir.exists():
                 return True, {"total_size_mb": 0, "repo_count": 0}
 
-            total_size = 0
-            repo_count = 0
-
-            # Calculate total size across all GitHub repositories
-            for owner_dir in github_dir.iterdir():
-                if owner_dir.is_dir():
-                    for repo_dir in owner_dir.iterdir():
-                        if repo_dir.is_dir():
-                            repo_size = await self.get_repository_size(repo_dir)
-                            total_size += repo_size
-                            repo_count += 1
+            # Cached totals across all GitHub repositories, kept current on
+            # clone/pull/prune
+            usage = await storage_usage.get(github_dir)
+            total_size = usage.size_bytes
+            repo_count = len(usage.git_repositories)
 
             total_size_mb = total_size / (1024 * 1024)
             limit_gb = settings.github_total_storage_limit_gb
@@ -281,6 +258,7 @@ class GitHubFilesystemService(BaseGitHubService):
 
                                 # Remove the repository
                                 shutil.rmtree(repo_dir)
+                                storage_usage.forget(repo_dir)
 
                                 pruned_repos.append({
                                     "path": f"{owner_dir.name}/{repo_dir.name}",
@@ -348,16 +326,39 @@ class GitHubFilesystemService(BaseGitHubService):
                 logger.error(f"Not a git repository: {repo_path}")
                 return False
 
-            # Checkout branch if specified
-            if branch:
-                success, _, stderr = await self._run_git_command(repo_path, ["checkout", branch])
-                if not success:
-                    logger.warning(f"Failed to checkout branch {branch}: {stderr}")
+            if not branch:
+                success, current, _ = await self._run_git_command(repo_path, ["branch", "--show-current"])
+                branch = current.strip() if success else ""
+            if not branch:
+                logger.error(f"Cannot determine branch to pull for {repo_path}")
+                return False
+
+            # Fetch only commits newer than what we have, without blobs (also
+            # for clones made before the partial-clone filter); blobs arrive
+            # for the files the merge checks out.  No --depth: the merge needs
+            # the common ancestor, which a depth-limited fetch would cut off.
+            success, _, stderr = await self._run_git_command(
+                repo_path,
+                [
+                    "fetch", "--no-tags", "--filter=blob:none", "origin",
+                    f"+refs/heads/{branch}:refs/remotes/origin/{branch}",
+                ]
+            )
+            if not success:
+                logger.error(f"Failed to fetch changes: {stderr}")
+                return False
+
+            # Checkout branch (creates a tracking branch the first time)
+            success, _, stderr = await self._run_git_command(repo_path, ["checkout", branch])
+            if not success:
+                logger.warning(f"Failed to checkout branch {branch}: {stderr}")
 
-            # Pull changes
-            success, stdout, stderr = await self._run_git_command(repo_path, ["pull"])
+            success, stdout, stderr = await self._run_git_command(
+                repo_path, ["merge", "--no-edit", "--no-stat", f"refs/remotes/origin/{branch}"]
+            )
 
             if success:
+                await storage_usage.refresh(repo_path)
                 logger.info(f"Successfully pulled changes for {repo_path}")
                 return True
             else:
@@ -602,6 +603,7 @@ class GitHubFilesystemService(BaseGitHubService):
             # Remove existing repository if it exists
             if target_path.exists():
                 shutil.rmtree(target_path)
+                storage_usage.forget(target_path)
 
             success = await self.clone_repository(repo_url, target_path, branch)
 
@@ -1,11 +1,13 @@
 """Enhanced GitHub service for handling folder structure import and sync."""
+import asyncio
 import hashlib
+import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 
 from app.crud.document import DocumentCRUD
@@ -14,6 +16,12 @@ from app.models.document import Document
 
 from .base import BaseGitHubService
 
+logger = logging.getLogger(__name__)
+
+# Blob downloads and file writes in flight per import
+IMPORT_CONCURRENCY = 16
+MARKDOWN_EXTENSIONS = ('.md', '.markdown')
+
 
 class GitHubImportService(BaseGitHubService):
     """Service for importing GitHub repository files with proper folder structure."""
@@ -150,32 +158,216 @@ class GitHubImportService(BaseGitHubService):
 
         return results
 
-    async def sync_repository_structure(
+    async def import_repository_tree(
         self,
         user_id: int,
         repository: GitHubRepository,
         access_token: str,
-        branch: str = "main"
+        branch: str = "main",
+        file_paths: Optional[List[str]] = None
     ) -> Dict[str, Any]:
-        """Sync entire repository structure, updating folder paths for existing documents."""
+        """Import markdown files from one tree listing in a single transaction.
+
+        The branch tree is listed once, unchanged files (same blob SHA) are
+        skipped, changed blobs are downloaded concurrently, and all document
+        rows are upserted in one statement.  Files are written to storage
+        only once that commit succeeded, so a failed import leaves no
+        orphaned files.  ``file_paths`` restricts the import to those paths.
+        """
         from .api import GitHubAPIService
         api_service = GitHubAPIService()
 
-        try:
-            # Get all files from GitHub
-            github_files = await api_service.get_repository_contents(
-                access_token,
-                repository.repo_owner,
-                repository.repo_name,
-                path="",
-                ref=branch
+        results: Dict[str, Any] = {
+            'imported': [],
+            'updated': [],
+            'errors': [],
+            'skipped': []
+        }
+
+        blobs = await self._list_import_blobs(api_service, access_token, repository, branch, file_paths, results)
+
+        existing = {
+            doc.github_file_path: doc
+            for doc in await self.document_crud.get_github_documents_by_repo_branch(
+                self.db_session, user_id, repository.id, branch
             )
+        }
+
+        changed = []
+        for path, sha in blobs.items():
+            doc = existing.get(path)
+            if doc is not None and doc.github_sha == sha and doc.github_sync_status == 'synced':
+                results['skipped'].append({'file_path': path, 'document_id': doc.id})
+            else:
+                changed.append((path, sha))
+
+        rows, contents = await self._fetch_changed_blobs(
+            api_service, user_id, repository, access_token, branch, changed, existing, results
+        )
+        document_ids, rejected = await self.document_crud.upsert_github_documents(self.db_session, rows)
+        for row in rejected:
+            results['errors'].append({
+                'file_path': row['github_file_path'],
+                'error': f"A document named {row['name']} already exists in {row['folder_path']}"
+            })
+        await self.db_session.commit()
+
+        rows = [row for row in rows if row['github_file_path'] in document_ids]
+        rows = await self._write_imported_files(user_id, rows, contents, document_ids, results)
+
+        for row in rows:
+            path = row['github_file_path']
+            bucket = 'updated' if path in existing else 'imported'
+            results[bucket].append({'file_path': path, 'document_id': document_ids.get(path)})
+
+        logger.info(
+            "Imported %s/%s: %d new, %d updated, %d unchanged, %d errors",
+            repository.repo_full_name, branch, len(results['imported']),
+            len(results['updated']), len(results['skipped']), len(results['errors'])
+        )
+        return results
+
+    async def _list_import_blobs(
+        self,
+        api_service,
+        access_token: str,
+        repository: GitHubRepository,
+        branch: str,
+        file_paths: Optional[List[str]],
+        results: Dict[str, Any],
+    ) -> Dict[str, str]:
+        """Return ``{path: blob sha}`` of the files to import from one tree listing.
+
+        Requested paths missing from the branch are recorded in
+        ``results['errors']``.
+        """
+        blobs, truncated = await api_service.get_tree_blob_shas(
+            access_token, repository.repo_owner, repository.repo_name, branch
+        )
+        if truncated:
+            # Very large trees are truncated; walk the contents API instead
+            contents = await api_service.get_repository_contents(
+                access_token, repository.repo_owner, repository.repo_name, path="", ref=branch
+            )
+            files = await self._flatten_repository_files(contents, access_token, repository, branch)
+            blobs = {f['path']: f['sha'] for f in files}
+
+        if file_paths is None:
+            return {path: sha for path, sha in blobs.items() if path.lower().endswith(MARKDOWN_EXTENSIONS)}
 
-            # Filter for markdown files and flatten the structure
-            markdown_files = await self._flatten_repository_files(
-                github_files, access_token, repository, branch
+        wanted = set(file_paths)
+        for missing in sorted(wanted - blobs.keys()):
+            results['errors'].append({'file_path': missing, 'error': 'File not found in repository'})
+        return {path: sha for path, sha in blobs.items() if path in wanted}
+
+    async def _fetch_changed_blobs(
+        self,
+        api_service,
+        user_id: int,
+        repository: GitHubRepository,
+        access_token: str,
+        branch: str,
+        changed: List[Tuple[str, str]],
+        existing: Dict[str, Document],
+        results: Dict[str, Any],
+    ) -> Tuple[List[dict], Dict[str, str]]:
+        """Download changed blobs concurrently.
+
+        Failures are recorded in ``results['errors']`` and left out.
+
+        Returns:
+            (document rows, github_file_path -> content)
+        """
+        semaphore = asyncio.Semaphore(IMPORT_CONCURRENCY)
+        now = datetime.utcnow()
+        contents: Dict[str, str] = {}
+
+        async def fetch(path: str, sha: str) -> Optional[dict]:
+            async with semaphore:
+                try:
+                    content = await api_service.get_blob_content(
+                        access_token, repository.repo_owner, repository.repo_name, sha
+                    )
+                except Exception as e:
+                    results['errors'].append({'file_path': path, 'error': str(e)})
+                    return None
+
+            contents[path] = content
+            doc = existing.get(path)
+            return {
+                'name': path.split('/')[-1],
+                'user_id': user_id,
+                'folder_path': Document.normalize_folder_path(
+                    repository.get_file_folder_path(path, branch)
+                ),
+                'file_path': (
+                    doc.file_path if doc is not None and doc.file_path
+                    else f"github/{repository.account_id}/{repository.repo_name}/{path}"
+                ),
+                'repository_type': 'github',
+                'is_shared': False,
+                'github_repository_id': repository.id,
+                'github_file_path': path,
+                'github_branch': branch,
+                'github_sha': sha,
+                'local_sha': self._generate_content_hash(content),
+                'github_sync_status': 'synced',
+                'last_github_sync_at': now,
+            }
+
+        rows = await asyncio.gather(*(fetch(p, s) for p, s in changed))
+        return [row for row in rows if row is not None], contents
+
+    async def _write_imported_files(
+        self,
+        user_id: int,
+        rows: List[dict],
+        contents: Dict[str, str],
+        document_ids: Dict[str, int],
+        results: Dict[str, Any],
+    ) -> List[dict]:
+        """Write committed documents to storage concurrently; returns the rows written.
+
+        A failed write is recorded in ``results['errors']`` and its document
+        marked ``error`` so the next import fetches it again.
+        """
+        from app.services.storage.user import UserStorage
+        user_storage_service = UserStorage()
+        semaphore = asyncio.Semaphore(IMPORT_CONCURRENCY)
+
+        async def write(row: dict) -> bool:
+            path = row['github_file_path']
+            async with semaphore:
+                try:
+                    # Content mirrors the remote blob, so no local commit per file
+                    if await user_storage_service.write_document(
+                        user_id, row['file_path'], contents[path], auto_commit=False
+                    ):
+                        return True
+                    error = "Failed to write file to storage"
+                except Exception as e:
+                    error = str(e)
+            results['errors'].append({'file_path': path, 'error': error})
+            return False
+
+        written = await asyncio.gather(*(write(row) for row in rows))
+        failed = [document_ids[row['github_file_path']] for row, ok in zip(rows, written) if not ok]
+        if failed:
+            await self.db_session.execute(
+                update(Document).where(Document.id.in_(failed)).values(github_sync_status='error')
             )
+            await self.db_session.commit()
+        return [row for row, ok in zip(rows, written) if ok]
 
+    async def sync_repository_structure(
+        self,
+        user_id: int,
+        repository: GitHubRepository,
+        access_token: str,
+        branch: str = "main"
+    ) -> Dict[str, Any]:
+        """Sync entire repository structure, updating folder paths for existing documents."""
+        try:
             # Get existing documents for this repository/branch
             existing_docs = await self.document_crud.get_github_documents_by_repo_branch(
                 self.db_session, user_id, repository.id, branch
@@ -190,15 +382,17 @@ class GitHubImportService(BaseGitHubService):
                         doc.folder_path = new_folder_path
                         updated_paths += 1
 
-            await self.db_session.commit()
-
-            # Import/update files
-            import_results = await self.import_repository_batch(
-                user_id, repository, access_token, markdown_files, branch
+            # Import/update files; commits the folder path updates too
+            import_results = await self.import_repository_tree(
+                user_id, repository, access_token, branch
             )
 
             # Cleanup orphaned documents
-            current_file_paths = [f['path'] for f in markdown_files]
+            current_file_paths = [
+                entry['file_path']
+                for key in ('imported', 'updated', 'skipped', 'errors')
+                for entry in import_results[key]
+            ]
             orphaned_count = await self.document_crud.cleanup_orphaned_github_documents(
                 self.db_session, user_id, repository.id, branch, current_file_paths
             )
@@ -0,0 +1,340 @@
+"""Line-level three-way merge for GitHub sync.
+
+``merge3`` merges local and remote edits of a document against the version
+both started from (the last synced blob), the way ``git merge-file`` does:
+
+* Lines are interned to integers so comparisons are hash lookups, and lines
+  that do not occur in the other version are set aside before diffing; they
+  can never match, and dropping them keeps mostly rewritten files cheap.
+* The remaining lines are diffed with Myers' O(ND) algorithm using the
+  linear-space middle-snake recursion.  Beyond a cost limit, the search
+  splits at the furthest-reaching path instead of insisting on a minimal
+  diff, as xdiff does.
+* Changes from both sides are grouped into regions of overlapping or
+  adjacent base lines.  A region changed on one side, or identically on both,
+  merges cleanly.  Otherwise the common leading and trailing lines of the two
+  versions are moved out of the region, and only the rest is wrapped in
+  conflict markers.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Minimum number of edit steps explored before the diff settles for a
+# non-minimal split (xdiff's XDL_MAX_COST_MIN)
+_MIN_MAX_COST = 256
+
+# (base_start, base_end, other_start, other_end) of one changed range
+Hunk = Tuple[int, int, int, int]
+
+
+@dataclass
+class MergeConflict:
+    """One conflicting region of a merge."""
+
+    # 1-based line of the opening conflict marker in the merged content
+    line: int
+    base: List[str]
+    local: List[str]
+    remote: List[str]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "line": self.line,
+            "base": "".join(self.base),
+            "local": "".join(self.local),
+            "remote": "".join(self.remote),
+        }
+
+
+@dataclass
+class MergeResult:
+    """Merged content plus the conflicts left in it."""
+
+    merged_content: str
+    conflicts: List[MergeConflict] = field(default_factory=list)
+
+    @property
+    def has_conflicts(self) -> bool:
+        return bool(self.conflicts)
+
+
+def _intern(*documents: Sequence[str]) -> List[List[int]]:
+    ids: Dict[str, int] = {}
+    return [[ids.setdefault(line, len(ids)) for line in lines] for lines in documents]
+
+
+def _next_x(v: List[int], offset: int, k: int, d: int) -> int:
+    """Return the x a ``d``-edit path on diagonal ``k`` starts its snake at.
+
+    ``v`` holds the furthest x reached on each diagonal with ``d - 1`` edits.
+    """
+    if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+        return v[offset + k + 1]
+    return v[offset + k - 1] + 1
+
+
+def _furthest_split(forward: List[int], offset: int, d: int, n: int, m: int) -> Optional[Tuple[int, int]]:
+    """Return the furthest point the forward search reached in ``d`` edits.
+
+    None when that point is a corner of the ranges and so splits nothing.
+    """
+    best_x, best_y = 0, 0
+    for k in range(-d, d + 1, 2):
+        x = min(forward[offset + k], n)
+        y = x - k
+        if 0 <= y <= m and x + y > best_x + best_y:
+            best_x, best_y = x, y
+    if 0 < best_x + best_y < n + m:
+        return best_x, best_y
+    return None
+
+
+class _SnakeSearch:
+    """Myers' bidirectional search for the middle snake of two ranges.
+
+    ``a[a_lo:a_hi]`` and ``b[b_lo:b_hi]`` are non-empty and differ in their
+    first and last elements.  ``forward`` and ``backward`` hold the furthest
+    x reached on each diagonal from the start and from the end.
+    """
+
+    def __init__(self, a: List[int], b: List[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int):
+        self.a, self.b = a, b
+        self.a_lo, self.a_hi, self.b_lo, self.b_hi = a_lo, a_hi, b_lo, b_hi
+        self.n = a_hi - a_lo
+        self.m = b_hi - b_lo
+        self.delta = self.n - self.m
+        self.max_d = (self.n + self.m + 1) // 2
+        self.offset = self.max_d + 1
+        self.forward = [0] * (2 * self.max_d + 3)
+        self.backward = [0] * (2 * self.max_d + 3)
+
+    def run(self) -> Tuple[int, int, int, int]:
+        max_cost = max(_MIN_MAX_COST, int((self.n + self.m) ** 0.5))
+        for d in range(self.max_d + 1):
+            snake = self._forward(d) or self._backward(d)
+            if snake:
+                return snake
+            if d >= max_cost:
+                # Too expensive: split where the forward search got furthest
+                split = _furthest_split(self.forward, self.offset, d, self.n, self.m)
+                if split:
+                    x, y = split
+                    return self.a_lo + x, self.b_lo + y, self.a_lo + x, self.b_lo + y
+                break
+        # No usable split; treat the ranges as entirely replaced
+        return self.a_hi, self.b_lo, self.a_hi, self.b_lo
+
+    def _slide(self, x: int, y: int, a_start: int, b_start: int, step: int) -> Tuple[int, int]:
+        """Follow equal elements from ``(x, y)``, walking the ranges by ``step``."""
+        a, b = self.a, self.b
+        while x < self.n and y < self.m and a[a_start + step * x] == b[b_start + step * y]:
+            x += 1
+            y += 1
+        return x, y
+
+    def _forward(self, d: int) -> Optional[Tuple[int, int, int, int]]:
+        """Extend every forward path by one edit; return the snake where it meets the backward search."""
+        # Paths can only overlap on odd deltas in the forward step
+        check = self.delta & 1
+        for k in range(-d, d + 1, 2):
+            x0 = _next_x(self.forward, self.offset, k, d)
+            x, y = self._slide(x0, x0 - k, self.a_lo, self.b_lo, 1)
+            self.forward[self.offset + k] = x
+            if check and abs(self.delta - k) <= d - 1 and x + self.backward[self.offset + self.delta - k] >= self.n:
+                return self.a_lo + x0, self.b_lo + x0 - k, self.a_lo + x, self.b_lo + y
+        return None
+
+    def _backward(self, d: int) -> Optional[Tuple[int, int, int, int]]:
+        """Extend every backward path by one edit; return the snake where it meets the forward search."""
+        # ...and on even deltas in the backward step
+        check = not self.delta & 1
+        for k in range(-d, d + 1, 2):
+            x0 = _next_x(self.backward, self.offset, k, d)
+            x, y = self._slide(x0, x0 - k, self.a_hi - 1, self.b_hi - 1, -1)
+            self.backward[self.offset + k] = x
+            if check and abs(self.delta - k) <= d and x + self.forward[self.offset + self.delta - k] >= self.n:
+                return self.a_hi - x, self.b_hi - y, self.a_hi - x0, self.b_hi - x0 + k
+        return None
+
+
+def _middle_snake(a: List[int], b: List[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int) -> Tuple[int, int, int, int]:
+    """Return ``(x0, y0, x1, y1)``: a snake on an optimal path splitting the edit script.
+
+    ``a[a_lo:a_hi]`` and ``b[b_lo:b_hi]`` are non-empty and differ in their
+    first and last elements.
+    """
+    return _SnakeSearch(a, b, a_lo, a_hi, b_lo, b_hi).run()
+
+
+def _trim_common(
+    a: List[int], b: List[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int
+) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]], Tuple[int, int, int, int]]:
+    """Strip the common prefix and suffix of two ranges.
+
+    Returns:
+        ``(head, tail, (a_lo, a_hi, b_lo, b_hi))``: matched pairs of the
+        prefix, of the suffix (in increasing order), and the remaining ranges
+    """
+    head = []
+    while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+        head.append((a_lo, b_lo))
+        a_lo += 1
+        b_lo += 1
+    tail = []
+    while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+        a_hi -= 1
+        b_hi -= 1
+        tail.append((a_hi, b_hi))
+    return head, tail[::-1], (a_lo, a_hi, b_lo, b_hi)
+
+
+def _matches(a: List[int], b: List[int]) -> List[Tuple[int, int]]:
+    """Return matched index pairs of ``a`` and ``b`` in increasing order."""
+    matches: List[Tuple[int, int]] = []
+    # Explicit stack instead of recursion; entries are either a range still to
+    # diff or matches to emit once everything to their left has been emitted
+    stack: List[Tuple[str, tuple]] = [("range", (0, len(a), 0, len(b)))]
+    while stack:
+        kind, item = stack.pop()
+        if kind == "match":
+            matches.extend(item)
+            continue
+        head, tail, (a_lo, a_hi, b_lo, b_hi) = _trim_common(a, b, *item)
+        matches.extend(head)
+        if a_lo == a_hi or b_lo == b_hi:
+            matches.extend(tail)
+            continue
+        x0, y0, x1, y1 = _middle_snake(a, b, a_lo, a_hi, b_lo, b_hi)
+        # Pushed in reverse so the left range is processed first
+        stack.append(("match", tuple(tail)))
+        if (x0, y0, x1, y1) != (a_hi, b_lo, a_hi, b_lo):
+            stack.append(("range", (x1, a_hi, y1, b_hi)))
+            stack.append(("match", tuple((x0 + i, y0 + i) for i in range(x1 - x0))))
+            stack.append(("range", (a_lo, x0, b_lo, y0)))
+    return matches
+
+
+def _shared_positions(ids_a: List[int], ids_b: List[int]) -> Tuple[List[int], List[int]]:
+    """Return the positions in each list of lines that also occur in the other."""
+    in_b = set(ids_b)
+    in_a = set(ids_a)
+    return [i for i, line in enumerate(ids_a) if line in in_b], [j for j, line in enumerate(ids_b) if line in in_a]
+
+
+def diff_lines(a: Sequence[str], b: Sequence[str]) -> List[Hunk]:
+    """Return the changed ranges turning lines ``a`` into lines ``b``."""
+    ids_a, ids_b = _intern(a, b)
+    # Lines unique to one side can never match; diff only the rest
+    keep_a, keep_b = _shared_positions(ids_a, ids_b)
+    pairs = _matches([ids_a[i] for i in keep_a], [ids_b[j] for j in keep_b])
+
+    hunks: List[Hunk] = []
+    i = j = 0
+    for x, y in [(keep_a[fi], keep_b[fj]) for fi, fj in pairs] + [(len(a), len(b))]:
+        if x > i or y > j:
+            hunks.append((i, x, j, y))
+        i, j = x + 1, y + 1
+    return hunks
+
+
+def _regions(changes: List[Tuple[Hunk, int]]) -> Iterator[Tuple[int, int, Tuple[List[Hunk], List[Hunk]]]]:
+    """Group sorted ``(hunk, side)`` changes into regions of overlapping or adjacent base lines.
+
+    Yields:
+        ``(base_lo, base_hi, (local_hunks, remote_hunks))``
+    """
+    index = 0
+    while index < len(changes):
+        lo, hi = changes[index][0][0], changes[index][0][1]
+        sides: Tuple[List[Hunk], List[Hunk]] = ([], [])
+        while index < len(changes) and changes[index][0][0] <= hi:
+            hunk, side = changes[index]
+            sides[side].append(hunk)
+            hi = max(hi, hunk[1])
+            index += 1
+        yield lo, hi, sides
+
+
+def _side_lines(lines: List[str], hunks: List[Hunk], base_lines: List[str], lo: int, hi: int) -> List[str]:
+    """Return one side's version of base range ``[lo, hi)``, mapped through its hunks in it."""
+    if not hunks:
+        return base_lines[lo:hi]
+    first, last = hunks[0], hunks[-1]
+    return lines[lo + first[2] - first[0]:hi + last[3] - last[1]]
+
+
+def _common_ends(ours: List[str], theirs: List[str]) -> Tuple[int, int]:
+    """Return how many leading and trailing lines ``ours`` and ``theirs`` share."""
+    shortest = min(len(ours), len(theirs))
+    start = 0
+    while start < shortest and ours[start] == theirs[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and ours[-1 - end] == theirs[-1 - end]:
+        end += 1
+    return start, end
+
+
+def _write_conflict(
+    out: List[str], base: List[str], ours: List[str], theirs: List[str], local_label: str, remote_label: str
+) -> MergeConflict:
+    """Append a conflict to ``out``, keeping lines both sides agree on outside the markers."""
+    start, end = _common_ends(ours, theirs)
+    out.extend(ours[:start])
+    conflict = MergeConflict(
+        line=len(out) + 1,
+        base=base,
+        local=ours[start:len(ours) - end],
+        remote=theirs[start:len(theirs) - end],
+    )
+    out.append(f"<<<<<<< {local_label}\n")
+    out.extend(_terminated(conflict.local))
+    out.append("=======\n")
+    out.extend(_terminated(conflict.remote))
+    out.append(f">>>>>>> {remote_label}\n")
+    out.extend(ours[len(ours) - end:])
+    return conflict
+
+
+def merge3(
+    base: str,
+    local: str,
+    remote: str,
+    local_label: str = "LOCAL",
+    remote_label: str = "REMOTE",
+) -> MergeResult:
+    """Three-way merge ``local`` and ``remote`` edits of ``base``."""
+    base_lines = base.splitlines(keepends=True)
+    local_lines = local.splitlines(keepends=True)
+    remote_lines = remote.splitlines(keepends=True)
+
+    changes = sorted(
+        [(hunk, 0) for hunk in diff_lines(base_lines, local_lines)]
+        + [(hunk, 1) for hunk in diff_lines(base_lines, remote_lines)],
+        key=lambda change: (change[0][0], change[0][1]),
+    )
+
+    out: List[str] = []
+    conflicts: List[MergeConflict] = []
+    position = 0
+    for lo, hi, (local_hunks, remote_hunks) in _regions(changes):
+        out.extend(base_lines[position:lo])
+        position = hi
+        ours = _side_lines(local_lines, local_hunks, base_lines, lo, hi)
+        theirs = _side_lines(remote_lines, remote_hunks, base_lines, lo, hi)
+        if not remote_hunks or ours == theirs:
+            out.extend(ours)
+        elif not local_hunks:
+            out.extend(theirs)
+        else:
+            conflicts.append(_write_conflict(out, base_lines[lo:hi], ours, theirs, local_label, remote_label))
+
+    out.extend(base_lines[position:])
+    return MergeResult(merged_content="".join(out), conflicts=conflicts)
+
+
+def _terminated(lines: List[str]) -> List[str]:
+    """Return ``lines`` with a newline after the last one so markers stay on their own line."""
+    if lines and not lines[-1].endswith(("\n", "\r")):
+        return lines[:-1] + [lines[-1] + "\n"]
+    return lines
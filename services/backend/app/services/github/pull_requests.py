@@ -1,10 +1,13 @@
 """GitHub Pull Request integration service."""
 from typing import Any, Dict, List
 
-import httpx
 from fastapi import HTTPException
 
+from app.services.http_clients import GITHUB, http_clients
+
 from .base import BaseGitHubService
+from .response_cache import github_response_cache
+from .scheduler import github_scheduler
 
 
 class GitHubPRService(BaseGitHubService):
@@ -41,21 +44,21 @@ class GitHubPRService(BaseGitHubService):
             "base": base_branch
         }
 
-        async with httpx.AsyncClient() as client:
-            url = f"{self.BASE_URL}/repos/{owner}/{repo}/pulls"
+        client = http_clients.get(GITHUB)
+        url = f"{self.BASE_URL}/repos/{owner}/{repo}/pulls"
 
-            response = await client.post(url, json=pr_data, headers=headers)
-            if response.status_code not in (200, 201):
-                try:
-                    error_data = response.json()
-                except Exception:
-                    error_data = {"message": response.text}
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Failed to create pull request: {error_data.get('message', 'Unknown error')}"
-                )
+        response = await github_scheduler.request(client, "POST", url, json=pr_data, headers=headers)
+        if response.status_code not in (200, 201):
+            try:
+                error_data = response.json()
+            except Exception:
+                error_data = {"message": response.text}
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Failed to create pull request: {error_data.get('message', 'Unknown error')}"
+            )
 
-            return response.json()
+        return response.json()
 
     async def get_pull_requests(
         self,
@@ -80,17 +83,17 @@ class GitHubPRService(BaseGitHubService):
             "direction": "desc"
         }
 
-        async with httpx.AsyncClient() as client:
-            url = f"{self.BASE_URL}/repos/{owner}/{repo}/pulls"
+        client = http_clients.get(GITHUB)
+        url = f"{self.BASE_URL}/repos/{owner}/{repo}/pulls"
 
-            response = await client.get(url, params=params, headers=headers)
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to get pull requests"
-                )
+        response = await github_response_cache.get(client, url, params=params, headers=headers)
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail="Failed to get pull requests"
+            )
 
-            return response.json()
+        return response.json()
 
     async def get_repository_contributors(
         self,
@@ -106,14 +109,14 @@ class GitHubPRService(BaseGitHubService):
             "User-Agent": "Markdown-Manager/1.0"
         }
 
-        async with httpx.AsyncClient() as client:
-            url = f"{self.BASE_URL}/repos/{owner}/{repo}/contributors"
+        client = http_clients.get(GITHUB)
+        url = f"{self.BASE_URL}/repos/{owner}/{repo}/contributors"
 
-            response = await client.get(url, headers=headers)
-            if response.status_code != 200:
-                return []  # Return empty list if cannot get contributors
+        response = await github_response_cache.get(client, url, headers=headers)
+        if response.status_code != 200:
+            return []  # Return empty list if cannot get contributors
 
-            return response.json()
+        return response.json()
 
 
 # Global service instance
@@ -0,0 +1,179 @@
+"""Conditional-request cache for GitHub API GETs.
+
+GitHub answers a request carrying ``If-None-Match``/``If-Modified-Since``
+with ``304 Not Modified`` when nothing changed, and 304 responses do not
+count against the rate limit.  ``GitHubResponseCache`` stores the body and
+validators of every cacheable GET in Redis (shared by all workers) and
+revalidates on the next identical request, so repeat browsing of
+repositories, branches and file listings is served from cache for free.
+
+Entries are keyed by URL, query parameters, ``Accept`` header and a hash of
+the access token, so private data is never shared between accounts.  When
+Redis is unavailable requests simply go straight to GitHub.
+
+The Redis instance also holds the event streams, so entries are kept small
+and short-lived: blob downloads (addressed by SHA, only fetched when a file
+changed) are never stored, nor are bodies over ``_MAX_BODY_BYTES``.
+"""
+import hashlib
+import json
+import logging
+from collections import Counter
+from typing import Any, Dict, Mapping, Optional
+
+import httpx
+
+from app.services.redis_pool import CONNECTION_ERRORS, redis_pool
+
+from .scheduler import github_scheduler
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "github:http:v1:"
+# Entries are revalidated on every use; the TTL only bounds storage
+_ENTRY_TTL_SECONDS = 24 * 3600
+# Larger bodies (big files, huge trees) are not worth keeping in Redis
+_MAX_BODY_BYTES = 128 * 1024
+# Immutable, fetched once per change; caching them only costs memory
+_UNCACHED_PATHS = ("/git/blobs/",)
+# Response headers replayed on a 304 hit
+_STORED_HEADERS = ("content-type", "etag", "last-modified", "link")
+
+
+class GitHubResponseCache:
+    """ETag / Last-Modified revalidation cache for GitHub GET requests."""
+
+    def __init__(self):
+        self._stats: Counter[str] = Counter()
+
+    @staticmethod
+    def _cache_key(url: str, params: Optional[Mapping[str, Any]], headers: Mapping[str, str]) -> str:
+        auth = headers.get("Authorization", "")
+        raw = json.dumps(
+            [
+                url,
+                sorted((str(k), str(v)) for k, v in (params or {}).items()),
+                headers.get("Accept", ""),
+                hashlib.sha256(auth.encode()).hexdigest(),
+            ]
+        )
+        return _KEY_PREFIX + hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> httpx.Response:
+        """GET ``url``, revalidating a cached copy if one exists.
+
+        A 304 is turned back into the cached 200 response, so callers see
+        the same ``httpx.Response`` they would without the cache.
+        """
+        headers = dict(headers or {})
+        if any(path in url for path in _UNCACHED_PATHS):
+            self._stats["uncached"] += 1
+            return await github_scheduler.request(client, "GET", url, params=params, headers=headers)
+
+        key = self._cache_key(url, params, headers)
+        r = await redis_pool.get()
+        entry = await self._load(r, key)
+
+        response = await github_scheduler.request(
+            client, "GET", url, params=params, headers=self._conditional_headers(headers, entry)
+        )
+
+        if response.status_code == 304 and entry:
+            return await self._revalidated(r, key, entry, response)
+
+        self._stats["fetched"] += 1
+        if r is not None and response.status_code == 200:
+            await self._store(r, key, response)
+        return response
+
+    @staticmethod
+    def _conditional_headers(headers: Dict[str, str], entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Add the cached entry's validators to the request headers."""
+        request_headers = dict(headers)
+        if entry and entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+        return request_headers
+
+    @staticmethod
+    async def _load(r, key: str) -> Optional[Dict[str, Any]]:
+        if r is None:
+            return None
+        try:
+            raw = await r.get(key)
+        except CONNECTION_ERRORS as exc:
+            logger.debug("GitHub response cache read failed", exc_info=True)
+            redis_pool.mark_failed(exc)
+            return None
+        except Exception:
+            logger.debug("GitHub response cache read rejected", exc_info=True)
+            return None
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            logger.debug("Ignoring unreadable GitHub response cache entry %s", key)
+            return None
+
+    async def _revalidated(self, r, key: str, entry: Dict[str, Any], response: httpx.Response) -> httpx.Response:
+        """Turn a 304 back into the cached 200 and extend the entry's TTL."""
+        self._stats["revalidated"] += 1
+        if r is not None:
+            try:
+                await r.expire(key, _ENTRY_TTL_SECONDS)
+            except CONNECTION_ERRORS as exc:
+                redis_pool.mark_failed(exc)
+            except Exception:
+                logger.debug("GitHub response cache TTL refresh rejected", exc_info=True)
+        return httpx.Response(
+            200,
+            headers={**entry["headers"], "X-Cache": "revalidated"},
+            content=entry["body"].encode("utf-8"),
+            request=response.request,
+        )
+
+    async def _store(self, r, key: str, response: httpx.Response) -> None:
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if not (etag or last_modified) or len(response.content) > _MAX_BODY_BYTES:
+            return
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {h: response.headers[h] for h in _STORED_HEADERS if h in response.headers},
+            "body": response.text,
+        }
+        try:
+            await r.set(key, json.dumps(entry), ex=_ENTRY_TTL_SECONDS)
+            self._stats["stored"] += 1
+        except CONNECTION_ERRORS as exc:
+            logger.debug("GitHub response cache write failed", exc_info=True)
+            redis_pool.mark_failed(exc)
+        except Exception:
+            logger.debug("GitHub response cache write rejected", exc_info=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return revalidation counters for this worker."""
+        total = self._stats["revalidated"] + self._stats["fetched"]
+        return {
+            "backend": "redis",
+            "redis_available": redis_pool.available,
+            "revalidated": self._stats["revalidated"],
+            "fetched": self._stats["fetched"],
+            "stored": self._stats["stored"],
+            "uncached": self._stats["uncached"],
+            "revalidation_rate": round(self._stats["revalidated"] / total * 100, 2) if total else 0.0,
+        }
+
+
+# Module-level singleton shared by all GitHub services
+github_response_cache = GitHubResponseCache()
@@ -0,0 +1,290 @@
+"""Rate-limit-aware scheduling of GitHub API requests per account.
+
+Every response from api.github.com reports the caller's budget in
+``X-RateLimit-Limit`` / ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset``.
+``GitHubRequestScheduler`` tracks that budget per access token and gates
+each request before it is sent:
+
+* Interactive requests (UI browsing, commits) go out immediately while the
+  account has budget left.
+* Background requests (periodic sync, post-OAuth repository sync) are paced
+  by a token bucket refilled at ``(remaining - reserve) / seconds_to_reset``,
+  always leave a reserve for interactive use, and yield to any interactive
+  request that is waiting.
+* Primary (``remaining == 0``) and secondary (``Retry-After`` / abuse
+  detection) limits block the account until the advertised time; background
+  work sleeps through the block and resumes, interactive work waits briefly
+  or fails fast with a 429.
+
+Mark background work with the ``background_priority()`` context manager (or
+the ``runs_in_background`` decorator for whole coroutines); the priority is
+carried in a context variable so nested service calls inherit it.
+State is per worker process and corrects itself from response headers.
+"""
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+import httpx
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+github_request_priority: ContextVar[str] = ContextVar("github_request_priority", default=INTERACTIVE)
+
+# Core REST limit for an authenticated user until GitHub tells us otherwise
+_DEFAULT_LIMIT = 5000
+_DEFAULT_WINDOW_SECONDS = 3600
+# Background requests never spend the last slice of an account's budget
+_BACKGROUND_RESERVE_FRACTION = 0.1
+_MIN_BACKGROUND_RESERVE = 50
+# Background burst size before pacing kicks in
+_BUCKET_CAPACITY = 10
+# Longest an interactive request waits on a limit before failing with 429
+_MAX_INTERACTIVE_WAIT = 10.0
+# GitHub asks for at least a minute between retries after a secondary limit
+_SECONDARY_BACKOFF_SECONDS = 60.0
+_MAX_SECONDARY_BACKOFF_SECONDS = 15 * 60.0
+_MAX_RETRIES = 3
+_MAX_TRACKED_ACCOUNTS = 1024
+
+T = TypeVar("T")
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Run the enclosed GitHub calls at background priority."""
+    token = github_request_priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        github_request_priority.reset(token)
+
+
+def runs_in_background(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Decorate a coroutine function so all of its GitHub calls run at background priority."""
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        with background_priority():
+            return await func(*args, **kwargs)
+    return wrapper
+
+
+@dataclass
+class _AccountBudget:
+    """Rate-limit state learned from one access token's responses."""
+
+    limit: int = _DEFAULT_LIMIT
+    remaining: Optional[int] = None
+    reset_at: float = 0.0
+    blocked_until: float = 0.0
+    secondary_strikes: int = 0
+    tokens: float = _BUCKET_CAPACITY
+    refilled_at: float = 0.0
+    interactive_waiting: int = 0
+    last_used: float = 0.0
+
+    @property
+    def reserve(self) -> int:
+        return max(_MIN_BACKGROUND_RESERVE, int(self.limit * _BACKGROUND_RESERVE_FRACTION))
+
+    def update_from_headers(self, headers: httpx.Headers) -> None:
+        """Take limit, remaining and reset from ``X-RateLimit-*`` headers when present."""
+        try:
+            if "x-ratelimit-limit" in headers:
+                self.limit = int(headers["x-ratelimit-limit"])
+            if "x-ratelimit-remaining" in headers:
+                self.remaining = int(headers["x-ratelimit-remaining"])
+            if "x-ratelimit-reset" in headers:
+                self.reset_at = float(headers["x-ratelimit-reset"])
+        except ValueError:
+            logger.debug("Ignoring malformed GitHub rate-limit headers")
+
+    def refill_rate(self, now: float) -> float:
+        """Background tokens per second that spread the budget to the reset."""
+        if self.remaining is None or self.reset_at <= now:
+            return self.limit / _DEFAULT_WINDOW_SECONDS
+        return max(self.remaining - self.reserve, 0) / max(self.reset_at - now, 1.0)
+
+
+class GitHubRequestScheduler:
+    """Per-account gate in front of every GitHub API request."""
+
+    def __init__(self):
+        self._accounts: Dict[str, _AccountBudget] = {}
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "background_requests": 0,
+            "throttled": 0,
+            "primary_limited": 0,
+            "secondary_limited": 0,
+            "retries": 0,
+            "rejected": 0,
+        }
+
+    @staticmethod
+    def _account_key(headers: Optional[Dict[str, str]]) -> str:
+        auth = (headers or {}).get("Authorization", "")
+        return hashlib.sha256(auth.encode()).hexdigest()[:16]
+
+    def _budget(self, key: str) -> _AccountBudget:
+        budget = self._accounts.get(key)
+        if budget is None:
+            if len(self._accounts) >= _MAX_TRACKED_ACCOUNTS:
+                self._prune()
+            budget = self._accounts[key] = _AccountBudget(refilled_at=time.monotonic())
+        return budget
+
+    def _prune(self) -> None:
+        """Drop the least recently used half of the tracked accounts."""
+        by_age = sorted(self._accounts, key=lambda k: self._accounts[k].last_used)
+        for key in by_age[: len(by_age) // 2]:
+            del self._accounts[key]
+
+    def _wait_time(self, budget: _AccountBudget, priority: str) -> float:
+        """Seconds to wait before a request may be sent; 0 means send now."""
+        now = time.time()
+        if budget.blocked_until > now:
+            return budget.blocked_until - now
+        if budget.remaining is not None and budget.reset_at > now:
+            floor = 0 if priority == INTERACTIVE else budget.reserve
+            if budget.remaining <= floor:
+                return budget.reset_at - now
+        if priority == INTERACTIVE:
+            return 0.0
+
+        if budget.interactive_waiting:
+            return 0.05
+        mono = time.monotonic()
+        budget.tokens = min(
+            _BUCKET_CAPACITY,
+            budget.tokens + (mono - budget.refilled_at) * budget.refill_rate(now),
+        )
+        budget.refilled_at = mono
+        if budget.tokens >= 1:
+            return 0.0
+        rate = budget.refill_rate(now)
+        return (1 - budget.tokens) / rate if rate > 0 else max(budget.reset_at - now, 1.0)
+
+    async def _acquire(self, budget: _AccountBudget, priority: str) -> None:
+        while True:
+            wait = self._wait_time(budget, priority)
+            if wait <= 0:
+                break
+            if priority == INTERACTIVE and wait > _MAX_INTERACTIVE_WAIT:
+                self._stats["rejected"] += 1
+                retry_after = int(wait) + 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"GitHub API rate limit exceeded, retry in {retry_after} seconds",
+                    headers={"Retry-After": str(retry_after)},
+                )
+            self._stats["throttled"] += 1
+            if priority == INTERACTIVE:
+                budget.interactive_waiting += 1
+                try:
+                    await asyncio.sleep(wait)
+                finally:
+                    budget.interactive_waiting -= 1
+            else:
+                if wait > 5:
+                    logger.info("GitHub background request waiting %.0fs for rate limit", wait)
+                await asyncio.sleep(wait)
+
+        if priority == BACKGROUND:
+            budget.tokens -= 1
+        if budget.remaining is not None:
+            budget.remaining -= 1
+        budget.last_used = time.monotonic()
+
+    def _record(self, budget: _AccountBudget, response: httpx.Response) -> bool:
+        """Update the budget from response headers; return True if rate limited."""
+        budget.update_from_headers(response.headers)
+        if response.status_code not in (403, 429):
+            budget.secondary_strikes = 0
+            return False
+
+        now = time.time()
+        retry_after = response.headers.get("retry-after")
+        if retry_after is not None and retry_after.isdigit():
+            wait: Optional[float] = int(retry_after)
+        elif budget.remaining == 0 and budget.reset_at > now:
+            self._stats["primary_limited"] += 1
+            budget.blocked_until = budget.reset_at
+            return True
+        else:
+            wait = self._secondary_backoff(budget, response)
+        if wait is None:
+            # A plain permission error
+            return False
+
+        budget.blocked_until = now + wait
+        budget.secondary_strikes += 1
+        self._stats["secondary_limited"] += 1
+        return True
+
+    @staticmethod
+    def _secondary_backoff(budget: _AccountBudget, response: httpx.Response) -> Optional[float]:
+        """Exponential backoff for a secondary limit without ``Retry-After``; None if not limited."""
+        if response.status_code == 429 or "rate limit" in response.text.lower():
+            return min(
+                _SECONDARY_BACKOFF_SECONDS * 2 ** budget.secondary_strikes,
+                _MAX_SECONDARY_BACKOFF_SECONDS,
+            )
+        return None
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a GitHub request once the account's budget allows it.
+
+        Rate-limited responses are retried after the advertised wait when
+        that fits the caller's priority; otherwise the limited response is
+        returned for the caller's normal error handling.
+        """
+        priority = github_request_priority.get()
+        budget = self._budget(self._account_key(kwargs.get("headers")))
+
+        for attempt in range(_MAX_RETRIES + 1):
+            await self._acquire(budget, priority)
+            self._stats["requests"] += 1
+            if priority == BACKGROUND:
+                self._stats["background_requests"] += 1
+
+            response = await client.request(method, url, **kwargs)
+            if not self._record(budget, response) or attempt == _MAX_RETRIES:
+                return response
+            if priority == INTERACTIVE and budget.blocked_until - time.time() > _MAX_INTERACTIVE_WAIT:
+                return response
+            self._stats["retries"] += 1
+            logger.warning(
+                "GitHub rate limit hit (%s %s), retrying after %.0fs",
+                method, url, max(budget.blocked_until - time.time(), 0),
+            )
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return scheduler counters and the number of blocked accounts."""
+        now = time.time()
+        return {
+            **self._stats,
+            "tracked_accounts": len(self._accounts),
+            "blocked_accounts": sum(1 for b in self._accounts.values() if b.blocked_until > now),
+        }
+
+
+# Module-level singleton shared by all GitHub services
+github_scheduler = GitHubRequestScheduler()
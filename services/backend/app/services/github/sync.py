@@ -1,8 +1,8 @@
 """Advanced GitHub synchronization service for bidirectional sync."""
-import difflib
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import HTTPException, status
 from sqlalchemy import select, and_
@@ -15,6 +15,7 @@ from app.models.document import Document
 from app.services.storage.user import UserStorage
 
 from .base import BaseGitHubService
+from .merge import merge3
 
 
 logger = logging.getLogger(__name__)
@@ -117,7 +118,7 @@ class GitHubSyncService(BaseGitHubService):
         else:
             # Attempt to merge changes
             return await self._merge_changes(
-                db, document, remote_content, remote_sha, user_id, current_content
+                db, document, remote_content, remote_sha, user_id, current_content, repository
             )
 
     async def _update_document_from_remote(
@@ -127,13 +128,21 @@ class GitHubSyncService(BaseGitHubService):
         remote_content: str,
         remote_sha: str,
         user_id: int,
-        backup_created: bool = False
+        backup_created: bool = False,
+        synced_content: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Update document with remote content."""
+        """Update document with remote content.
+
+        ``synced_content`` is the content of ``remote_sha`` when
+        ``remote_content`` is a merge that still carries local edits; the
+        document then keeps ``local_changes`` status so the edits get pushed.
+        """
         from .api import GitHubAPIService
         api_service = GitHubAPIService()
 
-        new_content_hash = api_service.generate_git_blob_hash(remote_content)
+        if synced_content is None:
+            synced_content = remote_content
+        new_content_hash = api_service.generate_git_blob_hash(synced_content)
 
         # Update document content in filesystem
         storage_service = UserStorage()
@@ -157,7 +166,7 @@ class GitHubSyncService(BaseGitHubService):
         # Update metadata
         document.github_sha = remote_sha
         document.local_sha = new_content_hash
-        document.github_sync_status = "synced"
+        document.github_sync_status = "synced" if remote_content == synced_content else "local_changes"
         document.last_github_sync_at = datetime.utcnow()
 
         await db.commit()
@@ -211,14 +220,15 @@ class GitHubSyncService(BaseGitHubService):
         remote_content: str,
         remote_sha: str,
         user_id: int,
-        current_content: str
+        current_content: str,
+        repository: Any
     ) -> Dict[str, Any]:
         """Attempt to merge local and remote changes."""
         # Get the original content (last synced version)
-        original_content = await self._get_original_content(db, document)
+        original_content = await self._get_original_content(db, document, repository)
 
         # Perform three-way merge
-        merge_result = self._three_way_merge(
+        merge_result = await self._three_way_merge(
             original_content,
             current_content,   # local changes
             remote_content     # remote changes
@@ -227,7 +237,8 @@ class GitHubSyncService(BaseGitHubService):
         if not merge_result["has_conflicts"]:
             # Successful merge
             await self._update_document_from_remote(
-                db, document, merge_result["merged_content"], remote_sha, user_id
+                db, document, merge_result["merged_content"], remote_sha, user_id,
+                synced_content=remote_content
             )
             return {
                 "success": True,
@@ -236,10 +247,8 @@ class GitHubSyncService(BaseGitHubService):
                 "changes_pulled": True
             }
         else:
-            # Conflicts detected, create content with conflict markers
-            conflict_content = self._create_conflict_markers(
-                current_content, remote_content, merge_result["conflicts"]
-            )
+            # Conflicts detected; merged content carries conflict markers
+            conflict_content = merge_result["merged_content"]
 
             # Update document with conflict markers in filesystem
             storage_service = UserStorage()
@@ -274,98 +283,44 @@ class GitHubSyncService(BaseGitHubService):
     async def _get_original_content(
         self,
         db: AsyncSession,
-        document: Document
+        document: Document,
+        repository: Any
     ) -> str:
-        """Retrieve original content from last successful sync."""
-        # This is a simplified implementation
-        # In production, you might want to store the original content or use Git-like diffs
-        return ""
+        """Retrieve original content from last successful sync.
+
+        That is the blob of ``document.github_sha`` on GitHub.  Without it
+        every differing line is treated as a concurrent edit.
+        """
+        if not document.github_sha or not repository or not repository.account:
+            return ""
+
+        from .api import GitHubAPIService
+        owner, repo_name = repository.repo_full_name.split("/", 1)
+        try:
+            return await GitHubAPIService().get_blob_content(
+                repository.account.access_token, owner, repo_name, document.github_sha
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load last synced content of document {document.id}: {e}")
+            return ""
 
-    def _three_way_merge(
+    async def _three_way_merge(
         self,
         original: str,
         local: str,
         remote: str
     ) -> Dict[str, Any]:
-        """Perform a three-way merge of text content."""
-        # Split into lines for easier merging
-        original_lines = original.splitlines(keepends=True)
-        local_lines = local.splitlines(keepends=True)
-        remote_lines = remote.splitlines(keepends=True)
-
-        # Use difflib to compute differences
-        local_diff = list(difflib.unified_diff(original_lines, local_lines, lineterm=''))
-        remote_diff = list(difflib.unified_diff(original_lines, remote_lines, lineterm=''))
-
-        # Simple conflict detection - if both versions changed the same lines
-        conflicts = []
-        has_conflicts = False
-
-        # Check for overlapping changes
-        local_changed_lines = set()
-        remote_changed_lines = set()
-
-        # Parse diff hunks to find changed lines
-        for diff_line in local_diff:
-            if diff_line.startswith('@@'):
-                # Extract line numbers from hunk header
-                pass
-
-        for diff_line in remote_diff:
-            if diff_line.startswith('@@'):
-                # Extract line numbers from hunk header
-                pass
-
-        # Check for conflicts (overlapping changes)
-        conflict_lines = local_changed_lines.intersection(remote_changed_lines)
-
-        if conflict_lines:
-            has_conflicts = True
-            merged_content = self._create_conflict_markers(local, remote, conflict_lines)
-        else:
-            # No conflicts, merge by applying both sets of changes
-            merged_content = remote  # Simplified - prefer remote in non-conflicting cases
+        """Perform a line-level three-way merge of text content.
 
+        The merge is CPU-bound, so it runs in a worker thread.
+        """
+        result = await asyncio.to_thread(merge3, original, local, remote)
         return {
-            "has_conflicts": has_conflicts,
-            "conflicts": conflicts,
-            "merged_content": merged_content
+            "has_conflicts": result.has_conflicts,
+            "conflicts": [conflict.to_dict() for conflict in result.conflicts],
+            "merged_content": result.merged_content
         }
 
-    def _create_conflict_markers(
-        self,
-        local_content: str,
-        remote_content: str,
-        conflict_lines: set
-    ) -> str:
-        """Create content with Git-style conflict markers."""
-        local_lines = local_content.splitlines()
-        remote_lines = remote_content.splitlines()
-
-        merged_lines = []
-        max_lines = max(len(local_lines), len(remote_lines))
-
-        i = 0
-        while i < max_lines:
-            if i in conflict_lines:
-                # Add conflict markers
-                merged_lines.append("<<<<<<< LOCAL")
-                if i < len(local_lines):
-                    merged_lines.append(local_lines[i])
-                merged_lines.append("=======")
-                if i < len(remote_lines):
-                    merged_lines.append(remote_lines[i])
-                merged_lines.append(">>>>>>> REMOTE")
-            else:
-                # No conflict, use remote version (or local if remote doesn't have this line)
-                if i < len(remote_lines):
-                    merged_lines.append(remote_lines[i])
-                elif i < len(local_lines):
-                    merged_lines.append(local_lines[i])
-            i += 1
-
-        return '\n'.join(merged_lines)
-
     async def resolve_conflicts(
         self,
         db: AsyncSession,
@@ -435,14 +390,65 @@ class GitHubSyncService(BaseGitHubService):
         # Placeholder for logging implementation
         print(f"Sync operation logged: {operation} {status} on {branch_name}")
 
+    async def _read_local_content(self, storage_service: UserStorage, user_id: int, document: Document) -> str:
+        """Load the document's current content from the filesystem ("" if unavailable)."""
+        if not document.file_path:
+            return ""
+        try:
+            content = await storage_service.read_document(
+                user_id=user_id,
+                file_path=document.file_path
+            )
+            return content or ""
+        except Exception as e:
+            logger.warning(f"Failed to load document content from filesystem: {e}")
+            return ""
+
+    async def _merge_local_changes(
+        self,
+        db: AsyncSession,
+        document: Document,
+        current_content: str,
+        remote_content: str
+    ) -> Optional[Tuple[str, str]]:
+        """Three-way merge local edits with ``remote_content`` for a background pull.
+
+        Returns:
+            ``(merged content, sync status)``, or None when the edits overlap
+            and the document was marked ``conflict``
+        """
+        repository = await self.github_crud.get_repository(db, document.github_repository_id)
+        original_content = await self._get_original_content(db, document, repository)
+        merge_result = await self._three_way_merge(original_content, current_content, remote_content)
+        if merge_result["has_conflicts"]:
+            # Overlapping edits - leave for manual resolution
+            document.github_sync_status = "conflict"
+            document.last_github_sync_at = datetime.utcnow()
+            await db.commit()
+            logger.info(
+                f"Document {document.id} has {len(merge_result['conflicts'])} "
+                f"conflicting change(s) - marked as conflict"
+            )
+            return None
+
+        new_content = merge_result["merged_content"]
+        return new_content, "synced" if new_content == remote_content else "local_changes"
+
     async def pull_document_changes(
         self,
         document_id: int,
         user_id: int,
         remote_content: str,
         remote_sha: str
-    ) -> bool:
-        """Pull remote changes for a document (simplified version for background sync)."""
+    ) -> Optional[str]:
+        """Pull remote changes for a document (simplified version for background sync).
+
+        Local edits are three-way merged with the remote ones; only
+        overlapping edits leave the document in ``conflict``.
+
+        Returns:
+            The document's new sync status, or None if the pull failed
+        """
         async with AsyncSessionLocal() as db:
             try:
                 # Get the document
@@ -454,21 +460,10 @@ class GitHubSyncService(BaseGitHubService):
 
                 if not document:
                     logger.error(f"Document {document_id} not found for user {user_id}")
-                    return False
+                    return None
 
-                # Load current document content from filesystem
                 storage_service = UserStorage()
-                current_content = ""
-                if document.file_path:
-                    try:
-                        content = await storage_service.read_document(
-                            user_id=user_id,
-                            file_path=document.file_path
-                        )
-                        current_content = content or ""
-                    except Exception as e:
-                        logger.warning(f"Failed to load document content from filesystem: {e}")
-                        current_content = ""
+                current_content = await self._read_local_content(storage_service, user_id, document)
 
                 # Check for local changes
                 from .api import GitHubAPIService
@@ -476,16 +471,15 @@ class GitHubSyncService(BaseGitHubService):
                 current_local_hash = api_service.generate_git_blob_hash(current_content)
                 has_local_changes = current_local_hash != document.local_sha
 
+                new_content = remote_content
+                sync_status = "synced"
+                commit_message = f"Background sync: {document.name}"
                 if has_local_changes:
-                    # Local changes exist - mark as conflict for manual resolution
-                    document.github_sync_status = "conflict"
-                    document.last_github_sync_at = datetime.utcnow()
-                    await db.commit()
-                    logger.info(f"Document {document_id} has local changes - marked as conflict")
-                    return True  # Still "successful" in terms of checking
-
-                # No local changes, safe to update
-                new_content_hash = api_service.generate_git_blob_hash(remote_content)
+                    merged = await self._merge_local_changes(db, document, current_content, remote_content)
+                    if merged is None:
+                        return "conflict"
+                    new_content, sync_status = merged
+                    commit_message = f"Background merge from GitHub: {document.name}"
 
                 # Update document content in filesystem
                 if document.file_path:
@@ -493,27 +487,28 @@ class GitHubSyncService(BaseGitHubService):
                         await storage_service.write_document(
                             user_id=user_id,
                             file_path=document.file_path,
-                            content=remote_content,
-                            commit_message=f"Background sync: {document.name}",
+                            content=new_content,
+                            commit_message=commit_message,
                             auto_commit=True
                         )
                     except Exception as e:
                         logger.error(f"Failed to write remote content to filesystem: {e}")
-                        return False
+                        return None
 
-                # Update metadata
+                # Update metadata; local_sha tracks the remote version so merged
+                # local edits still show up as local changes to push
                 document.github_sha = remote_sha
-                document.local_sha = new_content_hash
-                document.github_sync_status = "synced"
+                document.local_sha = api_service.generate_git_blob_hash(remote_content)
+                document.github_sync_status = sync_status
                 document.last_github_sync_at = datetime.utcnow()
 
                 await db.commit()
-                logger.info(f"Document {document_id} background synced successfully")
-                return True
+                logger.info(f"Document {document_id} background synced successfully ({sync_status})")
+                return sync_status
 
             except Exception as e:
                 logger.error(f"Failed to pull document changes for {document_id}: {e}")
-                return False
+                return None
 
 
 # Global service instance
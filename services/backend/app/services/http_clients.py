@@ -0,0 +1,135 @@
+"""Shared outbound HTTP clients, one connection pool per upstream.
+
+Most integrations used to open ``async with httpx.AsyncClient()`` inside
+every method, so each call paid a fresh TCP (and, for api.github.com or the
+LLM providers, TLS) handshake and no connection was ever reused.
+
+``HttpClientRegistry`` keeps one long-lived ``httpx.AsyncClient`` per
+upstream with limits and timeouts tuned for that service.  Clients are
+created on first use and closed by the app lifespan.  HTTP/2 is negotiated
+for public HTTPS upstreams when the ``h2`` package is installed
+(``httpx[http2]``).
+
+Usage::
+
+    client = http_clients.get(GITHUB)
+    response = await client.get(url, headers=headers)
+
+Per-request overrides (e.g. a short health-check timeout) go on the request:
+``await client.get(url, timeout=5.0)``.
+
+The clients are shared by every user, so they never store cookies: a
+``Set-Cookie`` from one user's request (e.g. the GitHub OAuth token exchange)
+must not be replayed on another user's request.
+"""
+import importlib.util
+import logging
+from dataclasses import dataclass, field
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Upstream names
+GITHUB = "github"
+EXPORT = "export"
+EMBEDDING = "embedding"
+LLM = "llm"
+INTERNAL = "internal"
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """Connection settings for one upstream."""
+
+    timeout: httpx.Timeout
+    limits: httpx.Limits
+    http2: bool = False
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+UPSTREAMS: Dict[str, UpstreamConfig] = {
+    # api.github.com: many small calls per sync/import; keep connections warm
+    GITHUB: UpstreamConfig(
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=90.0),
+        http2=True,
+        headers={"User-Agent": "Markdown-Manager/1.0"},
+    ),
+    # Export service: PDF rendering can take tens of seconds
+    EXPORT: UpstreamConfig(
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0),
+    ),
+    EMBEDDING: UpstreamConfig(
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0),
+    ),
+    # LLM providers (Ollama, OpenAI-compatible, GitHub Models): long streams
+    LLM: UpstreamConfig(
+        timeout=httpx.Timeout(120.0, connect=10.0),
+        limits=httpx.Limits(max_connections=40, max_keepalive_connections=10, keepalive_expiry=60.0),
+        http2=True,
+    ),
+    # Health checks and other short internal calls
+    INTERNAL: UpstreamConfig(
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0),
+    ),
+}
+
+
+class HttpClientRegistry:
+    """Lazily created, app-lifetime ``httpx.AsyncClient`` per upstream."""
+
+    def __init__(self, upstreams: Dict[str, UpstreamConfig] = UPSTREAMS):
+        self._upstreams = dict(upstreams)
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Return the shared client for ``name``, creating it on first use."""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            config = self._upstreams[name]
+            client = httpx.AsyncClient(
+                timeout=config.timeout,
+                limits=config.limits,
+                http2=config.http2 and HTTP2_AVAILABLE,
+                headers=config.headers,
+                cookies=self._cookieless_jar(),
+            )
+            self._clients[name] = client
+        return client
+
+    @staticmethod
+    def _cookieless_jar() -> CookieJar:
+        """A cookie jar whose policy accepts no domain, so nothing is stored or sent."""
+        return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+    async def aclose(self) -> None:
+        """Close every client; later ``get`` calls create fresh ones."""
+        clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception:
+                logger.warning("Failed to close HTTP client for %s", name, exc_info=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return which upstream clients are open and their protocol settings."""
+        return {
+            name: {
+                "open": name in self._clients and not self._clients[name].is_closed,
+                "http2": config.http2 and HTTP2_AVAILABLE,
+                "max_connections": config.limits.max_connections,
+            }
+            for name, config in self._upstreams.items()
+        }
+
+
+# Module-level singleton — closed by the app lifespan
+http_clients = HttpClientRegistry()
@@ -148,9 +148,9 @@ class IconService(BaseIconService):
         """Remove expired entries from cache and return count of removed entries."""
         return self.cache.cleanup_expired_entries()
 
-    def invalidate_pack_cache(self, pack_name: str) -> int:
-        """Invalidate cache entries for a specific pack."""
-        return self.cache.invalidate_pack(pack_name)
+    async def invalidate_pack_cache(self, pack_name: str) -> int:
+        """Invalidate cache entries for a specific pack on every worker."""
+        return await self.cache.invalidate_pack_everywhere(pack_name)
 
     def clear_all_cache(self) -> None:
         """Clear all cache entries."""
@@ -1,10 +1,25 @@
-"""Icon cache service with LRU and TTL-based caching."""
+"""Icon cache service with LRU and TTL-based caching.
+
+``IconCache`` is a two-tier cache: the in-process LRU maps (L1) sit in front
+of a Redis tier shared by all workers (L2, see ``redis_cache``).  The
+synchronous ``get_*``/``put_*`` methods only touch L1; the async
+``fetch_*``/``store_*`` methods read through and write through both tiers.
+"""
+import logging
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from threading import Lock
 
 from app.schemas.icon_schemas import IconMetadataResponse
+from .redis_cache import TTL_METADATA, TTL_SVG, IconRedisCache
+from .rendering import SVG_RENDER_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Shared SVG entries are keyed by render version so a deploy that changes
+# the rendering never serves markup produced by the previous code
+_SVG_KIND = f"svg.v{SVG_RENDER_VERSION}"
 
 
 @dataclass
@@ -14,6 +29,8 @@ class CacheStats:
     metadata_misses: int = 0
     svg_hits: int = 0
     svg_misses: int = 0
+    l2_hits: int = 0
+    l2_misses: int = 0
     metadata_size: int = 0
     svg_size: int = 0
 
@@ -29,6 +46,12 @@ class CacheStats:
         total = self.svg_hits + self.svg_misses
         return self.svg_hits / total if total > 0 else 0.0
 
+    @property
+    def l2_hit_ratio(self) -> float:
+        """Calculate shared (Redis) cache hit ratio for L1 misses."""
+        total = self.l2_hits + self.l2_misses
+        return self.l2_hits / total if total > 0 else 0.0
+
 
 @dataclass
 class CacheEntry:
@@ -142,13 +165,17 @@ class IconCache:
         metadata_cache_size: int = 1000,
         svg_cache_size: int = 500,
         svg_ttl_seconds: int = 3600,  # 1 hour
+        shared_cache: Optional[IconRedisCache] = None,
     ):
         """Initialize icon cache with configurable sizes and TTL."""
         self.metadata_cache = LRUCache(metadata_cache_size)
         self.svg_cache = LRUCache(svg_cache_size)
         self.svg_ttl_seconds = svg_ttl_seconds
+        self.shared = shared_cache or IconRedisCache()
         self.stats = CacheStats()
         self.lock = Lock()
+        # Pack versions the L1 entries were filled under
+        self._l1_pack_versions: Dict[str, int] = {}
 
     def get_icon_metadata(self, full_key: str) -> Optional[IconMetadataResponse]:
         """Get icon metadata from cache."""
@@ -188,6 +215,105 @@ class IconCache:
         with self.lock:
             self.stats.svg_size = self.svg_cache.size()
 
+    # -- Two-tier (L1 + shared L2) access ---------------------------------
+
+    async def _sync_pack_version(self, pack_name: str) -> None:
+        """Drop L1 entries of a pack another worker has invalidated."""
+        version = await self.shared.get_pack_version(pack_name)
+        if version is None:
+            return
+        known = self._l1_pack_versions.get(pack_name)
+        if known is not None and known != version:
+            self.invalidate_pack(pack_name)
+        self._l1_pack_versions[pack_name] = version
+
+    def _record_l2(self, hit: bool) -> None:
+        with self.lock:
+            if hit:
+                self.stats.l2_hits += 1
+            else:
+                self.stats.l2_misses += 1
+
+    async def fetch_icon_svg(self, full_key: str) -> Optional[str]:
+        """Get SVG content from L1, falling back to the shared L2 tier."""
+        await self._sync_pack_version(full_key.split(":", 1)[0])
+        svg_content = self.get_icon_svg(full_key)
+        if svg_content:
+            return svg_content
+
+        svg_content = await self.shared.get(_SVG_KIND, full_key)
+        self._record_l2(svg_content is not None)
+        if svg_content:
+            self.put_icon_svg(full_key, svg_content)
+        return svg_content
+
+    async def store_icon_svg(self, full_key: str, svg_content: str) -> None:
+        """Put SVG content in both cache tiers."""
+        self.put_icon_svg(full_key, svg_content)
+        await self.shared.set(_SVG_KIND, full_key, svg_content, TTL_SVG)
+
+    async def fetch_icon_metadata(self, full_key: str) -> Optional[IconMetadataResponse]:
+        """Get icon metadata from L1, falling back to the shared L2 tier."""
+        found, _ = await self.fetch_icon_metadata_many([full_key])
+        return found[0] if found else None
+
+    async def fetch_icon_metadata_many(
+        self, full_keys: List[str]
+    ) -> Tuple[List[IconMetadataResponse], List[str]]:
+        """Resolve several keys through both tiers.
+
+        Returns:
+            Tuple of (cached metadata, keys found in neither tier)
+        """
+        for pack_name in {k.split(":", 1)[0] for k in full_keys}:
+            await self._sync_pack_version(pack_name)
+
+        found: List[IconMetadataResponse] = []
+        l1_misses: List[str] = []
+        for full_key in full_keys:
+            cached = self.get_icon_metadata(full_key)
+            if cached:
+                found.append(cached)
+            else:
+                l1_misses.append(full_key)
+
+        if not l1_misses:
+            return found, []
+
+        raw_values = await self.shared.get_many("meta", l1_misses)
+        missing: List[str] = []
+        for full_key in l1_misses:
+            raw = raw_values.get(full_key)
+            if raw is None:
+                self._record_l2(False)
+                missing.append(full_key)
+                continue
+            try:
+                metadata = IconMetadataResponse.model_validate_json(raw)
+            except ValueError:
+                logger.debug("Discarding undecodable L2 metadata for %s", full_key)
+                self._record_l2(False)
+                missing.append(full_key)
+                continue
+            self._record_l2(True)
+            self.put_icon_metadata(full_key, metadata)
+            found.append(metadata)
+
+        return found, missing
+
+    async def store_icon_metadata(self, full_key: str, metadata: IconMetadataResponse) -> None:
+        """Put icon metadata in both cache tiers."""
+        self.put_icon_metadata(full_key, metadata)
+        await self.shared.set("meta", full_key, metadata.model_dump_json(), TTL_METADATA)
+
+    async def invalidate_pack_everywhere(self, pack_name: str) -> int:
+        """Invalidate a pack locally and bump its shared version for all workers."""
+        invalidated = self.invalidate_pack(pack_name)
+        version = await self.shared.bump_pack_version(pack_name)
+        if version is not None:
+            self._l1_pack_versions[pack_name] = version
+        return invalidated
+
     def invalidate_pack(self, pack_name: str) -> int:
         """Invalidate all cache entries for a specific pack."""
         invalidated_count = 0
@@ -250,6 +376,12 @@ class IconCache:
                     "max_size": self.svg_cache.max_size,
                     "ttl_seconds": self.svg_ttl_seconds,
                 },
+                "shared": {
+                    "hits": self.stats.l2_hits,
+                    "misses": self.stats.l2_misses,
+                    "hit_ratio": self.stats.l2_hit_ratio,
+                    **self.shared.get_stats(),
+                },
                 "memory_estimate_mb": self._estimate_memory_usage(),
                 "performance_metrics": self._get_performance_metrics(),
             }
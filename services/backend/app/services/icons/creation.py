@@ -6,6 +6,7 @@ from sqlalchemy import select
 from app.models.icon_models import IconMetadata, IconPack
 from app.schemas.icon_schemas import IconMetadataResponse, IconPackReference
 from .base import BaseIconService
+from .rendering import SVG_RENDER_VERSION, render_icon_svg
 
 
 class IconCreationService(BaseIconService):
@@ -42,10 +43,13 @@ class IconCreationService(BaseIconService):
                 existing_icon.search_terms = search_terms
                 existing_icon.icon_data = icon_data
                 existing_icon.file_path = file_path
+                existing_icon.rendered_svg = render_icon_svg(icon_data, file_path)
+                existing_icon.rendered_svg_version = SVG_RENDER_VERSION
                 # Note: full_key is computed automatically from pack.name and key
 
                 await self.db.commit()
                 await self.db.refresh(existing_icon)
+                await self.cache.invalidate_pack_everywhere(pack_name)
 
                 # Create response
                 response = IconMetadataResponse.model_validate(existing_icon)
@@ -60,6 +64,8 @@ class IconCreationService(BaseIconService):
                     search_terms=search_terms,
                     icon_data=icon_data,
                     file_path=file_path,
+                    rendered_svg=render_icon_svg(icon_data, file_path),
+                    rendered_svg_version=SVG_RENDER_VERSION,
                     access_count=0
                     # Note: full_key is computed automatically from pack.name and key
                 )
@@ -8,7 +8,9 @@ from sqlalchemy.orm import selectinload
 from app.models.icon_models import IconMetadata, IconPack
 from app.schemas.icon_schemas import IconPackResponse, StandardizedIconPackRequest
 from app.services.document_icon_updater import DocumentIconUpdater
+from app.services.icons.cache import get_icon_cache
 from app.services.icons.naming import humanize_icon_key
+from app.services.icons.rendering import SVG_RENDER_VERSION, render_icon_svg
 
 if TYPE_CHECKING:
     from app.schemas.icon_schemas import IconifyIconData
@@ -54,6 +56,9 @@ class StandardizedIconPackInstaller:
         # Note: icon_count is now computed automatically from relationship
         await self.db.commit()
 
+        # A re-install after delete (e.g. seeder upgrades) must not serve old SVGs
+        await get_icon_cache().invalidate_pack_everywhere(icon_pack.name)
+
         # Query the pack fresh from database to get the icon count
         icon_count_query = select(func.count(IconMetadata.id)).where(IconMetadata.pack_id == icon_pack.id)
         icon_count_result = await self.db.execute(icon_count_query)
@@ -108,6 +113,7 @@ class StandardizedIconPackInstaller:
             await document_updater.update_icon_pack_references(old_pack_name, new_pack_name)
 
         await self.db.commit()
+        await self._invalidate_cache(old_pack_name, new_pack_name)
 
         # Query the pack fresh from database to get the icon count
         icon_count_query = select(func.count(IconMetadata.id)).where(IconMetadata.pack_id == existing_pack.id)
@@ -169,6 +175,7 @@ class StandardizedIconPackInstaller:
 
         # Note: icon_count is now computed automatically via hybrid_property
         await self.db.commit()
+        await self._invalidate_cache(old_pack_name, new_pack_name)
 
         # Query the pack fresh from database to get the icon count
         icon_count_query = select(func.count(IconMetadata.id)).where(IconMetadata.pack_id == existing_pack.id)
@@ -187,6 +194,13 @@ class StandardizedIconPackInstaller:
             updated_at=existing_pack.updated_at
         )
 
+    async def _invalidate_cache(self, old_pack_name: str, new_pack_name: str) -> None:
+        """Invalidate cached icons under both the old and new pack names."""
+        cache = get_icon_cache()
+        await cache.invalidate_pack_everywhere(old_pack_name)
+        if new_pack_name != old_pack_name:
+            await cache.invalidate_pack_everywhere(new_pack_name)
+
     async def _get_existing_pack(self, pack_name: str) -> IconPack:
         """Get existing icon pack by name with icons relationship loaded."""
         query = select(IconPack).where(IconPack.name == pack_name).options(selectinload(IconPack.icons))
@@ -223,18 +237,22 @@ class StandardizedIconPackInstaller:
             height = getattr(icon_data, 'height', width)
             viewBox = getattr(icon_data, 'viewBox', f"0 0 {width} {height}")
 
+            stored_data = {
+                "body": icon_data.body,
+                "width": width,
+                "height": height,
+                "viewBox": viewBox
+            }
+
             icon_metadata = IconMetadata(
                 pack_id=pack_id,
                 key=icon_key,
                 display_name=humanize_icon_key(icon_key),
                 search_terms=search_terms,
-                icon_data={
-                    "body": icon_data.body,
-                    "width": width,
-                    "height": height,
-                    "viewBox": viewBox
-                },
+                icon_data=stored_data,
                 file_path=None,
+                rendered_svg=render_icon_svg(stored_data),
+                rendered_svg_version=SVG_RENDER_VERSION,
                 access_count=0
             )
 
@@ -8,6 +8,7 @@ from sqlalchemy.orm import selectinload
 from app.models.icon_models import IconMetadata, IconPack
 from app.schemas.icon_schemas import IconMetadataResponse, IconPackReference
 from .base import BaseIconService
+from .rendering import SVG_RENDER_VERSION, render_icon_svg
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +20,8 @@ class IconMetadataService(BaseIconService):
         """Get metadata for a specific icon by pack name and key."""
         full_key = f"{pack_name}:{key}"
 
-        # Try cache first
-        cached_metadata = self.cache.get_icon_metadata(full_key)
+        # Try cache first (local, then shared)
+        cached_metadata = await self.cache.fetch_icon_metadata(full_key)
         if cached_metadata:
             return cached_metadata
 
@@ -47,7 +48,7 @@ class IconMetadataService(BaseIconService):
             metadata.urls = None  # Will be set by caller if needed
 
             # Cache the result
-            self.cache.put_icon_metadata(full_key, metadata)
+            await self.cache.store_icon_metadata(full_key, metadata)
             return metadata
         return None
 
@@ -89,20 +90,15 @@ class IconMetadataService(BaseIconService):
             pack_name = icon.pack.name if icon.pack else None
             old_icon_key = icon.key
 
-            # Track if key is changing for document updates
-            key_changed = False
-            if 'key' in metadata and metadata['key'] != icon.key:
-                key_changed = True
-
-            # Update the icon metadata
-            for field, value in metadata.items():
-                if hasattr(icon, field):
-                    setattr(icon, field, value)
+            key_changed = self._apply_metadata(icon, metadata)
 
             # Commit the changes
             await self.db.commit()
             await self.db.refresh(icon)
 
+            if pack_name:
+                await self.cache.invalidate_pack_everywhere(pack_name)
+
             # Update documents if icon key changed
             # Note: For metadata updates, we skip document updates to avoid user context issues
             # Document updates should be handled separately when user context is available
@@ -110,35 +106,47 @@ class IconMetadataService(BaseIconService):
                 logger.info(f"Icon key changed from {old_icon_key} to {icon.key} in pack {pack_name}. "
                             f"Document updates should be handled separately with proper user context.")
 
-            # Let SQLAlchemy handle the relationships automatically
-            response = IconMetadataResponse.model_validate(icon)
-
-            # Override pack with IconPackReference if pack exists
-            if icon.pack:
-                response.pack = IconPackReference.model_validate(icon.pack)
-
-            response.urls = None  # URLs will be added by the router layer
-            return response
+            return self._create_icon_response(icon)
 
         except Exception as e:
             await self.db.rollback()
             raise e
 
+    @staticmethod
+    def _apply_metadata(icon: IconMetadata, metadata: Dict[str, Any]) -> bool:
+        """Copy ``metadata`` onto ``icon``; returns whether the key changed."""
+        key_changed = 'key' in metadata and metadata['key'] != icon.key
+
+        for field, value in metadata.items():
+            if hasattr(icon, field):
+                setattr(icon, field, value)
+
+        # Keep the pre-rendered SVG in step with its source data
+        if 'icon_data' in metadata or 'file_path' in metadata:
+            icon.rendered_svg = render_icon_svg(icon.icon_data, icon.file_path)
+            icon.rendered_svg_version = SVG_RENDER_VERSION
+        return key_changed
+
     async def delete_icon(self, icon_id: int) -> bool:
         """Delete an icon by ID."""
         try:
             # Get the icon
-            query = select(IconMetadata).where(IconMetadata.id == icon_id)
+            query = select(IconMetadata).options(selectinload(IconMetadata.pack)).where(IconMetadata.id == icon_id)
             result = await self.db.execute(query)
             icon = result.scalar_one_or_none()
 
             if not icon:
                 return False
 
+            pack_name = icon.pack.name if icon.pack else None
+
             # Delete the icon
             await self.db.delete(icon)
             await self.db.commit()
 
+            if pack_name:
+                await self.cache.invalidate_pack_everywhere(pack_name)
+
             return True
         except Exception as e:
             await self.db.rollback()
@@ -155,7 +163,7 @@ class IconMetadataService(BaseIconService):
             return [], not_found_keys
 
         # Check cache first
-        cached_icons, uncached_keys = self._get_cached_icons(valid_keys)
+        cached_icons, uncached_keys = await self.cache.fetch_icon_metadata_many(valid_keys)
         if not uncached_keys:
             return cached_icons, not_found_keys
 
@@ -186,20 +194,6 @@ class IconMetadataService(BaseIconService):
 
         return valid_keys, invalid_keys
 
-    def _get_cached_icons(self, valid_keys: List[str]) -> Tuple[List[IconMetadataResponse], List[str]]:
-        """Get cached icons and return cached/uncached lists."""
-        cached_icons = []
-        uncached_keys = []
-
-        for full_key in valid_keys:
-            cached_metadata = self.cache.get_icon_metadata(full_key)
-            if cached_metadata:
-                cached_icons.append(cached_metadata)
-            else:
-                uncached_keys.append(full_key)
-
-        return cached_icons, uncached_keys
-
     async def _bulk_query_icons(self, uncached_keys: List[str]) -> List[IconMetadataResponse]:
         """Perform bulk database query for uncached icons."""
         found_icons = []
@@ -217,7 +211,7 @@ class IconMetadataService(BaseIconService):
             # Convert to response objects and cache them
             for icon in db_icons:
                 metadata = self._create_icon_response(icon)
-                self.cache.put_icon_metadata(icon.full_key, metadata)
+                await self.cache.store_icon_metadata(icon.full_key, metadata)
                 found_icons.append(metadata)
 
         except Exception as e:
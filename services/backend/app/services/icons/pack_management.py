@@ -82,6 +82,7 @@ class IconPackService(BaseIconService):
 
         await self.db.commit()
         await self.db.refresh(pack)
+        await self.cache.invalidate_pack_everywhere(pack_name)
 
         # Get icon count
         icon_count = await self.get_pack_icon_count(pack.id)
@@ -102,6 +103,7 @@ class IconPackService(BaseIconService):
 
             await self.db.delete(pack)
             await self.db.commit()
+            await self.cache.invalidate_pack_everywhere(pack_name)
             return True
 
         except Exception as e:
@@ -0,0 +1,183 @@
+"""
+Redis-backed L2 cache for installed icon metadata and rendered SVGs.
+
+Every backend worker keeps its own in-process ``IconCache`` (L1).  This
+module adds a shared tier behind it so a freshly started worker can serve
+icons that any other worker has already rendered, without touching the
+database.
+
+Keys are namespaced by a per-pack version counter
+(``icons:l2:ver:{pack}``).  Bumping the counter when a pack is installed,
+updated or deleted orphans every key of the previous version in one
+``INCR`` — the stale entries simply age out via their TTL.
+
+Like ``ThirdPartyCache``, connections come from the shared application pool
+and all operations degrade to cache misses when Redis is unavailable.
+"""
+import logging
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+import redis.asyncio as aioredis
+
+from app.services.redis_pool import CONNECTION_ERRORS, is_unreachable, redis_pool
+
+logger = logging.getLogger(__name__)
+
+TTL_SVG = timedelta(hours=24)
+TTL_METADATA = timedelta(hours=6)
+
+_KEY_PREFIX = "icons:l2:"
+# How long a failed connection attempt keeps the L2 tier disabled
+_RETRY_AFTER_SECONDS = 30.0
+
+
+class IconRedisCache:
+    """Shared L2 tier for the icon cache with pack-version keyed invalidation."""
+
+    def __init__(self, version_check_interval: float = 5.0, redis_client: Optional[aioredis.Redis] = None):
+        """Initialize the L2 cache.
+
+        Args:
+            version_check_interval: Seconds a pack version read from Redis is
+                trusted locally before it is re-read.  This bounds how long a
+                worker can serve L1 entries after another worker invalidated
+                the pack.
+            redis_client: Explicit client; defaults to the shared pool
+        """
+        self._redis = redis_client
+        self._disabled_until: float = 0.0
+        self.version_check_interval = version_check_interval
+        # pack_name -> (version, fetched_at)
+        self._versions: Dict[str, tuple[int, float]] = {}
+
+    # -- Redis connection --------------------------------------------------
+
+    async def _get_redis(self) -> Optional[aioredis.Redis]:
+        if time.monotonic() < self._disabled_until:
+            return None
+        if self._redis is not None:
+            return self._redis
+        return await redis_pool.get()
+
+    def _mark_failed(self, exc: BaseException) -> None:
+        """Pause the L2 tier after a connection error; the pool re-verifies Redis."""
+        if is_unreachable(exc):
+            self._disabled_until = time.monotonic() + _RETRY_AFTER_SECONDS
+        redis_pool.mark_failed(exc)
+
+    @property
+    def available(self) -> bool:
+        """Whether the L2 tier is currently connected."""
+        if time.monotonic() < self._disabled_until:
+            return False
+        return self._redis is not None or redis_pool.available
+
+    # -- pack versions -----------------------------------------------------
+
+    async def get_pack_version(self, pack_name: str) -> Optional[int]:
+        """Return the current version of a pack, or ``None`` without Redis."""
+        cached = self._versions.get(pack_name)
+        now = time.monotonic()
+        if cached and now - cached[1] < self.version_check_interval:
+            return cached[0]
+
+        r = await self._get_redis()
+        if r is None:
+            return None
+        try:
+            raw = await r.get(f"{_KEY_PREFIX}ver:{pack_name}")
+        except CONNECTION_ERRORS as exc:
+            logger.debug("Redis GET failed for pack version %s", pack_name)
+            self._mark_failed(exc)
+            return None
+        except Exception:
+            logger.debug("Redis GET rejected for pack version %s", pack_name)
+            return None
+        version = int(raw) if raw is not None else 0
+        self._versions[pack_name] = (version, now)
+        return version
+
+    async def bump_pack_version(self, pack_name: str) -> Optional[int]:
+        """Invalidate every L2 entry of a pack by advancing its version."""
+        self._versions.pop(pack_name, None)
+        r = await self._get_redis()
+        if r is None:
+            return None
+        try:
+            version = int(await r.incr(f"{_KEY_PREFIX}ver:{pack_name}"))
+        except CONNECTION_ERRORS as exc:
+            logger.warning("Redis INCR failed for pack version %s", pack_name)
+            self._mark_failed(exc)
+            return None
+        except Exception:
+            logger.warning("Redis INCR rejected for pack version %s", pack_name, exc_info=True)
+            return None
+        self._versions[pack_name] = (version, time.monotonic())
+        return version
+
+    # -- entries -----------------------------------------------------------
+
+    @staticmethod
+    def _entry_key(kind: str, pack_name: str, version: int, key: str) -> str:
+        return f"{_KEY_PREFIX}{kind}:{pack_name}:{version}:{key}"
+
+    async def get(self, kind: str, full_key: str) -> Optional[str]:
+        """Return the raw cached string for ``kind`` (``svg``/``meta``)."""
+        values = await self.get_many(kind, [full_key])
+        return values.get(full_key)
+
+    async def get_many(self, kind: str, full_keys: List[str]) -> Dict[str, str]:
+        """Fetch several entries with a single ``MGET``."""
+        if not full_keys:
+            return {}
+        redis_keys: List[str] = []
+        requested: List[str] = []
+        for full_key in full_keys:
+            pack_name, _, key = full_key.partition(":")
+            version = await self.get_pack_version(pack_name)
+            if version is None:
+                return {}
+            redis_keys.append(self._entry_key(kind, pack_name, version, key))
+            requested.append(full_key)
+
+        r = await self._get_redis()
+        if r is None:
+            return {}
+        try:
+            raw_values = await r.mget(redis_keys)
+        except CONNECTION_ERRORS as exc:
+            logger.debug("Redis MGET failed for %d icon keys", len(redis_keys))
+            self._mark_failed(exc)
+            return {}
+        except Exception:
+            logger.debug("Redis MGET rejected for %d icon keys", len(redis_keys))
+            return {}
+        return {k: v for k, v in zip(requested, raw_values) if v is not None}
+
+    async def set(self, kind: str, full_key: str, value: str, ttl: timedelta) -> None:
+        """Store a raw string for ``kind`` under the pack's current version."""
+        pack_name, _, key = full_key.partition(":")
+        version = await self.get_pack_version(pack_name)
+        r = await self._get_redis()
+        if version is None or r is None:
+            return
+        try:
+            await r.set(
+                self._entry_key(kind, pack_name, version, key), value,
+                ex=int(ttl.total_seconds()),
+            )
+        except CONNECTION_ERRORS as exc:
+            logger.debug("Redis SET failed for %s", full_key)
+            self._mark_failed(exc)
+        except Exception:
+            logger.debug("Redis SET rejected for %s", full_key)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Return connection state and locally known pack versions."""
+        return {
+            "available": self.available,
+            "known_pack_versions": {name: v for name, (v, _) in self._versions.items()},
+            "version_check_interval": self.version_check_interval,
+        }
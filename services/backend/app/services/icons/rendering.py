@@ -0,0 +1,119 @@
+"""Pure SVG rendering for installed icons.
+
+Rendering is done once when an icon is installed (or its data changes) and
+the result is stored in ``IconMetadata.rendered_svg`` together with
+``SVG_RENDER_VERSION``.  Bump the version whenever the output of
+``render_icon_svg`` changes: stored SVGs from an older version are then
+re-rendered lazily on their next fetch, and cache entries keyed by the old
+version are never read again.
+"""
+import os
+import re
+from typing import Any, Dict, Optional
+
+SVG_RENDER_VERSION = 1
+
+_NAMESPACE_DECL = re.compile(r'xmlns:([^=\s]+)="([^"]*)"')
+_NS_ELEMENT_PREFIX = re.compile(r'<(/?)ns\d+:')
+_NS_ATTR_PREFIX = re.compile(r'\sns\d+:')
+_WHITESPACE = re.compile(r'\s+')
+# <title>, <desc> and XML comments confuse external tools
+# (e.g. Draw.io shows <desc> as a text label)
+_METADATA_ELEMENTS = re.compile(
+    r'<title[^>]*>.*?</title>|<desc[^>]*>.*?</desc>|<!--.*?-->', re.DOTALL
+)
+
+
+def clean_body_for_mermaid(body: str) -> str:
+    """Clean SVG body content for Mermaid use by removing namespaces.
+
+    Mermaid needs clean SVG content without namespace prefixes since
+    it wraps the content in its own SVG element without namespace declarations.
+    """
+    if not body:
+        return body
+
+    # Remove namespace declarations from body
+    body = _NAMESPACE_DECL.sub('', body)
+
+    # Remove namespace prefixes from element names
+    # e.g., <ns0:path> becomes <path>, <ns1:g> becomes <g>
+    body = _NS_ELEMENT_PREFIX.sub(r'<\1', body)
+
+    # Remove namespace prefixes from attributes
+    # e.g., ns1:pageshadow="2" becomes pageshadow="2"
+    body = _NS_ATTR_PREFIX.sub(' ', body)
+
+    # Clean up any extra whitespace
+    return _WHITESPACE.sub(' ', body).strip()
+
+
+def _resolve_dimensions(width: Any, height: Any, viewbox: str) -> tuple[Any, Any]:
+    """Prefer viewBox dimensions when the stored width/height disagree with them."""
+    try:
+        if viewbox != f'0 0 {width} {height}':
+            vb_parts = viewbox.split()
+            if len(vb_parts) == 4:
+                vb_width = float(vb_parts[2])
+                vb_height = float(vb_parts[3])
+                if abs(vb_width - float(width)) > 1 or abs(vb_height - float(height)) > 1:
+                    width = int(vb_width) if vb_width.is_integer() else vb_width
+                    height = int(vb_height) if vb_height.is_integer() else vb_height
+    except (ValueError, IndexError):
+        # Keep original dimensions if viewBox parsing fails
+        pass
+    return width, height
+
+
+def _render_iconify(icon_data: Dict[str, Any]) -> str:
+    """Wrap an Iconify-style ``body`` in a root ``<svg>`` element."""
+    width = icon_data.get('width', 24)
+    height = icon_data.get('height', 24)
+    viewbox = icon_data.get('viewBox', f'0 0 {width} {height}')
+    body = icon_data['body']
+
+    width, height = _resolve_dimensions(width, height, viewbox)
+
+    # Move namespace declarations from the body to the root SVG
+    namespaces = dict(_NAMESPACE_DECL.findall(body))
+    cleaned_body = _METADATA_ELEMENTS.sub('', _NAMESPACE_DECL.sub('', body))
+
+    # Auto-detect xlink usage and add namespace if not explicitly declared
+    if 'xlink:' in cleaned_body and 'xlink' not in namespaces:
+        namespaces['xlink'] = 'http://www.w3.org/1999/xlink'
+
+    xmlns_attrs = 'xmlns="http://www.w3.org/2000/svg"'
+    for prefix, uri in namespaces.items():
+        xmlns_attrs += f' xmlns:{prefix}="{uri}"'
+
+    return (
+        f'<svg width="{width}" height="{height}" viewBox="{viewbox}" '
+        f'{xmlns_attrs}>{cleaned_body}</svg>'
+    )
+
+
+def render_icon_svg(icon_data: Optional[Dict[str, Any]], file_path: Optional[str] = None) -> Optional[str]:
+    """Build the final SVG document for an icon from its stored data.
+
+    Returns ``None`` when the icon has no renderable data.
+    """
+    if icon_data:
+        if not isinstance(icon_data, dict):
+            return None
+        # Full SVG storage (for complex SVGs)
+        if 'full_svg' in icon_data:
+            return icon_data['full_svg']
+        # Iconify-style data
+        if 'body' in icon_data:
+            return _render_iconify(icon_data)
+        return None
+
+    if file_path and os.path.exists(file_path):
+        # File-based SVG (like AWS)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return _METADATA_ELEMENTS.sub('', f.read())
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    return None
@@ -1,74 +1,203 @@
-"""Icon search service."""
-from sqlalchemy import desc, func, select
+"""Icon search service.
+
+Keyword search matches ``search_terms`` with ``ILIKE '%term%'``, which the
+``pg_trgm`` GIN index (``ix_icon_metadata_search_terms_trgm``) serves on
+PostgreSQL.  Results are ranked (exact key, key prefix, other matches) and
+then ordered by popularity; the same sort key doubles as a keyset cursor so
+deep pages do not pay for ``OFFSET``.
+"""
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, func, literal, or_, select, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import ColumnElement, Select
 
 from app.models.icon_models import IconMetadata, IconPack
 from app.schemas.icon_schemas import IconSearchRequest, IconSearchResponse, IconMetadataResponse, IconPackReference
 from .base import BaseIconService
 
+# Below this planner estimate an exact COUNT is cheap enough to run anyway
+ESTIMATE_EXACT_THRESHOLD = 1000
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Optional[Sequence[type]] = None) -> List[Any]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    With ``types``, the cursor must hold exactly one value of each type.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid search cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid search cursor")
+    if types is not None and (
+        len(values) != len(types)
+        or any(isinstance(v, bool) or not isinstance(v, t) for v, t in zip(values, types))
+    ):
+        raise ValueError("Search cursor does not match this query")
+    return values
+
+
+def _after(sort_keys: Sequence[Tuple[ColumnElement, bool]], values: Sequence[Any]) -> ColumnElement:
+    """Build the keyset predicate "row sorts after ``values``".
+
+    ``sort_keys`` is a list of ``(expression, descending)`` pairs; mixed sort
+    directions rule out a plain row-value comparison.
+    """
+    (column, descending), rest = sort_keys[0], sort_keys[1:]
+    value = values[0]
+    beyond = column < value if descending else column > value
+    if not rest:
+        return beyond
+    return or_(beyond, and_(column == value, _after(rest, values[1:])))
+
 
 class IconSearchService(BaseIconService):
     """Service for icon search operations."""
 
     async def search_icons(self, search_request: IconSearchRequest) -> IconSearchResponse:
         """Search for icons based on the given criteria."""
-        query = select(IconMetadata).options(selectinload(IconMetadata.pack))
+        term = search_request.q.lower()
+        filtered = self._filtered_query(search_request, term)
+        rank, sort_keys = self._ranking(term)
+        query = filtered.add_columns(rank.label("rank")).order_by(
+            *(column.desc() if descending else column for column, descending in sort_keys)
+        )
+        query, offset = self._paginate(query, search_request, sort_keys, term)
+
+        # Fetch one extra row to know whether another page exists
+        rows = (await self.db.execute(query.limit(search_request.size + 1))).all()
+        has_next = len(rows) > search_request.size
+        rows = rows[:search_request.size]
+
+        # Count total results; a short first page already is the total
+        total_is_estimate = False
+        if not has_next and not search_request.cursor:
+            total = offset + len(rows)
+        else:
+            total, total_is_estimate = await self._count(filtered, search_request.count)
+
+        next_cursor = None
+        if has_next and rows:
+            last_icon, last_rank = rows[-1]
+            values = [last_icon.access_count, last_icon.key, last_icon.id]
+            next_cursor = encode_cursor([last_rank, *values] if term else values)
+
+        # Calculate pagination metadata
+        pages = (total + search_request.size - 1) // search_request.size
+        has_prev = search_request.page > 0 or bool(search_request.cursor)
+
+        return IconSearchResponse(
+            icons=[self._to_response(icon) for icon, _ in rows],
+            total=total,
+            page=search_request.page,
+            size=search_request.size,
+            pages=pages,
+            has_next=has_next,
+            has_prev=has_prev,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate,
+        )
+
+    @staticmethod
+    def _filtered_query(search_request: IconSearchRequest, term: str) -> Select:
+        """Build the icon query with pack, category and search term filters."""
+        query = select(IconMetadata).options(selectinload(IconMetadata.pack)).join(IconPack)
 
         # Determine pack filter: multi-pack takes priority over single pack
-        packs_filter = search_request.packs
-        if packs_filter:
-            # Multi-pack filter
-            query = query.join(IconPack).where(IconPack.name.in_(packs_filter))
+        if search_request.packs:
+            query = query.where(IconPack.name.in_(search_request.packs))
         elif search_request.pack != "all":
-            query = query.join(IconPack).where(IconPack.name == search_request.pack)
-        else:
-            query = query.join(IconPack)
+            query = query.where(IconPack.name == search_request.pack)
 
         # Add category filter
         if search_request.category != "all":
             query = query.where(IconPack.category == search_request.category)
 
         # Add search term filter
-        if search_request.q:
-            search_term = f"%{search_request.q.lower()}%"
-            query = query.where(IconMetadata.search_terms.ilike(search_term))
+        if term:
+            query = query.where(IconMetadata.search_terms.ilike(f"%{term}%"))
+        return query
 
-        # Count total results before pagination
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
+    @staticmethod
+    def _ranking(term: str) -> Tuple[ColumnElement, List[Tuple[ColumnElement, bool]]]:
+        """Return the rank expression and the ``(expression, descending)`` sort keys.
 
-        # Apply pagination
-        query = query.order_by(desc(IconMetadata.access_count), IconMetadata.key)
-        query = query.offset(search_request.page * search_request.size).limit(search_request.size)
+        Exact and prefix key matches rank first, then popularity.
+        """
+        sort_keys: List[Tuple[ColumnElement, bool]] = [
+            (IconMetadata.access_count, True),
+            (IconMetadata.key, False),
+            (IconMetadata.id, False),
+        ]
+        if not term:
+            return literal(0), sort_keys
 
-        # Execute query
-        result = await self.db.execute(query)
-        icons = result.scalars().all()
+        rank: ColumnElement = case(
+            (func.lower(IconMetadata.key) == term, 0),
+            (func.lower(IconMetadata.key).like(f"{term}%"), 1),
+            else_=2,
+        )
+        return rank, [(rank, False), *sort_keys]
 
-        # Convert to response objects
-        icon_responses = []
-        for icon in icons:
-            metadata = IconMetadataResponse.model_validate(icon)
+    @staticmethod
+    def _paginate(
+        query: Select,
+        search_request: IconSearchRequest,
+        sort_keys: Sequence[Tuple[ColumnElement, bool]],
+        term: str,
+    ) -> Tuple[Select, int]:
+        """Apply keyset pagination when a cursor is given, OFFSET otherwise."""
+        if search_request.cursor:
+            # rank (with a term), access_count, key, id
+            types = [int, int, str, int] if term else [int, str, int]
+            values = decode_cursor(search_request.cursor, types)
+            return query.where(_after(sort_keys, values)), 0
 
-            # Override pack with IconPackReference if pack exists
-            if icon.pack:
-                metadata.pack = IconPackReference.model_validate(icon.pack)
+        offset = search_request.page * search_request.size
+        return query.offset(offset), offset
 
-            metadata.urls = None  # URLs will be set by router if needed
-            icon_responses.append(metadata)
+    @staticmethod
+    def _to_response(icon: IconMetadata) -> IconMetadataResponse:
+        metadata = IconMetadataResponse.model_validate(icon)
 
-        # Calculate pagination metadata
-        pages = (total + search_request.size - 1) // search_request.size
-        has_next = search_request.page < pages - 1
-        has_prev = search_request.page > 0
+        # Override pack with IconPackReference if pack exists
+        if icon.pack:
+            metadata.pack = IconPackReference.model_validate(icon.pack)
 
-        return IconSearchResponse(
-            icons=icon_responses,
-            total=total,
-            page=search_request.page,
-            size=search_request.size,
-            pages=pages,
-            has_next=has_next,
-            has_prev=has_prev
+        metadata.urls = None  # URLs will be set by router if needed
+        return metadata
+
+    async def _count(self, query: Select, mode: str) -> Tuple[int, bool]:
+        """Count rows matched by ``query``; returns ``(total, is_estimate)``."""
+        if mode == "estimated" and self.db.get_bind().dialect.name == "postgresql":
+            estimate = await self._estimate_rows(query)
+            if estimate >= ESTIMATE_EXACT_THRESHOLD:
+                return estimate, True
+
+        count_query = select(func.count()).select_from(query.subquery())
+        total = (await self.db.execute(count_query)).scalar() or 0
+        return total, False
+
+    async def _estimate_rows(self, query: Select) -> int:
+        """Return the planner's row estimate for ``query`` (PostgreSQL only)."""
+        compiled = query.compile(
+            dialect=postgresql.dialect(paramstyle="named"),
+            compile_kwargs={"render_postcompile": True},
         )
+        result = await self.db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"), compiled.params)
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
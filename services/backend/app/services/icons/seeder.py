@@ -1,4 +1,5 @@
 """Auto-seed icon packs from bundled seed JSON files on startup."""
+import asyncio
 import json
 import logging
 import os
@@ -11,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import AsyncSessionLocal
 from app.models.icon_models import IconMetadata, IconPack
 from app.schemas.icon_schemas import IconifyIconData, StandardizedIconPackRequest
+from app.services.document_icon_index import document_icon_indexer
 from app.services.icons.installer import StandardizedIconPackInstaller
 
 logger = logging.getLogger(__name__)
@@ -31,6 +33,10 @@ def _find_seed_dir() -> Optional[Path]:
     return None
 
 
+# Impact notifications still running; held so they are not garbage collected
+_notification_tasks: Set[asyncio.Task] = set()
+
+
 class IconSeeder:
     """Loads .seed.json files and installs/updates packs that are missing or outdated."""
 
@@ -148,8 +154,9 @@ class IconSeeder:
     ) -> None:
         """Compare old and new icon keys before an upgrade.
 
-        When icons are removed, scans documents for broken references and
-        sends per-user notifications identifying affected documents.
+        When icons are removed, looks up documents with broken references in
+        the reference index and sends per-user notifications for them in the
+        background, so an upgrade never waits for the index backfill.
         """
         result = await db.execute(
             select(IconMetadata.key).where(IconMetadata.pack_id == pack.id)
@@ -165,10 +172,9 @@ class IconSeeder:
                 pack.name, new_version, len(removed),
                 ", ".join(sorted(removed)[:20]) + ("..." if len(removed) > 20 else ""),
             )
-            try:
-                await self._notify_impacted_documents(db, pack.name, removed, new_version)
-            except Exception:
-                logger.exception("Failed to scan/notify for removed icons in pack '%s'", pack.name)
+            task = asyncio.create_task(self._notify_impacted_documents(pack.name, removed, new_version))
+            _notification_tasks.add(task)
+            task.add_done_callback(_notification_tasks.discard)
 
         if added:
             logger.info(
@@ -191,153 +197,37 @@ class IconSeeder:
                 pack.name, new_version,
             )
 
-    async def _notify_impacted_documents(
-        self, db: AsyncSession, pack_name: str, removed_keys: Set[str], new_version: str
-    ) -> None:
-        """Scan documents for references to removed icons using grep + targeted reads.
+    async def _notify_impacted_documents(self, pack_name: str, removed_keys: Set[str], new_version: str) -> None:
+        """Notify users whose documents reference removed icons.
 
-        Uses kernel-level ``grep -rl`` to find only files containing the pack
-        prefix, then reads only those files with Python to identify specific
-        removed-key matches.  This avoids reading every document on disk.
+        Affected documents come from the document icon reference index, so
+        no document files are read (apart from the batched backfill of
+        documents that have never been indexed).
         """
-        import asyncio
-        import re
-        from app.routers.notifications import create_notification
-
-        DOCUMENT_ROOT = Path("/documents")
-        if not DOCUMENT_ROOT.is_dir():
-            logger.debug("Document root %s not found — skipping impact scan", DOCUMENT_ROOT)
-            return
-
-        # Step 1: grep for files that reference this pack at all
-        pack_prefix = f"{pack_name}:"
         try:
-            proc = await asyncio.subprocess.create_subprocess_exec(
-                "grep", "-rl", "--include=*.md", pack_prefix, str(DOCUMENT_ROOT),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
-        except FileNotFoundError:
-            logger.warning("grep not available — falling back to full scan")
-            await self._notify_impacted_documents_fallback(db, pack_name, removed_keys, new_version)
-            return
-
-        matching_paths = [p for p in stdout.decode().strip().splitlines() if p]
-        if not matching_paths:
-            logger.debug("No documents reference pack '%s' — nothing to notify", pack_name)
-            return
-
-        logger.info(
-            "grep found %d file(s) referencing '%s' — checking for removed keys",
-            len(matching_paths), pack_name,
-        )
-
-        # Step 2: build regex for removed keys only
-        escaped_keys = [re.escape(k) for k in removed_keys]
-        pattern = re.compile(
-            rf'{re.escape(pack_name)}:({"|".join(escaped_keys)})'
-        )
-
-        # Step 3: read only matching files, extract user_id from path
-        # Path pattern: /documents/{user_id}/local/{category}/{name}.md
-        user_impact: dict[int, dict] = {}
-
-        for fpath in matching_paths:
-            try:
-                parts = Path(fpath).relative_to(DOCUMENT_ROOT).parts
-                user_id = int(parts[0])
-            except (ValueError, IndexError):
-                continue
-
-            try:
-                content = Path(fpath).read_text(errors="replace")
-            except OSError:
-                continue
-
-            matches = set(pattern.findall(content))
-            if not matches:
-                continue
-
-            entry = user_impact.setdefault(user_id, {"broken_icons": set(), "doc_count": 0})
-            entry["broken_icons"].update(matches)
-            entry["doc_count"] += 1
-
-        # Step 4: batch-create notifications for impacted users
-        notified_count = 0
-        for user_id, impact in user_impact.items():
-            broken = impact["broken_icons"]
-            broken_list = ", ".join(sorted(broken)[:10])
-            if len(broken) > 10:
-                broken_list += f" (+{len(broken) - 10} more)"
-
-            # Build markdown detail listing all broken icons
-            detail_lines = [
-                f"## Icon Pack '{pack_name}' — Removed Icons\n",
-                f"Updated to **v{new_version}**. "
-                f"**{len(broken)}** icon(s) referenced in **{impact['doc_count']}** "
-                f"of your document(s) have been removed.\n",
-                "### Removed Icons\n",
-            ]
-            for icon_key in sorted(broken):
-                detail_lines.append(f"- `{pack_name}:{icon_key}`")
-
-            await create_notification(
-                db=db,
-                user_id=user_id,
-                title=f"Icon pack '{pack_name}' updated — {len(broken)} icon(s) removed",
-                message=(
-                    f"The '{pack_name}' icon pack was updated to v{new_version}. "
-                    f"{len(broken)} icon(s) used in your documents were removed: {broken_list}. "
-                    f"Affected documents ({impact['doc_count']}) may show broken icon references."
-                ),
-                category="warning",
-                detail="\n".join(detail_lines),
-            )
-            notified_count += 1
-
-        if notified_count:
-            await db.commit()
-            logger.info(
-                "Notified %d user(s) about broken icon references from pack '%s' upgrade",
-                notified_count, pack_name,
-            )
+            await document_icon_indexer.ensure_indexed()
+            async with AsyncSessionLocal() as db:
+                await self._notify_users(db, pack_name, removed_keys, new_version)
+        except Exception:
+            logger.exception("Failed to scan/notify for removed icons in pack '%s'", pack_name)
 
-    async def _notify_impacted_documents_fallback(
+    async def _notify_users(
         self, db: AsyncSession, pack_name: str, removed_keys: Set[str], new_version: str
     ) -> None:
-        """Fallback scan when grep is unavailable — walks filesystem with Python."""
-        import re
         from app.routers.notifications import create_notification
 
-        DOCUMENT_ROOT = Path("/documents")
-        escaped_keys = [re.escape(k) for k in removed_keys]
-        pattern = re.compile(
-            rf'{re.escape(pack_name)}:({"|".join(escaped_keys)})'
-        )
-        fast_check = f"{pack_name}:"
+        affected = await document_icon_indexer.documents_referencing(db, pack_name, icon_keys=removed_keys)
+        if not affected:
+            logger.debug("No documents reference removed icons of pack '%s' — nothing to notify", pack_name)
+            return
 
         user_impact: dict[int, dict] = {}
-
-        for md_file in DOCUMENT_ROOT.rglob("*.md"):
-            try:
-                parts = md_file.relative_to(DOCUMENT_ROOT).parts
-                user_id = int(parts[0])
-            except (ValueError, IndexError):
-                continue
-            try:
-                content = md_file.read_text(errors="replace")
-            except OSError:
-                continue
-            if fast_check not in content:
-                continue
-            matches = set(pattern.findall(content))
-            if not matches:
-                continue
+        for _, user_id, _, broken_keys in affected:
             entry = user_impact.setdefault(user_id, {"broken_icons": set(), "doc_count": 0})
-            entry["broken_icons"].update(matches)
+            entry["broken_icons"].update(broken_keys)
             entry["doc_count"] += 1
 
+        # Batch-create notifications for impacted users
         notified_count = 0
         for user_id, impact in user_impact.items():
             broken = impact["broken_icons"]
@@ -373,7 +263,7 @@ class IconSeeder:
         if notified_count:
             await db.commit()
             logger.info(
-                "Notified %d user(s) about broken icon references from pack '%s' upgrade (fallback)",
+                "Notified %d user(s) about broken icon references from pack '%s' upgrade",
                 notified_count, pack_name,
             )
 
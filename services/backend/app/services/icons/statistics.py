@@ -8,6 +8,7 @@ from sqlalchemy.orm import selectinload
 
 from app.models.icon_models import IconMetadata, IconPack
 from app.models.document import Document
+from app.services.document_icon_index import document_icon_indexer
 from app.services.document_icon_updater import DocumentIconUpdater
 from .base import BaseIconService
 
@@ -90,15 +91,20 @@ class IconStatisticsService(BaseIconService):
         }
 
     async def _analyze_document_usage(self, user_id: int) -> Dict[str, Any]:
-        """Analyze icon usage in user documents by scanning content."""
+        """Analyze icon usage in user documents from the reference index."""
         try:
+            await document_icon_indexer.ensure_indexed(user_id)
+
             # Get all icon packs for analysis
             packs_query = select(IconPack)
             packs_result = await self.db.execute(packs_query)
-            packs = packs_result.scalars().all()
+            packs = {pack.name: pack for pack in packs_result.scalars().all()}
+
+            docs_count_query = select(func.count(Document.id)).where(Document.user_id == user_id)
+            documents_analyzed = (await self.db.execute(docs_count_query)).scalar() or 0
 
             document_stats = {
-                'documents_analyzed': 0,
+                'documents_analyzed': documents_analyzed,
                 'documents_with_icons': 0,
                 'total_icon_references': 0,
                 'packs_used': {},
@@ -106,37 +112,27 @@ class IconStatisticsService(BaseIconService):
                 'most_used_in_documents': []
             }
 
-            # Get all user documents for analysis
-            docs_query = select(Document).where(Document.user_id == user_id)
-            docs_result = await self.db.execute(docs_query)
-            documents = docs_result.scalars().all()
-
-            document_stats['documents_analyzed'] = len(documents)
+            usage = await document_icon_indexer.pack_usage(self.db, user_id, packs.keys())
 
             icon_usage_counter = {}
             documents_with_icons_set = set()
 
-            # Analyze each pack for document usage
-            for pack in packs:
-                pack_stats = await self.document_updater.get_icon_usage_stats(pack.name, user_id)
-
-                if pack_stats['documents_count'] > 0:
-                    document_stats['packs_used'][pack.name] = {
-                        'display_name': pack.display_name,
-                        'category': pack.category,
-                        'documents_count': pack_stats['documents_count'],
-                        'total_references': pack_stats['total_references'],
-                        'unique_icons_used': pack_stats['unique_icons_used'],
-                        'icons_used': pack_stats['icon_names']
-                    }
+            for pack_name, pack_usage in usage.items():
+                pack = packs[pack_name]
+                document_stats['packs_used'][pack_name] = {
+                    'display_name': pack.display_name,
+                    'category': pack.category,
+                    'documents_count': len(pack_usage['documents']),
+                    'total_references': pack_usage['total_references'],
+                    'unique_icons_used': len(pack_usage['icons']),
+                    'icons_used': sorted(pack_usage['icons'])
+                }
 
-                    # Track documents with icons
-                    documents_with_icons_set.update(range(pack_stats['documents_count']))
+                documents_with_icons_set.update(pack_usage['documents'])
 
-                    # Count icon usage for most used list
-                    for icon_name in pack_stats['icon_names']:
-                        full_key = f"{pack.name}:{icon_name}"
-                        icon_usage_counter[full_key] = icon_usage_counter.get(full_key, 0) + pack_stats['total_references']
+                # Count icon usage for most used list
+                for icon_name, count in pack_usage['icons'].items():
+                    icon_usage_counter[f"{pack_name}:{icon_name}"] = count
 
             document_stats['documents_with_icons'] = len(documents_with_icons_set)
             document_stats['total_icon_references'] = sum(
@@ -168,22 +164,9 @@ class IconStatisticsService(BaseIconService):
             }
 
     async def _count_mermaid_diagrams(self, user_id: int) -> int:
-        """Count Mermaid diagrams in user documents."""
+        """Count Mermaid diagrams in user documents (recorded at index time)."""
         try:
-            docs_query = select(Document).where(Document.user_id == user_id)
-            docs_result = await self.db.execute(docs_query)
-            documents = docs_result.scalars().all()
-
-            mermaid_count = 0
-            mermaid_pattern = re.compile(r'```mermaid\s', re.IGNORECASE | re.MULTILINE)
-
-            for doc in documents:
-                content = await self.document_updater._load_document_content(doc, user_id)
-                matches = mermaid_pattern.findall(content)
-                mermaid_count += len(matches)
-
-            return mermaid_count
-
+            return await document_icon_indexer.mermaid_diagram_count(self.db, user_id)
         except Exception:
             return 0
 
@@ -200,18 +183,22 @@ class IconStatisticsService(BaseIconService):
             if not pack:
                 return {'error': f'Pack {pack_name} not found'}
 
-            # Get documents that use this pack
-            docs_using_pack = await self.document_updater.find_documents_using_pack(pack_name, user_id)
+            # Get documents that use this pack, with the icons each one references
+            docs_using_pack = await document_icon_indexer.documents_referencing(
+                self.db, pack_name, user_id=user_id
+            )
 
             # Get detailed icon usage within documents
             icon_details = {}
             for icon_name in pack_stats['icon_names']:
-                docs_with_icon = await self.document_updater.find_documents_using_icon(
-                    pack_name, icon_name, user_id
-                )
+                docs_with_icon = [
+                    {'id': doc_id, 'name': doc_name}
+                    for doc_id, _, doc_name, icon_keys in docs_using_pack
+                    if icon_name in icon_keys
+                ]
                 icon_details[icon_name] = {
                     'documents_count': len(docs_with_icon),
-                    'documents': [{'id': doc_id, 'name': doc_name} for doc_id, doc_name in docs_with_icon]
+                    'documents': docs_with_icon
                 }
 
             return {
@@ -221,7 +208,7 @@ class IconStatisticsService(BaseIconService):
                 'description': pack.description,
                 'summary': pack_stats,
                 'documents_using_pack': [
-                    {'id': doc_id, 'name': doc_name} for doc_id, doc_name in docs_using_pack
+                    {'id': doc_id, 'name': doc_name} for doc_id, _, doc_name, _ in docs_using_pack
                 ],
                 'icon_usage_details': icon_details
             }
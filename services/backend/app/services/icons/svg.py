@@ -1,13 +1,15 @@
 """Icon SVG and file operations service."""
-import os
-import re
+import logging
 from typing import Optional
 
-from sqlalchemy import and_, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, select, update
 
 from app.models.icon_models import IconMetadata, IconPack
+from app.services.access_tracker import access_tracker
 from .base import BaseIconService
+from .rendering import SVG_RENDER_VERSION, clean_body_for_mermaid, render_icon_svg
+
+logger = logging.getLogger(__name__)
 
 
 class IconSVGService(BaseIconService):
@@ -15,156 +17,65 @@ class IconSVGService(BaseIconService):
 
     @staticmethod
     def clean_body_for_mermaid(body: str) -> str:
-        """Clean SVG body content for Mermaid use by removing namespaces.
-
-        Mermaid needs clean SVG content without namespace prefixes since
-        it wraps the content in its own SVG element without namespace declarations.
-        """
-        if not body:
-            return body
-
-        # Remove namespace declarations from body
-        body = re.sub(r'xmlns:[^=\s]+="[^"]*"', '', body)
-
-        # Remove namespace prefixes from element names
-        # e.g., <ns0:path> becomes <path>, <ns1:g> becomes <g>
-        body = re.sub(r'<(/?)ns\d+:', r'<\1', body)
-
-        # Remove namespace prefixes from attributes
-        # e.g., ns1:pageshadow="2" becomes pageshadow="2"
-        body = re.sub(r'\sns\d+:', ' ', body)
-
-        # Clean up any extra whitespace
-        body = re.sub(r'\s+', ' ', body).strip()
-
-        return body
+        """Clean SVG body content for Mermaid use by removing namespaces."""
+        return clean_body_for_mermaid(body)
 
     async def get_icon_svg(self, pack_name: str, key: str) -> Optional[str]:
         """Get SVG content for an icon."""
         full_key = f"{pack_name}:{key}"
 
         # Try cache first
-        cached_svg = self.cache.get_icon_svg(full_key)
+        cached_svg = await self.cache.fetch_icon_svg(full_key)
         if cached_svg:
-            # Still track usage for cached content
             await self.track_usage(pack_name, key)
             return cached_svg
 
-        # If not in cache, get metadata and generate SVG
-        metadata = await self._get_icon_metadata_for_svg(pack_name, key)
-        if not metadata:
+        # SVGs are rendered at install time; only the stored columns are needed
+        query = (
+            select(
+                IconMetadata.id,
+                IconMetadata.rendered_svg,
+                IconMetadata.rendered_svg_version,
+                IconMetadata.icon_data,
+                IconMetadata.file_path,
+            )
+            .join(IconPack)
+            .where(and_(IconPack.name == pack_name, IconMetadata.key == key))
+        )
+        row = (await self.db.execute(query)).one_or_none()
+        if row is None:
             return None
 
-        # Track usage
         await self.track_usage(pack_name, key)
 
-        # Generate SVG based on icon type
-        svg_content = None
-        if metadata.icon_data:
-            # Handle full SVG storage (for complex SVGs)
-            if isinstance(metadata.icon_data, dict) and 'full_svg' in metadata.icon_data:
-                svg_content = metadata.icon_data['full_svg']
-            # Handle Iconify-style data
-            elif isinstance(metadata.icon_data, dict) and 'body' in metadata.icon_data:
-                width = metadata.icon_data.get('width', 24)
-                height = metadata.icon_data.get('height', 24)
-                viewbox = metadata.icon_data.get('viewBox', f'0 0 {width} {height}')
-                body = metadata.icon_data['body']
-
-                # Fix dimension mismatches: if width/height don't match viewBox, extract from viewBox
-                try:
-                    if viewbox != f'0 0 {width} {height}':
-                        vb_parts = viewbox.split()
-                        if len(vb_parts) == 4:
-                            vb_width = float(vb_parts[2])
-                            vb_height = float(vb_parts[3])
-                            # Use viewBox dimensions if they're significantly different from stored dimensions
-                            if abs(vb_width - float(width)) > 1 or abs(vb_height - float(height)) > 1:
-                                width = int(vb_width) if vb_width.is_integer() else vb_width
-                                height = int(vb_height) if vb_height.is_integer() else vb_height
-                except (ValueError, IndexError):
-                    # Keep original dimensions if viewBox parsing fails
-                    pass
-
-                # Extract namespace declarations from body and move to root SVG
-                namespaces = {}
-                namespace_pattern = r'xmlns:([^=\s]+)="([^"]*)"'
-
-                # Find all namespace declarations in the body
-                for match in re.finditer(namespace_pattern, body):
-                    prefix, uri = match.groups()
-                    namespaces[prefix] = uri
-
-                # Remove namespace declarations from body to avoid duplication
-                cleaned_body = re.sub(namespace_pattern, '', body)
-
-                # Strip <title>, <desc>, and XML comments that confuse
-                # external tools (e.g. Draw.io shows <desc> as a text label)
-                cleaned_body = re.sub(r'<title[^>]*>.*?</title>', '', cleaned_body, flags=re.DOTALL)
-                cleaned_body = re.sub(r'<desc[^>]*>.*?</desc>', '', cleaned_body, flags=re.DOTALL)
-                cleaned_body = re.sub(r'<!--.*?-->', '', cleaned_body, flags=re.DOTALL)
-
-                # Auto-detect xlink usage and add namespace if not explicitly declared
-                if 'xlink:' in cleaned_body and 'xlink' not in namespaces:
-                    namespaces['xlink'] = 'http://www.w3.org/1999/xlink'
-
-                # Build namespace declarations for root SVG
-                xmlns_attrs = 'xmlns="http://www.w3.org/2000/svg"'
-                for prefix, uri in namespaces.items():
-                    xmlns_attrs += f' xmlns:{prefix}="{uri}"'
-
-                svg_content = (
-                    f'<svg width="{width}" height="{height}" viewBox="{viewbox}" '
-                    f'{xmlns_attrs}>{cleaned_body}</svg>'
-                )
-
-        elif metadata.file_path:
-            # Handle file-based SVG (like AWS)
-            if os.path.exists(metadata.file_path):
-                try:
-                    with open(metadata.file_path, 'r', encoding='utf-8') as f:
-                        svg_content = f.read()
-                    # Strip metadata elements that confuse external tools
-                    svg_content = re.sub(r'<title[^>]*>.*?</title>', '', svg_content, flags=re.DOTALL)
-                    svg_content = re.sub(r'<desc[^>]*>.*?</desc>', '', svg_content, flags=re.DOTALL)
-                    svg_content = re.sub(r'<!--.*?-->', '', svg_content, flags=re.DOTALL)
-                except Exception:
-                    # Handle file read errors gracefully
-                    svg_content = None
+        svg_content = row.rendered_svg
+        # A NULL render at the current version means the icon has no
+        # renderable data; it is not re-rendered until its data changes
+        if row.rendered_svg_version != SVG_RENDER_VERSION:
+            # Icon installed before pre-rendering, or rendered by older code
+            svg_content = render_icon_svg(row.icon_data, row.file_path)
+            await self._store_rendered_svg(row.id, svg_content)
 
         # Cache the SVG content if we found it
         if svg_content:
-            self.cache.put_icon_svg(full_key, svg_content)
+            await self.cache.store_icon_svg(full_key, svg_content)
 
         return svg_content
 
-    async def _get_icon_metadata_for_svg(self, pack_name: str, key: str):
-        """Get icon metadata specifically for SVG generation (internal method)."""
-        query = (
-            select(IconMetadata)
-            .options(selectinload(IconMetadata.pack))
-            .join(IconPack)
-            .where(and_(IconPack.name == pack_name, IconMetadata.key == key))
-        )
-
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
-
-    async def track_usage(self, pack_name: str, key: str, user_id: Optional[int] = None) -> None:
-        """Track usage of an icon."""
+    async def _store_rendered_svg(self, icon_id: int, svg_content: Optional[str]) -> None:
+        """Persist a lazily re-rendered SVG so the next miss is a plain read."""
         try:
-            query = (
-                select(IconMetadata)
-                .join(IconPack)
-                .where(and_(IconPack.name == pack_name, IconMetadata.key == key))
+            await self.db.execute(
+                update(IconMetadata)
+                .where(IconMetadata.id == icon_id)
+                .values(rendered_svg=svg_content, rendered_svg_version=SVG_RENDER_VERSION)
             )
-            result = await self.db.execute(query)
-            icon = result.scalar_one_or_none()
-
-            if icon:
-                icon.access_count = icon.access_count + 1
-                await self.db.commit()
-
+            await self.db.commit()
         except Exception:
-            # Don't let usage tracking failures break the main operation
+            # A failed backfill only costs a re-render on the next miss
+            logger.debug("Failed to store rendered SVG for icon %s", icon_id)
             await self.db.rollback()
+
+    async def track_usage(self, pack_name: str, key: str, user_id: Optional[int] = None) -> None:
+        """Track usage of an icon (buffered, flushed in the background)."""
+        access_tracker.record_icon(pack_name, key)
@@ -11,7 +11,7 @@ from typing import Any, Optional
 
 import redis.asyncio as aioredis
 
-from app.configs import settings
+from app.services.redis_pool import CONNECTION_ERRORS, redis_pool
 
 logger = logging.getLogger(__name__)
 
@@ -26,30 +26,18 @@ _KEY_PREFIX = "icons:tp:"
 class ThirdPartyCache:
     """Redis-first cache with in-memory fallback for third-party icon data."""
 
-    def __init__(self):
-        self._redis: Optional[aioredis.Redis] = None
-        self._redis_available: Optional[bool] = None
+    def __init__(self, redis_client: Optional[aioredis.Redis] = None):
+        # Explicit client (tests); otherwise the shared application pool
+        self._redis = redis_client
         # In-memory fallback (mirrors the old behaviour)
         self._mem: dict[str, Any] = {}
 
-    # -- Redis connection (lazy) -------------------------------------------
+    # -- Redis connection --------------------------------------------------
 
     async def _get_redis(self) -> Optional[aioredis.Redis]:
-        if self._redis_available is False:
-            return None
         if self._redis is not None:
             return self._redis
-        try:
-            self._redis = aioredis.from_url(
-                settings.redis_url, decode_responses=True,
-            )
-            await self._redis.ping()
-            self._redis_available = True
-            return self._redis
-        except Exception:
-            logger.warning("Redis unavailable — icon cache falling back to in-memory")
-            self._redis_available = False
-            return None
+        return await redis_pool.get()
 
     # -- public API --------------------------------------------------------
 
@@ -62,8 +50,11 @@ class ThirdPartyCache:
                 raw = await r.get(full_key)
                 if raw is not None:
                     return json.loads(raw)
-            except Exception:
+            except CONNECTION_ERRORS as exc:
                 logger.debug("Redis GET failed for %s, falling back to memory", key)
+                redis_pool.mark_failed(exc)
+            except Exception:
+                logger.debug("Unreadable Redis entry for %s, falling back to memory", key)
         return self._mem.get(full_key)
 
     async def set(self, key: str, value: Any, ttl: timedelta = TTL_COLLECTIONS) -> None:
@@ -76,8 +67,11 @@ class ThirdPartyCache:
         if r is not None:
             try:
                 await r.set(full_key, serialised, ex=int(ttl.total_seconds()))
-            except Exception:
+            except CONNECTION_ERRORS as exc:
                 logger.debug("Redis SET failed for %s", key)
+                redis_pool.mark_failed(exc)
+            except Exception:
+                logger.debug("Redis SET rejected for %s", key)
 
     async def delete(self, key: str) -> None:
         full_key = f"{_KEY_PREFIX}{key}"
@@ -107,8 +101,11 @@ class ThirdPartyCache:
                         await r.delete(*keys)
                     if cursor == 0:
                         break
-            except Exception:
+            except CONNECTION_ERRORS as exc:
                 logger.debug("Redis SCAN/DELETE failed for pattern %s", pattern)
+                redis_pool.mark_failed(exc)
+            except Exception:
+                logger.debug("Redis SCAN/DELETE rejected for pattern %s", pattern)
 
     async def clear_all(self) -> None:
         self._mem.clear()
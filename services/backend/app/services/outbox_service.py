@@ -9,6 +9,9 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
+# Channel the event-publisher relay LISTENs on; the payload is the topic
+OUTBOX_NOTIFY_CHANNEL = "outbox_events"
+
 
 class OutboxEvent(BaseModel):
     """Outbox event data model."""
@@ -53,15 +56,20 @@ class OutboxService:
         """
         event_id = str(uuid.uuid4())
 
-        # Insert into outbox table
-        query = text("""
-            INSERT INTO identity.outbox (
-                event_id, event_type, aggregate_type, aggregate_id,
-                payload, created_at, published, attempts, topic
-            ) VALUES (
-                :event_id, :event_type, :aggregate_type, :aggregate_id,
-                :payload, :created_at, :published, :attempts, :topic
+        # Insert into outbox table and wake the relay; NOTIFY is delivered
+        # only when this transaction commits, so the row is always visible
+        query = text(f"""
+            WITH inserted AS (
+                INSERT INTO identity.outbox (
+                    event_id, event_type, aggregate_type, aggregate_id,
+                    payload, created_at, published, attempts, topic
+                ) VALUES (
+                    :event_id, :event_type, :aggregate_type, :aggregate_id,
+                    :payload, :created_at, :published, :attempts, :topic
+                )
+                RETURNING topic
             )
+            SELECT pg_notify('{OUTBOX_NOTIFY_CHANNEL}', topic) FROM inserted
         """)
 
         await self.db.execute(query, {
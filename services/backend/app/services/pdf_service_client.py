@@ -6,6 +6,8 @@ from typing import Optional
 import httpx
 from fastapi import HTTPException
 
+from app.services.http_clients import EXPORT, http_clients
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,35 +32,35 @@ class ExportServiceClient:
         try:
             logger.info(f"Requesting PDF generation for document: {document_name}")
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "html_content": html_content,
-                    "document_name": document_name,
-                    "is_dark_mode": is_dark_mode,
-                    "options": options or {},
-                }
+            client = http_clients.get(EXPORT)
+            payload = {
+                "html_content": html_content,
+                "document_name": document_name,
+                "is_dark_mode": is_dark_mode,
+                "options": options or {},
+            }
 
-                response = await client.post(
-                    f"{self.base_url}/generate-pdf", json=payload
-                )
+            response = await client.post(
+                f"{self.base_url}/generate-pdf", json=payload, timeout=self.timeout
+            )
 
-                if response.status_code != 200:
-                    error_detail = f"PDF service error: {response.status_code}"
-                    try:
-                        error_data = response.json()
-                        error_detail = error_data.get("detail", error_detail)
-                    except Exception:
-                        pass
+            if response.status_code != 200:
+                error_detail = f"PDF service error: {response.status_code}"
+                try:
+                    error_data = response.json()
+                    error_detail = error_data.get("detail", error_detail)
+                except Exception:
+                    pass
 
-                    logger.error(f"PDF service failed: {error_detail}")
-                    raise HTTPException(
-                        status_code=503,
-                        detail=f"PDF service unavailable: {error_detail}",
-                    )
+                logger.error(f"PDF service failed: {error_detail}")
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"PDF service unavailable: {error_detail}",
+                )
 
-                pdf_bytes = response.content
-                logger.info(f"PDF generated successfully, size: {len(pdf_bytes)} bytes")
-                return pdf_bytes
+            pdf_bytes = response.content
+            logger.info(f"PDF generated successfully, size: {len(pdf_bytes)} bytes")
+            return pdf_bytes
 
         except httpx.TimeoutException:
             logger.error("PDF service timeout")
@@ -80,9 +82,9 @@ class ExportServiceClient:
     async def health_check(self) -> bool:
         """Check if the PDF service is healthy."""
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(5.0)) as client:
-                response = await client.get(f"{self.base_url}/health")
-                return response.status_code == 200
+            client = http_clients.get(EXPORT)
+            response = await client.get(f"{self.base_url}/health", timeout=5.0)
+            return response.status_code == 200
         except Exception as e:
             logger.warning(f"PDF service health check failed: {e}")
             return False
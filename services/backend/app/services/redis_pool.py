@@ -0,0 +1,222 @@
+"""Application-scoped Redis connection pool.
+
+Redis users in the backend (icon caches, semantic search, the analytics rate
+limiter, the cross-app event consumer and publisher, health checks) used to
+call ``redis.asyncio.from_url`` themselves, so every request or cache object
+paid its own TCP handshake and nothing capped the total connection count.
+
+``RedisPool`` owns one ``BlockingConnectionPool`` for the whole process.  It is opened
+in the app lifespan, hands out a client bound to that pool, and backs off for
+a while after a failed connection so callers can degrade to their in-memory
+paths without retrying Redis on every call.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import MaxConnectionsError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from app.configs import settings
+
+logger = logging.getLogger(__name__)
+
+# How long a failed connection attempt keeps Redis marked unavailable
+_RETRY_AFTER_SECONDS = 30.0
+
+# Errors that can mean Redis itself is unreachable; anything else (bad JSON, a
+# rejected command) must leave the pool alone
+CONNECTION_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError)
+
+
+def is_unreachable(exc: BaseException) -> bool:
+    """Whether ``exc`` means Redis could not be reached.
+
+    Running out of pooled connections during a burst raises connection
+    errors too, but says nothing about Redis itself.
+    """
+    if isinstance(exc, MaxConnectionsError):
+        return False
+    if isinstance(exc, RedisConnectionError) and isinstance(exc.__cause__, asyncio.TimeoutError):
+        # BlockingConnectionPool gave up waiting for a free connection
+        return False
+    return isinstance(exc, CONNECTION_ERRORS)
+
+
+class RedisPool:
+    """Shared ``redis.asyncio`` client with health checks and usage counters."""
+
+    MAX_CONNECTIONS = 64
+    # Connections idle longer than this are PINGed before being handed out
+    HEALTH_CHECK_INTERVAL = 30
+    CONNECT_TIMEOUT = 5.0
+    # How long a command waits for a free pooled connection during a burst
+    POOL_TIMEOUT = 5.0
+    # Must exceed the longest blocking read (XREADGROUP BLOCK 5000)
+    SOCKET_TIMEOUT = 10.0
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        max_connections: int = MAX_CONNECTIONS,
+        health_check_interval: int = HEALTH_CHECK_INTERVAL,
+    ):
+        """Initialize the pool (no connection is made until first use).
+
+        Args:
+            url: Redis URL; defaults to ``settings.redis_url``
+            max_connections: Upper bound on open connections for the process
+            health_check_interval: Idle seconds after which a pooled
+                connection is verified before reuse
+        """
+        self._url = url
+        self.max_connections = max_connections
+        self.health_check_interval = health_check_interval
+        self._client: Optional[aioredis.Redis] = None
+        self._verified = False
+        self._disabled_until = 0.0
+        self._counters: Counter[str] = Counter()
+        self._last_ping_ms: Optional[float] = None
+
+    @property
+    def url(self) -> str:
+        return self._url or settings.redis_url
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self) -> bool:
+        """Open the pool and verify connectivity; returns whether Redis is up."""
+        return await self.get() is not None
+
+    async def stop(self) -> None:
+        """Close the client and every pooled connection."""
+        client, self._client = self._client, None
+        self._verified = False
+        if client is not None:
+            await client.aclose(close_connection_pool=True)
+
+    # -- clients -----------------------------------------------------------
+
+    @property
+    def client(self) -> aioredis.Redis:
+        """Client bound to the shared pool.
+
+        Unlike ``get`` this never checks availability, so commands raise on
+        connection errors.  Use it where the caller reports Redis failures
+        itself (health checks, stream consumers).
+        """
+        if self._client is None:
+            # Blocking, so a burst waits for a connection instead of failing
+            pool = aioredis.BlockingConnectionPool.from_url(
+                self.url,
+                decode_responses=True,
+                max_connections=self.max_connections,
+                timeout=self.POOL_TIMEOUT,
+                health_check_interval=self.health_check_interval,
+                socket_timeout=self.SOCKET_TIMEOUT,
+                socket_connect_timeout=self.CONNECT_TIMEOUT,
+                socket_keepalive=True,
+                retry_on_timeout=True,
+            )
+            self._client = aioredis.Redis(connection_pool=pool)
+        return self._client
+
+    async def get(self) -> Optional[aioredis.Redis]:
+        """Return the shared client, or ``None`` while Redis is unavailable."""
+        if self._verified:
+            return self._client
+        if time.monotonic() < self._disabled_until:
+            return None
+        try:
+            await self.ping()
+        except Exception as exc:
+            logger.warning("Redis unavailable (%s) — retrying in %ss", exc, int(_RETRY_AFTER_SECONDS))
+            self._counters["connect_failures"] += 1
+            self._disabled_until = time.monotonic() + _RETRY_AFTER_SECONDS
+            return None
+        self._verified = True
+        return self._client
+
+    def mark_failed(self, exc: Optional[BaseException] = None) -> None:
+        """Report a failed command so ``get`` re-verifies after the back-off.
+
+        When ``exc`` is given, only errors for which ``is_unreachable`` holds
+        start the back-off.
+        """
+        self._counters["command_errors"] += 1
+        if exc is not None and not is_unreachable(exc):
+            return
+        if self._verified:
+            self._verified = False
+            self._disabled_until = time.monotonic() + _RETRY_AFTER_SECONDS
+
+    @property
+    def available(self) -> bool:
+        """Whether the last connectivity check succeeded."""
+        return self._verified
+
+    # -- helpers -----------------------------------------------------------
+
+    async def ping(self) -> float:
+        """PING Redis and return the round-trip time in milliseconds."""
+        start = time.perf_counter()
+        await self.client.ping()
+        self._last_ping_ms = round((time.perf_counter() - start) * 1000, 2)
+        return self._last_ping_ms
+
+    async def pipeline(
+        self,
+        build: Callable[[Pipeline], Any],
+        transaction: bool = False,
+    ) -> Optional[List[Any]]:
+        """Queue commands with ``build`` and send them in one round-trip.
+
+        Returns:
+            The command results, or ``None`` if Redis is unavailable or the
+            pipeline failed
+        """
+        r = await self.get()
+        if r is None:
+            return None
+        try:
+            async with r.pipeline(transaction=transaction) as pipe:
+                build(pipe)
+                queued = len(pipe)
+                results = await pipe.execute()
+        except CONNECTION_ERRORS as exc:
+            logger.debug("Redis pipeline failed", exc_info=True)
+            self.mark_failed(exc)
+            return None
+        except Exception:
+            logger.debug("Redis pipeline rejected", exc_info=True)
+            self._counters["command_errors"] += 1
+            return None
+        self._counters["pipelines"] += 1
+        self._counters["pipelined_commands"] += queued
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool usage and connectivity counters."""
+        pool = self._client.connection_pool if self._client is not None else None
+        in_use = len(getattr(pool, "_in_use_connections", ())) if pool else 0
+        idle = len(getattr(pool, "_available_connections", ())) if pool else 0
+        return {
+            "available": self.available,
+            "max_connections": self.max_connections,
+            "connections_in_use": in_use,
+            "connections_idle": idle,
+            "last_ping_ms": self._last_ping_ms,
+            "connect_failures": self._counters["connect_failures"],
+            "command_errors": self._counters["command_errors"],
+            "pipelines": self._counters["pipelines"],
+            "pipelined_commands": self._counters["pipelined_commands"],
+        }
+
+
+# Module-level singleton — opened and closed by the app lifespan
+redis_pool = RedisPool()
@@ -1,7 +1,7 @@
 """HTTP client for the embedding microservice."""
 import logging
 
-import httpx
+from app.services.http_clients import EMBEDDING, http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -18,29 +18,31 @@ class EmbeddingClient:
 
     async def embed_texts(self, texts: list[str]) -> list[list[float]]:
         """Embed a batch of texts. Returns list of 384-dim float vectors."""
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(
-                f"{self._base_url}/embed",
-                json={"texts": texts},
-            )
-            response.raise_for_status()
-            return response.json()["embeddings"]
+        client = http_clients.get(EMBEDDING)
+        response = await client.post(
+            f"{self._base_url}/embed",
+            json={"texts": texts},
+            timeout=self._timeout,
+        )
+        response.raise_for_status()
+        return response.json()["embeddings"]
 
     async def embed_query(self, query: str) -> list[float]:
         """Embed a single query string. Returns a 384-dim float vector."""
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            response = await client.post(
-                f"{self._base_url}/embed-query",
-                json={"query": query},
-            )
-            response.raise_for_status()
-            return response.json()["embedding"]
+        client = http_clients.get(EMBEDDING)
+        response = await client.post(
+            f"{self._base_url}/embed-query",
+            json={"query": query},
+            timeout=self._timeout,
+        )
+        response.raise_for_status()
+        return response.json()["embedding"]
 
     async def health_check(self) -> bool:
         """Return True if the embedding service is reachable and healthy."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self._base_url}/health")
-                return response.status_code == 200
+            client = http_clients.get(EMBEDDING)
+            response = await client.get(f"{self._base_url}/health", timeout=5.0)
+            return response.status_code == 200
         except Exception:
             return False
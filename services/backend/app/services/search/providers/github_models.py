@@ -7,7 +7,7 @@ import json
 import logging
 from typing import AsyncIterator
 
-import httpx
+from app.services.http_clients import LLM, http_clients
 
 # Models that have rejected optional params (temperature, max_completion_tokens)
 # get cached here so we don't waste a request on every call.
@@ -107,54 +107,54 @@ class GitHubModelsProvider(LLMProvider):
 
     async def _do_stream(self, payload: dict) -> AsyncIterator[str]:
         """Execute a single streaming request and yield tokens."""
-        async with httpx.AsyncClient(timeout=httpx.Timeout(120.0, connect=10.0)) as client:
-            async with client.stream(
-                "POST",
-                self._inference_url("/inference/chat/completions"),
-                json=payload,
-                headers=self._headers(),
-            ) as response:
-                if response.status_code == 429:
-                    body = await response.aread()
-                    retry_after = response.headers.get("retry-after", "")
-                    detail = "Rate limited by GitHub Models"
-                    if retry_after:
-                        detail += f" (retry after {retry_after}s)"
-                    try:
-                        err_data = json.loads(body)
-                        msg = err_data.get("error", {}).get("message", "")
-                        if msg:
-                            detail += f": {msg}"
-                    except (json.JSONDecodeError, AttributeError):
-                        pass
-                    raise RuntimeError(detail)
-                if response.status_code != 200:
-                    body = await response.aread()
-                    detail = f"GitHub Models API error {response.status_code}"
-                    try:
-                        err_data = json.loads(body)
-                        msg = err_data.get("error", {}).get("message", "")
-                        if msg:
-                            detail += f": {msg}"
-                    except (json.JSONDecodeError, AttributeError):
-                        pass
-                    raise RuntimeError(detail)
-                async for line in response.aiter_lines():
-                    line = line.strip()
-                    if not line or not line.startswith("data: "):
-                        continue
-                    data_str = line[6:]
-                    if data_str == "[DONE]":
-                        break
-                    try:
-                        data = json.loads(data_str)
-                        choices = data.get("choices", [])
-                        if choices:
-                            delta = choices[0].get("delta", {})
-                            if token := delta.get("content"):
-                                yield token
-                    except json.JSONDecodeError:
-                        continue
+        client = http_clients.get(LLM)
+        async with client.stream(
+            "POST",
+            self._inference_url("/inference/chat/completions"),
+            json=payload,
+            headers=self._headers(),
+        ) as response:
+            if response.status_code == 429:
+                body = await response.aread()
+                retry_after = response.headers.get("retry-after", "")
+                detail = "Rate limited by GitHub Models"
+                if retry_after:
+                    detail += f" (retry after {retry_after}s)"
+                try:
+                    err_data = json.loads(body)
+                    msg = err_data.get("error", {}).get("message", "")
+                    if msg:
+                        detail += f": {msg}"
+                except (json.JSONDecodeError, AttributeError):
+                    pass
+                raise RuntimeError(detail)
+            if response.status_code != 200:
+                body = await response.aread()
+                detail = f"GitHub Models API error {response.status_code}"
+                try:
+                    err_data = json.loads(body)
+                    msg = err_data.get("error", {}).get("message", "")
+                    if msg:
+                        detail += f": {msg}"
+                except (json.JSONDecodeError, AttributeError):
+                    pass
+                raise RuntimeError(detail)
+            async for line in response.aiter_lines():
+                line = line.strip()
+                if not line or not line.startswith("data: "):
+                    continue
+                data_str = line[6:]
+                if data_str == "[DONE]":
+                    break
+                try:
+                    data = json.loads(data_str)
+                    choices = data.get("choices", [])
+                    if choices:
+                        delta = choices[0].get("delta", {})
+                        if token := delta.get("content"):
+                            yield token
+                except json.JSONDecodeError:
+                    continue
 
     async def _stream_with_retry(
         self, payload: dict, optional_params: dict
@@ -198,67 +198,69 @@ class GitHubModelsProvider(LLMProvider):
     async def health_check(self) -> bool:
         """Validate the API key by listing the model catalog."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self._base_url}/catalog/models",
-                    headers=self._catalog_headers(),
-                )
-                return response.status_code == 200
+            client = http_clients.get(LLM)
+            response = await client.get(
+                f"{self._base_url}/catalog/models",
+                headers=self._catalog_headers(),
+                timeout=10.0,
+            )
+            return response.status_code == 200
         except Exception:
             return False
 
     async def list_models(self) -> list[dict]:
         """Fetch available models with metadata from the GitHub Models catalog."""
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.get(
-                    f"{self._base_url}/catalog/models",
-                    headers=self._catalog_headers(),
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = http_clients.get(LLM)
+            response = await client.get(
+                f"{self._base_url}/catalog/models",
+                headers=self._catalog_headers(),
+                timeout=15.0,
+            )
+            response.raise_for_status()
+            data = response.json()
 
-                # The catalog may return a bare JSON array or a dict wrapper
-                items: list = []
-                if isinstance(data, list):
-                    items = data
-                elif isinstance(data, dict):
-                    # Try common wrapper keys
-                    items = data.get("models") or data.get("data") or data.get("value") or []
-                    if not isinstance(items, list):
-                        items = []
-                    logger.info(
-                        "GitHub Models catalog returned dict with keys=%s, extracted %d items",
-                        list(data.keys()), len(items),
-                    )
-                else:
-                    logger.warning(
-                        "GitHub Models catalog returned unexpected type: %s",
-                        type(data).__name__,
-                    )
+            # The catalog may return a bare JSON array or a dict wrapper
+            items: list = []
+            if isinstance(data, list):
+                items = data
+            elif isinstance(data, dict):
+                # Try common wrapper keys
+                items = data.get("models") or data.get("data") or data.get("value") or []
+                if not isinstance(items, list):
+                    items = []
+                logger.info(
+                    "GitHub Models catalog returned dict with keys=%s, extracted %d items",
+                    list(data.keys()), len(items),
+                )
+            else:
+                logger.warning(
+                    "GitHub Models catalog returned unexpected type: %s",
+                    type(data).__name__,
+                )
 
-                models = []
-                for m in items:
-                    if "id" not in m:
-                        continue
-                    entry: dict = {"id": m["id"]}
-                    if m.get("name"):
-                        entry["name"] = m["name"]
-                    if m.get("publisher"):
-                        entry["publisher"] = m["publisher"]
-                    if m.get("summary"):
-                        entry["description"] = m["summary"][:200]
-                    limits = m.get("limits") or m.get("model_limits") or {}
-                    if limits.get("max_input_tokens"):
-                        entry["context_window"] = limits["max_input_tokens"]
-                    if limits.get("max_output_tokens"):
-                        entry["max_output"] = limits["max_output_tokens"]
-                    if m.get("rate_limit_tier"):
-                        entry["tier"] = m["rate_limit_tier"]
-                    models.append(entry)
-                models.sort(key=lambda x: x["id"])
-                logger.info("GitHub Models catalog: %d models fetched", len(models))
-                return models
+            models = []
+            for m in items:
+                if "id" not in m:
+                    continue
+                entry: dict = {"id": m["id"]}
+                if m.get("name"):
+                    entry["name"] = m["name"]
+                if m.get("publisher"):
+                    entry["publisher"] = m["publisher"]
+                if m.get("summary"):
+                    entry["description"] = m["summary"][:200]
+                limits = m.get("limits") or m.get("model_limits") or {}
+                if limits.get("max_input_tokens"):
+                    entry["context_window"] = limits["max_input_tokens"]
+                if limits.get("max_output_tokens"):
+                    entry["max_output"] = limits["max_output_tokens"]
+                if m.get("rate_limit_tier"):
+                    entry["tier"] = m["rate_limit_tier"]
+                models.append(entry)
+            models.sort(key=lambda x: x["id"])
+            logger.info("GitHub Models catalog: %d models fetched", len(models))
+            return models
         except Exception as exc:
             logger.warning("Failed to list models from GitHub Models: %s", exc)
             return []
@@ -9,6 +9,7 @@ from typing import AsyncIterator
 import httpx
 
 from .base import LLMProvider
+from app.services.http_clients import LLM, http_clients
 from app.services.search.tokens import estimate_messages_tokens
 
 logger = logging.getLogger(__name__)
@@ -79,68 +80,69 @@ class OllamaProvider(LLMProvider):
             "keep_alive": "10m",
         }
 
-        # No read timeout — CPU prefill can take minutes for large prompts.
-        async with httpx.AsyncClient(timeout=httpx.Timeout(None, connect=10.0)) as client:
-            async with client.stream(
-                "POST",
-                f"{self._url}/api/chat",
-                json=payload,
-            ) as response:
-                if response.status_code != 200:
-                    body = await response.aread()
-                    detail = f"Ollama error {response.status_code}"
-                    try:
-                        err_data = json.loads(body)
-                        if msg := err_data.get("error", ""):
-                            detail += f": {msg}"
-                    except (json.JSONDecodeError, AttributeError):
-                        pass
-                    raise RuntimeError(detail)
-                async for line in response.aiter_lines():
-                    if not line.strip():
-                        continue
-                    try:
-                        data = json.loads(line)
-                        message = data.get("message", {})
-                        if token := message.get("content", ""):
-                            yield token
-                        if data.get("done"):
-                            break
-                    except json.JSONDecodeError:
-                        continue
+        client = http_clients.get(LLM)
+        async with client.stream(
+            "POST",
+            f"{self._url}/api/chat",
+            json=payload,
+            # No read timeout — CPU prefill can take minutes for large prompts.
+            timeout=httpx.Timeout(None, connect=10.0),
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                detail = f"Ollama error {response.status_code}"
+                try:
+                    err_data = json.loads(body)
+                    if msg := err_data.get("error", ""):
+                        detail += f": {msg}"
+                except (json.JSONDecodeError, AttributeError):
+                    pass
+                raise RuntimeError(detail)
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    message = data.get("message", {})
+                    if token := message.get("content", ""):
+                        yield token
+                    if data.get("done"):
+                        break
+                except json.JSONDecodeError:
+                    continue
 
     async def health_check(self) -> bool:
         """Return True if Ollama is reachable."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self._url}/api/tags")
-                return response.status_code == 200
+            client = http_clients.get(LLM)
+            response = await client.get(f"{self._url}/api/tags", timeout=5.0)
+            return response.status_code == 200
         except Exception:
             return False
 
     async def list_models(self) -> list[dict]:
         """List locally-available Ollama models via ``/api/tags``."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self._url}/api/tags")
-                response.raise_for_status()
-                data = response.json()
-                models = []
-                for m in data.get("models", []):
-                    name = m.get("name", "")
-                    if not name:
-                        continue
-                    entry: dict = {"id": name, "name": name}
-                    details = m.get("details") or {}
-                    if details.get("parameter_size"):
-                        entry["parameter_size"] = details["parameter_size"]
-                    if m.get("size"):
-                        # Convert bytes to human-readable
-                        size_gb = m["size"] / (1024 ** 3)
-                        entry["size"] = f"{size_gb:.1f} GB" if size_gb >= 1 else f"{m['size'] / (1024 ** 2):.0f} MB"
-                    models.append(entry)
-                models.sort(key=lambda x: x["id"])
-                return models
+            client = http_clients.get(LLM)
+            response = await client.get(f"{self._url}/api/tags", timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+            models = []
+            for m in data.get("models", []):
+                name = m.get("name", "")
+                if not name:
+                    continue
+                entry: dict = {"id": name, "name": name}
+                details = m.get("details") or {}
+                if details.get("parameter_size"):
+                    entry["parameter_size"] = details["parameter_size"]
+                if m.get("size"):
+                    # Convert bytes to human-readable
+                    size_gb = m["size"] / (1024 ** 3)
+                    entry["size"] = f"{size_gb:.1f} GB" if size_gb >= 1 else f"{m['size'] / (1024 ** 2):.0f} MB"
+                models.append(entry)
+            models.sort(key=lambda x: x["id"])
+            return models
         except Exception as exc:
             logger.warning("Failed to list Ollama models: %s", exc)
             return []
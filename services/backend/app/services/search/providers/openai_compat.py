@@ -6,7 +6,7 @@ import json
 import logging
 from typing import AsyncIterator
 
-import httpx
+from app.services.http_clients import LLM, http_clients
 
 from .base import LLMProvider
 from .retry import retry_stream_on_rate_limit
@@ -93,54 +93,54 @@ class OpenAICompatProvider(LLMProvider):
 
     async def _do_stream(self, payload: dict, headers: dict) -> AsyncIterator[str]:
         """Execute a single streaming request and yield tokens."""
-        async with httpx.AsyncClient(timeout=httpx.Timeout(120.0, connect=10.0)) as client:
-            async with client.stream(
-                "POST",
-                f"{self._base_url}/chat/completions",
-                json=payload,
-                headers=headers,
-            ) as response:
-                if response.status_code == 429:
-                    body = await response.aread()
-                    retry_after = response.headers.get("retry-after", "")
-                    detail = f"Rate limited by {self._provider_id}"
-                    if retry_after:
-                        detail += f" (retry after {retry_after}s)"
-                    try:
-                        err_data = json.loads(body)
-                        msg = err_data.get("error", {}).get("message", "")
-                        if msg:
-                            detail += f": {msg}"
-                    except (json.JSONDecodeError, AttributeError):
-                        pass
-                    raise RuntimeError(detail)
-                if response.status_code != 200:
-                    body = await response.aread()
-                    detail = f"{self._provider_id} API error {response.status_code}"
-                    try:
-                        err_data = json.loads(body)
-                        msg = err_data.get("error", {}).get("message", "")
-                        if msg:
-                            detail += f": {msg}"
-                    except (json.JSONDecodeError, AttributeError):
-                        pass
-                    raise RuntimeError(detail)
-                async for line in response.aiter_lines():
-                    line = line.strip()
-                    if not line or not line.startswith("data: "):
-                        continue
-                    data_str = line[6:]  # strip "data: " prefix
-                    if data_str == "[DONE]":
-                        break
-                    try:
-                        data = json.loads(data_str)
-                        choices = data.get("choices", [])
-                        if choices:
-                            delta = choices[0].get("delta", {})
-                            if token := delta.get("content"):
-                                yield token
-                    except json.JSONDecodeError:
-                        continue
+        client = http_clients.get(LLM)
+        async with client.stream(
+            "POST",
+            f"{self._base_url}/chat/completions",
+            json=payload,
+            headers=headers,
+        ) as response:
+            if response.status_code == 429:
+                body = await response.aread()
+                retry_after = response.headers.get("retry-after", "")
+                detail = f"Rate limited by {self._provider_id}"
+                if retry_after:
+                    detail += f" (retry after {retry_after}s)"
+                try:
+                    err_data = json.loads(body)
+                    msg = err_data.get("error", {}).get("message", "")
+                    if msg:
+                        detail += f": {msg}"
+                except (json.JSONDecodeError, AttributeError):
+                    pass
+                raise RuntimeError(detail)
+            if response.status_code != 200:
+                body = await response.aread()
+                detail = f"{self._provider_id} API error {response.status_code}"
+                try:
+                    err_data = json.loads(body)
+                    msg = err_data.get("error", {}).get("message", "")
+                    if msg:
+                        detail += f": {msg}"
+                except (json.JSONDecodeError, AttributeError):
+                    pass
+                raise RuntimeError(detail)
+            async for line in response.aiter_lines():
+                line = line.strip()
+                if not line or not line.startswith("data: "):
+                    continue
+                data_str = line[6:]  # strip "data: " prefix
+                if data_str == "[DONE]":
+                    break
+                try:
+                    data = json.loads(data_str)
+                    choices = data.get("choices", [])
+                    if choices:
+                        delta = choices[0].get("delta", {})
+                        if token := delta.get("content"):
+                            yield token
+                except json.JSONDecodeError:
+                    continue
 
     async def health_check(self) -> bool:
         """Validate the API key by listing models (lightweight call)."""
@@ -154,9 +154,9 @@ class OpenAICompatProvider(LLMProvider):
                 url = f"{workspace_url}/api/2.0/serving-endpoints"
             else:
                 url = f"{self._base_url}/models"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, headers=headers)
-                return response.status_code == 200
+            client = http_clients.get(LLM)
+            response = await client.get(url, headers=headers, timeout=10.0)
+            return response.status_code == 200
         except Exception:
             return False
 
@@ -176,23 +176,24 @@ class OpenAICompatProvider(LLMProvider):
             if self._provider_id == "databricks":
                 return await self._list_databricks_models(headers)
 
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.get(
-                    f"{self._base_url}/models",
-                    headers=headers,
-                )
-                response.raise_for_status()
-                data = response.json()
-                models = []
-                for m in data.get("data", []):
-                    if "id" not in m:
-                        continue
-                    models.append({
-                        "id": m["id"],
-                        "owned_by": m.get("owned_by", ""),
-                    })
-                models.sort(key=lambda x: x["id"])
-                return models
+            client = http_clients.get(LLM)
+            response = await client.get(
+                f"{self._base_url}/models",
+                headers=headers,
+                timeout=15.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            models = []
+            for m in data.get("data", []):
+                if "id" not in m:
+                    continue
+                models.append({
+                    "id": m["id"],
+                    "owned_by": m.get("owned_by", ""),
+                })
+            models.sort(key=lambda x: x["id"])
+            return models
         except Exception as exc:
             logger.warning("Failed to list models from %s: %s", self._base_url, exc)
             return []
@@ -203,62 +204,64 @@ class OpenAICompatProvider(LLMProvider):
         native_base = self._base_url.replace("/openai", "")
         # Google's native API uses x-goog-api-key (not Bearer tokens)
         gemini_headers = {"x-goog-api-key": self._api_key}
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(
-                f"{native_base}/models",
-                headers=gemini_headers,
-            )
-            response.raise_for_status()
-            data = response.json()
-            models = []
-            for m in data.get("models", []):
-                # Gemini model names are like "models/gemini-2.0-flash"
-                raw_name = m.get("name", "")
-                model_id = raw_name.replace("models/", "") if raw_name.startswith("models/") else raw_name
-                if not model_id:
-                    continue
-                entry: dict = {"id": model_id}
-                if m.get("displayName"):
-                    entry["name"] = m["displayName"]
-                if m.get("description"):
-                    entry["description"] = m["description"][:200]
-                if m.get("inputTokenLimit"):
-                    entry["context_window"] = m["inputTokenLimit"]
-                if m.get("outputTokenLimit"):
-                    entry["max_output"] = m["outputTokenLimit"]
-                models.append(entry)
-            models.sort(key=lambda x: x["id"])
-            return models
+        client = http_clients.get(LLM)
+        response = await client.get(
+            f"{native_base}/models",
+            headers=gemini_headers,
+            timeout=15.0,
+        )
+        response.raise_for_status()
+        data = response.json()
+        models = []
+        for m in data.get("models", []):
+            # Gemini model names are like "models/gemini-2.0-flash"
+            raw_name = m.get("name", "")
+            model_id = raw_name.replace("models/", "") if raw_name.startswith("models/") else raw_name
+            if not model_id:
+                continue
+            entry: dict = {"id": model_id}
+            if m.get("displayName"):
+                entry["name"] = m["displayName"]
+            if m.get("description"):
+                entry["description"] = m["description"][:200]
+            if m.get("inputTokenLimit"):
+                entry["context_window"] = m["inputTokenLimit"]
+            if m.get("outputTokenLimit"):
+                entry["max_output"] = m["outputTokenLimit"]
+            models.append(entry)
+        models.sort(key=lambda x: x["id"])
+        return models
 
     async def _list_xai_models(self, headers: dict) -> list[dict]:
         """Use xAI's ``/v1/language-models`` for pricing metadata."""
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(
-                f"{self._base_url}/language-models",
-                headers=headers,
-            )
-            response.raise_for_status()
-            data = response.json()
-            models = []
-            for m in data.get("models", data.get("data", [])):
-                model_id = m.get("id", "")
-                if not model_id:
-                    continue
-                entry: dict = {"id": model_id}
-                # xAI pricing fields (per-token, we convert to per-1M)
-                if m.get("prompt_text_token_price"):
-                    try:
-                        entry["input_price"] = float(m["prompt_text_token_price"]) * 1_000_000
-                    except (ValueError, TypeError):
-                        pass
-                if m.get("completion_text_token_price"):
-                    try:
-                        entry["output_price"] = float(m["completion_text_token_price"]) * 1_000_000
-                    except (ValueError, TypeError):
-                        pass
-                models.append(entry)
-            models.sort(key=lambda x: x["id"])
-            return models
+        client = http_clients.get(LLM)
+        response = await client.get(
+            f"{self._base_url}/language-models",
+            headers=headers,
+            timeout=15.0,
+        )
+        response.raise_for_status()
+        data = response.json()
+        models = []
+        for m in data.get("models", data.get("data", [])):
+            model_id = m.get("id", "")
+            if not model_id:
+                continue
+            entry: dict = {"id": model_id}
+            # xAI pricing fields (per-token, we convert to per-1M)
+            if m.get("prompt_text_token_price"):
+                try:
+                    entry["input_price"] = float(m["prompt_text_token_price"]) * 1_000_000
+                except (ValueError, TypeError):
+                    pass
+            if m.get("completion_text_token_price"):
+                try:
+                    entry["output_price"] = float(m["completion_text_token_price"]) * 1_000_000
+                except (ValueError, TypeError):
+                    pass
+            models.append(entry)
+        models.sort(key=lambda x: x["id"])
+        return models
 
     async def _list_databricks_models(self, headers: dict) -> list[dict]:
         """List available serving endpoints from Databricks workspace."""
@@ -267,27 +270,27 @@ class OpenAICompatProvider(LLMProvider):
         if workspace_url.endswith("/serving-endpoints"):
             workspace_url = workspace_url[: -len("/serving-endpoints")]
         api_url = f"{workspace_url}/api/2.0/serving-endpoints"
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(api_url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            models = []
-            for ep in data.get("endpoints", []):
-                name = ep.get("name", "")
-                if not name:
-                    continue
-                state = ep.get("state", {}).get("ready", "")
-                if state != "READY":
-                    continue
-                entry: dict = {"id": name}
-                # Extract model info from served entities if available
-                config = ep.get("config", {})
-                served = config.get("served_entities", config.get("served_models", []))
-                if served:
-                    entity = served[0]
-                    foundation_model = entity.get("foundation_model_name", "")
-                    if foundation_model:
-                        entry["name"] = foundation_model
-                models.append(entry)
-            models.sort(key=lambda x: x["id"])
-            return models
+        client = http_clients.get(LLM)
+        response = await client.get(api_url, headers=headers, timeout=15.0)
+        response.raise_for_status()
+        data = response.json()
+        models = []
+        for ep in data.get("endpoints", []):
+            name = ep.get("name", "")
+            if not name:
+                continue
+            state = ep.get("state", {}).get("ready", "")
+            if state != "READY":
+                continue
+            entry: dict = {"id": name}
+            # Extract model info from served entities if available
+            config = ep.get("config", {})
+            served = config.get("served_entities", config.get("served_models", []))
+            if served:
+                entity = served[0]
+                foundation_model = entity.get("foundation_model_name", "")
+                if foundation_model:
+                    entry["name"] = foundation_model
+            models.append(entry)
+        models.sort(key=lambda x: x["id"])
+        return models
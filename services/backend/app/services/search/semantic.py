@@ -7,6 +7,7 @@ Redis caching avoids repeated embedding + search for similar queries.
 from __future__ import annotations
 
 import hashlib
+import json
 import logging
 from dataclasses import dataclass
 
@@ -31,6 +32,9 @@ logger = logging.getLogger(__name__)
 # Redis cache TTL for search results (seconds)
 _SEARCH_CACHE_TTL = 120
 _SEARCH_CACHE_PREFIX = "search:v1:"
+# Query embeddings depend only on the query text and the embedding model
+_QUERY_EMBEDDING_TTL = 3600
+_QUERY_EMBEDDING_PREFIX = f"search:qemb:v1:{EMBEDDING_DIM}:"
 
 
 def _get_filesystem() -> Filesystem:
@@ -237,6 +241,26 @@ class SemanticSearchService:
         except Exception:
             logger.debug("Failed to invalidate search cache", exc_info=True)
 
+    async def _embed_query(self, query: str) -> list[float]:
+        """Embed a search query, reusing the cached vector from Redis if present."""
+        key = _QUERY_EMBEDDING_PREFIX + _sha256(query)
+        if self._redis:
+            try:
+                cached = await self._redis.get(key)
+                if cached:
+                    return json.loads(cached)
+            except Exception:
+                logger.debug("Failed to read cached query embedding", exc_info=True)
+
+        vector = await self._client.embed_query(query)
+
+        if self._redis:
+            try:
+                await self._redis.set(key, json.dumps(vector), ex=_QUERY_EMBEDDING_TTL)
+            except Exception:
+                logger.debug("Failed to cache query embedding", exc_info=True)
+        return vector
+
     async def search(
         self,
         db: AsyncSession,
@@ -258,7 +282,7 @@ class SemanticSearchService:
         If *category_id* is provided, results are limited to that category.
         """
         try:
-            query_vector = await self._client.embed_query(query)
+            query_vector = await self._embed_query(query)
         except Exception:
             logger.exception("Failed to embed search query")
             return []
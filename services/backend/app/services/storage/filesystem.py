@@ -14,6 +14,8 @@ import logging
 from datetime import datetime
 
 from app.configs.settings import get_settings
+from app.services.document_icon_index import document_icon_indexer
+from app.services.storage.usage import file_size, storage_usage
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -124,9 +126,14 @@ class Filesystem:
             # Ensure parent directory exists
             full_path.parent.mkdir(parents=True, exist_ok=True)
 
+            old_size = file_size(full_path)
             async with aiofiles.open(full_path, 'w', encoding='utf-8') as f:
                 await f.write(content)
 
+            # Keep the document -> icon reference index current
+            document_icon_indexer.schedule(user_id, file_path, content)
+            storage_usage.record_file_change(full_path, old_size, file_size(full_path))
+
             logger.info(f"Successfully wrote document: {full_path}")
             return True
 
@@ -159,7 +166,11 @@ class Filesystem:
             new_full_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Move the file
+            size = file_size(old_full_path)
+            replaced_size = file_size(new_full_path)
             shutil.move(str(old_full_path), str(new_full_path))
+            storage_usage.record_file_change(old_full_path, size, None)
+            storage_usage.record_file_change(new_full_path, replaced_size, size)
 
             logger.info(f"Successfully moved document from {old_full_path} to {new_full_path}")
             return True
@@ -186,7 +197,9 @@ class Filesystem:
                 logger.warning(f"Document not found for deletion: {full_path}")
                 return False
 
+            size = file_size(full_path)
             full_path.unlink()
+            storage_usage.record_file_change(full_path, size, None)
 
             logger.info(f"Successfully deleted document: {full_path}")
             return True
@@ -0,0 +1,229 @@
+"""Cached disk-usage accounting for user directories and GitHub clones.
+
+Storage limits, pruning and the admin storage views used to walk every file
+of every clone with ``rglob('*')`` + ``stat()`` on each call, on the event
+loop.  ``StorageUsageTracker`` keeps the last measured usage per directory
+(a clone, a user's GitHub directory, a user root):
+
+* Reads return the cached figure; a directory is only scanned the first time
+  it is asked for.
+* Clones, pulls and prunes rescan (or drop) just the affected repository and
+  apply the difference to every tracked directory containing it, so user
+  totals stay current without walking the user's other repositories.
+* Document writes, moves and deletes apply the file's size change to every
+  tracked directory containing it, without scanning.  A background loop
+  rescans directories whose previous usage was unknown and reconciles every
+  tracked directory periodically, which also picks up changes made outside
+  these notifications.
+
+Scans use ``os.scandir`` in a worker thread and never follow symlinks.
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DirectoryUsage:
+    """Disk usage of one directory tree at ``measured_at``."""
+
+    size_bytes: int = 0
+    file_count: int = 0
+    directory_count: int = 0
+    # Paths (relative to the scanned directory) that contain a ``.git`` entry
+    git_repositories: Tuple[str, ...] = ()
+    measured_at: float = 0.0
+
+
+def file_size(path: Path) -> Optional[int]:
+    """Return the size of file ``path``, or ``None`` when it does not exist."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+def scan_directory(root: Path) -> DirectoryUsage:
+    """Measure ``root`` with ``os.scandir``; blocking, run it off the event loop."""
+    size = files = directories = 0
+    git_repositories = []
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            directories += 1
+                            if entry.name == ".git":
+                                git_repositories.append(os.path.relpath(current, root))
+                            stack.append(Path(entry.path))
+                        elif entry.is_file(follow_symlinks=False):
+                            files += 1
+                            size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return DirectoryUsage(
+        size_bytes=size,
+        file_count=files,
+        directory_count=directories,
+        git_repositories=tuple(sorted(git_repositories)),
+        measured_at=time.time(),
+    )
+
+
+class StorageUsageTracker:
+    """Per-directory usage cache kept current by change notifications."""
+
+    DIRTY_REFRESH_SECONDS = 10.0
+    RECONCILE_INTERVAL_SECONDS = 15 * 60.0
+
+    def __init__(self):
+        self._usage: Dict[Path, DirectoryUsage] = {}
+        self._dirty: Set[Path] = set()
+        self._task: asyncio.Task | None = None
+        self._stats = {"scans": 0, "hits": 0}
+
+    @staticmethod
+    def _key(path: Path) -> Path:
+        return Path(os.path.abspath(path))
+
+    async def get(self, path: Path) -> DirectoryUsage:
+        """Return cached usage for ``path``, scanning it on first use."""
+        key = self._key(path)
+        usage = self._usage.get(key)
+        if usage is not None:
+            self._stats["hits"] += 1
+            return usage
+        return await self.refresh(key)
+
+    async def refresh(self, path: Path) -> DirectoryUsage:
+        """Rescan ``path`` now and propagate the change to tracked ancestors.
+
+        Ancestors only receive the difference when ``path`` was already
+        tracked; otherwise its previous contribution is unknown and they are
+        marked dirty instead.
+        """
+        key = self._key(path)
+        return await self._rescan(key, self._usage.get(key))
+
+    async def add(self, path: Path) -> DirectoryUsage:
+        """Start tracking a directory that did not exist before (e.g. a new clone)."""
+        key = self._key(path)
+        return await self._rescan(key, DirectoryUsage())
+
+    def forget(self, path: Path) -> None:
+        """Drop ``path`` (e.g. a deleted clone) and its tracked subdirectories."""
+        key = self._key(path)
+        removed = self._usage.get(key)
+        for tracked in [p for p in self._usage if p == key or key in p.parents]:
+            self._usage.pop(tracked, None)
+            self._dirty.discard(tracked)
+        self._propagate(key, removed, DirectoryUsage())
+
+    async def _rescan(self, key: Path, previous: DirectoryUsage | None) -> DirectoryUsage:
+        self._dirty.discard(key)
+        if key.exists():
+            usage = await asyncio.to_thread(scan_directory, key)
+            self._stats["scans"] += 1
+            self._usage[key] = usage
+        else:
+            usage = DirectoryUsage(measured_at=time.time())
+            self._usage.pop(key, None)
+        self._propagate(key, previous, usage)
+        return usage
+
+    def _propagate(self, key: Path, old: DirectoryUsage | None, new: DirectoryUsage) -> None:
+        """Apply the change of ``key`` from ``old`` to ``new`` to tracked ancestors."""
+        for ancestor in key.parents:
+            current = self._usage.get(ancestor)
+            if current is None:
+                continue
+            if old is None:
+                self._dirty.add(ancestor)
+                continue
+            rel = key.relative_to(ancestor).as_posix()
+            repositories = {
+                r for r in current.git_repositories
+                if r != rel and not r.startswith(rel + "/")
+            }
+            repositories.update(rel if r == "." else f"{rel}/{r}" for r in new.git_repositories)
+            self._usage[ancestor] = replace(
+                current,
+                size_bytes=max(0, current.size_bytes + new.size_bytes - old.size_bytes),
+                file_count=max(0, current.file_count + new.file_count - old.file_count),
+                directory_count=max(0, current.directory_count + new.directory_count - old.directory_count),
+                git_repositories=tuple(sorted(repositories)),
+            )
+
+    def record_file_change(self, path: Path, old_size: Optional[int], new_size: Optional[int]) -> None:
+        """Apply one file's size change to every tracked directory containing it.
+
+        ``old_size`` and ``new_size`` are the file's size before and after
+        the change, ``None`` when it did not exist.  Nothing is scanned;
+        directories created alongside the file are counted at the next
+        reconcile.
+        """
+        if old_size == new_size:
+            return
+        self._propagate(self._key(path), self._file_usage(old_size), self._file_usage(new_size))
+
+    @staticmethod
+    def _file_usage(size: Optional[int]) -> DirectoryUsage:
+        if size is None:
+            return DirectoryUsage()
+        return DirectoryUsage(size_bytes=size, file_count=1)
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start the background refresh/reconcile loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop the background loop."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        last_reconcile = time.monotonic()
+        while True:
+            await asyncio.sleep(self.DIRTY_REFRESH_SECONDS)
+            try:
+                if time.monotonic() - last_reconcile >= self.RECONCILE_INTERVAL_SECONDS:
+                    self._dirty.update(self._usage)
+                    last_reconcile = time.monotonic()
+                await self.refresh_dirty()
+            except Exception:
+                logger.exception("Storage usage refresh failed")
+
+    async def refresh_dirty(self) -> int:
+        """Rescan every dirty directory; returns how many were rescanned."""
+        dirty, self._dirty = self._dirty, set()
+        # Deepest first so ancestors rescanned later are not left dirty again
+        for path in sorted(dirty, key=lambda p: len(p.parts), reverse=True):
+            await self._rescan(path, self._usage.get(path))
+        return len(dirty)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        return {**self._stats, "tracked": len(self._usage), "dirty": len(self._dirty)}
+
+
+# Module-level singleton, started and stopped by the app lifespan
+storage_usage = StorageUsageTracker()
@@ -1,5 +1,4 @@
 """Unified Document Service - Single interface for all document types."""
-from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -254,15 +253,9 @@ class UnifiedDocumentService:
             return {"has_changes": False, "status": "error"}
 
     async def _update_last_opened(self, db: AsyncSession, document: Document):
-        """Update last opened timestamp."""
-        try:
-            document.last_opened_at = datetime.utcnow()
-            db.add(document)
-            await db.commit()
-        except Exception as e:
-            # Log the error but don't fail the whole request over timestamp update
-            print(f"Warning: Failed to update last_opened_at: {e}")
-            await db.rollback()
+        """Update last opened timestamp (buffered, flushed in the background)."""
+        from app.services.access_tracker import access_tracker
+        access_tracker.record_document_opened(document.id)
 
 
 # Global service instance
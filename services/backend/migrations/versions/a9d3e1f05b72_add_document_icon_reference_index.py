@@ -0,0 +1,58 @@
+"""add document icon reference index tables
+
+Revision ID: a9d3e1f05b72
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-18
+
+Tables start empty; documents are indexed when next written, and any
+document without a document_icon_index row is indexed lazily the first time
+usage statistics or pack-impact checks need it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "a9d3e1f05b72"
+down_revision: Union[str, Sequence[str], None] = "d4e5f6a7b8c9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_icon_index",
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False,
+                  comment="SHA-256 of the indexed content"),
+        sa.Column("mermaid_diagrams", sa.Integer(), nullable=False,
+                  comment="Number of ```mermaid fences"),
+        sa.Column("indexed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("document_id"),
+    )
+    op.create_table(
+        "document_icon_references",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("pack_name", sa.String(length=100), nullable=False),
+        sa.Column("icon_key", sa.String(length=255), nullable=False),
+        sa.Column("context", sa.String(length=20), nullable=False,
+                  comment="'mermaid' (inside a mermaid fence) or 'markdown'"),
+        sa.Column("occurrences", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["document_id"], ["documents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("document_id", "pack_name", "icon_key", "context",
+                            name="uq_document_icon_reference"),
+    )
+    op.create_index(
+        "ix_document_icon_references_pack_icon",
+        "document_icon_references",
+        ["pack_name", "icon_key"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_icon_references_pack_icon", table_name="document_icon_references")
+    op.drop_table("document_icon_references")
+    op.drop_table("document_icon_index")
@@ -0,0 +1,50 @@
+"""outbox partial indexes for pending rows and retention
+
+Revision ID: b7e2c4d91f30
+Revises: a9d3e1f05b72
+Create Date: 2026-10-18
+
+The relay only ever reads unpublished rows, and the retention job only ever
+deletes old published rows, so both get partial indexes whose size tracks
+the backlog / the retention window instead of the whole table.  The full
+boolean index on ``published`` is useless at this selectivity and is dropped,
+as is the narrower pending index superseded by the composite one.
+
+The pending index leads with ``created_at`` because the relay reads
+``ORDER BY created_at LIMIT n`` and filters ``next_attempt_at IS NULL OR
+next_attempt_at <= now()``.  The OR cannot be an index condition, but in
+``created_at`` order the scan stops after ``n`` due rows instead of sorting
+every pending row.  The same index answers the oldest-pending gauge
+(``MIN(created_at)``).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "b7e2c4d91f30"
+down_revision: Union[str, Sequence[str], None] = "a9d3e1f05b72"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_identity_outbox_pending
+        ON identity.outbox (created_at, next_attempt_at)
+        WHERE published = FALSE
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_identity_outbox_published_at
+        ON identity.outbox (published_at)
+        WHERE published = TRUE
+    """)
+    op.execute("DROP INDEX IF EXISTS identity.idx_identity_outbox_next_attempt")
+    op.execute("DROP INDEX IF EXISTS identity.idx_identity_outbox_published")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_identity_outbox_published ON identity.outbox(published)")
+    op.execute("""CREATE INDEX IF NOT EXISTS idx_identity_outbox_next_attempt
+                  ON identity.outbox(next_attempt_at) WHERE published = FALSE""")
+    op.execute("DROP INDEX IF EXISTS identity.idx_identity_outbox_published_at")
+    op.execute("DROP INDEX IF EXISTS identity.idx_identity_outbox_pending")
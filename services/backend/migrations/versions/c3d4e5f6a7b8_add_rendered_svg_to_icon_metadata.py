@@ -0,0 +1,34 @@
+"""add pre-rendered SVG columns to icon_metadata
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-18
+
+Existing rows are left NULL; they are rendered lazily on their first fetch
+(or eagerly the next time the seeder reinstalls their pack).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "c3d4e5f6a7b8"
+down_revision: Union[str, Sequence[str], None] = "b2c3d4e5f6a7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("icon_metadata", sa.Column(
+        "rendered_svg", sa.Text(), nullable=True,
+        comment="Final SVG markup rendered from icon_data/file_path",
+    ))
+    op.add_column("icon_metadata", sa.Column(
+        "rendered_svg_version", sa.Integer(), nullable=True,
+        comment="SVG_RENDER_VERSION that produced rendered_svg",
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column("icon_metadata", "rendered_svg_version")
+    op.drop_column("icon_metadata", "rendered_svg")
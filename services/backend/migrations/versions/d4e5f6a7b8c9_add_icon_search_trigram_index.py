@@ -0,0 +1,40 @@
+"""add trigram and popularity indexes for icon keyword search
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-18
+
+``search_terms ILIKE '%term%'`` cannot use a btree index; a pg_trgm GIN index
+serves it.  The popularity index matches the search ordering
+(access_count DESC, key, id) used for keyset pagination.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, Sequence[str], None] = "c3d4e5f6a7b8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_icon_metadata_search_terms_trgm",
+        "icon_metadata",
+        ["search_terms"],
+        postgresql_using="gin",
+        postgresql_ops={"search_terms": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_icon_metadata_popularity",
+        "icon_metadata",
+        [sa.text("access_count DESC"), "key", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_icon_metadata_popularity", table_name="icon_metadata")
+    op.drop_index("ix_icon_metadata_search_terms_trgm", table_name="icon_metadata")
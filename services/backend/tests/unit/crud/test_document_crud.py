@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.document import DocumentCRUD
+from app.services.access_tracker import AccessTracker
 from app.models.document import Document
 from app.models.category import Category
 from app.models.user import User
@@ -341,11 +342,13 @@ class TestDocumentCRUD:
         mock_db.commit = AsyncMock()
 
         # Call method
-        await document_crud.mark_document_opened(mock_db, document_id=1, user_id=1)
+        with patch("app.services.access_tracker.access_tracker", AccessTracker()) as tracker:
+            await document_crud.mark_document_opened(mock_db, document_id=1, user_id=1)
 
-        # Assert last_opened_at was updated
+        # Assert last_opened_at was updated and buffered instead of committed
         assert sample_document.last_opened_at is not None
-        mock_db.commit.assert_called_once()
+        assert tracker.pending_documents == {1: sample_document.last_opened_at}
+        mock_db.commit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_search_documents_success(self, document_crud, mock_db, sample_document):
@@ -491,3 +494,38 @@ class TestDocumentCRUD:
         # Assert document creation
         mock_db.add.assert_called_once()
         mock_db.commit.assert_called_once()
+
+
+class TestGitHubUpsertNameConflicts:
+    """Rows that would violate uq_user_folder_name are rejected up front."""
+
+    @staticmethod
+    def _row(branch, path, folder_path):
+        return {
+            "user_id": 1, "name": path.split("/")[-1], "folder_path": folder_path,
+            "github_repository_id": 3, "github_file_path": path, "github_branch": branch,
+        }
+
+    async def test_taken_folder_and_name_are_rejected(self, document_crud):
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from app.models.base import Base
+
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Document.__table__])
+        async with async_sessionmaker(engine)() as db:
+            db.add(Document(
+                name="a.md", user_id=1, folder_path="/GitHub/docs/feature/x",
+                github_repository_id=3, github_file_path="x/a.md", github_branch="feature",
+            ))
+            await db.commit()
+
+            own = self._row("feature", "x/a.md", "/GitHub/docs/feature/x")
+            clash = self._row("feature/x", "a.md", "/GitHub/docs/feature/x")
+            first = self._row("main", "b.md", "/GitHub/docs/main")
+            duplicate = self._row("main/", "b.md", "/GitHub/docs/main")
+            accepted, rejected = await document_crud._split_name_conflicts(db, [own, clash, first, duplicate])
+
+        await engine.dispose()
+        assert accepted == [own, first]
+        assert rejected == [clash, duplicate]
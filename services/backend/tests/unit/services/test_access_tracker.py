@@ -0,0 +1,98 @@
+"""Tests for the buffered icon/document access tracker."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.access_tracker import AccessTracker
+
+
+def _session_factory(dialect: str = "postgresql"):
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    session.get_bind.return_value.dialect.name = dialect
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory, session
+
+
+class TestAccessTrackerRecording:
+    """Recording never touches the database."""
+
+    def test_icon_hits_aggregate(self):
+        tracker = AccessTracker()
+        tracker.record_icon("logos", "react")
+        tracker.record_icon("logos", "react")
+        tracker.record_icon("awssvg", "ec2")
+        assert tracker.pending_icons == {("logos", "react"): 2, ("awssvg", "ec2"): 1}
+
+    def test_document_open_keeps_latest_timestamp(self):
+        tracker = AccessTracker()
+        now = datetime.now(timezone.utc)
+        tracker.record_document_opened(7, now)
+        tracker.record_document_opened(7, now - timedelta(seconds=5))
+        assert tracker.pending_documents == {7: now}
+
+    def test_discard_document(self):
+        tracker = AccessTracker()
+        tracker.record_document_opened(7)
+        tracker.discard_document(7)
+        assert tracker.pending_documents == {}
+
+
+class TestAccessTrackerFlush:
+    """Flushing writes one statement per table."""
+
+    async def test_postgres_flush_uses_values_list(self):
+        tracker = AccessTracker()
+        tracker.record_icon("logos", "react", 3)
+        tracker.record_icon("awssvg", "ec2")
+        tracker.record_document_opened(1)
+        tracker.record_document_opened(2)
+
+        factory, session = _session_factory()
+        with patch("app.services.access_tracker.AsyncSessionLocal", factory):
+            assert await tracker.flush() == {"icons": 2, "documents": 2}
+
+        assert session.execute.await_count == 2
+        icon_sql = str(session.execute.await_args_list[0].args[0])
+        assert "FROM (VALUES" in icon_sql and icon_sql.count("CAST(:p") == 2
+        doc_sql = str(session.execute.await_args_list[1].args[0])
+        assert "FROM (VALUES" in doc_sql and doc_sql.count("CAST(:i") == 2
+        session.commit.assert_awaited_once()
+        assert tracker.pending_icons == {} and tracker.pending_documents == {}
+
+    async def test_sqlite_flush_uses_executemany(self):
+        tracker = AccessTracker()
+        tracker.record_icon("logos", "react", 3)
+
+        factory, session = _session_factory("sqlite")
+        with patch("app.services.access_tracker.AsyncSessionLocal", factory):
+            await tracker.flush()
+
+        params = session.execute.await_args.args[1]
+        assert params == [{"pack_name": "logos", "key": "react", "delta": 3}]
+
+    async def test_empty_flush_skips_database(self):
+        factory, _ = _session_factory()
+        with patch("app.services.access_tracker.AsyncSessionLocal", factory):
+            assert await AccessTracker().flush() == {"icons": 0, "documents": 0}
+        factory.assert_not_called()
+
+    async def test_failed_flush_keeps_pending(self):
+        tracker = AccessTracker()
+        tracker.record_icon("logos", "react")
+        tracker.record_document_opened(3)
+
+        factory = MagicMock()
+        factory.return_value.__aenter__ = AsyncMock(side_effect=RuntimeError("db down"))
+        factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.services.access_tracker.AsyncSessionLocal", factory):
+            with pytest.raises(RuntimeError):
+                await tracker.flush()
+
+        assert tracker.pending_icons == {("logos", "react"): 1}
+        assert set(tracker.pending_documents) == {3}
@@ -0,0 +1,157 @@
+"""Tests for the document -> icon reference index."""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.base import Base
+from app.models.document import Document
+from app.models.document_icon_reference import DocumentIconIndex, DocumentIconReference
+from app.models.icon_models import IconPack
+from app.services import document_icon_index
+from app.services.document_icon_index import UNREADABLE_CONTENT_HASH, DocumentIconIndexer, extract_icon_references
+from app.services.storage.filesystem import Filesystem
+
+CONTENT = """# Architecture
+
+Uses logos:react and logos:react again, plus awssvg:ec2.
+
+```mermaid
+architecture-beta
+    service api(logos:react)[API]
+    service db(awssvg:rds)[DB]
+```
+"""
+
+
+@pytest.fixture
+async def sessions():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[
+                Document.__table__, DocumentIconIndex.__table__, DocumentIconReference.__table__, IconPack.__table__,
+            ],
+        )
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all([
+            Document(id=1, name="arch", user_id=1, folder_path="/", file_path="local/arch.md"),
+            Document(id=2, name="notes", user_id=2, folder_path="/", file_path="local/notes.md"),
+            IconPack(name="logos", display_name="Logos", category="logos"),
+            IconPack(name="awssvg", display_name="AWS", category="aws"),
+        ])
+        await session.commit()
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(sessions):
+    async with sessions() as session:
+        yield session
+
+
+async def _references(db, document_id):
+    result = await db.execute(
+        select(DocumentIconReference).where(DocumentIconReference.document_id == document_id)
+    )
+    return {(r.pack_name, r.icon_key, r.context): r.occurrences for r in result.scalars()}
+
+
+class TestExtractIconReferences:
+    """Tests for extract_icon_references."""
+
+    def test_references_are_counted_per_context(self):
+        extracted = extract_icon_references(CONTENT)
+        assert extracted.references == {
+            ("logos", "react", "markdown"): 2,
+            ("awssvg", "ec2", "markdown"): 1,
+            ("logos", "react", "mermaid"): 1,
+            ("awssvg", "rds", "mermaid"): 1,
+        }
+        assert extracted.mermaid_diagrams == 1
+
+    def test_pack_names_match_whole_identifiers(self):
+        # A substring scan for "logos:" would have counted this as the logos pack
+        assert set(extract_icon_references("mylogos:react").references) == {("mylogos", "react", "markdown")}
+
+    def test_urls_are_not_references(self):
+        content = "See https://example.com and logos:vue"
+        assert set(extract_icon_references(content).references) == {("logos", "vue", "markdown")}
+
+
+class TestDocumentIconIndexer:
+    """Tests for DocumentIconIndexer."""
+
+    async def test_index_document_reconciles_incrementally(self, db):
+        indexer = DocumentIconIndexer()
+        assert await indexer.index_document(db, 1, CONTENT)
+        assert not await indexer.index_document(db, 1, CONTENT)  # unchanged content
+
+        assert await indexer.index_document(db, 1, "logos:react logos:vue")
+        assert await _references(db, 1) == {
+            ("logos", "react", "markdown"): 1,
+            ("logos", "vue", "markdown"): 1,
+        }
+        state = await db.get(DocumentIconIndex, 1)
+        assert state.mermaid_diagrams == 0
+
+    async def test_queries(self, db):
+        indexer = DocumentIconIndexer()
+        await indexer.index_document(db, 1, CONTENT)
+        await indexer.index_document(db, 2, "awssvg:ec2 awssvg:s3")
+        await db.commit()
+
+        affected = await indexer.documents_referencing(db, "awssvg", icon_keys={"ec2"})
+        assert affected == [(1, 1, "arch", {"ec2"}), (2, 2, "notes", {"ec2"})]
+        assert await indexer.documents_referencing(db, "awssvg", user_id=2) == [(2, 2, "notes", {"ec2", "s3"})]
+
+        usage = await indexer.pack_usage(db, 1, ["logos", "awssvg"])
+        assert usage["logos"]["documents"] == {1}
+        assert usage["logos"]["total_references"] == 3
+        assert dict(usage["awssvg"]["icons"]) == {"ec2": 1, "rds": 1}
+        assert await indexer.mermaid_diagram_count(db, 1) == 1
+
+    async def test_packs_installed_later_see_existing_references(self, db):
+        indexer = DocumentIconIndexer()
+        await indexer.index_document(db, 1, "logos:react devicon:python")
+        await db.commit()
+
+        # The unchanged document is not reindexed when devicon is installed
+        db.add(IconPack(name="devicon", display_name="Devicon", category="dev"))
+        assert not await indexer.index_document(db, 1, "logos:react devicon:python")
+        assert await indexer.documents_referencing(db, "devicon") == [(1, 1, "arch", {"python"})]
+
+    async def test_concurrent_index_does_not_conflict(self, sessions):
+        indexer = DocumentIconIndexer()
+        async with sessions() as db:
+            await indexer.index_document(db, 1, "logos:react")
+            await db.commit()
+        # A backfill that found the document unindexed before the flush committed
+        async with sessions() as db:
+            await indexer._reconcile_references(db, 1, extract_icon_references("logos:react logos:react").references)
+            await indexer._store_state(db, 1, UNREADABLE_CONTENT_HASH, 0)
+            await db.commit()
+            assert await _references(db, 1) == {("logos", "react", "markdown"): 2}
+
+    async def test_backfill_marks_unreadable_documents(self, sessions, monkeypatch):
+        async def read_document(self, user_id, file_path):
+            return CONTENT if user_id == 1 else None
+
+        monkeypatch.setattr(document_icon_index, "AsyncSessionLocal", sessions)
+        monkeypatch.setattr(Filesystem, "read_document", read_document)
+        indexer = DocumentIconIndexer()
+        indexer.BACKFILL_BATCH_SIZE = 1
+
+        assert await indexer.ensure_indexed() == 1
+        assert await indexer.ensure_indexed() == 0  # the unreadable document is not retried
+        async with sessions() as db:
+            assert (await db.get(DocumentIconIndex, 2)).content_hash == UNREADABLE_CONTENT_HASH
+            assert ("logos", "react", "mermaid") in await _references(db, 1)
+
+    def test_schedule_keeps_latest_content(self):
+        indexer = DocumentIconIndexer()
+        indexer.schedule(1, "local/arch.md", "old")
+        indexer.schedule(1, "local/arch.md", "new")
+        assert indexer.pending == {(1, "local/arch.md"): "new"}
@@ -9,7 +9,7 @@ from app.services.search.embedding_client import EmbeddingClient
 
 class TestEmbedTexts:
 
-    @patch("app.services.search.embedding_client.httpx.AsyncClient")
+    @patch("app.services.search.embedding_client.http_clients.get")
     async def test_returns_embeddings(self, mock_client_cls):
         fake_embeddings = [[0.1] * 384, [0.2] * 384]
         mock_response = MagicMock()
@@ -30,7 +30,7 @@ class TestEmbedTexts:
         call_args = mock_client.post.call_args
         assert call_args[1]["json"] == {"texts": ["text1", "text2"]}
 
-    @patch("app.services.search.embedding_client.httpx.AsyncClient")
+    @patch("app.services.search.embedding_client.http_clients.get")
     async def test_raises_on_http_error(self, mock_client_cls):
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
@@ -50,7 +50,7 @@ class TestEmbedTexts:
 
 class TestEmbedQuery:
 
-    @patch("app.services.search.embedding_client.httpx.AsyncClient")
+    @patch("app.services.search.embedding_client.http_clients.get")
     async def test_returns_single_vector(self, mock_client_cls):
         fake_embedding = [0.3] * 384
         mock_response = MagicMock()
@@ -73,7 +73,7 @@ class TestEmbedQuery:
 
 class TestHealthCheck:
 
-    @patch("app.services.search.embedding_client.httpx.AsyncClient")
+    @patch("app.services.search.embedding_client.http_clients.get")
     async def test_healthy(self, mock_client_cls):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -87,7 +87,7 @@ class TestHealthCheck:
         client = EmbeddingClient()
         assert await client.health_check() is True
 
-    @patch("app.services.search.embedding_client.httpx.AsyncClient")
+    @patch("app.services.search.embedding_client.http_clients.get")
     async def test_unhealthy_status(self, mock_client_cls):
         mock_response = MagicMock()
         mock_response.status_code = 503
@@ -101,7 +101,7 @@ class TestHealthCheck:
         client = EmbeddingClient()
         assert await client.health_check() is False
 
-    @patch("app.services.search.embedding_client.httpx.AsyncClient")
+    @patch("app.services.search.embedding_client.http_clients.get")
     async def test_connection_error(self, mock_client_cls):
         mock_client = AsyncMock()
         mock_client.get = AsyncMock(side_effect=httpx.ConnectError("refused"))
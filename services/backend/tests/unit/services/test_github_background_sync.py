@@ -0,0 +1,122 @@
+"""Tests for tree-based GitHub background sync."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.github.background import GitHubBackgroundService
+
+
+def _document(doc_id, path, sha, repository_id=1, branch="main", status="synced"):
+    return SimpleNamespace(
+        id=doc_id, user_id=7, name=f"{path}", github_repository_id=repository_id,
+        github_branch=branch, github_file_path=path, github_sha=sha,
+        github_sync_status=status, last_github_sync_at=None,
+    )
+
+
+def _repository(repository_id=1):
+    return SimpleNamespace(
+        id=repository_id, repo_owner="octo", repo_name="docs", repo_full_name="octo/docs",
+        account=SimpleNamespace(access_token="token"),
+    )
+
+
+@pytest.fixture
+def api():
+    api = MagicMock()
+    api.get_tree_blob_shas = AsyncMock()
+    api.get_blob_content = AsyncMock(return_value="# updated")
+    api.get_file_content = AsyncMock()
+    with patch("app.services.github.background.GitHubAPIService", return_value=api):
+        yield api
+
+
+@pytest.fixture
+def sync_service():
+    service = MagicMock()
+    service.pull_document_changes = AsyncMock(return_value="synced")
+    with patch("app.services.github.background.GitHubSyncService", return_value=service), \
+            patch("app.services.github.background.create_notification", AsyncMock()):
+        yield service
+
+
+@pytest.fixture
+def background():
+    service = GitHubBackgroundService()
+    service._load_repositories = AsyncMock(return_value={1: _repository(1), 2: _repository(2)})
+    return service
+
+
+class TestTreeSync:
+
+    async def test_one_tree_request_per_repository_branch(self, background, api, sync_service):
+        documents = [
+            _document(1, "a.md", "sha-a"),
+            _document(2, "b.md", "sha-b"),
+            _document(3, "c.md", "sha-c", repository_id=2),
+        ]
+        api.get_tree_blob_shas.side_effect = [
+            ({"a.md": "sha-a", "b.md": "sha-b-new"}, False),
+            ({"c.md": "sha-c"}, False),
+        ]
+
+        stats = await background._sync_documents_by_tree(AsyncMock(), documents)
+
+        assert stats == {"synced": 3, "errors": 0, "api_calls": 3}
+        assert api.get_tree_blob_shas.await_count == 2
+        api.get_blob_content.assert_awaited_once_with("token", "octo", "docs", "sha-b-new")
+        sync_service.pull_document_changes.assert_awaited_once_with(2, 7, "# updated", "sha-b-new")
+        api.get_file_content.assert_not_awaited()
+        assert documents[1].github_sync_status == "synced"
+
+    async def test_local_changes_are_merged(self, background, api, sync_service):
+        document = _document(1, "a.md", "sha-a", status="local_changes")
+        api.get_tree_blob_shas.return_value = ({"a.md": "sha-a-new"}, False)
+        sync_service.pull_document_changes.return_value = "local_changes"
+
+        stats = await background._sync_documents_by_tree(AsyncMock(), [document])
+
+        assert stats["synced"] == 1
+        sync_service.pull_document_changes.assert_awaited_once_with(1, 7, "# updated", "sha-a-new")
+        assert document.github_sync_status == "local_changes"
+
+    async def test_overlapping_changes_become_conflict(self, background, api, sync_service):
+        document = _document(1, "a.md", "sha-a", status="local_changes")
+        api.get_tree_blob_shas.return_value = ({"a.md": "sha-a-new"}, False)
+        sync_service.pull_document_changes.return_value = "conflict"
+
+        stats = await background._sync_documents_by_tree(AsyncMock(), [document])
+
+        assert stats["synced"] == 1
+        assert document.github_sync_status == "conflict"
+
+    async def test_unresolved_conflict_is_not_pulled(self, background, api, sync_service):
+        document = _document(1, "a.md", "sha-a", status="conflict")
+        api.get_tree_blob_shas.return_value = ({"a.md": "sha-a-new"}, False)
+
+        stats = await background._sync_documents_by_tree(AsyncMock(), [document])
+
+        assert stats["synced"] == 1
+        assert document.github_sync_status == "conflict"
+        api.get_blob_content.assert_not_awaited()
+        sync_service.pull_document_changes.assert_not_awaited()
+
+    async def test_missing_file_marked_error(self, background, api, sync_service):
+        document = _document(1, "gone.md", "sha-a")
+        api.get_tree_blob_shas.return_value = ({}, False)
+
+        stats = await background._sync_documents_by_tree(AsyncMock(), [document])
+
+        assert stats["errors"] == 1
+        assert document.github_sync_status == "error"
+
+    async def test_truncated_tree_falls_back_to_file_lookup(self, background, api, sync_service):
+        document = _document(1, "deep/a.md", "sha-a")
+        api.get_tree_blob_shas.return_value = ({}, True)
+        api.get_file_content.return_value = ("# same", "sha-a")
+
+        stats = await background._sync_documents_by_tree(AsyncMock(), [document])
+
+        assert stats == {"synced": 1, "errors": 0, "api_calls": 2}
+        api.get_file_content.assert_awaited_once()
@@ -0,0 +1,140 @@
+"""Tests for cached diagram rendering and upload skipping on GitHub save."""
+import base64
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.services.github.api import GitHubAPIService
+from app.services.github.conversion import GitHubDiagramConversionService
+from app.services.github.diagram_cache import diagram_render_cache, git_blob_sha
+
+PNG = b"\x89PNG-fake"
+DIAGRAMS = [{"diagram_code": "architecture-beta\n  service api", "svg_content": "<svg>api</svg>"}]
+CONTENT = "# Doc\n\n```mermaid\narchitecture-beta\n  service api\n```\n"
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands the cache uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def expire(self, key, seconds):
+        pass
+
+
+@pytest.fixture
+def redis():
+    redis = FakeRedis()
+
+    async def pipeline(build, transaction=False):
+        build(redis)
+        return []
+
+    with patch("app.services.github.diagram_cache.redis_pool.get", AsyncMock(return_value=redis)), \
+            patch("app.services.github.diagram_cache.redis_pool.pipeline", pipeline):
+        yield redis
+
+
+@pytest.fixture
+def service():
+    service = GitHubDiagramConversionService()
+    service.export_calls = []
+
+    def export(request):
+        service.export_calls.append(request)
+        return httpx.Response(200, json={"image_data": base64.b64encode(PNG).decode()})
+
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(export))
+    return service
+
+
+async def _convert(service):
+    return await service.convert_document(
+        CONTENT, {"auto_convert_diagrams": True},
+        repository_path=".markdown-manager/diagrams/",
+        repository_owner="octo", repository_name="docs", branch="main",
+        rendered_diagrams=DIAGRAMS,
+    )
+
+
+class TestDiagramRenderCache:
+
+    async def test_unchanged_diagram_is_not_rendered_or_uploaded_again(self, redis, service):
+        first = await _convert(service)
+        assert len(service.export_calls) == 1
+        assert first.diagrams[0].needs_upload is True
+
+        path = f".markdown-manager/diagrams/{first.diagrams[0].filename}"
+        await diagram_render_cache.record_uploaded("octo", "docs", "main", {path: git_blob_sha(PNG)})
+
+        second = await _convert(service)
+
+        assert len(service.export_calls) == 1
+        assert second.diagrams[0].image_data == PNG
+        assert second.diagrams[0].needs_upload is False
+        assert second.converted_content == first.converted_content
+
+    async def test_other_branch_still_uploads(self, redis, service):
+        first = await _convert(service)
+        path = f".markdown-manager/diagrams/{first.diagrams[0].filename}"
+        await diagram_render_cache.record_uploaded("octo", "docs", "feature", {path: git_blob_sha(PNG)})
+
+        second = await _convert(service)
+
+        assert second.diagrams[0].needs_upload is True
+
+    async def test_renders_without_redis(self, service):
+        with patch("app.services.github.diagram_cache.redis_pool.get", AsyncMock(return_value=None)):
+            await _convert(service)
+            result = await _convert(service)
+
+        assert len(service.export_calls) == 2
+        assert result.diagrams[0].needs_upload is True
+
+    async def test_cached_upload_is_confirmed_against_branch_tree(self):
+        api = GitHubAPIService()
+        path = ".markdown-manager/diagrams/diagram_a.png"
+        diagrams = [
+            {"filename": "diagram_a.png", "image_data": PNG, "needs_upload": False},
+            {"filename": "diagram_b.png", "image_data": PNG, "needs_upload": False},
+        ]
+
+        with patch.object(api, "get_tree_blob_shas", AsyncMock(return_value=({path: git_blob_sha(PNG)}, False))):
+            uploads = await api._diagrams_to_upload(
+                "token", "octo", "docs", "main", diagrams, ".markdown-manager/diagrams/", False
+            )
+        # diagram_b is in the cache but no longer on the branch
+        assert [d["filename"] for d in uploads] == ["diagram_b.png"]
+
+        with patch.object(api, "get_tree_blob_shas", AsyncMock(side_effect=RuntimeError("tree unavailable"))):
+            uploads = await api._diagrams_to_upload(
+                "token", "octo", "docs", "main", diagrams, ".markdown-manager/diagrams/", False
+            )
+        assert uploads == diagrams
+
+    def test_render_key_ignores_mermaid_render_id(self):
+        def svg(render_id, fill="#fff"):
+            return f'<svg id="{render_id}"><style>#{render_id} .node{{fill:{fill}}}</style></svg>'
+
+        key = diagram_render_cache.render_key(svg("mermaid-1718000000000-k3j9x0abc"))
+        assert diagram_render_cache.render_key(svg("mermaid-1718000004321-q8w2e7rty")) == key
+        # A different theme is a different render
+        assert diagram_render_cache.render_key(svg("mermaid-1718000004321-q8w2e7rty", "#000")) != key
+
+    def test_git_blob_sha_matches_git(self):
+        assert git_blob_sha(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
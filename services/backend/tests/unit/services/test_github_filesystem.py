@@ -0,0 +1,79 @@
+"""Tests for sparse, blobless GitHub repository clones."""
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from app.services.github.filesystem import GitHubFilesystemService
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.email=test@example.com", "-c", "user.name=test", *args],
+        cwd=cwd, check=True, capture_output=True, text=True,
+    ).stdout
+
+
+def _write(root: Path, files: dict) -> None:
+    for path, content in files.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_bytes(content)
+
+
+def _working_files(repo: Path) -> list:
+    return sorted(
+        str(p.relative_to(repo)) for p in repo.rglob("*")
+        if p.is_file() and ".git" not in p.parts
+    )
+
+
+def _missing_blobs(repo: Path) -> int:
+    output = _git(repo, "rev-list", "--objects", "--missing=print", "HEAD")
+    return sum(1 for line in output.splitlines() if line.startswith("?"))
+
+
+@pytest.fixture
+def remote(tmp_path):
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    _git(origin, "init", "-q", "-b", "main")
+    _git(origin, "config", "uploadpack.allowFilter", "true")
+    _write(origin, {
+        "README": b"readme",
+        "docs/guide.md": b"# Guide",
+        "assets/logo.png": b"\x89PNG" * 1000,
+        "src/app.py": b"print()",
+    })
+    _git(origin, "add", "-A")
+    _git(origin, "commit", "-qm", "initial")
+    return origin
+
+
+class TestSparseClone:
+
+    async def test_clone_checks_out_markdown_only_without_other_blobs(self, remote, tmp_path):
+        target = tmp_path / "clone"
+
+        assert await GitHubFilesystemService().clone_repository(f"file://{remote}", target, "main")
+
+        assert _working_files(target) == ["README", "docs/guide.md"]
+        assert _git(target, "status", "--porcelain") == ""
+        assert _missing_blobs(target) == 2
+
+    async def test_pull_fetches_new_markdown_incrementally(self, remote, tmp_path):
+        target = tmp_path / "clone"
+        service = GitHubFilesystemService()
+        await service.clone_repository(f"file://{remote}", target, "main")
+
+        _write(remote, {"docs/new.md": b"# New", "src/app.py": b"print(1)"})
+        _git(remote, "add", "-A")
+        _git(remote, "commit", "-qm", "update")
+
+        assert await service.pull_changes(target, "main")
+
+        assert _working_files(target) == ["README", "docs/guide.md", "docs/new.md"]
+        # logo.png plus both versions of app.py were never downloaded
+        assert _missing_blobs(target) == 3
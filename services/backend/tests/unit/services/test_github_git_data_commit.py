@@ -0,0 +1,125 @@
+"""Tests for single-commit GitHub saves through the Git Data API."""
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.services.github.api import GitHubAPIService
+from app.services.github.diagram_cache import git_blob_sha
+
+
+class FakeGitHub:
+    """Mock Git Data API that records requests and can reject ref updates."""
+
+    def __init__(self, reject_ref_updates=0):
+        self.requests = []
+        self.reject_ref_updates = reject_ref_updates
+        self.blobs = 0
+        self.tree = {}
+        self.contents = {}
+
+    def __call__(self, request):
+        self.requests.append(request)
+        path = request.url.path
+        if request.method == "POST" and path.endswith("/git/blobs"):
+            self.blobs += 1
+            return httpx.Response(201, json={"sha": f"blob-{self.blobs}"})
+        if request.method == "GET" and "/contents/" in path:
+            sha = self.contents.get(path.split("/contents/", 1)[1])
+            return httpx.Response(200, json={"sha": sha}) if sha else httpx.Response(404, json={})
+        if request.method == "GET" and "/git/trees/" in path:
+            return httpx.Response(200, json={
+                "tree": [{"path": p, "type": "blob", "sha": sha} for p, sha in self.tree.items()]
+            })
+        if request.method == "GET" and "/git/ref/heads/" in path:
+            return httpx.Response(200, json={"object": {"sha": "head"}})
+        if request.method == "GET" and path.endswith("/git/commits/head"):
+            return httpx.Response(200, json={"tree": {"sha": "base-tree"}})
+        if request.method == "POST" and path.endswith("/git/trees"):
+            return httpx.Response(201, json={"sha": "new-tree"})
+        if request.method == "POST" and path.endswith("/git/commits"):
+            return httpx.Response(201, json={"sha": "new-commit", "html_url": "https://github.com/c"})
+        if request.method == "PATCH" and "/git/refs/heads/" in path:
+            if self.reject_ref_updates:
+                self.reject_ref_updates -= 1
+                return httpx.Response(422, json={"message": "Update is not a fast forward"})
+            return httpx.Response(200, json={"object": {"sha": "new-commit"}})
+        return httpx.Response(404, json={"message": "unexpected"})
+
+    def calls(self, method, suffix):
+        return [r for r in self.requests if r.method == method and r.url.path.endswith(suffix)]
+
+
+def _diagram(n):
+    return {
+        "filename": f"d{n}.svg", "hash": f"h{n}", "image_format": "svg",
+        "image_data": b"<svg/>", "needs_upload": True,
+    }
+
+
+@pytest.fixture
+def github():
+    fake = FakeGitHub()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake))
+    with patch("app.services.github.api.http_clients.get", return_value=client), \
+            patch("app.services.github.response_cache.redis_pool.get", AsyncMock(return_value=None)):
+        yield fake
+
+
+async def _save(diagrams, sha=None):
+    return await GitHubAPIService().commit_file_with_diagrams(
+        "token", "octo", "docs", "docs/a.md", "# A", "Update a", "main", diagrams, sha=sha
+    )
+
+
+class TestCommitFileWithDiagrams:
+
+    async def test_one_commit_for_document_and_diagrams(self, github):
+        github.tree = {".markdown-manager/diagrams/d3.svg": git_blob_sha(b"<svg/>")}
+        result = await _save([_diagram(1), _diagram(2), {**_diagram(3), "needs_upload": False}])
+
+        assert result["success"] is True
+        assert result["diagrams_uploaded"] == 2 and result["total_diagrams"] == 3
+        assert len(github.calls("POST", "/git/blobs")) == 3
+        assert len(github.calls("POST", "/git/commits")) == 1
+        assert len(github.calls("PATCH", "/heads/main")) == 1
+        tree = json.loads(github.calls("POST", "/git/trees")[0].content)
+        assert tree["base_tree"] == "base-tree"
+        assert {entry["path"] for entry in tree["tree"]} == {
+            "docs/a.md", ".markdown-manager/diagrams/d1.svg", ".markdown-manager/diagrams/d2.svg"
+        }
+        assert result["commit"]["commit"]["sha"] == "new-commit"
+        assert result["commit"]["content"]["path"] == "docs/a.md"
+        assert all(d["sha"].startswith("blob-") for d in result["uploaded_diagrams"])
+
+    async def test_rebuilds_commit_when_branch_moved(self, github):
+        github.reject_ref_updates = 1
+
+        result = await _save([_diagram(1)])
+
+        assert result["success"] is True
+        assert len(github.calls("POST", "/git/commits")) == 2
+        assert len(github.calls("POST", "/git/blobs")) == 2
+
+    async def test_failure_leaves_branch_untouched(self, github):
+        github.reject_ref_updates = 2
+
+        result = await _save([_diagram(1)])
+
+        assert result["success"] is False
+        assert result["diagrams_uploaded"] == 0
+        assert "changed during commit" in result["errors"][0]
+
+    async def test_remote_edit_since_last_pull_is_a_conflict(self, github):
+        github.contents["docs/a.md"] = "remote-edit"
+
+        with pytest.raises(HTTPException) as error:
+            await _save([_diagram(1)], sha="last-pulled")
+
+        assert error.value.status_code == 409
+        assert github.calls("PATCH", "/heads/main") == []
+
+        github.contents["docs/a.md"] = "last-pulled"
+        assert (await _save([_diagram(1)], sha="last-pulled"))["success"] is True
@@ -0,0 +1,114 @@
+"""Tests for the tree-based GitHub repository import pipeline."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.github.importer import GitHubImportService
+
+
+def _repository():
+    repository = MagicMock()
+    repository.id = 3
+    repository.account_id = 9
+    repository.repo_owner = "octo"
+    repository.repo_name = "docs"
+    repository.repo_full_name = "octo/docs"
+    repository.get_file_folder_path.side_effect = lambda path, branch: f"/GitHub/docs/{branch}"
+    return repository
+
+
+@pytest.fixture
+def api():
+    api = MagicMock()
+    api.get_tree_blob_shas = AsyncMock(return_value=(
+        {"README.md": "sha-readme", "guide/a.md": "sha-a", "logo.png": "sha-png"}, False
+    ))
+    api.get_blob_content = AsyncMock(side_effect=lambda token, owner, repo, sha: f"# {sha}")
+    with patch("app.services.github.api.GitHubAPIService", return_value=api):
+        yield api
+
+
+@pytest.fixture
+def storage():
+    storage = MagicMock()
+    storage.write_document = AsyncMock(return_value=True)
+    with patch("app.services.storage.user.UserStorage", return_value=storage):
+        yield storage
+
+
+@pytest.fixture
+def importer():
+    db = MagicMock()
+    db.commit = AsyncMock()
+    service = GitHubImportService(db)
+    service.document_crud = MagicMock()
+    service.document_crud.get_github_documents_by_repo_branch = AsyncMock(return_value=[
+        SimpleNamespace(id=1, github_file_path="README.md", github_sha="sha-readme",
+                        github_sync_status="synced", file_path="github/9/docs/README.md"),
+    ])
+    service.document_crud.upsert_github_documents = AsyncMock(return_value=({"guide/a.md": 2}, []))
+    return service
+
+
+class TestImportRepositoryTree:
+
+    async def test_imports_changed_markdown_in_one_upsert(self, importer, api, storage):
+        results = await importer.import_repository_tree(7, _repository(), "token", "main")
+
+        api.get_tree_blob_shas.assert_awaited_once()
+        api.get_blob_content.assert_awaited_once_with("token", "octo", "docs", "sha-a")
+        storage.write_document.assert_awaited_once_with(
+            7, "github/9/docs/guide/a.md", "# sha-a", auto_commit=False
+        )
+        rows = importer.document_crud.upsert_github_documents.await_args.args[1]
+        assert [row["github_file_path"] for row in rows] == ["guide/a.md"]
+        importer.db_session.commit.assert_awaited_once()
+        assert results["imported"] == [{"file_path": "guide/a.md", "document_id": 2}]
+        assert results["skipped"] == [{"file_path": "README.md", "document_id": 1}]
+
+    async def test_selected_paths_report_missing_files(self, importer, api, storage):
+        results = await importer.import_repository_tree(
+            7, _repository(), "token", "main", file_paths=["logo.png", "missing.md"]
+        )
+
+        assert results["errors"] == [{"file_path": "missing.md", "error": "File not found in repository"}]
+        rows = importer.document_crud.upsert_github_documents.await_args.args[1]
+        assert [row["github_file_path"] for row in rows] == ["logo.png"]
+
+    async def test_failed_download_is_reported_not_upserted(self, importer, api, storage):
+        api.get_blob_content.side_effect = RuntimeError("boom")
+
+        results = await importer.import_repository_tree(7, _repository(), "token", "main")
+
+        assert results["errors"] == [{"file_path": "guide/a.md", "error": "boom"}]
+        assert importer.document_crud.upsert_github_documents.await_args.args[1] == []
+
+    async def test_name_conflicts_are_reported_per_file(self, importer, api, storage):
+        importer.document_crud.upsert_github_documents.side_effect = lambda db, rows: ({}, rows)
+
+        results = await importer.import_repository_tree(7, _repository(), "token", "main")
+
+        assert results["errors"] == [{
+            "file_path": "guide/a.md", "error": "A document named a.md already exists in /GitHub/docs/main",
+        }]
+        assert results["imported"] == []
+        storage.write_document.assert_not_awaited()
+
+    async def test_files_are_written_only_after_commit(self, importer, api, storage):
+        importer.db_session.commit.side_effect = RuntimeError("commit failed")
+
+        with pytest.raises(RuntimeError):
+            await importer.import_repository_tree(7, _repository(), "token", "main")
+
+        storage.write_document.assert_not_awaited()
+
+    async def test_failed_write_marks_document_for_retry(self, importer, api, storage):
+        importer.db_session.execute = AsyncMock()
+        storage.write_document.return_value = False
+
+        results = await importer.import_repository_tree(7, _repository(), "token", "main")
+
+        assert results["errors"] == [{"file_path": "guide/a.md", "error": "Failed to write file to storage"}]
+        assert results["imported"] == []
+        importer.db_session.execute.assert_awaited_once()
@@ -0,0 +1,116 @@
+"""Tests for the line-level three-way merge used by GitHub sync."""
+import random
+
+from app.services.github.merge import diff_lines, merge3
+from app.services.github.sync import GitHubSyncService
+
+BASE = "".join(f"line {i}\n" for i in range(10))
+
+
+def _edit(text, old, new):
+    assert old in text
+    return text.replace(old, new, 1)
+
+
+def _apply(a, b, hunks):
+    out, position = [], 0
+    for base_start, base_end, other_start, other_end in hunks:
+        out += a[position:base_start] + b[other_start:other_end]
+        position = base_end
+    return out + a[position:]
+
+
+def _lcs_length(a, b):
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+class TestDiffLines:
+
+    def test_diff_is_minimal(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            a = [rng.choice("abcd") for _ in range(rng.randint(0, 20))]
+            b = [rng.choice("abcd") for _ in range(rng.randint(0, 20))]
+
+            hunks = diff_lines(a, b)
+
+            assert _apply(a, b, hunks) == b
+            assert len(a) - sum(end - start for start, end, _, _ in hunks) == _lcs_length(a, b)
+
+    def test_large_file_with_few_changes(self):
+        a = [f"line {i}\n" for i in range(100000)]
+        b = list(a)
+        b[10] = "changed\n"
+        del b[50000]
+
+        assert diff_lines(a, b) == [(10, 11, 10, 11), (50000, 50001, 50000, 50000)]
+
+
+class TestMerge3:
+
+    def test_non_overlapping_edits_merge(self):
+        local = _edit(BASE, "line 1\n", "local 1\n")
+        remote = _edit(_edit(BASE, "line 7\n", "remote 7\n"), "line 4\n", "")
+
+        result = merge3(BASE, local, remote)
+
+        assert not result.has_conflicts
+        assert result.merged_content == _edit(_edit(local, "line 7\n", "remote 7\n"), "line 4\n", "")
+
+    def test_identical_edits_merge(self):
+        edited = _edit(BASE, "line 3\n", "same\n")
+
+        result = merge3(BASE, edited, edited)
+
+        assert not result.has_conflicts
+        assert result.merged_content == edited
+
+    def test_overlapping_edits_get_minimal_markers(self):
+        local = _edit(BASE, "line 4\nline 5\nline 6\n", "line 4\nlocal 5\nline 6\n")
+        remote = _edit(BASE, "line 4\nline 5\nline 6\n", "line 4\nremote 5\nline 6\n")
+
+        result = merge3(BASE, local, remote)
+
+        assert len(result.conflicts) == 1
+        assert result.conflicts[0].line == 6
+        assert result.merged_content == _edit(
+            BASE, "line 5\n", "<<<<<<< LOCAL\nlocal 5\n=======\nremote 5\n>>>>>>> REMOTE\n"
+        )
+
+    def test_common_lines_are_kept_out_of_conflict(self):
+        local = _edit(BASE, "line 2\n", "shared\nlocal\n")
+        remote = _edit(BASE, "line 2\n", "shared\nremote\n")
+
+        result = merge3(BASE, local, remote)
+
+        assert result.merged_content == _edit(
+            BASE, "line 2\n", "shared\n<<<<<<< LOCAL\nlocal\n=======\nremote\n>>>>>>> REMOTE\n"
+        )
+
+    def test_missing_trailing_newline(self):
+        result = merge3("a\nb", "a\nlocal", "a\nremote")
+
+        assert result.merged_content == "a\n<<<<<<< LOCAL\nlocal\n=======\nremote\n>>>>>>> REMOTE\n"
+
+
+class TestSyncServiceMerge:
+
+    async def test_three_way_merge_reports_conflicts(self):
+        service = GitHubSyncService()
+        local = _edit(BASE, "line 0\n", "local\n")
+
+        clean = await service._three_way_merge(BASE, local, _edit(BASE, "line 9\n", "remote\n"))
+        conflicted = await service._three_way_merge(BASE, local, _edit(BASE, "line 0\n", "remote\n"))
+
+        assert clean["has_conflicts"] is False
+        assert clean["merged_content"] == _edit(local, "line 9\n", "remote\n")
+        assert conflicted["has_conflicts"] is True
+        assert conflicted["conflicts"] == [
+            {"line": 1, "base": "line 0\n", "local": "local\n", "remote": "remote\n"}
+        ]
@@ -0,0 +1,125 @@
+"""Tests for the conditional-request GitHub response cache."""
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.services.github.response_cache import GitHubResponseCache
+
+
+class FakeRedis:
+    """Minimal async key/value store standing in for Redis."""
+
+    def __init__(self):
+        self.data = {}
+        self.expired = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def expire(self, key, seconds):
+        self.expired.append(key)
+
+
+def _github(etag='"v1"'):
+    """Mock GitHub that answers 304 when If-None-Match matches ``etag``."""
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, headers={"ETag": etag}, json=[{"name": "main"}])
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), seen
+
+
+@pytest.fixture
+def redis():
+    redis = FakeRedis()
+    with patch("app.services.github.response_cache.redis_pool.get", AsyncMock(return_value=redis)):
+        yield redis
+
+
+HEADERS = {"Authorization": "token abc", "Accept": "application/vnd.github.v3+json"}
+URL = "https://api.github.com/repos/octo/docs/branches"
+
+
+class TestGitHubResponseCache:
+
+    async def test_revalidates_and_serves_cached_body_on_304(self, redis):
+        cache = GitHubResponseCache()
+        client, seen = _github()
+
+        first = await cache.get(client, URL, headers=HEADERS)
+        second = await cache.get(client, URL, headers=HEADERS)
+
+        assert first.status_code == second.status_code == 200
+        assert second.json() == [{"name": "main"}]
+        assert second.headers["X-Cache"] == "revalidated"
+        assert "If-None-Match" not in seen[0].headers
+        assert seen[1].headers["If-None-Match"] == '"v1"'
+        assert len(redis.expired) == 1
+        assert cache.get_stats()["revalidated"] == 1
+
+    async def test_entries_are_scoped_to_access_token(self, redis):
+        cache = GitHubResponseCache()
+        client, seen = _github()
+
+        await cache.get(client, URL, headers=HEADERS)
+        await cache.get(client, URL, headers={**HEADERS, "Authorization": "token other"})
+
+        assert "If-None-Match" not in seen[1].headers
+        assert len(redis.data) == 2
+
+    async def test_errors_are_not_cached(self, redis):
+        cache = GitHubResponseCache()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(404, headers={"ETag": '"x"'})
+        ))
+
+        response = await cache.get(client, URL, headers=HEADERS)
+
+        assert response.status_code == 404
+        assert redis.data == {}
+
+    async def test_passes_through_without_redis(self):
+        cache = GitHubResponseCache()
+        client, seen = _github()
+
+        with patch("app.services.github.response_cache.redis_pool.get", AsyncMock(return_value=None)):
+            await cache.get(client, URL, headers=HEADERS)
+            response = await cache.get(client, URL, headers=HEADERS)
+
+        assert response.status_code == 200
+        assert all("If-None-Match" not in request.headers for request in seen)
+
+    async def test_blobs_and_large_bodies_are_not_stored(self, redis):
+        cache = GitHubResponseCache()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                200, headers={"ETag": '"b"'},
+                content=b"x" * (300 * 1024 if "contents" in request.url.path else 10),
+            )
+        ))
+
+        await cache.get(client, "https://api.github.com/repos/octo/docs/git/blobs/abc", headers=HEADERS)
+        await cache.get(client, "https://api.github.com/repos/octo/docs/contents/big.md", headers=HEADERS)
+
+        assert redis.data == {}
+        assert cache.get_stats()["uncached"] == 1
+
+    async def test_corrupt_entry_is_a_miss_not_an_outage(self, redis):
+        cache = GitHubResponseCache()
+        client, seen = _github()
+        redis.data[cache._cache_key(URL, None, HEADERS)] = "{not json"
+
+        with patch("app.services.github.response_cache.redis_pool.mark_failed") as mark_failed:
+            response = await cache.get(client, URL, headers=HEADERS)
+
+        assert response.status_code == 200
+        assert "If-None-Match" not in seen[0].headers
+        mark_failed.assert_not_called()
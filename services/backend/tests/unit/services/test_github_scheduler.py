@@ -0,0 +1,122 @@
+"""Tests for the per-account GitHub request scheduler."""
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.services.github.scheduler import (
+    BACKGROUND,
+    GitHubRequestScheduler,
+    background_priority,
+    github_request_priority,
+    runs_in_background,
+)
+
+HEADERS = {"Authorization": "token abc"}
+URL = "https://api.github.com/user/repos"
+
+
+def _client(*responses):
+    """Client that returns ``responses`` in order, repeating the last one."""
+    queue = list(responses)
+
+    def handler(request):
+        return queue.pop(0) if len(queue) > 1 else queue[0]
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _limits(remaining, reset_in=3600, limit=5000):
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+    }
+
+
+@pytest.fixture
+def sleep():
+    """Patch sleep to advance the scheduler's wall clock instead of waiting."""
+    clock = [time.time()]
+
+    async def advance(seconds):
+        clock[0] += seconds
+
+    with patch("app.services.github.scheduler.time.time", lambda: clock[0]), \
+            patch("app.services.github.scheduler.asyncio.sleep", AsyncMock(side_effect=advance)) as sleep:
+        yield sleep
+
+
+class TestGitHubRequestScheduler:
+
+    async def test_records_budget_from_headers(self, sleep):
+        scheduler = GitHubRequestScheduler()
+        client = _client(httpx.Response(200, headers=_limits(4321)))
+
+        await scheduler.request(client, "GET", URL, headers=HEADERS)
+
+        budget = scheduler._budget(scheduler._account_key(HEADERS))
+        assert budget.remaining == 4321
+        sleep.assert_not_awaited()
+
+    async def test_interactive_fails_fast_when_exhausted(self, sleep):
+        scheduler = GitHubRequestScheduler()
+        client = _client(httpx.Response(200, headers=_limits(0, reset_in=600)))
+        await scheduler.request(client, "GET", URL, headers=HEADERS)
+
+        with pytest.raises(HTTPException) as exc:
+            await scheduler.request(client, "GET", URL, headers=HEADERS)
+
+        assert exc.value.status_code == 429
+        assert int(exc.value.headers["Retry-After"]) > 500
+
+    async def test_background_keeps_reserve_and_waits_for_reset(self, sleep):
+        scheduler = GitHubRequestScheduler()
+        client = _client(
+            httpx.Response(200, headers=_limits(40, reset_in=120)),
+            httpx.Response(200, headers=_limits(5000)),
+        )
+        await scheduler.request(client, "GET", URL, headers=HEADERS)
+
+        with background_priority():
+            response = await scheduler.request(client, "GET", URL, headers=HEADERS)
+
+        assert response.status_code == 200
+        assert sleep.await_args_list[0].args[0] > 100
+
+    async def test_secondary_limit_retries_after_retry_after(self, sleep):
+        scheduler = GitHubRequestScheduler()
+        client = _client(
+            httpx.Response(403, headers={"Retry-After": "3"}, json={"message": "secondary rate limit"}),
+            httpx.Response(200, json=[]),
+        )
+
+        response = await scheduler.request(client, "GET", URL, headers=HEADERS)
+
+        assert response.status_code == 200
+        assert 2 < sleep.await_args_list[0].args[0] <= 3
+        assert scheduler.get_stats()["secondary_limited"] == 1
+
+    async def test_permission_errors_are_not_retried(self, sleep):
+        scheduler = GitHubRequestScheduler()
+        client = _client(httpx.Response(403, json={"message": "Resource not accessible"}))
+
+        response = await scheduler.request(client, "GET", URL, headers=HEADERS)
+
+        assert response.status_code == 403
+        assert scheduler.get_stats()["requests"] == 1
+
+    def test_background_priority_resets(self):
+        with background_priority():
+            assert github_request_priority.get() == BACKGROUND
+        assert github_request_priority.get() != BACKGROUND
+
+    async def test_runs_in_background_decorator(self):
+        @runs_in_background
+        async def task():
+            return github_request_priority.get()
+
+        assert await task() == BACKGROUND
+        assert github_request_priority.get() != BACKGROUND
@@ -0,0 +1,117 @@
+"""Tests for GitHub push webhook ingestion."""
+import asyncio
+import hashlib
+import hmac
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.routers.github import webhooks
+from app.services.github.background import GitHubBackgroundService
+
+SECRET = "webhook-secret"
+
+
+def _push(commits=None, ref="refs/heads/main", **extra):
+    return {
+        "ref": ref,
+        "repository": {"id": 42, "full_name": "octo/docs"},
+        "commits": commits if commits is not None else [
+            {"added": ["docs/new.md"], "modified": ["README.md"], "removed": []},
+            {"added": [], "modified": [], "removed": ["old.md"]},
+        ],
+        **extra,
+    }
+
+
+@pytest.fixture
+def queue():
+    queue = MagicMock()
+    with patch.object(webhooks.settings, "github_webhook_secret", SECRET), \
+            patch.object(webhooks, "github_background_sync", queue):
+        yield queue
+
+
+async def _post(payload, event="push", secret=SECRET):
+    body = json.dumps(payload).encode()
+    signature = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    app = FastAPI()
+    app.include_router(webhooks.router, prefix="/webhooks")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post(
+            "/webhooks", content=body,
+            headers={"X-GitHub-Event": event, "X-Hub-Signature-256": signature},
+        )
+
+
+class TestPushWebhook:
+
+    async def test_push_queues_changed_paths(self, queue):
+        response = await _post(_push())
+
+        assert response.status_code == 202
+        assert response.json()["queued"] is True
+        queue.enqueue_push.assert_called_once_with(42, "main", {"docs/new.md", "README.md", "old.md"})
+
+    async def test_push_dropped_while_sync_stopped(self, queue):
+        queue.enqueue_push.return_value = False
+
+        response = await _post(_push())
+
+        assert response.status_code == 202
+        assert response.json()["queued"] is False
+
+    async def test_rejects_bad_signature(self, queue):
+        response = await _post(_push(), secret="wrong")
+
+        assert response.status_code == 401
+        queue.enqueue_push.assert_not_called()
+
+    async def test_truncated_or_forced_push_syncs_whole_branch(self, queue):
+        await _post(_push(commits=[{"modified": ["a.md"]}] * webhooks.MAX_PAYLOAD_COMMITS))
+        await _post(_push(forced=True))
+
+        assert [c.args[2] for c in queue.enqueue_push.call_args_list] == [None, None]
+
+    async def test_ignores_tags_deletions_and_other_events(self, queue):
+        await _post(_push(ref="refs/tags/v1"))
+        await _post(_push(deleted=True))
+        ping = await _post({"zen": "hi"}, event="ping")
+
+        assert ping.json() == {"message": "pong"}
+        queue.enqueue_push.assert_not_called()
+
+    async def test_disabled_without_secret(self, queue):
+        with patch.object(webhooks.settings, "github_webhook_secret", None):
+            response = await _post(_push())
+
+        assert response.status_code == 503
+
+
+class TestPushQueue:
+
+    async def test_pushes_are_coalesced_per_branch(self):
+        service = GitHubBackgroundService()
+        service.push_debounce_seconds = 0
+        service.sync_pushed_documents = AsyncMock()
+        service.running = True
+
+        service.enqueue_push(42, "main", ["a.md"])
+        service.enqueue_push(42, "main", ["/b.md"])
+        service.enqueue_push(42, "dev", None)
+        service.enqueue_push(42, "dev", ["c.md"])
+        await asyncio.sleep(0.01)
+        await service.shutdown()
+
+        service.sync_pushed_documents.assert_awaited_once_with(
+            {(42, "main"): {"a.md", "b.md"}, (42, "dev"): None}
+        )
+
+    async def test_pushes_are_ignored_while_stopped(self):
+        service = GitHubBackgroundService()
+        assert service.enqueue_push(42, "main", ["a.md"]) is False
+        assert service._pushes == {}
+        assert service._push_task is None
@@ -0,0 +1,63 @@
+"""Tests for the shared per-upstream HTTP client registry."""
+import httpx
+
+from app.services.http_clients import (
+    EMBEDDING,
+    GITHUB,
+    UPSTREAMS,
+    HttpClientRegistry,
+)
+
+
+class TestHttpClientRegistry:
+
+    async def test_reuses_one_client_per_upstream(self):
+        registry = HttpClientRegistry()
+        try:
+            github = registry.get(GITHUB)
+
+            assert registry.get(GITHUB) is github
+            assert registry.get(EMBEDDING) is not github
+            assert github.timeout == UPSTREAMS[GITHUB].timeout
+        finally:
+            await registry.aclose()
+
+    async def test_aclose_closes_clients_and_get_recreates(self):
+        registry = HttpClientRegistry()
+        client = registry.get(EMBEDDING)
+
+        await registry.aclose()
+
+        assert client.is_closed
+        replacement = registry.get(EMBEDDING)
+        assert replacement is not client and not replacement.is_closed
+        await registry.aclose()
+
+    async def test_recreates_client_closed_elsewhere(self):
+        registry = HttpClientRegistry()
+        client = registry.get(GITHUB)
+        await client.aclose()
+
+        assert registry.get(GITHUB) is not client
+        await registry.aclose()
+
+    async def test_shared_clients_do_not_keep_cookies(self):
+        registry = HttpClientRegistry()
+        client = registry.get(GITHUB)
+        request = httpx.Request("POST", "https://github.com/login/oauth/access_token")
+        response = httpx.Response(200, headers={"Set-Cookie": "_gh_sess=abc; Path=/"}, request=request)
+
+        client.cookies.extract_cookies(response)
+
+        assert len(client.cookies) == 0
+        await registry.aclose()
+
+    def test_stats_report_open_clients(self):
+        registry = HttpClientRegistry({GITHUB: UPSTREAMS[GITHUB]})
+        assert registry.get_stats()[GITHUB]["open"] is False
+
+        registry.get(GITHUB)
+
+        stats = registry.get_stats()[GITHUB]
+        assert stats["open"] is True
+        assert stats["max_connections"] == UPSTREAMS[GITHUB].limits.max_connections
@@ -0,0 +1,97 @@
+"""Tests for the two-tier (in-process + Redis) icon cache."""
+from datetime import datetime
+
+import pytest
+
+from app.schemas.icon_schemas import IconMetadataResponse
+from app.services.icons.cache import IconCache
+from app.services.icons.redis_cache import IconRedisCache
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio commands we use."""
+
+    def __init__(self):
+        self.store: dict[str, str] = {}
+
+    async def ping(self):
+        return True
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+
+def _shared(redis_client, interval: float = 0.0) -> IconRedisCache:
+    shared = IconRedisCache(version_check_interval=interval)
+    shared._redis = redis_client
+    return shared
+
+
+def _metadata(full_key: str) -> IconMetadataResponse:
+    pack_name, key = full_key.split(":", 1)
+    return IconMetadataResponse(
+        id=1, pack_id=1, key=key, full_key=full_key, search_terms=key,
+        access_count=0, created_at=datetime(2024, 1, 1),
+    )
+
+
+class TestIconCacheSharedTier:
+    """Read-through / write-through behaviour across workers."""
+
+    @pytest.fixture
+    def redis_client(self):
+        return FakeRedis()
+
+    async def test_new_worker_reads_svg_from_shared_tier(self, redis_client):
+        worker_a = IconCache(shared_cache=_shared(redis_client))
+        worker_b = IconCache(shared_cache=_shared(redis_client))
+
+        await worker_a.store_icon_svg("logos:react", "<svg/>")
+
+        assert await worker_b.fetch_icon_svg("logos:react") == "<svg/>"
+        # Promoted into worker B's L1
+        assert worker_b.get_icon_svg("logos:react") == "<svg/>"
+        assert worker_b.stats.l2_hits == 1
+
+    async def test_metadata_round_trips_through_json(self, redis_client):
+        worker_a = IconCache(shared_cache=_shared(redis_client))
+        worker_b = IconCache(shared_cache=_shared(redis_client))
+
+        await worker_a.store_icon_metadata("logos:react", _metadata("logos:react"))
+
+        found, missing = await worker_b.fetch_icon_metadata_many(["logos:react", "logos:vue"])
+        assert [m.full_key for m in found] == ["logos:react"]
+        assert missing == ["logos:vue"]
+
+    async def test_pack_invalidation_reaches_other_workers(self, redis_client):
+        worker_a = IconCache(shared_cache=_shared(redis_client))
+        worker_b = IconCache(shared_cache=_shared(redis_client))
+
+        await worker_a.store_icon_svg("logos:react", "<svg>old</svg>")
+        assert await worker_b.fetch_icon_svg("logos:react") == "<svg>old</svg>"
+
+        await worker_a.invalidate_pack_everywhere("logos")
+
+        assert await worker_b.fetch_icon_svg("logos:react") is None
+        assert worker_b.get_icon_svg("logos:react") is None
+
+    async def test_degrades_to_l1_without_redis(self):
+        shared = IconRedisCache()
+        shared._disabled_until = float("inf")
+        cache = IconCache(shared_cache=shared)
+
+        await cache.store_icon_svg("logos:react", "<svg/>")
+
+        assert await cache.fetch_icon_svg("logos:react") == "<svg/>"
+        assert await cache.fetch_icon_svg("logos:vue") is None
+        assert await cache.invalidate_pack_everywhere("logos") == 1
@@ -0,0 +1,91 @@
+"""Tests for install-time icon SVG rendering."""
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.base import Base
+from app.models.icon_models import IconMetadata, IconPack
+from app.services.icons.rendering import SVG_RENDER_VERSION, clean_body_for_mermaid, render_icon_svg
+from app.services.icons.svg import IconSVGService
+
+
+class TestRenderIconSvg:
+    """Tests for render_icon_svg."""
+
+    def test_iconify_body_is_wrapped(self):
+        svg = render_icon_svg({"body": '<path d="M0"/>', "width": 24, "height": 24})
+        assert svg == (
+            '<svg width="24" height="24" viewBox="0 0 24 24" '
+            'xmlns="http://www.w3.org/2000/svg"><path d="M0"/></svg>'
+        )
+
+    def test_viewbox_dimensions_win_when_they_disagree(self):
+        svg = render_icon_svg({"body": "<g/>", "width": 24, "height": 24, "viewBox": "0 0 64 32"})
+        assert svg.startswith('<svg width="64" height="32" viewBox="0 0 64 32"')
+
+    def test_namespaces_move_to_root_and_metadata_is_stripped(self):
+        body = (
+            '<title>t</title><desc>d</desc><!-- c -->'
+            '<g xmlns:sodipodi="http://sodipodi"><use xlink:href="#a"/></g>'
+        )
+        svg = render_icon_svg({"body": body})
+        assert 'xmlns:sodipodi="http://sodipodi"' in svg.split(">", 1)[0]
+        assert 'xmlns:xlink="http://www.w3.org/1999/xlink"' in svg
+        assert "<title>" not in svg and "<desc>" not in svg and "<!--" not in svg
+
+    def test_full_svg_is_returned_verbatim(self):
+        assert render_icon_svg({"full_svg": "<svg>x</svg>"}) == "<svg>x</svg>"
+
+    def test_file_based_icon(self, tmp_path):
+        path = tmp_path / "icon.svg"
+        path.write_text("<svg><title>AWS</title><path/></svg>")
+        assert render_icon_svg(None, str(path)) == "<svg><path/></svg>"
+
+    def test_missing_data(self, tmp_path):
+        assert render_icon_svg(None, str(tmp_path / "missing.svg")) is None
+        assert render_icon_svg({"unknown": True}) is None
+
+    def test_clean_body_for_mermaid(self):
+        body = '<ns0:g xmlns:ns0="http://x"  ns1:pageshadow="2"></ns0:g>'
+        assert clean_body_for_mermaid(body) == '<g pageshadow="2"></g>'
+
+
+class TestStoredRender:
+    """Tests for the stored render read on an SVG cache miss."""
+
+    @pytest.fixture
+    async def db(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[IconPack.__table__, IconMetadata.__table__])
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            pack = IconPack(name="logos", display_name="Logos", category="logos")
+            session.add(pack)
+            await session.flush()
+            session.add_all([
+                IconMetadata(
+                    pack_id=pack.id, key="empty", search_terms="empty",
+                    rendered_svg=None, rendered_svg_version=SVG_RENDER_VERSION,
+                ),
+                IconMetadata(
+                    pack_id=pack.id, key="legacy", search_terms="legacy",
+                    icon_data={"full_svg": "<svg/>"},
+                ),
+            ])
+            await session.commit()
+            yield session
+        await engine.dispose()
+
+    async def test_unrenderable_icon_is_not_rendered_again(self, db):
+        service = IconSVGService(db)
+        service.cache = AsyncMock()
+        service.cache.fetch_icon_svg.return_value = None
+        service._store_rendered_svg = AsyncMock()
+
+        assert await service.get_icon_svg("logos", "empty") is None
+        service._store_rendered_svg.assert_not_awaited()
+
+        # Rows rendered before pre-rendering existed are rendered once and stored
+        assert await service.get_icon_svg("logos", "legacy") == "<svg/>"
+        service._store_rendered_svg.assert_awaited_once()
@@ -0,0 +1,77 @@
+"""Tests for ranked, keyset-paginated icon search."""
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.base import Base
+from app.models.icon_models import IconMetadata, IconPack
+from app.schemas.icon_schemas import IconSearchRequest
+from app.services.icons.search import IconSearchService, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[IconPack.__table__, IconMetadata.__table__]
+        )
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        pack = IconPack(name="logos", display_name="Logos", category="logos")
+        session.add(pack)
+        await session.flush()
+        for key, hits in [("aws-lambda", 5), ("lambda", 1), ("lambda-function", 9), ("react", 50), ("vue", 0)]:
+            session.add(IconMetadata(pack_id=pack.id, key=key, search_terms=key.replace("-", " "), access_count=hits))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def _keys(response):
+    return [icon.key for icon in response.icons]
+
+
+class TestIconSearch:
+    """Tests for IconSearchService.search_icons."""
+
+    async def test_exact_and_prefix_matches_rank_first(self, db):
+        response = await IconSearchService(db).search_icons(IconSearchRequest(q="lambda"))
+        assert _keys(response) == ["lambda", "lambda-function", "aws-lambda"]
+        assert response.total == 3 and not response.has_next and response.next_cursor is None
+
+    async def test_keyset_pages_cover_all_rows_once(self, db):
+        service = IconSearchService(db)
+        first = await service.search_icons(IconSearchRequest(size=2))
+        assert _keys(first) == ["react", "lambda-function"]
+        assert first.has_next and first.total == 5
+
+        second = await service.search_icons(IconSearchRequest(size=2, cursor=first.next_cursor))
+        third = await service.search_icons(IconSearchRequest(size=2, cursor=second.next_cursor))
+        assert _keys(second) == ["aws-lambda", "lambda"]
+        assert _keys(third) == ["vue"]
+        assert not third.has_next and third.has_prev
+
+    async def test_offset_pagination_still_works(self, db):
+        response = await IconSearchService(db).search_icons(IconSearchRequest(q="lambda", page=1, size=2))
+        assert _keys(response) == ["aws-lambda"]
+        assert response.total == 3 and response.pages == 2
+
+    async def test_estimated_count_falls_back_to_exact_off_postgres(self, db):
+        response = await IconSearchService(db).search_icons(IconSearchRequest(size=1, count="estimated"))
+        assert response.total == 5 and not response.total_is_estimate
+
+    async def test_mismatched_cursor_is_rejected(self, db):
+        with pytest.raises(ValueError):
+            await IconSearchService(db).search_icons(IconSearchRequest(q="lambda", cursor=encode_cursor([1, "x", 2])))
+
+    async def test_cursor_with_wrong_types_is_rejected(self, db):
+        for values in (["0", 10, "ec2", 7], [0, 10, 5, 7], [0, True, "ec2", 7]):
+            with pytest.raises(ValueError):
+                await IconSearchService(db).search_icons(
+                    IconSearchRequest(q="lambda", cursor=encode_cursor(values))
+                )
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor([2, 10, "ec2", 7])) == [2, 10, "ec2", 7]
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor!")
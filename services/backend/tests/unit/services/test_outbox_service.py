@@ -75,6 +75,14 @@ class TestOutboxServiceAddEvent:
         payload = json.loads(params["payload"])
         assert payload["name"] == "Test"
 
+    async def test_add_event_notifies_relay_in_same_statement(self, service, mock_db):
+        await service.add_event(event_type="UserCreated", aggregate_id="user-1", payload={})
+
+        mock_db.execute.assert_awaited_once()
+        sql = str(mock_db.execute.call_args[0][0])
+        assert "INSERT INTO identity.outbox" in sql
+        assert "pg_notify('outbox_events', topic)" in sql
+
 
 class TestOutboxServiceUserEvents:
     """Tests for user-specific event convenience methods."""
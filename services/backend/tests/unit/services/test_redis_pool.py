@@ -0,0 +1,122 @@
+"""Tests for the shared application Redis pool."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import MaxConnectionsError
+
+from app.services.redis_pool import RedisPool, is_unreachable
+
+
+class FakePipeline:
+    """Records queued commands and returns one result per command."""
+
+    def __init__(self):
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __len__(self):
+        return len(self.commands)
+
+    def incr(self, key):
+        self.commands.append(("incr", key))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    async def execute(self):
+        return [1] * len(self.commands)
+
+
+def _pool(client) -> RedisPool:
+    pool = RedisPool(url="redis://example:6379")
+    pool._client = client
+    return pool
+
+
+class TestRedisPool:
+
+    async def test_get_verifies_once_and_reuses_client(self):
+        client = MagicMock()
+        client.ping = AsyncMock(return_value=True)
+        pool = _pool(client)
+
+        assert await pool.get() is client
+        assert await pool.get() is client
+        assert client.ping.await_count == 1
+        assert pool.available
+
+    async def test_backs_off_after_failed_connection(self):
+        client = MagicMock()
+        client.ping = AsyncMock(side_effect=ConnectionError("refused"))
+        pool = _pool(client)
+
+        assert await pool.get() is None
+        assert await pool.get() is None
+        assert client.ping.await_count == 1
+        assert pool.get_stats()["connect_failures"] == 1
+
+    async def test_mark_failed_forces_reverification(self):
+        client = MagicMock()
+        client.ping = AsyncMock(return_value=True)
+        pool = _pool(client)
+        await pool.get()
+
+        pool.mark_failed()
+
+        assert not pool.available
+        assert await pool.get() is None
+        assert pool.get_stats()["command_errors"] == 1
+
+    async def test_exhausted_pool_is_not_an_outage(self):
+        client = MagicMock()
+        client.ping = AsyncMock(return_value=True)
+        pool = _pool(client)
+        await pool.get()
+        waited = RedisConnectionError("No connection available.")
+        waited.__cause__ = asyncio.TimeoutError()
+
+        pool.mark_failed(MaxConnectionsError("Too many connections"))
+        pool.mark_failed(waited)
+        pool.mark_failed(ValueError("bad entry"))
+
+        assert pool.available
+        assert is_unreachable(RedisConnectionError("refused"))
+        assert pool.get_stats()["command_errors"] == 3
+
+    async def test_pipeline_sends_queued_commands(self):
+        pipe = FakePipeline()
+        client = MagicMock()
+        client.ping = AsyncMock(return_value=True)
+        client.pipeline = MagicMock(return_value=pipe)
+        pool = _pool(client)
+
+        results = await pool.pipeline(lambda p: (p.incr("k"), p.expire("k", 60)))
+
+        assert results == [1, 1]
+        assert pipe.commands == [("incr", "k"), ("expire", "k", 60)]
+        stats = pool.get_stats()
+        assert stats["pipelines"] == 1 and stats["pipelined_commands"] == 2
+
+    async def test_pipeline_returns_none_without_redis(self):
+        client = MagicMock()
+        client.ping = AsyncMock(side_effect=ConnectionError("refused"))
+        pool = _pool(client)
+
+        assert await pool.pipeline(lambda p: p.incr("k")) is None
+        client.pipeline.assert_not_called()
+
+    async def test_stop_closes_client(self):
+        client = MagicMock()
+        client.aclose = AsyncMock()
+        pool = _pool(client)
+
+        await pool.stop()
+
+        client.aclose.assert_awaited_once_with(close_connection_pool=True)
+        assert pool._client is None
@@ -355,6 +355,29 @@ class TestCacheInvalidation:
         await service._invalidate_user_cache(user_id=1)
 
 
+class TestQueryEmbeddingCache:
+
+    async def test_cached_vector_skips_embedding_service(self):
+        client = AsyncMock()
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value="[0.5, -0.5]")
+        service = SemanticSearchService(client, redis_client=redis)
+
+        assert await service._embed_query("hello") == [0.5, -0.5]
+        client.embed_query.assert_not_awaited()
+
+    async def test_miss_embeds_and_stores_vector(self):
+        client = AsyncMock()
+        client.embed_query = AsyncMock(return_value=[0.25, 0.75])
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value=None)
+        service = SemanticSearchService(client, redis_client=redis)
+
+        assert await service._embed_query("hello") == [0.25, 0.75]
+        key, value = redis.set.await_args.args
+        assert key.startswith("search:qemb:v1:") and value == "[0.25, 0.75]"
+
+
 class AsyncIterHelper:
     """Helper to make a list behave as an async iterator for scan_iter."""
     def __init__(self, items):
@@ -0,0 +1,122 @@
+"""Tests for cached storage usage accounting."""
+import os
+import shutil
+
+import pytest
+
+from app.services.github import filesystem as github_filesystem
+from app.services.storage.usage import StorageUsageTracker, scan_directory
+
+
+def _write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+def _repo(root, owner, name, size):
+    repo = root / owner / name
+    (repo / ".git").mkdir(parents=True)
+    _write(repo / "README.md", size)
+    return repo
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = StorageUsageTracker()
+    monkeypatch.setattr(github_filesystem, "storage_usage", tracker)
+    return tracker
+
+
+class TestScanDirectory:
+
+    def test_counts_files_directories_and_repositories(self, tmp_path):
+        _repo(tmp_path, "octo", "docs", 10)
+        _write(tmp_path / "notes" / "a.md", 5)
+        os.symlink(tmp_path / "notes", tmp_path / "link")
+
+        usage = scan_directory(tmp_path)
+
+        assert usage.size_bytes == 15
+        assert usage.file_count == 2
+        # octo, octo/docs, octo/docs/.git, notes
+        assert usage.directory_count == 4
+        assert usage.git_repositories == ("octo/docs",)
+
+
+class TestStorageUsageTracker:
+
+    async def test_get_scans_once(self, tmp_path, tracker):
+        _write(tmp_path / "a.md", 3)
+
+        assert (await tracker.get(tmp_path)).size_bytes == 3
+        _write(tmp_path / "b.md", 4)
+        assert (await tracker.get(tmp_path)).size_bytes == 3
+        assert tracker.get_stats()["scans"] == 1
+
+    async def test_clone_and_prune_adjust_tracked_totals(self, tmp_path, tracker):
+        github_dir = tmp_path / "GitHub"
+        _repo(github_dir, "octo", "docs", 10)
+        await tracker.get(github_dir)
+
+        repo = _repo(github_dir, "octo", "wiki", 20)
+        await tracker.add(repo)
+        usage = await tracker.get(github_dir)
+        assert usage.size_bytes == 30
+        assert usage.git_repositories == ("octo/docs", "octo/wiki")
+
+        _write(repo / "more.md", 5)
+        await tracker.refresh(repo)
+        assert (await tracker.get(github_dir)).size_bytes == 35
+
+        shutil.rmtree(repo)
+        tracker.forget(repo)
+        usage = await tracker.get(github_dir)
+        assert usage.size_bytes == 10
+        assert usage.git_repositories == ("octo/docs",)
+        assert tracker.get_stats()["scans"] == 3
+
+    async def test_file_changes_apply_deltas_without_scanning(self, tmp_path, tracker):
+        user_dir = tmp_path / "1"
+        _write(user_dir / "local" / "a.md", 3)
+        await tracker.get(user_dir)
+
+        _write(user_dir / "local" / "b.md", 4)
+        tracker.record_file_change(user_dir / "local" / "b.md", None, 4)
+        tracker.record_file_change(user_dir / "local" / "a.md", 3, 1)
+        usage = await tracker.get(user_dir)
+        assert (usage.size_bytes, usage.file_count) == (5, 2)
+
+        tracker.record_file_change(user_dir / "local" / "b.md", 4, None)
+        usage = await tracker.get(user_dir)
+        assert (usage.size_bytes, usage.file_count) == (1, 1)
+        assert tracker.get_stats()["scans"] == 1
+        assert await tracker.refresh_dirty() == 0
+
+    async def test_untracked_children_are_reconciled(self, tmp_path, tracker):
+        github_dir = tmp_path / "GitHub"
+        _repo(github_dir, "octo", "docs", 10)
+        await tracker.get(github_dir)
+
+        _write(github_dir / "octo" / "docs" / "more.md", 5)
+        await tracker.refresh(github_dir / "octo" / "docs")
+
+        assert await tracker.refresh_dirty() == 1
+        assert (await tracker.get(github_dir)).size_bytes == 15
+
+
+class TestGitHubStorageLimits:
+
+    async def test_limits_use_cached_usage(self, tmp_path, tracker):
+        service = github_filesystem.GitHubFilesystemService()
+        service.storage_root = tmp_path
+        github_dir = tmp_path / "7" / "GitHub"
+        _repo(github_dir, "octo", "docs", 1024)
+        _repo(github_dir, "octo", "wiki", 1024)
+
+        within, info = await service.check_storage_limits(7)
+        await service.check_storage_limits(7)
+
+        assert within is True
+        assert info["repo_count"] == 2
+        assert await service.get_repository_size(github_dir / "octo" / "docs") == 1024
+        assert tracker.get_stats()["scans"] == 2
@@ -4,29 +4,23 @@ import asyncio
 import json
 import logging
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 import redis.asyncio as redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .database import DatabaseManager
+from .idempotency import RecentEventIds
+from .metrics import count_events, observe_event, refresh_stream_gauges
 from events_core.models.envelope_v1 import EventEnvelopeV1
 
-# Import validators and constants
-try:
-    from events_core.validators import EventValidator, EventTypes
-except ImportError:
-    # Fallback if validators not available
-    class EventValidator:
-        def validate_event(self, event_data):
-            return True
-
-    class EventTypes:
-        USER_CREATED = "UserCreated"
-        USER_UPDATED = "UserUpdated"
-        USER_DISABLED = "UserDisabled"
+# Compiled schema validators and constants
+from events_core.constants import EventTypes
+from events_core.registry import EventValidationError, get_registry
 
 # Import event models from top-level events_core package
 try:
@@ -58,9 +52,36 @@ class ConfigurableConsumer:
 
         self.redis_client = None
         self.db_manager = None
-        self.event_validator = EventValidator()
+        self.schema_registry = get_registry()
         self._running = False
 
+        # Optional "processing" section tunes throughput and failure handling
+        processing = config.get('processing', {})
+        self.workers = max(1, int(processing.get('workers', 8)))
+        self.batch_size = int(processing.get('batch_size', 50))
+        self.reclaim_idle_ms = int(processing.get('reclaim_idle_ms', 60000))
+        self.reclaim_interval = float(processing.get('reclaim_interval_seconds', 30))
+        self.max_deliveries = int(processing.get('max_deliveries', 5))
+        self.recent_events = RecentEventIds(int(processing.get('recent_event_cache', 10000)))
+
+        # Shared by the read and reclaim loops: a lane is processed by one loop
+        # at a time, and an aggregate with an unacknowledged failure holds back
+        # its later events until the reclaim loop has retried up to the newest
+        # of them ((topic, aggregate) -> newest held stream ID)
+        self._lane_locks = [asyncio.Lock() for _ in range(self.workers)]
+        self._held: Dict[Tuple[str, str], str] = {}
+        # Failed processing attempts per (topic, stream ID).  Held events are
+        # reclaimed along with the failing one, so their XPENDING delivery
+        # counts say nothing about whether they are poison; only attempts
+        # that actually ran count towards max_deliveries.  Counts start over
+        # when the consumer restarts.
+        self._failures: Dict[Tuple[str, str], int] = {}
+
+        # Optional "metrics" section; port 0 disables the Prometheus endpoint
+        metrics = config.get('metrics', {})
+        self.metrics_port = int(metrics.get('port', 9100))
+        self.metrics_interval = float(metrics.get('refresh_interval_seconds', 15))
+
         # Extract database URL from environment
         import os
         database_url = os.getenv('DATABASE_URL')
@@ -154,54 +175,303 @@ class ConfigurableConsumer:
         consumer_group = self.config['consumer_group']
         consumer_name = f"{self.service_config['name']}-{os.getpid()}"
 
-        logger.info(f"Starting {self.service_config['name']} consumer loop as '{consumer_name}'")
+        logger.info(
+            f"Starting {self.service_config['name']} consumer loop as '{consumer_name}' "
+            f"({self.workers} workers, batch {self.batch_size})"
+        )
 
-        while not shutdown_flag.is_set() and self._running:
-            try:
-                # Read events from all topics
-                topic_streams = {topic: ">" for topic in self.topics}
-                events = await self.redis_client.xreadgroup(
-                    consumer_group,
-                    consumer_name,
-                    topic_streams,
-                    count=10,
-                    block=1000
-                )
+        # Pick up messages left pending by crashed/restarted consumers
+        background = [asyncio.create_task(self._reclaim_loop(consumer_name, shutdown_flag))]
+        if self.metrics_port:
+            background.append(asyncio.create_task(self._metrics_loop(shutdown_flag)))
 
-                if events:
-                    await self._process_batch(events)
+        try:
+            while not shutdown_flag.is_set() and self._running:
+                try:
+                    # Read events from all topics
+                    topic_streams = {topic: ">" for topic in self.topics}
+                    events = await self.redis_client.xreadgroup(
+                        consumer_group,
+                        consumer_name,
+                        topic_streams,
+                        count=self.batch_size,
+                        block=1000
+                    )
 
-            except redis.ConnectionError as e:
-                logger.error(f"Redis connection error: {e}")
-                await asyncio.sleep(5)  # Wait before retrying
-            except Exception as e:
-                logger.error(f"Error in consumer loop: {e}", exc_info=True)
-                await asyncio.sleep(1)
+                    if events:
+                        await self._process_batch(events)
+
+                except redis.ConnectionError as e:
+                    logger.error(f"Redis connection error: {e}")
+                    await asyncio.sleep(5)  # Wait before retrying
+                except Exception as e:
+                    logger.error(f"Error in consumer loop: {e}", exc_info=True)
+                    await asyncio.sleep(1)
+        finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
 
         logger.info("Consumer loop stopped")
 
     async def _process_batch(self, events: List[Any]):
         """Process a batch of events from multiple topics."""
-        consumer_group = self.config['consumer_group']
-
         # events format: [(topic_name, [(event_id, fields), ...])]
         for topic_name, topic_events in events:
-            for event_id, fields in topic_events:
-                try:
-                    await self._process_event(event_id, fields)
+            await self._process_messages(topic_name, topic_events)
+
+    async def _process_messages(self, topic_name: str, messages: List[Any], retry: bool = False) -> List[str]:
+        """Process one topic's messages concurrently and acknowledge the successes.
+
+        Messages are partitioned into ``self.workers`` lanes by a hash of
+        ``aggregate_id``; lanes run concurrently and each lane processes its
+        messages in stream order, so events for one aggregate never overtake
+        each other.
+
+        Args:
+            retry: True for pending messages claimed by the reclaim loop
+
+        Returns:
+            Stream IDs that were processed and acknowledged
+        """
+        fresh, duplicates = await self._split_processed(messages)
+        if duplicates:
+            logger.info(f"Skipping {len(duplicates)} already processed events on {topic_name}")
+            count_events(topic_name, "duplicate", len(duplicates))
+            if retry:
+                self._settle_duplicates(topic_name, messages, set(duplicates))
+
+        done = duplicates + await self._run_lanes(topic_name, fresh, retry)
+
+        if done:
+            # Acknowledge all successful messages in one round-trip
+            await self.redis_client.xack(topic_name, self.config['consumer_group'], *done)
+            logger.debug(f"Acknowledged {len(done)} events on {topic_name}")
+
+        return done
+
+    def _settle_duplicates(self, topic_name: str, messages: List[Any], duplicates: set):
+        """Forget retry state of reclaimed events that turned out to be processed already."""
+        for message_id, fields in messages:
+            if message_id in duplicates:
+                self._failures.pop((topic_name, message_id), None)
+                self._release((topic_name, fields.get("aggregate_id") or message_id), message_id)
+
+    async def _run_lanes(self, topic_name: str, messages: List[Any], retry: bool) -> List[str]:
+        """Partition messages into lanes, run the lanes concurrently and return the IDs that succeeded."""
+        lanes: List[List[Any]] = [[] for _ in range(self.workers)]
+        for message_id, fields in messages:
+            lanes[self._lane_for(message_id, fields)].append((message_id, fields))
+
+        results = await asyncio.gather(*(
+            self._run_lane(topic_name, index, lane, retry) for index, lane in enumerate(lanes) if lane
+        ))
+        return [message_id for lane_done in results for message_id in lane_done]
+
+    async def _split_processed(self, messages: List[Any]) -> Tuple[List[Any], List[str]]:
+        """Separate redelivered events that are already in the ledger.
+
+        Recently processed IDs are answered from memory; the rest of the batch
+        is checked with a single ledger query.
+
+        Returns:
+            (messages still to process, stream IDs of already processed events)
+        """
+        unknown = {
+            fields["event_id"] for _, fields in messages
+            if fields.get("event_id") and fields["event_id"] not in self.recent_events
+        }
+        if unknown:
+            async with self.db_manager.session_factory() as session:
+                self.recent_events.update(
+                    await self.db_manager.filter_processed_events(session, unknown)
+                )
 
-                    # Acknowledge successful processing
-                    await self.redis_client.xack(
-                        topic_name,
-                        consumer_group,
-                        event_id
-                    )
+        fresh, duplicates = [], []
+        for message_id, fields in messages:
+            event_id = fields.get("event_id")
+            if event_id and event_id in self.recent_events:
+                duplicates.append(message_id)
+            else:
+                fresh.append((message_id, fields))
+        return fresh, duplicates
+
+    def _lane_for(self, message_id: str, fields: Dict[str, str]) -> int:
+        """Stable lane index for a message (same aggregate -> same lane)."""
+        key = fields.get("aggregate_id") or message_id
+        return zlib.crc32(key.encode()) % self.workers
+
+    @staticmethod
+    def _stream_order(message_id: str) -> Tuple[int, int]:
+        milliseconds, _, sequence = message_id.partition("-")
+        return int(milliseconds), int(sequence or 0)
+
+    def _hold(self, key: Tuple[str, str], message_id: str):
+        """Leave ``message_id`` pending and hold the aggregate's later events behind it."""
+        held = self._held.get(key)
+        if held is None or self._stream_order(message_id) > self._stream_order(held):
+            self._held[key] = message_id
+
+    def _release(self, key: Tuple[str, str], message_id: str):
+        """Release the aggregate once its newest held event has been settled."""
+        held = self._held.get(key)
+        if held is not None and self._stream_order(message_id) >= self._stream_order(held):
+            del self._held[key]
+
+    async def _run_lane(self, topic_name: str, index: int, lane: List[Any], retry: bool = False) -> List[str]:
+        """Process a lane sequentially; returns the stream IDs that succeeded.
+
+        Once an aggregate fails, its later events stay pending so they are
+        retried after it (reclaim returns pending entries in ID order).  The
+        read loop keeps skipping the aggregate until the reclaim loop has
+        settled every event held back so far.
+        """
+        done = []
+        failed = set()
+
+        async with self._lane_locks[index]:
+            for message_id, fields in lane:
+                key = (topic_name, fields.get("aggregate_id") or message_id)
+                if key in failed or (not retry and key in self._held):
+                    self._hold(key, message_id)
+                    continue
+                result = await self._run_event(topic_name, message_id, fields)
+                if result == "failure":
+                    failed.add(key)
+                    self._hold(key, message_id)
+                    self._failures[(topic_name, message_id)] = self._failures.get((topic_name, message_id), 0) + 1
+                    continue
+                self._failures.pop((topic_name, message_id), None)
+                if result == "success":
+                    done.append(message_id)
+                if retry:
+                    self._release(key, message_id)
+
+        return done
+
+    async def _run_event(self, topic_name: str, message_id: str, fields: Dict[str, str]) -> str:
+        """Process one event; returns its result label ("success", "invalid" or "failure")."""
+        started = time.perf_counter()
+        try:
+            await self._process_event(message_id, fields)
+            result = "success"
+            logger.debug(f"Successfully processed event {message_id}")
+        except EventValidationError as e:
+            # Retrying cannot fix a schema violation; dead-letter it right away
+            logger.error(f"Event {message_id} failed schema validation: {e}")
+            await self._dead_letter(topic_name, message_id, fields, deliveries=1, error=str(e))
+            result = "invalid"
+        except Exception as e:
+            logger.error(f"Failed to process event {message_id}: {e}", exc_info=True)
+            # Event will remain unacknowledged and is retried by the reclaim loop
+            result = "failure"
+        observe_event(
+            topic_name, fields.get("event_type"), result,
+            time.perf_counter() - started, fields.get("occurred_at"),
+        )
+        return result
 
-                    logger.debug(f"Successfully processed and acknowledged event {event_id}")
+    async def _reclaim_loop(self, consumer_name: str, shutdown_flag: asyncio.Event):
+        """Periodically claim and retry stale pending messages."""
+        while not shutdown_flag.is_set():
+            try:
+                await asyncio.wait_for(shutdown_flag.wait(), timeout=self.reclaim_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
 
+            for topic in self.topics:
+                try:
+                    await self._reclaim_topic(topic, consumer_name)
+                except redis.ResponseError as e:
+                    logger.error(f"Reclaim failed for {topic}: {e}")
+                except redis.ConnectionError as e:
+                    logger.error(f"Redis connection error during reclaim: {e}")
                 except Exception as e:
-                    logger.error(f"Failed to process event {event_id}: {e}", exc_info=True)
-                    # Event will remain unacknowledged and can be retried
+                    logger.error(f"Error reclaiming pending events on {topic}: {e}", exc_info=True)
+
+    async def _metrics_loop(self, shutdown_flag: asyncio.Event):
+        """Periodically refresh the stream/consumer-group gauges."""
+        while not shutdown_flag.is_set():
+            try:
+                await refresh_stream_gauges(self.redis_client, self.topics, self.config['consumer_group'])
+            except Exception as e:
+                logger.warning(f"Metrics refresh failed: {e}")
+
+            try:
+                await asyncio.wait_for(shutdown_flag.wait(), timeout=self.metrics_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _reclaim_topic(self, topic: str, consumer_name: str) -> int:
+        """XAUTOCLAIM stale pending entries of one topic; returns messages handled."""
+        consumer_group = self.config['consumer_group']
+        handled = 0
+        start_id = "0-0"
+
+        while True:
+            reply = await self.redis_client.xautoclaim(
+                topic, consumer_group, consumer_name,
+                min_idle_time=self.reclaim_idle_ms,
+                start_id=start_id,
+                count=self.batch_size,
+            )
+            start_id, claimed = reply[0], reply[1]
+            # Entries trimmed from the stream while pending (Redis 7+) can only be acked
+            deleted = reply[2] if len(reply) > 2 else []
+            if deleted:
+                await self.redis_client.xack(topic, consumer_group, *deleted)
+
+            messages = [(message_id, fields) for message_id, fields in claimed if fields]
+            if messages:
+                retry = await self._dead_letter_exhausted(topic, messages)
+                if retry:
+                    logger.info(f"Retrying {len(retry)} stale pending events on {topic}")
+                    await self._process_messages(topic, retry, retry=True)
+                handled += len(messages)
+
+            if start_id in ("0-0", b"0-0"):
+                return handled
+
+    async def _dead_letter_exhausted(self, topic: str, messages: List[Any]) -> List[Any]:
+        """Dead-letter claimed messages that failed ``max_deliveries`` times; returns the rest.
+
+        Events held behind a failing one have not failed themselves and are
+        returned for retry, so they are processed once the failing event is
+        dead-lettered.
+        """
+        retry = []
+        for message_id, fields in messages:
+            failures = self._failures.get((topic, message_id), 0)
+            if failures >= self.max_deliveries:
+                await self._dead_letter(topic, message_id, fields, failures, error="max deliveries exceeded")
+                del self._failures[(topic, message_id)]
+                self._release((topic, fields.get("aggregate_id") or message_id), message_id)
+            else:
+                retry.append((message_id, fields))
+        return retry
+
+    async def _dead_letter(
+        self, topic: str, message_id: str, fields: Dict[str, str], deliveries: int, error: str
+    ):
+        """Route a poison message to ``{topic}.dlq`` and acknowledge it."""
+        dlq_stream = f"{topic}.dlq"
+        dlq_data = {
+            **fields,
+            "original_stream": topic,
+            "original_message_id": message_id,
+            "consumer_group": self.config['consumer_group'],
+            "deliveries": str(deliveries),
+            "error": error,
+            "failed_at": datetime.now(timezone.utc).isoformat(),
+        }
+        await self.redis_client.xadd(dlq_stream, dlq_data, maxlen=1000)
+        await self.redis_client.xack(topic, self.config['consumer_group'], message_id)
+        count_events(topic, "dead_lettered")
+        logger.warning(
+            f"Moved event {fields.get('event_id', message_id)} to {dlq_stream} "
+            f"after {deliveries} deliveries"
+        )
 
     async def _process_event(self, event_id: str, fields: Dict[str, str]):
         """Process a single event."""
@@ -227,8 +497,10 @@ class ConfigurableConsumer:
             logger.error(f"Failed to parse event data for {event_id}: {e}")
             return
 
-        # For now, skip complex validation and just parse the data directly
-        # TODO: Implement proper event validation with events_core
+        # Validate envelope and payload with the compiled schema validators;
+        # event types without a registered schema are passed through
+        self.schema_registry.validate(event_data)
+
         envelope_data = {
             "event_id": event_data["event_id"],
             "event_type": event_data["event_type"],
@@ -249,28 +521,26 @@ class ConfigurableConsumer:
         session_gen = self.db_manager.get_session()
         session = await session_gen.__anext__()
         try:
-            # Check if event already processed (idempotency)
-            if await self.db_manager.check_event_processed(session, envelope.event_id):
-                logger.info(f"Event {envelope.event_id} already processed, skipping")
-                return
-
             # Process based on event type and configuration
             handler_name = self.event_handlers.get(envelope.event_type)
             if not handler_name:
                 logger.warning(f"No handler configured for event type: {envelope.event_type}")
                 return
 
-            await self._handle_event(session, envelope, payload, handler_name)
+            # Claim the event in the ledger (idempotency). The batch was already
+            # filtered; this only loses to a concurrent delivery of the same event.
+            if not await self.db_manager.record_events_processed(
+                session, [envelope.event_id], datetime.utcnow()
+            ):
+                logger.info(f"Event {envelope.event_id} already processed, skipping")
+                self.recent_events.add(envelope.event_id)
+                return
 
-            # Record event as processed
-            await self.db_manager.record_event_processed(
-                session,
-                envelope.event_id,
-                datetime.utcnow()
-            )
+            await self._handle_event(session, envelope, payload, handler_name)
 
             # Commit transaction
             await session.commit()
+            self.recent_events.add(envelope.event_id)
 
             logger.info(f"Processed {envelope.event_type} event for user {payload.user_id}")
 
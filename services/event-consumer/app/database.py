@@ -3,7 +3,7 @@
 import json
 import logging
 from datetime import datetime
-from typing import AsyncGenerator, Dict, Any, Optional
+from typing import AsyncGenerator, Dict, Any, Iterable, Optional, Set
 from uuid import UUID
 
 from sqlalchemy import text
@@ -121,31 +121,56 @@ class DatabaseManager:
 
         await conn.execute(text(create_sql))
 
+    def _ledger_table(self) -> str:
+        """Qualified name of the event ledger table."""
+        table_config = self.tables.get('event_ledger', {})
+        return (table_config.get('table_name', f'{self.schema}.event_ledger')
+                if isinstance(table_config, dict) else f'{self.schema}.event_ledger')
+
     async def check_event_processed(self, session: AsyncSession, event_id: str) -> bool:
         """Check if an event has already been processed."""
-        table_config = self.tables.get('event_ledger', {})
-        table_name = (table_config.get('table_name', f'{self.schema}.event_ledger')
-                     if isinstance(table_config, dict) else f'{self.schema}.event_ledger')
+        return event_id in await self.filter_processed_events(session, [event_id])
+
+    async def filter_processed_events(self, session: AsyncSession, event_ids: Iterable[str]) -> Set[str]:
+        """Return which of ``event_ids`` are already in the ledger (one query)."""
+        event_ids = list(event_ids)
+        if not event_ids:
+            return set()
         result = await session.execute(
-            text(f"SELECT 1 FROM {table_name} WHERE event_id = :event_id"),
-            {"event_id": event_id}
+            text(f"SELECT event_id FROM {self._ledger_table()} WHERE event_id = ANY(:event_ids)"),
+            {"event_ids": event_ids}
         )
-        return result.first() is not None
+        return {row.event_id for row in result}
 
     async def record_event_processed(
         self, session: AsyncSession, event_id: str, received_at: datetime
     ):
-        """Record that an event has been processed."""
-        table_config = self.tables.get('event_ledger', {})
-        table_name = (table_config.get('table_name', f'{self.schema}.event_ledger')
-                     if isinstance(table_config, dict) else f'{self.schema}.event_ledger')
-        await session.execute(
+        """Record that an event has been processed (no-op if already recorded)."""
+        await self.record_events_processed(session, [event_id], received_at)
+
+    async def record_events_processed(
+        self, session: AsyncSession, event_ids: Iterable[str], received_at: datetime
+    ) -> Set[str]:
+        """Record several processed events with one multi-row insert.
+
+        Returns:
+            The event IDs that were newly recorded; IDs already in the ledger
+            (e.g. committed by a concurrent delivery) are left out
+        """
+        event_ids = list(event_ids)
+        if not event_ids:
+            return set()
+        result = await session.execute(
             text(f"""
-                INSERT INTO {table_name} (event_id, received_at)
-                VALUES (:event_id, :received_at)
+                INSERT INTO {self._ledger_table()} (event_id, received_at)
+                SELECT event_id, :received_at
+                FROM unnest(CAST(:event_ids AS VARCHAR[])) AS event_id
+                ON CONFLICT (event_id) DO NOTHING
+                RETURNING event_id
             """),
-            {"event_id": event_id, "received_at": received_at}
+            {"event_ids": event_ids, "received_at": received_at}
         )
+        return {row.event_id for row in result}
 
     async def upsert_identity_projection(
         self,
@@ -5,12 +5,14 @@ This module provides utilities for:
 - Tracking processed events in event_ledger
 - Ensuring idempotent message handling
 - Checking if events have been processed before
+- Remembering recently processed event IDs in memory
 """
 
 import logging
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, List, Optional, Set, Tuple
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,6 +20,41 @@ from sqlalchemy.ext.asyncio import AsyncSession
 logger = logging.getLogger(__name__)
 
 
+class RecentEventIds:
+    """Bounded LRU set of recently processed event IDs.
+
+    Lets a consumer drop redelivered events without a ledger query. It is
+    only a shortcut: the ledger stays the source of truth.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+
+    def __contains__(self, event_id: str) -> bool:
+        if event_id in self._ids:
+            self._ids.move_to_end(event_id)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, event_id: str):
+        """Remember an event ID, evicting the least recently seen one if full."""
+        if self.capacity <= 0:
+            return
+        self._ids[event_id] = None
+        self._ids.move_to_end(event_id)
+        while len(self._ids) > self.capacity:
+            self._ids.popitem(last=False)
+
+    def update(self, event_ids: Iterable[str]):
+        """Remember several event IDs."""
+        for event_id in event_ids:
+            self.add(event_id)
+
+
 class IdempotencyTracker:
     """Utility for tracking processed events to ensure idempotent handling."""
 
@@ -76,6 +113,69 @@ class IdempotencyTracker:
             logger.error(f"Failed to mark event as processed: {e}")
             return False
 
+    async def processed_event_ids(self, session: AsyncSession, event_ids: Iterable[str]) -> Set[str]:
+        """Return which of ``event_ids`` this consumer group already processed (one query)."""
+        event_ids = list(event_ids)
+        if not event_ids:
+            return set()
+        try:
+            query = text(f"""
+                SELECT event_id FROM {self.schema}.event_ledger
+                WHERE event_id = ANY(:event_ids)
+                AND consumer_group = :consumer_group
+            """)
+
+            result = await session.execute(query, {
+                "event_ids": event_ids,
+                "consumer_group": self.consumer_group
+            })
+
+            return {str(row.event_id) for row in result}
+
+        except Exception as e:
+            logger.error(f"Failed to check event processing status: {e}")
+            return set()
+
+    async def mark_events_processed(self, session: AsyncSession, events: List[Tuple[str, str]],
+                                    result: str = "success") -> bool:
+        """Mark several ``(event_id, event_type)`` pairs as processed with one multi-row insert."""
+        # ON CONFLICT DO UPDATE cannot touch the same row twice in one statement
+        events = list(dict(events).items())
+        if not events:
+            return True
+        try:
+            # Validate event_ids are proper UUIDs
+            for event_id, _ in events:
+                uuid.UUID(event_id)
+
+            params = {
+                "consumer_group": self.consumer_group,
+                "result": result,
+                "processed_at": datetime.now(timezone.utc)
+            }
+            rows = []
+            for i, (event_id, event_type) in enumerate(events):
+                rows.append(f"(:event_id_{i}, :event_type_{i}, :consumer_group, :result, :processed_at)")
+                params[f"event_id_{i}"] = event_id
+                params[f"event_type_{i}"] = event_type
+
+            query = text(f"""
+                INSERT INTO {self.schema}.event_ledger
+                (event_id, event_type, consumer_group, processing_result, processed_at)
+                VALUES {", ".join(rows)}
+                ON CONFLICT (event_id) DO UPDATE SET
+                    processing_result = EXCLUDED.processing_result,
+                    processed_at = EXCLUDED.processed_at
+            """)
+
+            await session.execute(query, params)
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to mark events as processed: {e}")
+            return False
+
     async def get_processing_stats(self, session: AsyncSession,
                                  hours: int = 24) -> dict:
         """Get processing statistics for the consumer group."""
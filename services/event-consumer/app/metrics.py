@@ -1,14 +1,104 @@
-"""Metrics collection and reporting for consumer services."""
+"""Metrics collection and reporting for consumer services.
+
+Besides the in-memory ``ConsumerMetrics`` snapshot, this module defines the
+Prometheus collectors the consumer updates while processing events; they are
+served in text format by ``start_metrics_server``.
+"""
 
 import asyncio
 import logging
 import time
 from collections import defaultdict
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional
 from datetime import datetime, timezone
 
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
 logger = logging.getLogger(__name__)
 
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+EVENTS_TOTAL = Counter(
+    "consumer_events_total",
+    "Stream entries handled, by result (success, failure, invalid, duplicate, dead_lettered)",
+    ["topic", "result"],
+)
+EVENT_HANDLE_SECONDS = Histogram(
+    "consumer_event_handle_duration_seconds",
+    "Time to handle one event (ledger claim, handler and commit)",
+    ["topic", "event_type"],
+    buckets=LATENCY_BUCKETS,
+)
+EVENT_LAG_SECONDS = Histogram(
+    "consumer_event_lag_seconds",
+    "Time from event occurrence to successful handling",
+    ["topic"],
+    buckets=LATENCY_BUCKETS,
+)
+PENDING_MESSAGES = Gauge(
+    "consumer_pending_messages",
+    "Entries delivered to the group but not yet acknowledged (XPENDING)",
+    ["topic", "group"],
+)
+GROUP_LAG = Gauge(
+    "consumer_group_lag",
+    "Entries not yet delivered to the group (XINFO GROUPS lag, Redis 7+)",
+    ["topic", "group"],
+)
+STREAM_LENGTH = Gauge(
+    "consumer_stream_length", "Entries in the stream (XLEN)", ["topic"]
+)
+
+
+def start_metrics_server(port: int):
+    """Serve the Prometheus collectors on ``port`` from a background thread."""
+    start_http_server(port)
+    logger.info(f"Prometheus metrics available on :{port}/metrics")
+
+
+def observe_event(topic: str, event_type: Optional[str], result: str, duration: float,
+                  occurred_at: Optional[str] = None):
+    """Record the outcome and latency of one handled event."""
+    EVENTS_TOTAL.labels(topic, result).inc()
+    EVENT_HANDLE_SECONDS.labels(topic, event_type or "unknown").observe(duration)
+
+    if result == "success" and occurred_at:
+        try:
+            occurred = datetime.fromisoformat(occurred_at.replace("Z", "+00:00"))
+        except ValueError:
+            return
+        if occurred.tzinfo is None:
+            occurred = occurred.replace(tzinfo=timezone.utc)
+        lag = (datetime.now(timezone.utc) - occurred).total_seconds()
+        EVENT_LAG_SECONDS.labels(topic).observe(max(lag, 0.0))
+
+
+def count_events(topic: str, result: str, count: int = 1):
+    """Count entries that were not handled (duplicates, dead-lettered)."""
+    EVENTS_TOTAL.labels(topic, result).inc(count)
+
+
+async def refresh_stream_gauges(redis_client, topics: Iterable[str], group: str):
+    """Refresh pending, lag and length gauges with one pipelined round-trip."""
+    topics = list(topics)
+    pipe = redis_client.pipeline(transaction=False)
+    for topic in topics:
+        pipe.xpending(topic, group)
+        pipe.xlen(topic)
+        pipe.xinfo_groups(topic)
+    results = await pipe.execute(raise_on_error=False)
+
+    for i, topic in enumerate(topics):
+        pending, length, groups = results[3 * i:3 * i + 3]
+        if not isinstance(pending, Exception):
+            PENDING_MESSAGES.labels(topic, group).set(pending["pending"])
+        if not isinstance(length, Exception):
+            STREAM_LENGTH.labels(topic).set(length)
+        if not isinstance(groups, Exception):
+            for info in groups:
+                if info.get("name") == group and info.get("lag") is not None:
+                    GROUP_LAG.labels(topic, group).set(info["lag"])
+
 
 class ConsumerMetrics:
     """Metrics collector for consumer service operations."""
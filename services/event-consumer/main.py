@@ -10,6 +10,7 @@ from pathlib import Path
 
 from app.consumer import ConfigurableConsumer
 from app.logging_config import configure_logging
+from app.metrics import start_metrics_server
 
 # Configure structured JSON logging
 configure_logging(service_name="mm-event-consumer")
@@ -62,6 +63,9 @@ async def main():
         await consumer.initialize()
         logger.info("Configurable consumer service initialized successfully")
 
+        if consumer.metrics_port:
+            start_metrics_server(consumer.metrics_port)
+
         # Start processing loop
         await consumer.run(shutdown_flag)
 
@@ -0,0 +1,182 @@
+"""
+Unit tests for concurrent batch processing, pending-entry reclaim, DLQ routing
+and batched idempotency checks.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.consumer import ConfigurableConsumer
+from app.idempotency import RecentEventIds
+
+
+def _message(stream_id, aggregate_id):
+    return (stream_id, {"event_id": f"evt-{stream_id}", "aggregate_id": aggregate_id, "payload": "{}"})
+
+
+@pytest.fixture
+def consumer(service_config):
+    config = {**service_config, "processing": {"workers": 4, "max_deliveries": 3}}
+    consumer = ConfigurableConsumer(config)
+    consumer.redis_client = AsyncMock()
+    consumer.db_manager.session_factory = MagicMock()
+    consumer.db_manager.filter_processed_events = AsyncMock(return_value=set())
+    return consumer
+
+
+class TestConcurrentProcessing:
+    """Test lane partitioning and batched acknowledgement."""
+
+    @pytest.mark.unit
+    async def test_aggregate_order_preserved_and_acked_once(self, consumer):
+        processed = []
+
+        async def process(message_id, fields):
+            await asyncio.sleep(0)
+            processed.append((fields["aggregate_id"], message_id))
+
+        consumer._process_event = process
+        messages = [_message(f"{i}-0", f"user-{i % 3}") for i in range(9)]
+
+        done = await consumer._process_messages("identity.user.v1", messages)
+
+        assert sorted(done) == sorted(m[0] for m in messages)
+        for aggregate in ("user-0", "user-1", "user-2"):
+            ids = [mid for agg, mid in processed if agg == aggregate]
+            assert ids == [mid for mid, f in messages if f["aggregate_id"] == aggregate]
+        consumer.redis_client.xack.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_failure_holds_back_later_events_of_same_aggregate(self, consumer):
+        async def process(message_id, fields):
+            if message_id == "1-0":
+                raise RuntimeError("boom")
+
+        consumer._process_event = process
+        messages = [_message("1-0", "user-a"), _message("2-0", "user-a"), _message("3-0", "user-b")]
+
+        done = await consumer._process_messages("identity.user.v1", messages)
+
+        assert done == ["3-0"]
+        consumer.redis_client.xack.assert_awaited_once_with("identity.user.v1", "test_group", "3-0")
+
+    @pytest.mark.unit
+    async def test_failed_aggregate_held_across_batches_until_reclaimed(self, consumer):
+        failing = {"1-0"}
+        processed = []
+
+        async def process(message_id, fields):
+            if message_id in failing:
+                raise RuntimeError("boom")
+            processed.append(message_id)
+
+        consumer._process_event = process
+        topic = "identity.user.v1"
+        await consumer._process_messages(topic, [_message("1-0", "user-a")])
+
+        # Later reads skip the aggregate instead of overtaking the failed event
+        assert await consumer._process_messages(topic, [_message("2-0", "user-a")]) == []
+
+        failing.clear()
+        retry = [_message("1-0", "user-a"), _message("2-0", "user-a")]
+        assert await consumer._process_messages(topic, retry, retry=True) == ["1-0", "2-0"]
+        assert await consumer._process_messages(topic, [_message("3-0", "user-a")]) == ["3-0"]
+        assert processed == ["1-0", "2-0", "3-0"]
+
+
+class TestReclaim:
+    """Test XAUTOCLAIM retry and poison-message routing."""
+
+    @pytest.mark.unit
+    async def test_poison_message_routed_to_dlq(self, consumer):
+        consumer._process_event = AsyncMock()
+        consumer._failures[("identity.user.v1", "1-0")] = 3
+        consumer.redis_client.xautoclaim.return_value = [
+            "0-0", [_message("1-0", "user-a"), _message("2-0", "user-b")], []
+        ]
+
+        handled = await consumer._reclaim_topic("identity.user.v1", "test-consumer-1")
+
+        assert handled == 2
+        dlq_stream, dlq_fields = consumer.redis_client.xadd.await_args.args
+        assert dlq_stream == "identity.user.v1.dlq"
+        assert dlq_fields["original_message_id"] == "1-0" and dlq_fields["deliveries"] == "3"
+        consumer._process_event.assert_awaited_once_with("2-0", _message("2-0", "user-b")[1])
+
+    @pytest.mark.unit
+    async def test_only_the_failing_event_is_dead_lettered(self, consumer):
+        processed = []
+
+        async def process(message_id, fields):
+            if message_id == "1-0":
+                raise RuntimeError("poison")
+            processed.append(message_id)
+
+        consumer._process_event = process
+        topic = "identity.user.v1"
+        messages = [_message(f"{i}-0", "user-a") for i in range(1, 5)]
+        await consumer._process_messages(topic, messages)
+
+        # Every reclaim cycle claims the held events together with the poison one
+        consumer.redis_client.xautoclaim.return_value = ["0-0", messages, []]
+        for _ in range(consumer.max_deliveries):
+            await consumer._reclaim_topic(topic, "test-consumer-1")
+
+        assert consumer.redis_client.xadd.await_count == 1
+        assert consumer.redis_client.xadd.await_args.args[1]["original_message_id"] == "1-0"
+        assert processed == ["2-0", "3-0", "4-0"]
+        assert consumer._held == {} and consumer._failures == {}
+
+
+class TestBatchedIdempotency:
+    """Test the batch ledger check and the recent-event cache."""
+
+    @pytest.mark.unit
+    async def test_processed_events_skipped_with_one_ledger_query(self, consumer):
+        consumer._process_event = AsyncMock()
+        consumer.recent_events.add("evt-1-0")
+        consumer.db_manager.filter_processed_events.return_value = {"evt-2-0"}
+        messages = [_message("1-0", "user-a"), _message("2-0", "user-b"), _message("3-0", "user-c")]
+
+        done = await consumer._process_messages("identity.user.v1", messages)
+
+        assert sorted(done) == ["1-0", "2-0", "3-0"]
+        consumer.db_manager.filter_processed_events.assert_awaited_once()
+        assert set(consumer.db_manager.filter_processed_events.await_args.args[1]) == {"evt-2-0", "evt-3-0"}
+        consumer._process_event.assert_awaited_once_with("3-0", _message("3-0", "user-c")[1])
+
+    @pytest.mark.unit
+    def test_recent_event_ids_evicts_least_recently_seen(self):
+        recent = RecentEventIds(capacity=2)
+        recent.update(["a", "b"])
+        assert "a" in recent  # refreshes "a"
+        recent.add("c")
+        assert "b" not in recent
+        assert "a" in recent and "c" in recent and len(recent) == 2
+
+
+class TestSchemaValidation:
+    """Test that schema violations are dead-lettered without retries."""
+
+    @pytest.mark.unit
+    async def test_invalid_event_routed_to_dlq(self, consumer):
+        fields = {
+            "event_id": "123e4567-e89b-12d3-a456-426614174000",
+            "event_type": "UserCreated",
+            "topic": "identity.user.v1",
+            "schema_version": "1",
+            "occurred_at": "2024-01-01T00:00:00Z",
+            "tenant_id": "550e8400-e29b-41d4-a716-446655440000",
+            "aggregate_id": "6ba7b810-9dad-11d1-80b4-00c04fd430c8",
+            "aggregate_type": "user",
+            "payload": '{"user_id": "6ba7b810-9dad-11d1-80b4-00c04fd430c8", "status": "unknown"}',
+        }
+
+        done = await consumer._process_messages("identity.user.v1", [("1-0", fields)])
+
+        assert done == []
+        dlq_stream, dlq_fields = consumer.redis_client.xadd.await_args.args
+        assert dlq_stream == "identity.user.v1.dlq"
+        assert "Invalid UserCreated v1 payload" in dlq_fields["error"]
+        consumer.redis_client.xack.assert_awaited_once_with("identity.user.v1", "test_group", "1-0")
@@ -0,0 +1,56 @@
+"""
+Unit tests for the consumer's Prometheus metrics.
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.consumer import ConfigurableConsumer
+from app.metrics import refresh_stream_gauges
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.unit
+async def test_handled_events_are_counted_and_timed(service_config):
+    consumer = ConfigurableConsumer(service_config)
+    consumer.redis_client = AsyncMock()
+    consumer.db_manager.session_factory = MagicMock()
+    consumer.db_manager.filter_processed_events = AsyncMock(return_value=set())
+    consumer._process_event = AsyncMock(side_effect=[None, RuntimeError("boom")])
+
+    topic = "metrics.test.v1"
+    successes = _sample("consumer_events_total", topic=topic, result="success")
+    failures = _sample("consumer_events_total", topic=topic, result="failure")
+    timed = _sample("consumer_event_handle_duration_seconds_count", topic=topic, event_type="UserCreated")
+
+    messages = [
+        ("1-0", {"event_id": "a", "aggregate_id": "x", "event_type": "UserCreated",
+                 "occurred_at": "2024-01-01T00:00:00Z"}),
+        ("2-0", {"event_id": "b", "aggregate_id": "x", "event_type": "UserCreated"}),
+    ]
+    await consumer._process_messages(topic, messages)
+
+    assert _sample("consumer_events_total", topic=topic, result="success") == successes + 1
+    assert _sample("consumer_events_total", topic=topic, result="failure") == failures + 1
+    assert _sample("consumer_event_handle_duration_seconds_count", topic=topic, event_type="UserCreated") == timed + 2
+    assert _sample("consumer_event_lag_seconds_count", topic=topic) >= 1
+
+
+@pytest.mark.unit
+async def test_refresh_stream_gauges():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[
+        {"pending": 7}, 120, [{"name": "other", "lag": 1}, {"name": "test_group", "lag": 42}],
+    ])
+    redis_client = MagicMock()
+    redis_client.pipeline.return_value = pipe
+
+    await refresh_stream_gauges(redis_client, ["gauges.test.v1"], "test_group")
+
+    assert _sample("consumer_pending_messages", topic="gauges.test.v1", group="test_group") == 7
+    assert _sample("consumer_stream_length", topic="gauges.test.v1") == 120
+    assert _sample("consumer_group_lag", topic="gauges.test.v1", group="test_group") == 42
@@ -27,7 +27,17 @@ class Settings(BaseSettings):
 
     poll_interval: int = Field(
         default=5,
-        description="Seconds to wait between polling for events",
+        description="Seconds to wait between polls when no NOTIFY arrives (safety net)",
+    )
+
+    notify_channel: str = Field(
+        default="outbox_events",
+        description="Postgres LISTEN channel the backend NOTIFYs on new outbox rows",
+    )
+
+    listen_enabled: bool = Field(
+        default=True,
+        description="Wake on Postgres NOTIFY instead of relying on polling alone",
     )
 
     # HTTP server configuration
@@ -57,6 +67,27 @@ class Settings(BaseSettings):
         description="Dead letter queue stream name",
     )
 
+    # Retention of published events
+    retention_days: int = Field(
+        default=7,
+        description="Days to keep published outbox events (0 disables pruning)",
+    )
+
+    retention_interval: int = Field(
+        default=3600,
+        description="Seconds between retention runs",
+    )
+
+    retention_batch_size: int = Field(
+        default=5000,
+        description="Rows archived/deleted per retention transaction",
+    )
+
+    archive_dir: str = Field(
+        default="",
+        description="Directory for gzipped JSONL exports of pruned events (empty: no export)",
+    )
+
     # Monitoring
     log_level: str = Field(
         default="INFO",
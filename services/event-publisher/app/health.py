@@ -2,7 +2,8 @@
 
 import logging
 from typing import Dict, Any
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 import redis.asyncio as redis
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -97,6 +98,43 @@ def setup_health_endpoints(app: FastAPI, settings: Settings, session_factory):
             "metrics": relay_metrics.get_metrics()
         }
 
+    setup_metrics_endpoints(app, settings, session_factory)
+
+
+async def refresh_pipeline_gauges(settings: Settings, session_factory, redis_client: redis.Redis):
+    """Refresh outbox backlog and stream length gauges before a scrape."""
+    try:
+        async with session_factory() as session:
+            # Served by the pending-rows partial index
+            result = await session.execute(text("""
+                SELECT COUNT(*) AS backlog,
+                       COALESCE(EXTRACT(EPOCH FROM now() - MIN(created_at)), 0) AS oldest_age
+                FROM identity.outbox
+                WHERE published = FALSE
+            """))
+            row = result.one()
+            relay_metrics.set_outbox_backlog(row.backlog)
+            relay_metrics.set_oldest_unpublished_age(float(row.oldest_age))
+    except Exception as e:
+        logger.warning(f"Outbox gauge refresh failed: {e}")
+
+    try:
+        streams = sorted({settings.stream_name, *relay_metrics.events_published_total})
+        pipe = redis_client.pipeline(transaction=False)
+        for stream in streams:
+            pipe.xlen(stream)
+        for stream, length in zip(streams, await pipe.execute()):
+            relay_metrics.set_stream_length(stream, length)
+    except Exception as e:
+        logger.warning(f"Stream gauge refresh failed: {e}")
+
+
+def setup_metrics_endpoints(app: FastAPI, settings: Settings, session_factory):
+    """Set up the JSON and Prometheus metrics endpoints."""
+    # Shared client for scrapes (connections are pooled, opened lazily)
+    scrape_redis = redis.from_url(settings.redis_url, decode_responses=True)
+    app.add_event_handler("shutdown", scrape_redis.close)
+
     @app.get("/metrics")
     async def get_metrics() -> Dict[str, Any]:
         """Get relay service metrics."""
@@ -105,6 +143,12 @@ def setup_health_endpoints(app: FastAPI, settings: Settings, session_factory):
             "metrics": relay_metrics.get_metrics()
         }
 
+    @app.get("/metrics/prometheus")
+    async def prometheus_metrics() -> Response:
+        """Relay metrics in Prometheus text format."""
+        await refresh_pipeline_gauges(settings, session_factory, scrape_redis)
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
     @app.post("/metrics/reset")
     async def reset_metrics() -> Dict[str, str]:
         """Reset metrics (admin endpoint)."""
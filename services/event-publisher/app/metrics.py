@@ -1,4 +1,9 @@
-"""Metrics collection and reporting for relay service."""
+"""Metrics collection and reporting for relay service.
+
+``RelayMetrics`` keeps the JSON snapshot served by ``/metrics``; the same
+updates feed the Prometheus collectors below, exposed in text format by
+``/metrics/prometheus``.
+"""
 
 import asyncio
 import logging
@@ -7,8 +12,42 @@ from collections import defaultdict
 from typing import Dict, Any
 from datetime import datetime, timezone
 
+from prometheus_client import Counter, Gauge, Histogram
+
 logger = logging.getLogger(__name__)
 
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+EVENTS_PUBLISHED = Counter(
+    "relay_events_published_total", "Outbox events published to Redis Streams", ["topic"]
+)
+EVENTS_FAILED = Counter(
+    "relay_events_failed_total", "Outbox events whose publish attempt failed"
+)
+EVENTS_DLQ = Counter(
+    "relay_events_dlq_total", "Outbox events moved to the dead letter queue", ["topic"]
+)
+PUBLISH_BATCH_SECONDS = Histogram(
+    "relay_publish_batch_duration_seconds",
+    "Time to publish one outbox batch (pipelined XADDs, UPDATE and commit)",
+    buckets=LATENCY_BUCKETS,
+)
+PUBLISH_LAG_SECONDS = Histogram(
+    "relay_event_publish_lag_seconds",
+    "Time from outbox insert to publish",
+    ["topic"],
+    buckets=LATENCY_BUCKETS,
+)
+OUTBOX_UNPUBLISHED = Gauge(
+    "relay_outbox_unpublished_events", "Outbox rows not yet published"
+)
+OUTBOX_OLDEST_AGE = Gauge(
+    "relay_outbox_oldest_unpublished_age_seconds", "Age of the oldest unpublished outbox row"
+)
+STREAM_LENGTH = Gauge(
+    "relay_stream_length", "Entries in a Redis stream (XLEN)", ["stream"]
+)
+
 
 class RelayMetrics:
     """Metrics collector for relay service operations."""
@@ -29,18 +68,41 @@ class RelayMetrics:
         self.events_published_total[topic] += 1
         self.publish_success_total += 1
         self.last_publish_timestamp = datetime.now(timezone.utc)
+        EVENTS_PUBLISHED.labels(topic).inc()
 
     def increment_dlq(self, topic: str):
         """Increment DLQ events counter."""
         self.events_dlq_total[topic] += 1
+        EVENTS_DLQ.labels(topic).inc()
 
     def increment_failure(self):
         """Increment failure counter."""
         self.publish_failure_total += 1
+        EVENTS_FAILED.inc()
 
     def set_outbox_backlog(self, count: int):
         """Set current outbox backlog count."""
         self.outbox_backlog_current = count
+        OUTBOX_UNPUBLISHED.set(count)
+
+    def set_oldest_unpublished_age(self, seconds: float):
+        """Set the age of the oldest unpublished outbox event."""
+        OUTBOX_OLDEST_AGE.set(seconds)
+
+    def set_stream_length(self, stream: str, length: int):
+        """Set the current length of a Redis stream."""
+        STREAM_LENGTH.labels(stream).set(length)
+
+    def observe_publish_lag(self, topic: str, created_at: datetime):
+        """Record the time an event spent in the outbox before publish."""
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        lag = (datetime.now(timezone.utc) - created_at).total_seconds()
+        PUBLISH_LAG_SECONDS.labels(topic).observe(max(lag, 0.0))
+
+    def observe_batch_duration(self, seconds: float):
+        """Record how long publishing one batch took."""
+        PUBLISH_BATCH_SECONDS.observe(seconds)
 
     def add_error(self, error: str, event_id: str = None):
         """Add processing error to recent errors list."""
@@ -80,7 +142,10 @@ class RelayMetrics:
         return round((self.publish_success_total / total_attempts) * 100, 2)
 
     def reset_metrics(self):
-        """Reset all metrics (for admin use)."""
+        """Reset all metrics (for admin use).
+
+        Prometheus collectors are left alone; counters must stay monotonic.
+        """
         self.events_published_total.clear()
         self.events_dlq_total.clear()
         self.outbox_backlog_current = 0
@@ -3,10 +3,12 @@
 import asyncio
 import json
 import logging
+import time
 import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 
+import asyncpg
 import redis.asyncio as redis
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -26,6 +28,8 @@ class OutboxRelay:
         self.session_factory = None
         self.redis = None
         self.running = False
+        self._listen_conn: Optional[asyncpg.Connection] = None
+        self._wakeup = asyncio.Event()
 
     async def initialize(self):
         """Initialize database and Redis connections."""
@@ -64,8 +68,53 @@ class OutboxRelay:
         await self.redis.ping()
         logger.info("Redis connection successful")
 
+    async def _ensure_listener(self):
+        """Open (or reopen) the dedicated LISTEN connection.
+
+        Failures are logged and leave the relay in polling mode; the next
+        idle iteration tries again.
+        """
+        if not self.settings.listen_enabled:
+            return
+        if self._listen_conn is not None and not self._listen_conn.is_closed():
+            return
+
+        try:
+            # asyncpg wants a plain postgresql:// DSN
+            dsn = self.settings.database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+            self._listen_conn = await asyncpg.connect(dsn)
+            await self._listen_conn.add_listener(self.settings.notify_channel, self._on_notify)
+            logger.info(f"Listening for outbox notifications on '{self.settings.notify_channel}'")
+            # Rows may have been inserted while we were not listening
+            self._wakeup.set()
+        except Exception as e:
+            logger.warning(f"LISTEN unavailable, falling back to polling: {e}")
+            self._listen_conn = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        """asyncpg notification callback: wake the processing loop."""
+        self._wakeup.set()
+
+    async def _wait_for_events(self, shutdown_flag: asyncio.Event):
+        """Sleep until a NOTIFY arrives, shutdown is requested, or the poll interval elapses."""
+        await self._ensure_listener()
+        wakeup = asyncio.create_task(self._wakeup.wait())
+        shutdown = asyncio.create_task(shutdown_flag.wait())
+        try:
+            await asyncio.wait(
+                {wakeup, shutdown},
+                timeout=self.settings.poll_interval,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            wakeup.cancel()
+            shutdown.cancel()
+
     async def cleanup(self):
         """Clean up connections."""
+        if self._listen_conn is not None and not self._listen_conn.is_closed():
+            await self._listen_conn.close()
+
         if self.redis:
             await self.redis.close()
 
@@ -80,17 +129,21 @@ class OutboxRelay:
         """Main processing loop."""
         self.running = True
         logger.info("Starting outbox relay processing loop")
+        await self._ensure_listener()
 
         while self.running and not shutdown_flag.is_set():
             try:
+                # Clear before querying so a NOTIFY during the batch is not lost
+                self._wakeup.clear()
+
                 # Process a batch of events
                 processed_count = await self._process_batch()
 
                 if processed_count > 0:
                     logger.info(f"Processed {processed_count} events")
                 else:
-                    # No events to process, wait before next poll
-                    await asyncio.sleep(self.settings.poll_interval)
+                    # No events to process, wait for a NOTIFY (or the safety-net poll)
+                    await self._wait_for_events(shutdown_flag)
 
             except Exception as e:
                 logger.error(f"Error in processing loop: {e}", exc_info=True)
@@ -99,7 +152,12 @@ class OutboxRelay:
         logger.info("Outbox relay processing stopped")
 
     async def _process_batch(self) -> int:
-        """Process a batch of unpublished events."""
+        """Process a batch of unpublished events.
+
+        All XADDs for the batch go out in one pipelined round-trip and the
+        successful events are marked published with a single UPDATE; events
+        whose envelope or XADD failed go through the usual retry/DLQ path.
+        """
         from .metrics import relay_metrics
 
         async with self.session_factory() as session:
@@ -109,43 +167,58 @@ class OutboxRelay:
             if not events:
                 return 0
 
-            processed_count = 0
+            started = time.perf_counter()
+            failures: List[tuple] = []
+            pending: List[tuple] = []
+            pipe = self.redis.pipeline(transaction=False)
 
             for event in events:
                 try:
-                    # Create event envelope
+                    # Create event envelope and queue its XADD
                     envelope = await self._create_event_envelope(event)
+                    self._queue_publish(pipe, envelope)
+                    pending.append((event, envelope))
+                except Exception as e:
+                    failures.append((event, e))
 
-                    # Publish to Redis Stream
-                    await self._publish_to_stream(envelope)
+            # One round-trip for the whole batch; per-command errors come back in place
+            results = await pipe.execute(raise_on_error=False) if pending else []
 
-                    # Mark as published
-                    await self._mark_published(session, event["event_id"])
+            published_ids = []
+            for (event, envelope), result in zip(pending, results):
+                if isinstance(result, Exception):
+                    failures.append((event, result))
+                    continue
 
-                    processed_count += 1
+                published_ids.append(event["id"])
+                relay_metrics.increment_published(envelope["topic"])
+                relay_metrics.observe_publish_lag(envelope["topic"], event["created_at"])
+                logger.debug(
+                    f"Published event {event['event_id']} of type {event['event_type']} "
+                    f"to stream {envelope['topic']} with ID {result}"
+                )
 
-                    # Update metrics
-                    relay_metrics.increment_published(envelope["topic"])
+            # Mark the published events in one statement
+            await self._mark_published_batch(session, published_ids)
 
-                    logger.debug(f"Published event {event['event_id']} of type {event['event_type']}")
+            for event, error in failures:
+                logger.error(f"Failed to process event {event['event_id']}: {error}")
 
-                except Exception as e:
-                    logger.error(f"Failed to process event {event['event_id']}: {e}")
+                # Update failure metrics
+                relay_metrics.increment_failure()
+                relay_metrics.add_error(str(error), event.get("event_id"))
 
-                    # Update failure metrics
-                    relay_metrics.increment_failure()
-                    relay_metrics.add_error(str(e), event.get("event_id"))
-
-                    # Handle retry logic
-                    await self._handle_failed_event(session, event, str(e))
+                # Handle retry logic
+                await self._handle_failed_event(session, event, str(error))
 
             # Commit all changes
             await session.commit()
 
-            return processed_count
+            relay_metrics.observe_batch_duration(time.perf_counter() - started)
+            return len(published_ids)
 
     async def _get_unpublished_events(self, session: AsyncSession, limit: int) -> List[Dict[str, Any]]:
-        """Get unpublished events from outbox table."""
+        """Get unpublished events from outbox table (served by the created_at pending partial index)."""
         query = text("""
             SELECT id, event_id, event_type, aggregate_type, aggregate_id,
                    payload, created_at, attempts, next_attempt_at, topic
@@ -197,8 +270,8 @@ class OutboxRelay:
 
         return envelope
 
-    async def _publish_to_stream(self, envelope: Dict[str, Any]):
-        """Publish event envelope to Redis Stream."""
+    def _queue_publish(self, pipe, envelope: Dict[str, Any]):
+        """Queue an XADD of the event envelope on a Redis pipeline."""
         # Convert envelope to Redis stream format (flat key-value pairs)
         stream_data = {
             "event_id": envelope["event_id"],
@@ -212,15 +285,28 @@ class OutboxRelay:
             "payload": json.dumps(envelope["payload"])
         }
 
-        # Add to Redis Stream — route to the topic-specific stream
-        target_stream = envelope["topic"]
-        stream_id = await self.redis.xadd(
-            target_stream,
+        # Route to the topic-specific stream
+        pipe.xadd(
+            envelope["topic"],
             stream_data,
             maxlen=10000  # Keep last 10k events
         )
 
-        logger.debug(f"Published to stream {target_stream} with ID {stream_id}")
+    async def _mark_published_batch(self, session: AsyncSession, ids: List[int]):
+        """Mark a set of outbox rows as published."""
+        if not ids:
+            return
+
+        query = text("""
+            UPDATE identity.outbox
+            SET published = TRUE, published_at = :published_at
+            WHERE id = ANY(:ids)
+        """)
+
+        await session.execute(query, {
+            "ids": ids,
+            "published_at": datetime.now(timezone.utc)
+        })
 
     async def _mark_published(self, session: AsyncSession, event_id: str):
         """Mark event as published."""
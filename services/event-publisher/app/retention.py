@@ -0,0 +1,109 @@
+"""Retention for published outbox events.
+
+Published rows are only needed for a short audit window.  The retention
+loop deletes rows published more than ``retention_days`` ago in bounded
+chunks, optionally exporting each chunk to a gzipped JSON-lines archive
+first, so ``identity.outbox`` stays proportional to recent traffic.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRetention:
+    """Periodic pruning (and archiving) of published outbox events."""
+
+    def __init__(self, settings: Settings, session_factory):
+        self.settings = settings
+        self.session_factory = session_factory
+
+    async def run(self, shutdown_flag: asyncio.Event):
+        """Prune on ``retention_interval`` until shutdown."""
+        if self.settings.retention_days <= 0:
+            logger.info("Outbox retention disabled")
+            return
+
+        logger.info(
+            f"Outbox retention: keeping {self.settings.retention_days} day(s) of published events"
+        )
+        while not shutdown_flag.is_set():
+            try:
+                removed = await self.prune()
+                if removed:
+                    logger.info(f"Pruned {removed} published outbox events")
+            except Exception as e:
+                logger.error(f"Outbox retention failed: {e}", exc_info=True)
+
+            try:
+                await asyncio.wait_for(shutdown_flag.wait(), timeout=self.settings.retention_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def prune(self) -> int:
+        """Archive and delete expired published events; returns rows removed."""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.settings.retention_days)
+        total = 0
+
+        while True:
+            async with self.session_factory() as session:
+                rows = await self._select_expired(session, cutoff)
+                if not rows:
+                    return total
+
+                # Export before deleting so a failed write loses nothing
+                if self.settings.archive_dir:
+                    await asyncio.to_thread(self._write_archive, rows)
+
+                await session.execute(
+                    text("DELETE FROM identity.outbox WHERE id = ANY(:ids)"),
+                    {"ids": [row["id"] for row in rows]},
+                )
+                await session.commit()
+
+            total += len(rows)
+            if len(rows) < self.settings.retention_batch_size:
+                return total
+
+    async def _select_expired(self, session: AsyncSession, cutoff: datetime) -> List[Dict[str, Any]]:
+        """Lock the next chunk of expired rows (served by the published_at partial index)."""
+        query = text("""
+            SELECT id, event_id, event_type, aggregate_type, aggregate_id,
+                   payload, topic, created_at, published_at, attempts, error_message
+            FROM identity.outbox
+            WHERE published = TRUE
+              AND published_at < :cutoff
+            ORDER BY published_at ASC
+            LIMIT :limit
+            FOR UPDATE SKIP LOCKED
+        """)
+
+        result = await session.execute(query, {
+            "cutoff": cutoff,
+            "limit": self.settings.retention_batch_size,
+        })
+        return [dict(row._mapping) for row in result]
+
+    def _write_archive(self, rows: List[Dict[str, Any]]):
+        """Write one chunk as ``outbox-<timestamp>-<first id>.jsonl.gz``."""
+        archive_dir = Path(self.settings.archive_dir)
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = archive_dir / f"outbox-{stamp}-{rows[0]['id']}.jsonl.gz"
+
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, default=str) + "\n")
+
+        logger.info(f"Archived {len(rows)} outbox events to {path}")
@@ -12,6 +12,7 @@ import uvicorn
 
 from app.config import Settings
 from app.relay import OutboxRelay
+from app.retention import OutboxRetention
 from app.health import setup_health_endpoints
 from app.logging_config import configure_logging
 
@@ -89,6 +90,10 @@ async def main():
             
             # Start relay processing
             relay_task = tg.create_task(relay.run(shutdown_flag))
+
+            # Prune published events past the retention window
+            retention = OutboxRetention(settings, relay.session_factory)
+            retention_task = tg.create_task(retention.run(shutdown_flag))
             
             # Wait for shutdown signal
             await shutdown_flag.wait()
@@ -96,6 +101,7 @@ async def main():
             # Cancel tasks gracefully
             health_task.cancel()
             relay_task.cancel()
+            retention_task.cancel()
 
     except* (asyncio.CancelledError, Exception) as eg:
         for exc in eg.exceptions: